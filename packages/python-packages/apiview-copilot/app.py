@@ -29,9 +29,11 @@ from src._database_manager import DatabaseManager
 from src._diff import create_diff_with_line_numbers
 from src._mention import handle_mention_request
 from src._report_issue import handle_report_issue_request
+from src._review_scheduler import ReviewScheduler, SchedulerFullError, review_job_key
 from src._settings import SettingsManager
 from src._thread_resolution import handle_thread_resolution_request
 from src._prompt_runner import run_prompt
+from src._rate_limiter import Priority, llm_priority
 from src._utils import get_language_pretty_name
 from src.agent._agent import get_readonly_agent, get_readwrite_agent, invoke_agent
 
@@ -39,6 +41,7 @@ from src.agent._agent import get_readonly_agent, get_readwrite_agent, invoke_age
 JOB_RETENTION_SECONDS = 1800  # 30 minutes
 db_manager = DatabaseManager.get_instance()
 settings = SettingsManager()
+review_scheduler = ReviewScheduler()
 
 # Application Insights telemetry — enabled when connection string is available
 _appinsights_conn_str = os.environ.get("APPLICATIONINSIGHTS_CONNECTION_STRING")
@@ -85,6 +88,9 @@ class ApiReviewJobStatusResponse(BaseModel):
     status: ApiReviewJobStatus
     comments: list = None
     details: str = None
+    # Reported while the job is queued or running on the instance that answers
+    queue_position: Optional[int] = None
+    eta_seconds: Optional[float] = None
 
 
 class ApiReviewJobStartResponse(BaseModel):
@@ -108,24 +114,34 @@ async def submit_api_review_job(
     if job_request.language not in SUPPORTED_LANGUAGES:
         raise HTTPException(status_code=400, detail=f"Unsupported language `{job_request.language}`")
 
+    # An identical submission that is queued or running already will produce the same comments
+    job_key = review_job_key(
+        job_request.language, job_request.target, job_request.base, job_request.outline, job_request.comments
+    )
+    existing_job_id = review_scheduler.find_identical(job_key)
+    if existing_job_id is not None:
+        return ApiReviewJobStartResponse(job_id=existing_job_id)
+
     try:
-        reviewer = ApiViewReview(
+        # Off the event loop: the reviewer loads the language's guideline snapshot, which may fetch it.
+        reviewer = await asyncio.to_thread(
+            ApiViewReview,
             language=job_request.language,
             target=job_request.target,
             base=job_request.base,
             outline=job_request.outline,
             comments=job_request.comments,
+            # Revisions of a package mostly repeat the sections of the previous one
+            reuse_section_results=True,
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
     job_id = reviewer.job_id
-    db_manager.review_jobs.create(job_id, data={"status": ApiReviewJobStatus.InProgress, "finished": None})
 
     async def run_review_job():
         try:
-            loop = asyncio.get_running_loop()
-            # Run the blocking review in a thread pool executor
-            result = await loop.run_in_executor(None, reviewer.run)
+            # Run the review on the event loop, so concurrent reviews don't each hold a pool of threads
+            result = await reviewer.arun()
             reviewer.close()
             # Parse comments from result
             result_json = json.loads(result.model_dump_json())
@@ -141,8 +157,18 @@ async def submit_api_review_job(
                 job_id, data={"status": ApiReviewJobStatus.Error, "details": str(e), "finished": now}
             )
 
-    # Schedule the job in the background
-    asyncio.create_task(run_review_job())
+    # Queue the job, to run in the background once fewer than the maximum number of reviews are running
+    try:
+        submitted_job_id = review_scheduler.submit(job_key, job_id, run_review_job)
+    except SchedulerFullError as e:
+        reviewer.close()
+        raise HTTPException(status_code=503, detail=str(e)) from e
+    if submitted_job_id != job_id:
+        # An identical job was submitted while the reviewer was created
+        reviewer.close()
+        return ApiReviewJobStartResponse(job_id=submitted_job_id)
+    # The job starts only once this handler yields, so its record exists before it runs.
+    db_manager.review_jobs.create(job_id, data={"status": ApiReviewJobStatus.InProgress, "finished": None})
     return ApiReviewJobStartResponse(job_id=job_id)
 
 
@@ -154,6 +180,9 @@ async def get_api_review_job_status(
     """Get the status of an API review job."""
     try:
         job = db_manager.review_jobs.get(job_id)
+        if job.get("status") == ApiReviewJobStatus.InProgress:
+            job["queue_position"] = review_scheduler.position(job_id)
+            job["eta_seconds"] = review_scheduler.eta(job_id)
         return job
     except CosmosResourceNotFoundError as exc:
         raise HTTPException(status_code=404, detail=f"Job with id {html.escape(str(job_id))} not found") from exc
@@ -222,7 +251,8 @@ async def agent_chat(
         is_writer = (AppRole.WRITER.value in token_roles) or (AppRole.APP_WRITER.value in token_roles)
         agent_factory = get_readwrite_agent if is_writer else get_readonly_agent
 
-        with agent_factory() as (client, agent_id):
+        # Prompts run by the agent's tools go before those of background work such as reviews
+        with agent_factory() as (client, agent_id), llm_priority(Priority.INTERACTIVE):
             response, thread_id_out, messages = await invoke_agent(
                 client=client,
                 agent_id=agent_id,
@@ -46,7 +46,7 @@ from src._apiview import (
     get_thread_start_dates,
     resolve_package,
 )
-from src._apiview_reviewer import SUPPORTED_LANGUAGES, ApiViewReview
+from src._apiview_reviewer import DEFAULT_COMMENT_BATCH_SIZE, SUPPORTED_LANGUAGES, ApiViewReview
 from src._database_manager import ContainerNames, DatabaseManager
 from src._garbage_collector import GarbageCollector
 from src._apiview_metrics import (
@@ -246,6 +246,8 @@ def _local_review(
     outline: str = None,
     existing_comments: str = None,
     debug_log: bool = False,
+    comment_batch_size: int = DEFAULT_COMMENT_BATCH_SIZE,
+    reuse_sections: bool = False,
 ):
     """
     Generates a review using the locally installed code.
@@ -287,6 +289,8 @@ def _local_review(
             comments=comments_obj,
             write_output=True,
             write_debug_logs=debug_log,
+            comment_batch_size=comment_batch_size,
+            reuse_section_results=reuse_sections,
         )
     except ValueError as e:
         raise CLIError(str(e)) from e
@@ -368,6 +372,8 @@ def generate_review(
     existing_comments: Optional[str] = None,
     remote: bool = False,
     debug_log: bool = False,
+    comment_batch_size: int = DEFAULT_COMMENT_BATCH_SIZE,
+    reuse_sections: bool = False,
 ):
     """
     Generates a review synchronously.
@@ -411,6 +417,8 @@ def generate_review(
             outline=outline,
             existing_comments=existing_comments,
             debug_log=debug_log,
+            comment_batch_size=comment_batch_size,
+            reuse_sections=reuse_sections,
         )
 
 
@@ -1434,9 +1442,18 @@ def _cascade_unlink(db, item: dict, item_type: str):
 
 def _try_run_indexers(containers: list[tuple[str, object]]):
     """Best-effort trigger of search indexers for the given (label, container) pairs."""
+    runs = []
     for label, container in containers:
         try:
-            container.run_indexer()
+            runs.append((label, container.run_indexer()))
+        except Exception as e:
+            print(f"Warning: Failed to trigger indexer for {label}: {e}. Run `avc search reindex` manually.")
+    # Runs start in the background once their requests are coalesced; wait to report failures.
+    for label, run in runs:
+        if run is None:
+            continue
+        try:
+            run.wait()
         except Exception as e:
             print(f"Warning: Failed to trigger indexer for {label}: {e}. Run `avc search reindex` manually.")
 
@@ -2770,6 +2787,21 @@ class CliCommandsLoader(CLICommandsLoader):
                 action="store_true",
                 help="Enable debug logging for the review process. Outputs to `scratch/logs/<LANG>` directory.",
             )
+            ac.argument(
+                "comment_batch_size",
+                type=int,
+                options_list=["--comment-batch-size"],
+                default=DEFAULT_COMMENT_BATCH_SIZE,
+                # pylint: disable=line-too-long
+                help=f"Number of comments evaluated per hard filter and judge prompt call. Use 1 to disable batching. Local reviews only. Default is {DEFAULT_COMMENT_BATCH_SIZE}.",
+            )
+            ac.argument(
+                "reuse_sections",
+                options_list=["--reuse-sections"],
+                action="store_true",
+                # pylint: disable=line-too-long
+                help="Reuse the comments generated for sections identical to those of an earlier review. Set APIVIEW_PROMPT_CACHE_PATH to keep them across runs. Local reviews only.",
+            )
         with ArgumentsContext(self, "test extract-section") as ac:
             ac.argument("size", type=int, help="The size of the section to extract.")
             ac.argument(
@@ -8,7 +8,7 @@
 
 Minimal schema (intentionally lean):
 - name: unique workflow name
-- kind: 'prompt' | 'apiview'
+- kind: 'prompt' | 'summarize_prompt' | 'batch_prompt' | 'apiview'
 - tests: path to .jsonl testcases (relative to yaml location allowed)
 - prompty: required iff kind == 'prompt'
 
@@ -24,6 +24,7 @@ from typing import Dict, Type
 
 import yaml
 from evals._custom import (
+    BatchPromptEvaluator,
     PromptEvaluator,
     PromptSummaryEvaluator,
 )
@@ -152,6 +153,7 @@ def load_workflow_config(path: str | os.PathLike) -> WorkflowConfig:
 # Register evaluators at module load time to prevent circular imports
 register_evaluator("prompt", PromptEvaluator)
 register_evaluator("summarize_prompt", PromptSummaryEvaluator)
+register_evaluator("batch_prompt", BatchPromptEvaluator)
 
 
 __all__ = [
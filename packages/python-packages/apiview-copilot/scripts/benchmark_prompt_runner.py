@@ -0,0 +1,77 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+"""
+Microbenchmark of the per-call overhead of executing a .prompty file.
+
+Runs a prompt against a stubbed model response, first with the prompt registry and client
+pool cleared before every call, as every call used to parse the file, compile its templates
+and create a client, and then with them warm. No request is sent, so the time saved by
+reusing open connections instead of making a new TLS handshake is not included.
+
+Usage:
+    python scripts/benchmark_prompt_runner.py [--calls 200] [--prompt api_review/judge_comment_confidence.prompty]
+"""
+
+import argparse
+import os
+import sys
+from time import perf_counter
+from unittest.mock import MagicMock, patch
+
+# Ensure the project root is on sys.path so `src` imports work
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from azure.ai.inference import ChatCompletionsClient
+
+from src._prompt_runner import _execute_prompt_template, clear_prompt_caches
+from src._utils import get_prompt_path
+
+
+def _time_calls(prompt_path, calls: int, cold: bool) -> float:
+    """Return the average seconds per call."""
+    total = 0.0
+    for _ in range(calls):
+        if cold:
+            clear_prompt_caches()
+        start = perf_counter()
+        _execute_prompt_template(prompt_path, configuration={"api_key": "benchmark"})
+        total += perf_counter() - start
+    return total / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the per-call overhead of executing a .prompty file.")
+    parser.add_argument("--calls", type=int, default=200, help="Number of calls to time for each case.")
+    parser.add_argument(
+        "--prompt",
+        default="api_review/judge_comment_confidence.prompty",
+        help="Prompt to execute, relative to the prompts folder.",
+    )
+    args = parser.parse_args()
+    folder, filename = os.path.split(args.prompt)
+    prompt_path = get_prompt_path(folder=folder, filename=filename)
+
+    settings = MagicMock()
+    settings.get.return_value = "https://benchmark.services.ai.azure.com"
+    response = MagicMock()
+    response.choices[0].message.content = "{}"
+    with patch("src._settings.SettingsManager", return_value=settings), patch.object(
+        ChatCompletionsClient, "complete", return_value=response
+    ):
+        cold = _time_calls(prompt_path, args.calls, cold=True)
+        clear_prompt_caches()
+        _execute_prompt_template(prompt_path, configuration={"api_key": "benchmark"})
+        warm = _time_calls(prompt_path, args.calls, cold=False)
+    clear_prompt_caches()
+
+    print(f"{args.prompt}, {args.calls} calls each:")
+    print(f"  without caches: {cold * 1000:.3f} ms per call")
+    print(f"  with caches:    {warm * 1000:.3f} ms per call ({cold / warm:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+"""
+Benchmark of sectioning a synthetic API listing with SectionedDocument.
+
+Sections listings of increasing size, up to --lines, and prints the time per 1000 lines, which
+stays flat when sectioning scales linearly. Each listing is also sectioned with the previous
+algorithm, which looked up every top-level line with list.index and so took quadratic time, to
+check that both produce identical sections. Use --reference-lines to cap the listing size the
+previous algorithm is run on, as it takes most of a minute on a 200k-line listing.
+
+Usage:
+    python scripts/benchmark_sectioned_document.py [--lines 200000] [--reference-lines 200000]
+"""
+
+import argparse
+import os
+import random
+import sys
+from time import perf_counter
+
+# Ensure the project root is on sys.path so `src` imports work
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src._sectioned_document import Section, SectionedDocument, _is_decorator_line
+
+
+class _QuadraticSectionedDocument(SectionedDocument):
+    """SectionedDocument with the previous, quadratic split into initial sections."""
+
+    @staticmethod
+    def _initial_sections(line_data, base_indent):
+        top_level_lines = [
+            x
+            for x in line_data
+            if x.indent == base_indent
+            and x.line[base_indent:] != ""
+            and x.line[base_indent:] != "}"
+            and not _is_decorator_line(x.line)
+        ]
+        initial_sections = []
+        for i, line1 in enumerate(top_level_lines):
+            line1_idx = line_data.index(line1)
+            section_start_idx = line1_idx
+            while section_start_idx > 0:
+                prev_line = line_data[section_start_idx - 1]
+                if prev_line.indent == base_indent and _is_decorator_line(prev_line.line):
+                    section_start_idx -= 1
+                else:
+                    break
+            try:
+                line2_idx = line_data.index(top_level_lines[i + 1])
+                section_end_idx = line2_idx
+                while section_end_idx > line1_idx:
+                    prev_line = line_data[section_end_idx - 1]
+                    if prev_line.indent == base_indent and _is_decorator_line(prev_line.line):
+                        section_end_idx -= 1
+                    else:
+                        break
+                lines_between = line_data[section_start_idx:section_end_idx]
+            except IndexError:
+                lines_between = line_data[section_start_idx:]
+            initial_sections.append(Section(lines_between))
+        return initial_sections
+
+
+def _synthetic_listing(line_count: int, seed: int = 0) -> list:
+    """
+    Return a numbered API listing of about line_count lines: mostly small decorated classes and
+    functions, so there are thousands of top-level declarations, and a few classes large enough
+    to be subdivided.
+    """
+    rng = random.Random(seed)
+    lines = []
+    index = 0
+    while len(lines) < line_count:
+        index += 1
+        kind = rng.random()
+        if kind < 0.3:
+            lines.append(f"def function_{index}(value: int, *, name: str = None) -> str: ...")
+            continue
+        for decorator in range(rng.randint(0, 2)):
+            lines.append(f"@decorator_{decorator}")
+        lines.append(f"class Class{index}:")
+        size = rng.randint(600, 1500) if kind > 0.998 else rng.randint(2, 40)
+        for method in range(size):
+            if method % 5 == 0:
+                lines.append("    @overload")
+            lines.append(f"    def method_{method}(self, value: int) -> None: ...")
+        lines.append("")
+    return [f"{i + 1}: {line}" for i, line in enumerate(lines[:line_count])]
+
+
+def _shape(document: SectionedDocument) -> list:
+    return [[x.line_no for x in section.lines] for section in document]
+
+
+def _time(document_class, lines: list) -> tuple:
+    start = perf_counter()
+    document = document_class(lines=lines)
+    return perf_counter() - start, document
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sectioning a synthetic API listing.")
+    parser.add_argument("--lines", type=int, default=200_000, help="Lines of the largest listing.")
+    parser.add_argument(
+        "--reference-lines",
+        type=int,
+        default=200_000,
+        help="Largest listing to also section with the previous algorithm, to check the sections are identical.",
+    )
+    args = parser.parse_args()
+
+    print(f"{'lines':>8} {'sections':>9} {'ms':>9} {'ms/1k lines':>12} {'previous ms':>12}")
+    for line_count in (args.lines // 8, args.lines // 4, args.lines // 2, args.lines):
+        lines = _synthetic_listing(line_count)
+        elapsed, document = _time(SectionedDocument, lines)
+        previous = ""
+        if line_count <= args.reference_lines:
+            previous_elapsed, previous_document = _time(_QuadraticSectionedDocument, lines)
+            if _shape(previous_document) != _shape(document):
+                raise SystemExit(f"Sections of the {line_count}-line listing differ from the previous algorithm.")
+            previous = f"{previous_elapsed * 1000:.0f}"
+        print(
+            f"{line_count:>8} {len(document):>9} {elapsed * 1000:>9.1f} {elapsed * 1e6 / line_count:>12.3f} {previous:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -8,16 +8,23 @@
 Module for the APIView Copilot API review functionality.
 """
 
+import asyncio
 import concurrent.futures
+import contextlib
+import functools
+import hashlib
 import json
 import logging
 import os
+import re
 import signal
 import sys
 import threading
 import uuid
+from collections import Counter, defaultdict
+from dataclasses import dataclass
 from time import time
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import yaml
 from opentelemetry import metrics
@@ -26,9 +33,10 @@ from src._credential import get_credential
 from src._diff import create_diff_with_line_numbers
 from pydantic import ValidationError
 from src._models import Comment, ExistingComment, ReviewResult
-from src._prompt_runner import run_prompt
+from src._prompt_runner import prompt_version, run_prompt, run_prompt_async
+from src._response_cache import CachedResponse, get_section_result_cache
 from src._search_manager import SearchManager
-from src._sectioned_document import SectionedDocument
+from src._sectioned_document import Section, SectionedDocument
 from src._settings import SettingsManager
 from src._utils import get_language_pretty_name
 
@@ -76,6 +84,11 @@ _review_normalized_duration_histogram = _meter.create_histogram(
     description="Review duration normalized by the number of sections (chunks) processed",
     unit="s",
 )
+_review_stage_duration_histogram = _meter.create_histogram(
+    name="apiview.review.stage.duration",
+    description="Duration of a review stage, or of a single task within a stage, in seconds",
+    unit="s",
+)
 _review_request_counter = _meter.create_counter(
     name="apiview.review.requests",
     description="Total number of review requests",
@@ -85,6 +98,15 @@ _review_request_counter = _meter.create_counter(
 
 CREDENTIAL = get_credential()
 
+# Maximum number of concurrent search queries when retrieving context for sections
+MAX_CONCURRENT_RETRIEVALS = 8
+
+# Default number of comments evaluated per call of the batched hard filter and judge prompts
+DEFAULT_COMMENT_BATCH_SIZE = 8
+
+# Seconds an unchanged section reuses the comments generated for it by an earlier review
+SECTION_RESULT_TTL_SECONDS = 7 * 24 * 60 * 60
+
 SUPPORTED_LANGUAGES = [
     "android",
     "clang",
@@ -99,6 +121,46 @@ SUPPORTED_LANGUAGES = [
 ]
 
 
+_GUIDELINE_TAG = "guideline"
+_GENERIC_TAG = "generic"
+_CONTEXT_TAG = "context"
+_SKIP_GENERIC = True  # Generic review is disabled for all languages
+
+
+def _remap_line_numbers(result: dict, old_line_numbers: list, new_line_numbers: list) -> dict:
+    """
+    Move the line numbers of the raw comments in a section prompt result from the lines of a section
+    to the lines of an identical section at another position. Line numbers outside the section move
+    by the offset of its first line.
+    """
+    mapping = {old: new for old, new in zip(old_line_numbers, new_line_numbers) if old is not None and new is not None}
+    offset = next((new - old for old, new in mapping.items()), 0)
+
+    def _remap(match: re.Match) -> str:
+        line_no = int(match.group(0))
+        return str(mapping.get(line_no, line_no + offset))
+
+    for comment in result.get("comments") or []:
+        line_no = comment.get("line_no")
+        if isinstance(line_no, int) and not isinstance(line_no, bool):
+            comment["line_no"] = mapping.get(line_no, line_no + offset)
+        elif isinstance(line_no, str):
+            comment["line_no"] = re.sub(r"\d+", _remap, line_no)
+    return result
+
+
+@dataclass
+class ReviewStats:
+    """Counts of the comments generated, merged, discarded and scored during a review."""
+
+    generated: int = 0
+    generic_discarded: int = 0
+    merged: int = 0
+    hard_discarded: int = 0
+    preexisting_discarded: int = 0
+    scored: int = 0
+
+
 class ApiViewReviewMode:
     """Enumeration for APIView review modes."""
 
@@ -121,7 +183,11 @@ class ApiViewReview:
         include_general_guidelines: bool = False,
         write_debug_logs: bool = False,
         write_output: bool = False,
+        comment_batch_size: int = DEFAULT_COMMENT_BATCH_SIZE,
+        reuse_section_results: bool = False,
     ):
+        if comment_batch_size < 1:
+            raise ValueError(f"comment_batch_size must be at least 1, got {comment_batch_size}.")
         self.job_id = str(uuid.uuid4())
         self.target = self._unescape(target)
         self.base = self._unescape(base) if base else None
@@ -134,14 +200,17 @@ class ApiViewReview:
             self.max_chunk_size = 450
         else:
             self.max_chunk_size = 500
-        self.search = SearchManager(language=language)
+        self.search = SearchManager(language=language, cache_context=True, use_guideline_snapshot=True)
         self.semantic_search_failed = False
         self.allowed_ids = [x.id for x in self.search.language_guidelines or []]
         self.results = ReviewResult()
         self.summary = None
         self.outline = outline
         self.existing_comments = self._parse_existing_comments(comments)
+        self.comment_batch_size = comment_batch_size
+        self.reuse_section_results = reuse_section_results
         self.executor = concurrent.futures.ThreadPoolExecutor()
+        self.retrieval_executor = concurrent.futures.ThreadPoolExecutor(max_workers=MAX_CONCURRENT_RETRIEVALS)
         self.filter_expression = f"language eq '{language}' and not (tags/any(t: t eq 'documentation' or t eq 'vague'))"
         if include_general_guidelines:
             self.filter_expression += " or language eq '' or language eq null"
@@ -189,11 +258,14 @@ class ApiViewReview:
         self.logger = JobLogger(logger, self.job_id)
         self._chunk_count = 0
         self.run_prompt = run_prompt  # Use shared prompt runner
+        self.run_prompt_async = run_prompt_async
 
     def __del__(self):
-        # Ensure the executor is properly shut down
+        # Ensure the executors are properly shut down
         if hasattr(self, "executor"):
             self.executor.shutdown(wait=False)
+        if hasattr(self, "retrieval_executor"):
+            self.retrieval_executor.shutdown(wait=False)
 
     def _hash(self, obj) -> str:
         return str(hash(json.dumps(obj)))
@@ -249,6 +321,15 @@ class ApiViewReview:
         context = sum(1 for c in self.results.comments if c.memory_ids)
         self._print_message(f"  Comments: Total={total}, Guideline={guideline}, Memory={context}, Generic={generic}")
 
+    def _record_stage_duration(self, stage: str, duration: float):
+        """
+        Record the duration of a review stage, or of a single task within a stage, in seconds.
+        """
+        _review_stage_duration_histogram.record(
+            duration,
+            attributes={"review.language": self.language, "review.mode": self.mode, "review.stage": stage},
+        )
+
     def _print_message(self, msg: str = "", overwrite: bool = False):
         """
         Print messages, using carriage return for terminal, or newlines for non-terminal.
@@ -283,7 +364,15 @@ class ApiViewReview:
             raise NotImplementedError(f"Review mode {self.mode} is not implemented.")
 
     def _execute_prompt_task(
-        self, *, folder: str, filename: str, inputs: dict, task_name: str, status_idx: int, status_array: List[str]
+        self,
+        *,
+        folder: str,
+        filename: str,
+        inputs: dict,
+        task_name: str,
+        status_idx: int,
+        status_array: List[str],
+        section: Optional[Section] = None,
     ) -> Optional[dict]:
         """Execute a single prompt task with percent progress tracking.
 
@@ -294,70 +383,116 @@ class ApiViewReview:
             task_name (str): Name of the task (e.g., "summary", "guideline").
             status_idx (int): Index in the status array to update.
             status_array (List[str]): Array tracking the status of all tasks.
+            section (Optional[Section]): The section the prompt reviews. If given, and reuse_section_results
+                is set, the result of an earlier review of an identical section is reused.
 
         Returns:
             Optional[dict]: The result of the prompt execution, or None if an error occurred.
         """
-        # Numeric percent progress update (status_array is just a placeholder for counting)
-        total = len(status_array)
-        completed = sum(1 for s in status_array if s)
-        percent = int((completed / total) * 100) if total else 100
-        self._print_message(f"Evaluating prompts... {percent}% complete", overwrite=True)
-
+        self._print_prompt_progress(status_array)
+        start_time = time()
         try:
+            key, reused = self._reused_section_result(section, folder, filename, inputs)
+            if reused is not None:
+                return reused
             # Run the prompt
             response = self._run_prompt(folder, filename, inputs)
+            duration = time() - start_time
+            self._record_stage_duration(f"{task_name.split('_')[0]}_prompt", duration)
             result = json.loads(response)
-
-            # Mark this task as done (for numeric progress only)
-            status_array[status_idx] = True
-            completed = sum(1 for s in status_array if s)
-            percent = int((completed / total) * 100) if total else 100
-            self._print_message(f"Evaluating prompts... {percent}% complete", overwrite=True)
+            self._store_section_result(key, section, result, duration)
             return result
+        except Exception as e:
+            self.logger.error(f"Error executing {task_name}: {str(e)}")
+            return None
+        finally:
+            # Mark this task as done, even on error (for numeric progress only)
+            status_array[status_idx] = True
+            self._print_prompt_progress(status_array)
 
+    async def _aexecute_prompt_task(
+        self,
+        *,
+        folder: str,
+        filename: str,
+        inputs: dict,
+        task_name: str,
+        status_idx: int,
+        status_array: List[str],
+        section: Optional[Section] = None,
+    ) -> Optional[dict]:
+        """Async counterpart of _execute_prompt_task."""
+        self._print_prompt_progress(status_array)
+        start_time = time()
+        try:
+            key, reused = await asyncio.to_thread(self._reused_section_result, section, folder, filename, inputs)
+            if reused is not None:
+                return reused
+            response = await self._arun_prompt(folder, filename, inputs)
+            duration = time() - start_time
+            self._record_stage_duration(f"{task_name.split('_')[0]}_prompt", duration)
+            result = json.loads(response)
+            if key is not None:
+                await asyncio.to_thread(self._store_section_result, key, section, result, duration)
+            return result
         except Exception as e:
-            status_array[status_idx] = True  # Mark as done even on error
-            completed = sum(1 for s in status_array if s)
-            percent = int((completed / total) * 100) if total else 100
-            self._print_message(f"Evaluating prompts... {percent}% complete", overwrite=True)
             self.logger.error(f"Error executing {task_name}: {str(e)}")
             return None
+        finally:
+            status_array[status_idx] = True
+            self._print_prompt_progress(status_array)
 
-    def _generate_comments(self):
+    def _section_result_key(self, section: Section, folder: str, filename: str, inputs: dict) -> str:
         """
-        Generate comments for the API view by submitting jobs in parallel.
+        Return the fingerprint of a section prompt: a hash of the section's text without its line numbers,
+        the version of the prompt and its other inputs, which include the guidelines or memories it is given.
         """
-        guideline_tag = "guideline"
-        generic_tag = "generic"
-        context_tag = "context"
-        skip_generic = True  # Generic review is disabled for all languages
-
-        sectioned_doc = self._create_sectioned_document()
-
-        sections_to_process = [(i, section) for i, section in enumerate(sectioned_doc)]
-        self._chunk_count = len(sections_to_process)
-
-        # Select appropriate prompts based on mode
-        if self.mode == ApiViewReviewMode.FULL:
-            guideline_prompt_file = "guidelines_review.prompty"
-            context_prompt_file = "context_review.prompty"
-            generic_prompt_file = "generic_review.prompty"
-        elif self.mode == ApiViewReviewMode.DIFF:
-            guideline_prompt_file = "guidelines_diff_review.prompty"
-            context_prompt_file = "context_diff_review.prompty"
-            generic_prompt_file = "generic_diff_review.prompty"
-        else:
-            raise NotImplementedError(f"Review mode {self.mode} is not implemented.")
+        fingerprint = {
+            "prompt": f"{folder}/{filename}",
+            "version": prompt_version(folder, filename),
+            "inputs": {k: v for k, v in inputs.items() if k != "content"},
+            "lines": [f"{x.git_status or ''}{x.line.rstrip()}" for x in section.lines],
+        }
+        return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode("utf-8")).hexdigest()
 
-        # Set up progress tracking
-        self._print_message("Processing sections: ", overwrite=True)
+    def _reused_section_result(
+        self, section: Optional[Section], folder: str, filename: str, inputs: dict
+    ) -> Tuple[Optional[str], Optional[dict]]:
+        """
+        Return the fingerprint of a section prompt and the result of an earlier review of an identical
+        section, with its line numbers moved to this section. Both are None unless reuse_section_results
+        is set; the result is None if the section has not been reviewed before.
+        """
+        if section is None or not self.reuse_section_results:
+            return None, None
+        key = self._section_result_key(section, folder, filename, inputs)
+        cached = get_section_result_cache().get(key, prompt=os.path.splitext(filename)[0])
+        if cached is None:
+            return key, None
+        stored = json.loads(cached.content)
+        return key, _remap_line_numbers(stored["result"], stored["line_numbers"], [x.line_no for x in section.lines])
+
+    def _store_section_result(self, key: Optional[str], section: Section, result: Optional[dict], duration: float):
+        """Store the result of a section prompt under its fingerprint, for later reviews to reuse."""
+        if key is None or not isinstance(result, dict):
+            return
+        content = json.dumps({"line_numbers": [x.line_no for x in section.lines], "result": result})
+        get_section_result_cache().set(key, CachedResponse(content, latency=duration), SECTION_RESULT_TTL_SECONDS)
 
-        prompts_per_section = 2 if skip_generic else 3
-        total_prompts = len(sections_to_process) * prompts_per_section
-        prompt_status = [False] * total_prompts
+    def _print_prompt_progress(self, status_array: List[str]):
+        """Print the percentage of the prompt tasks marked as done in status_array."""
+        # Numeric percent progress update (status_array is just a placeholder for counting)
+        total = len(status_array)
+        completed = sum(1 for s in status_array if s)
+        percent = int((completed / total) * 100) if total else 100
+        self._print_message(f"Evaluating prompts... {percent}% complete", overwrite=True)
 
-        # Set up keyboard interrupt handler for more responsive cancellation (only in main thread)
+    @contextlib.contextmanager
+    def _cancellation(self):
+        """
+        Install a keyboard interrupt handler (in the main thread only) for more responsive
+        cancellation, and yield the event that is set when cancellation is requested.
+        """
         cancel_event = threading.Event()
 
         is_main_thread = threading.current_thread() == threading.main_thread()
@@ -371,496 +506,998 @@ class ApiViewReview:
 
             signal.signal(signal.SIGINT, keyboard_interrupt_handler)
 
+        try:
+            yield cancel_event
+        except KeyboardInterrupt:
+            self._print_message("\n\nCancellation requested! Terminating process...")
+            cancel_event.set()
+            os._exit(1)
+        finally:
+            # Restore original signal handler if it was set
+            if is_main_thread:
+                signal.signal(signal.SIGINT, original_handler)
+
+    def _submit_section_prompts(
+        self, sections: List[Section], cancel_event: threading.Event
+    ) -> Dict[int, Dict[str, concurrent.futures.Future]]:
+        """
+        Submit the review prompts for every section.
+
+        Returns:
+            Dict[int, Dict[str, concurrent.futures.Future]]: The prompt futures of each section, keyed by
+                section index and then by task name, in submission order.
+        """
+        prompt_files = self._section_prompt_files()
+        tags = list(prompt_files)
+
+        # Set up progress tracking
+        self._print_message("Processing sections: ", overwrite=True)
+        prompt_status = [False] * (len(sections) * len(tags))
+
         # Retrieve guidelines as context for the guideline review phase
         guideline_context = self._retrieve_guidelines_as_context()
         guideline_context_string = guideline_context.to_markdown() if guideline_context else ""
 
-        # Submit all jobs to the executor
-        all_futures = {}
+        section_futures = {}
 
-        # Guideline and generic tasks for each section
-        for idx, (section_idx, section) in enumerate(sections_to_process):
+        # Guideline, generic and context tasks for each section
+        for idx, section in enumerate(sections):
             # First check if cancellation is requested
             if cancel_event.is_set():
                 break
+            futures = section_futures[idx] = {}
+            for position, tag in enumerate(tags):
+                task = {
+                    "filename": prompt_files[tag],
+                    "task_name": f"{tag}_{idx}",
+                    "status_idx": idx * len(tags) + position,
+                    "status_array": prompt_status,
+                }
+                if tag == _CONTEXT_TAG:
+                    # Context prompt, submitted as soon as the context for the section is retrieved
+                    futures[task["task_name"]] = self._submit_context_prompt(section, **task)
+                else:
+                    futures[task["task_name"]] = self.executor.submit(
+                        self._execute_prompt_task,
+                        folder="api_review",
+                        inputs=self._section_prompt_inputs(section, tag, guideline_context_string),
+                        section=section,
+                        **task,
+                    )
+        return section_futures
 
-            # Guideline prompt
-            guideline_key = f"{guideline_tag}_{section_idx}"
-            all_futures[guideline_key] = self.executor.submit(
-                self._execute_prompt_task,
+    async def _asubmit_section_prompts(self, sections: List[Section]) -> Dict[int, Dict[str, asyncio.Task]]:
+        """
+        Async counterpart of _submit_section_prompts, which starts the review prompts of every section
+        as tasks on the running event loop.
+
+        The context of each section is retrieved in a worker thread, with at most MAX_CONCURRENT_RETRIEVALS
+        retrievals running at once, and its context prompt starts as soon as its retrieval finishes.
+        """
+        prompt_files = self._section_prompt_files()
+        tags = list(prompt_files)
+        self._print_message("Processing sections: ", overwrite=True)
+        prompt_status = [False] * (len(sections) * len(tags))
+
+        guideline_context = await asyncio.to_thread(self._retrieve_guidelines_as_context)
+        guideline_context_string = guideline_context.to_markdown() if guideline_context else ""
+        retrieval_slots = asyncio.Semaphore(MAX_CONCURRENT_RETRIEVALS)
+
+        async def _context_prompt(section: Section, filename: str, task_name: str, status_idx: int) -> Optional[dict]:
+            async with retrieval_slots:
+                context = await asyncio.to_thread(self._retrieve_context, str(section))
+            context_string = context.to_markdown() if context else ""
+            return await self._aexecute_prompt_task(
                 folder="api_review",
-                filename=guideline_prompt_file,
-                inputs={
-                    "language": get_language_pretty_name(self.language),
-                    "context": guideline_context_string,
-                    "content": section.numbered(),
-                },
-                task_name=guideline_key,
-                status_idx=idx * prompts_per_section,
+                filename=filename,
+                inputs=self._section_prompt_inputs(section, _CONTEXT_TAG, context_string),
+                task_name=task_name,
+                status_idx=status_idx,
                 status_array=prompt_status,
+                section=section,
             )
 
-            if not skip_generic:
-                generic_metadata = self._load_generic_metadata()
-                generic_key = f"{generic_tag}_{section_idx}"
-                all_futures[generic_key] = self.executor.submit(
+        section_tasks = {}
+        for idx, section in enumerate(sections):
+            tasks = section_tasks[idx] = {}
+            for position, tag in enumerate(tags):
+                filename = prompt_files[tag]
+                task_name = f"{tag}_{idx}"
+                status_idx = idx * len(tags) + position
+                if tag == _CONTEXT_TAG:
+                    coro = _context_prompt(section, filename, task_name, status_idx)
+                else:
+                    coro = self._aexecute_prompt_task(
+                        folder="api_review",
+                        filename=filename,
+                        inputs=self._section_prompt_inputs(section, tag, guideline_context_string),
+                        task_name=task_name,
+                        status_idx=status_idx,
+                        status_array=prompt_status,
+                        section=section,
+                    )
+                tasks[task_name] = asyncio.create_task(coro)
+        return section_tasks
+
+    def _section_prompt_files(self) -> Dict[str, str]:
+        """
+        Return the prompt file of each task that reviews a section, keyed by task tag in submission order.
+        """
+        # Select appropriate prompts based on mode
+        if self.mode == ApiViewReviewMode.FULL:
+            prompt_files = {
+                _GUIDELINE_TAG: "guidelines_review.prompty",
+                _GENERIC_TAG: "generic_review.prompty",
+                _CONTEXT_TAG: "context_review.prompty",
+            }
+        elif self.mode == ApiViewReviewMode.DIFF:
+            prompt_files = {
+                _GUIDELINE_TAG: "guidelines_diff_review.prompty",
+                _GENERIC_TAG: "generic_diff_review.prompty",
+                _CONTEXT_TAG: "context_diff_review.prompty",
+            }
+        else:
+            raise NotImplementedError(f"Review mode {self.mode} is not implemented.")
+        if _SKIP_GENERIC:
+            del prompt_files[_GENERIC_TAG]
+        return prompt_files
+
+    def _section_prompt_inputs(self, section: Section, tag: str, context_string: str) -> dict:
+        """
+        Return the inputs of the prompt of the given task tag for a section.
+        """
+        if tag == _GENERIC_TAG:
+            return {
+                "language": get_language_pretty_name(self.language),
+                "custom_rules": self._load_generic_metadata()["custom_rules"],
+                "content": section.numbered(),
+            }
+        return {
+            "language": get_language_pretty_name(self.language),
+            "context": context_string,
+            "content": section.numbered(),
+        }
+
+    def _collect_section_comments(
+        self, section: Section, futures: Dict[str, concurrent.futures.Future]
+    ) -> List[Comment]:
+        """
+        Wait for the prompts of a section and return its comments, with line numbers corrected
+        against the section and guideline IDs validated.
+        """
+        comments = []
+        for key, future in futures.items():
+            try:
+                result = future.result()
+                if result and "comments" in result:
+                    section_type = key.split("_")[0]
+                    # ensure raw comments are of a pure type
+                    for comment in result["comments"]:
+                        if section_type == _GENERIC_TAG:
+                            comment["is_generic"] = True
+                            comment["guideline_ids"] = []
+                            comment["memory_ids"] = []
+                            comments.append(comment)
+                            continue
+                        if section_type == _GUIDELINE_TAG and comment.get("guideline_ids"):
+                            comment["is_generic"] = False
+                            comment["memory_ids"] = []
+                            comments.append(comment)
+                            continue
+                        if section_type == _CONTEXT_TAG and comment.get("memory_ids"):
+                            comment["is_generic"] = False
+                            comment["guideline_ids"] = []
+                            comments.append(comment)
+                            continue
+            except Exception as e:
+                self.logger.error(f"Error processing {key}: {str(e)}")
+        if not comments:
+            return []
+        return ReviewResult(comments=comments, allowed_ids=self.allowed_ids, section=section).comments
+
+    def _submit_context_prompt(
+        self, section, *, filename: str, task_name: str, status_idx: int, status_array: List[str]
+    ) -> concurrent.futures.Future:
+        """Retrieve the context for a section and submit the context prompt once it is retrieved.
+
+        Retrievals run on the bounded retrieval executor, so the search queries of all sections
+        run concurrently instead of in the submission loop, and each context prompt starts as soon
+        as its own retrieval finishes.
+
+        Returns:
+            concurrent.futures.Future: A future for the result of the context prompt.
+        """
+        prompt_future = concurrent.futures.Future()
+
+        def _relay_result(future: concurrent.futures.Future):
+            try:
+                prompt_future.set_result(future.result())
+            except Exception as e:
+                prompt_future.set_exception(e)
+
+        def _submit_prompt(retrieval_future: concurrent.futures.Future):
+            try:
+                context = retrieval_future.result()
+                context_string = context.to_markdown() if context else ""
+                future = self.executor.submit(
                     self._execute_prompt_task,
                     folder="api_review",
-                    filename=generic_prompt_file,
-                    inputs={
-                        "language": get_language_pretty_name(self.language),
-                        "custom_rules": generic_metadata["custom_rules"],
-                        "content": section.numbered(),
-                    },
-                    task_name=generic_key,
-                    status_idx=(idx * prompts_per_section) + 1,
-                    status_array=prompt_status,
+                    filename=filename,
+                    inputs=self._section_prompt_inputs(section, _CONTEXT_TAG, context_string),
+                    section=section,
+                    task_name=task_name,
+                    status_idx=status_idx,
+                    status_array=status_array,
                 )
+            except Exception as e:
+                prompt_future.set_exception(e)
+                return
+            future.add_done_callback(_relay_result)
 
-            # Context prompt
-            context_key = f"{context_tag}_{section_idx}"
-            context = self._retrieve_context(str(section))
-            context_string = context.to_markdown() if context else ""
-            context_status_offset = 2 if not skip_generic else 1
-            all_futures[context_key] = self.executor.submit(
-                self._execute_prompt_task,
-                folder="api_review",
-                filename=context_prompt_file,
-                inputs={
-                    "language": get_language_pretty_name(self.language),
-                    "context": context_string,
-                    "content": section.numbered(),
-                },
-                task_name=context_key,
-                status_idx=(idx * prompts_per_section) + context_status_offset,
-                status_array=prompt_status,
-            )
+        self.retrieval_executor.submit(self._retrieve_context, str(section)).add_done_callback(_submit_prompt)
+        return prompt_future
 
-        # Process results as they complete
+    def _timed(self, stage: str, func, *args, **kwargs):
+        """
+        Call func and record its duration as a task of the given review stage.
+        """
+        start_time = time()
         try:
-            # Process each section's results
-            section_results = {}
-
-            for key, future in all_futures.items():
-                try:
-                    result = future.result()
-                    if result:
-                        section_type, section_idx = key.split("_")
-                        section_idx = int(section_idx)
-
-                        # Initialize section result if needed
-                        if section_idx not in section_results:
-                            section_results[section_idx] = {"comments": []}
-
-                        if "comments" in result:
-                            filtered_comments = []
-                            # ensure raw comments are of a pure type
-                            for comment in result["comments"]:
-                                if section_type == generic_tag:
-                                    comment["is_generic"] = True
-                                    comment["guideline_ids"] = []
-                                    comment["memory_ids"] = []
-                                    filtered_comments.append(comment)
-                                    continue
-                                if section_type == guideline_tag and comment.get("guideline_ids"):
-                                    comment["is_generic"] = False
-                                    comment["memory_ids"] = []
-                                    filtered_comments.append(comment)
-                                    continue
-                                if section_type == context_tag and comment.get("memory_ids"):
-                                    comment["is_generic"] = False
-                                    comment["guideline_ids"] = []
-                                    filtered_comments.append(comment)
-                                    continue
-                            section_results[section_idx]["comments"].extend(filtered_comments)
-                except Exception as e:
-                    self.logger.error(f"Error processing {key}: {str(e)}")
-
-            # Merge results from all sections
-            for section_idx, section_result in section_results.items():
-                if section_result and section_result["comments"]:
-                    comments = section_result["comments"]
-                    section = sections_to_process[section_idx][1]
-                    section_result = ReviewResult(comments=comments, allowed_ids=self.allowed_ids, section=section)
-                    self.results.comments.extend(section_result.comments)
-        except KeyboardInterrupt:
-            self._print_message("\n\nCancellation requested! Terminating process...")
-            cancel_event.set()
-            os._exit(1)
+            return func(*args, **kwargs)
         finally:
-            # Restore original signal handler if it was set
-            if is_main_thread:
-                signal.signal(signal.SIGINT, original_handler)
+            self._record_stage_duration(stage, time() - start_time)
+
+    async def _atimed(self, stage: str, func, *args, **kwargs):
+        """
+        Await the coroutine function func and record its duration as a task of the given review stage.
+        """
+        start_time = time()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            self._record_stage_duration(stage, time() - start_time)
 
-    def _filter_generic_comments(self):
+    def _run_stage_prompt(self, request_func, parse_func, *args):
         """
-        Filter generic comments by running the filter prompt on each comment, separating into keep
-        and discard lists, reporting counts, and dumping to debug log if enabled.
+        Build the prompt of a review stage with request_func(*args), run it, and return parse_func(response).
         """
-        self._print_message("\nFiltering generic comments...")
+        filename, inputs = request_func(*args)
+        return parse_func(self._run_prompt("api_review", filename, inputs))
 
-        # Submit each generic comment to the executor for parallel processing
-        futures = {}
-        for idx, comment in enumerate(self.results.comments):
-            if not comment.is_generic:
-                continue
-            search_result = self.search.search_all(query=comment.comment)
-            context = self.search.build_context(search_result)
-            context_text = context.to_markdown() if search_result else "EMPTY"
-            futures[idx] = self.executor.submit(
-                self._run_prompt,
-                "api_review",
-                "filter_generic_comment.prompty",
-                inputs={
-                    "content": comment.model_dump(),
-                    "language": get_language_pretty_name(self.language),
-                    "context": context_text,
-                },
-            )
+    async def _arun_stage_prompt(self, request_func, parse_func, *args):
+        """
+        Async counterpart of _run_stage_prompt. The prompt is built in a worker thread, as building
+        it can run search queries.
+        """
+        filename, inputs = await asyncio.to_thread(request_func, *args)
+        return parse_func(await self._arun_prompt("api_review", filename, inputs))
 
-        # Collect results as they complete, with % complete logging
-        keep_results = {}
-        discard_results = {}
-        total = len(futures)
-        for progress_idx, (idx, future) in enumerate(futures.items()):
-            try:
-                response = future.result()
-                if not response or not response.strip():
-                    self.logger.error(f"Error judging comment at index {idx}: Empty response from prompt.")
-                    continue
-                try:
-                    response_json = json.loads(response)
-                except Exception as je:
-                    self.logger.error(
-                        f"Error judging comment at index {idx}: Invalid JSON response: {repr(response)} | {str(je)}"
-                    )
-                    continue
-                if response_json.get("action") == "DISCARD":
-                    discard_results[idx] = response_json
-                elif response_json.get("action") == "KEEP":
-                    keep_results[idx] = response_json
-                else:
-                    # log an error but keep the comment to be safe
-                    self.logger.error(
-                        f"Error judging comment at index {idx}: Unknown action in response: {repr(response)}"
-                    )
-                    keep_results[idx] = response_json
-            except Exception as e:
-                self.logger.error(f"Error judging comment at index {idx}: {str(e)}")
-            percent = int(((progress_idx + 1) / total) * 100) if total else 100
-            self._print_message(f"Filtering generic comments... {percent}% complete", overwrite=True)
-        self._print_message()  # Ensure the progress bar is visible before the summary
+    def _generic_filter_request(self, comment: Comment) -> Tuple[str, dict]:
+        """
+        Return the prompt file and inputs of the generic filter for a single generic comment.
+        """
+        search_result = self.search.search_all(query=comment.comment)
+        context = self.search.build_context(search_result)
+        context_text = context.to_markdown() if search_result else "EMPTY"
+        return "filter_generic_comment.prompty", {
+            "content": comment.model_dump(),
+            "language": get_language_pretty_name(self.language),
+            "context": context_text,
+        }
 
-        # Report summary
-        self._print_message(
-            # pylint: disable=line-too-long
-            f"Filtering generic comments completed. Kept {len(keep_results)}. Discarded {len(discard_results)}."
+    @staticmethod
+    def _parse_generic_filter_response(response: str) -> dict:
+        if not response or not response.strip():
+            raise ValueError("Empty response from prompt.")
+        try:
+            return json.loads(response)
+        except Exception as je:
+            raise ValueError(f"Invalid JSON response: {repr(response)} | {str(je)}") from je
+
+    def _filter_generic_comment(self, comment: Comment) -> dict:
+        """
+        Run the generic filter prompt on a single generic comment and return the parsed response.
+        """
+        return self._run_stage_prompt(self._generic_filter_request, self._parse_generic_filter_response, comment)
+
+    async def _afilter_generic_comment(self, comment: Comment) -> dict:
+        """
+        Async counterpart of _filter_generic_comment.
+        """
+        return await self._arun_stage_prompt(self._generic_filter_request, self._parse_generic_filter_response, comment)
+
+    def _merge_request(self, batch: List[Comment]) -> Tuple[str, dict]:
+        """
+        Return the prompt file and inputs that merge the comments proposed for the same line.
+        """
+        # Collect all rule IDs for the batch
+        all_guideline_ids = set()
+        all_memory_ids = set()
+        for comment in batch:
+            all_guideline_ids.update(comment.guideline_ids)
+            all_memory_ids.update(comment.memory_ids)
+
+        # Prepare the context for the prompt
+        search_results = self.search.search_all_by_id(list(all_guideline_ids.union(all_memory_ids)))
+        context = self.search.build_context(search_results)
+        return "merge_comments.prompty", {"comments": batch, "context": context}
+
+    @staticmethod
+    def _parse_merge_response(line_no: int, response: str) -> Comment:
+        merge_results = json.loads(response)
+        result_comments = merge_results.get("comments", [])
+        if len(result_comments) != 1:
+            raise ValueError(f"Error merging comments for line {line_no}: {merge_results}")
+        return Comment(**result_comments[0])
+
+    def _merge_line_comments(self, line_no: int, batch: List[Comment]) -> Comment:
+        """
+        Merge the comments proposed for the same line into a single comment.
+        """
+        return self._run_stage_prompt(
+            self._merge_request, functools.partial(self._parse_merge_response, line_no), batch
         )
 
-        # Debug log: dump keep_comments and discard_comments to files if enabled
-        if self.write_debug_logs:
-            os.makedirs(self.output_dir, exist_ok=True)
-            for idx, comment in keep_results.items():
-                comment_dict = self.results.comments[idx].model_dump()
-                keep_results[idx] = {**comment_dict, **comment}
-            for idx, comment in discard_results.items():
-                comment_dict = self.results.comments[idx].model_dump()
-                discard_results[idx] = {**comment_dict, **comment}
-            keep_path = os.path.join(self.output_dir, "filter_generic_comments_KEEP.json")
-            discard_path = os.path.join(self.output_dir, "filter_generic_comments_DISCARD.json")
-            with open(keep_path, "w", encoding="utf-8") as f:
-                json.dump(list(keep_results.values()), f, indent=2)
-            with open(discard_path, "w", encoding="utf-8") as f:
-                json.dump(list(discard_results.values()), f, indent=2)
-            self.logger.debug(f"Kept generic comments written to {keep_path}")
-            self.logger.debug(f"Discarded generic comments written to {discard_path}")
-
-        # handle removing the discarded comments, preserving order of remaining comments
-        idx_to_remove = list(set(discard_results.keys()))
-        filtered_comments = []
-        for idx, comment in enumerate(self.results.comments):
-            if idx not in idx_to_remove:
-                filtered_comments.append(comment)
-        self.results.comments = filtered_comments
-
-    def _deduplicate_comments(self):
-        """
-        Deduplicate comments based on line number and rule IDs.
-        """
-        comments = self.results.comments
-        unique_comments = []
-        batches = {}
-
-        # First, collect all duplicate comments into batches to send to the LLM
-        # and add any unique comments to the unique_comments list
-        line_ids = set([x.line_no for x in comments])
-        for line_id in line_ids:
-            matches = [x for x in comments if x.line_no == line_id]
-            if len(matches) == 1:
-                unique_comments.append(matches[0])
-                continue
-            batches[line_id] = matches
-
-        self._print_message("\nDeduplicating comments...")
-
-        # Submit all batches to the executor for parallel processing
-        futures = {}
-        for line_no, batch in batches.items():
-            # Collect all rule IDs for the batch
-            all_guideline_ids = set()
-            all_memory_ids = set()
-            for comment in batch:
-                all_guideline_ids.update(comment.guideline_ids)
-                all_memory_ids.update(comment.memory_ids)
-
-            # Prepare the context for the prompt
-            search_results = self.search.search_all_by_id(list(all_guideline_ids.union(all_memory_ids)))
-            context = self.search.build_context(search_results)
-
-            # Submit the task to the executor
-            futures[line_no] = self.executor.submit(
-                self._run_prompt,
-                "api_review",
-                "merge_comments.prompty",
-                {"comments": batch, "context": context},
-            )
+    async def _amerge_line_comments(self, line_no: int, batch: List[Comment]) -> Comment:
+        """
+        Async counterpart of _merge_line_comments.
+        """
+        return await self._arun_stage_prompt(
+            self._merge_request, functools.partial(self._parse_merge_response, line_no), batch
+        )
 
-        # Process the results as they complete
-        for line_no, future in futures.items():
-            try:
-                response = future.result()
-                merge_results = json.loads(response)
-                result_comments = merge_results.get("comments", [])
-                if len(result_comments) != 1:
-                    self.logger.error(f"Error merging comments for line {line_no}: {merge_results}")
-                    continue
-                merged_comment = result_comments[0]
-                merged_comment_obj = Comment(**merged_comment)
-                unique_comments.append(merged_comment_obj)
-            except Exception as e:
-                self.logger.error(f"Error processing deduplication for line {line_no}: {str(e)}")
+    def _hard_filter_request(self, comment: Comment) -> Tuple[str, dict]:
+        """
+        Return the prompt file and inputs of the hard filter for a single comment.
+        """
+        return "filter_comment_with_metadata.prompty", {
+            "content": comment.model_dump(),
+            "language": get_language_pretty_name(self.language),
+            "outline": self.outline,
+            "exceptions": self._load_filter_metadata().get("exceptions", "None"),
+        }
 
-        # Update the comments list with the unique comments
-        self.results.comments = unique_comments
+    def _hard_filter_batch_request(self, comments: List[Comment]) -> Tuple[str, dict]:
+        """
+        Return the prompt file and inputs of the batched hard filter for several comments.
+        """
+        return "filter_comment_with_metadata_batch.prompty", {
+            "comments": [{"index": idx, **comment.model_dump()} for idx, comment in enumerate(comments)],
+            "language": get_language_pretty_name(self.language),
+            "outline": self.outline,
+            "exceptions": self._load_filter_metadata().get("exceptions", "None"),
+        }
 
-    def _filter_comments_with_metadata(self):
+    def _filter_comment_with_metadata(self, comment: Comment) -> dict:
         """
-        Run the filter prompt on the comments, processing each comment in parallel.
+        Run the hard filter prompt on a single comment and return the parsed response.
         """
-        # Submit each comment to the executor for parallel processing
-        futures = {}
-        for idx, comment in enumerate(self.results.comments):
-            futures[idx] = self.executor.submit(
-                self._run_prompt,
-                folder="api_review",
-                filename="filter_comment_with_metadata.prompty",
-                inputs={
-                    "content": comment.model_dump(),
-                    "language": get_language_pretty_name(self.language),
-                    "outline": self.outline,
-                    "exceptions": self._load_filter_metadata().get("exceptions", "None"),
-                },
-            )
+        return self._run_stage_prompt(self._hard_filter_request, json.loads, comment)
 
-        # Collect results as they complete, with % complete logging
-        keep_debug = []
-        discard_debug = []
-        comments_to_remove = []
-        total = len(futures)
-        for progress_idx, (idx, future) in enumerate(futures.items()):
-            orig_comment = self.results.comments[idx]
-            try:
-                response = future.result()
-                response_json = json.loads(response)
-                action = response_json.get("action")
-                if action == "KEEP":
-                    keep_debug.append({**orig_comment.model_dump(), **response_json})
-                elif action == "DISCARD":
-                    discard_debug.append({**orig_comment.model_dump(), **response_json})
-                    comments_to_remove.append(idx)
-                else:
-                    self.logger.warning(f"Unexpected action for line {orig_comment.line_no}: {repr(response)}")
-                    keep_debug.append({**orig_comment.model_dump(), **response_json})
-            except Exception as e:
-                self.logger.error(f"Error filtering comment at index {idx}: {str(e)}")
-            # Log % complete
-            percent = int(((progress_idx + 1) / total) * 100) if total else 100
-            self._print_message(f"Hard filtering comments... {percent}% complete", overwrite=True)
-        self._print_message()  # Ensure the progress bar is visible before the summary
-
-        # Summary message (final counts computed after removals)
-        removed_count = len(set(comments_to_remove))
-        initial_count = len(self.results.comments)
-        final_count = initial_count - removed_count
-        self._print_message(f"Hard filtering completed. Kept {final_count}. Discarded {removed_count}.")
-
-        # Debug log: dump keep_comments and discard_comments to files if enabled
-        if self.write_debug_logs:
-            os.makedirs(self.output_dir, exist_ok=True)
-            keep_path = os.path.join(self.output_dir, "filter_comments_with_metadata_KEEP.json")
-            discard_path = os.path.join(self.output_dir, "filter_comments_with_metadata_DISCARD.json")
-            with open(keep_path, "w", encoding="utf-8") as f:
-                json.dump(keep_debug, f, indent=2)
-            with open(discard_path, "w", encoding="utf-8") as f:
-                json.dump(discard_debug, f, indent=2)
-            self.logger.debug(f"Kept comments written to {keep_path}")
-            self.logger.debug(f"Discarded comments written to {discard_path}")
-
-        # Remove comments that were marked for removal, preserving order of remaining comments
-        if comments_to_remove:
-            to_remove = set(comments_to_remove)
-            self.results.comments = [comment for i, comment in enumerate(self.results.comments) if i not in to_remove]
-
-    def _filter_preexisting_comments(self):
-        """
-        Check if there are any preexisting comments on the same line as new proposed comments. If so,
-        resolve them with the LLM to either discard or update the proposed comment.
-        """
-        comments_to_remove = []
-        # Prepare tasks for comments that have preexisting comments
-        tasks = []
-        indices = []
-        for idx, comment in enumerate(self.results.comments):
-            existing_comments = [e for e in self.existing_comments if e.line_no == comment.line_no]
-            if not existing_comments:
+    async def _afilter_comment_with_metadata(self, comment: Comment) -> dict:
+        """
+        Async counterpart of _filter_comment_with_metadata.
+        """
+        return await self._arun_stage_prompt(self._hard_filter_request, json.loads, comment)
+
+    def _filter_comments_with_metadata_batch(self, comments: List[Comment]) -> Dict[int, dict]:
+        """
+        Run the batched hard filter prompt on several comments and return the valid results by batch index.
+        """
+        parse = functools.partial(self._parse_batch_response, count=len(comments), required_keys=("action",))
+        return self._run_stage_prompt(self._hard_filter_batch_request, parse, comments)
+
+    async def _afilter_comments_with_metadata_batch(self, comments: List[Comment]) -> Dict[int, dict]:
+        """
+        Async counterpart of _filter_comments_with_metadata_batch.
+        """
+        parse = functools.partial(self._parse_batch_response, count=len(comments), required_keys=("action",))
+        return await self._arun_stage_prompt(self._hard_filter_batch_request, parse, comments)
+
+    def _filter_comments_with_metadata(self, comments: List[Comment]) -> list:
+        """
+        Run the hard filter on a batch of comments and return the response, or the error, for each comment in order.
+        """
+        return self._run_batched(
+            "hard filter",
+            comments,
+            self._filter_comments_with_metadata_batch,
+            self._filter_comment_with_metadata,
+        )
+
+    async def _afilter_comments_with_metadata(self, comments: List[Comment]) -> list:
+        """
+        Async counterpart of _filter_comments_with_metadata.
+        """
+        return await self._arun_batched(
+            "hard filter",
+            comments,
+            self._afilter_comments_with_metadata_batch,
+            self._afilter_comment_with_metadata,
+        )
+
+    def _preexisting_filter_request(
+        self, comment: Comment, existing_comments: List[ExistingComment]
+    ) -> Tuple[str, dict]:
+        """
+        Return the prompt file and inputs that resolve a proposed comment against the preexisting comments on its line.
+        """
+        return "filter_existing_comment.prompty", {
+            "comment": comment.model_dump(),
+            "existing": [e.model_dump() for e in existing_comments],
+            "language": get_language_pretty_name(self.language),
+        }
+
+    def _filter_preexisting_comment(self, comment: Comment, existing_comments: List[ExistingComment]) -> dict:
+        """
+        Resolve a proposed comment against the preexisting comments on its line and return the parsed response.
+        """
+        return self._run_stage_prompt(self._preexisting_filter_request, json.loads, comment, existing_comments)
+
+    async def _afilter_preexisting_comment(self, comment: Comment, existing_comments: List[ExistingComment]) -> dict:
+        """
+        Async counterpart of _filter_preexisting_comment.
+        """
+        return await self._arun_stage_prompt(self._preexisting_filter_request, json.loads, comment, existing_comments)
+
+    def _judge_request(self, comment: Comment) -> Tuple[str, dict]:
+        """
+        Return the prompt file and inputs of the judge for a single comment.
+        """
+        context_ids = comment.guideline_ids + comment.memory_ids
+        search_results = self.search.search_all_by_id(context_ids)
+        context = self.search.build_context(search_results)
+        return "judge_comment_confidence.prompty", {
+            "content": comment.model_dump(),
+            "language": get_language_pretty_name(self.language),
+            "context": context.to_markdown() if search_results else "NONE",
+        }
+
+    def _judge_batch_request(self, comments: List[Comment]) -> Tuple[str, dict]:
+        """
+        Return the prompt file and inputs of the batched judge for several comments.
+        """
+        context_ids = list(dict.fromkeys(x for comment in comments for x in comment.guideline_ids + comment.memory_ids))
+        search_results = self.search.search_all_by_id(context_ids)
+        context = self.search.build_context(search_results)
+        return "judge_comment_confidence_batch.prompty", {
+            "comments": [{"index": idx, **comment.model_dump()} for idx, comment in enumerate(comments)],
+            "language": get_language_pretty_name(self.language),
+            "context": context.to_markdown() if search_results else "NONE",
+        }
+
+    def _score_comment_with_judge_prompt(self, comment: Comment) -> dict:
+        """
+        Run the judge prompt on a single comment and return the parsed response.
+        """
+        return self._run_stage_prompt(self._judge_request, json.loads, comment)
+
+    async def _ascore_comment_with_judge_prompt(self, comment: Comment) -> dict:
+        """
+        Async counterpart of _score_comment_with_judge_prompt.
+        """
+        return await self._arun_stage_prompt(self._judge_request, json.loads, comment)
+
+    def _score_comments_with_judge_prompt_batch(self, comments: List[Comment]) -> Dict[int, dict]:
+        """
+        Run the batched judge prompt on several comments and return the valid results by batch index.
+        """
+        parse = functools.partial(
+            self._parse_batch_response, count=len(comments), required_keys=("severity", "results")
+        )
+        return self._run_stage_prompt(self._judge_batch_request, parse, comments)
+
+    async def _ascore_comments_with_judge_prompt_batch(self, comments: List[Comment]) -> Dict[int, dict]:
+        """
+        Async counterpart of _score_comments_with_judge_prompt_batch.
+        """
+        parse = functools.partial(
+            self._parse_batch_response, count=len(comments), required_keys=("severity", "results")
+        )
+        return await self._arun_stage_prompt(self._judge_batch_request, parse, comments)
+
+    def _score_comments_with_judge_prompt(self, comments: List[Comment]) -> list:
+        """
+        Run the judge on a batch of comments and return the response, or the error, for each comment in order.
+        """
+        return self._run_batched(
+            "judge",
+            comments,
+            self._score_comments_with_judge_prompt_batch,
+            self._score_comment_with_judge_prompt,
+        )
+
+    async def _ascore_comments_with_judge_prompt(self, comments: List[Comment]) -> list:
+        """
+        Async counterpart of _score_comments_with_judge_prompt.
+        """
+        return await self._arun_batched(
+            "judge",
+            comments,
+            self._ascore_comments_with_judge_prompt_batch,
+            self._ascore_comment_with_judge_prompt,
+        )
+
+    @staticmethod
+    def _parse_batch_response(response: str, count: int, required_keys: tuple) -> Dict[int, dict]:
+        """
+        Parse the response of a batched prompt into per-comment results keyed by their index in the batch.
+
+        Entries that are malformed, out of range, duplicated, or missing a required key are left out so that
+        their comments fall back to the single-comment prompt.
+        """
+        try:
+            entries = json.loads(response).get("comments")
+        except Exception:
+            return {}
+        if not isinstance(entries, list):
+            return {}
+        results = {}
+        duplicates = set()
+        for entry in entries:
+            if not isinstance(entry, dict) or any(key not in entry for key in required_keys):
                 continue
-            inputs = {
-                "comment": comment.model_dump(),
-                "existing": [e.model_dump() for e in existing_comments],
-                "language": get_language_pretty_name(self.language),
-            }
-            tasks.append((idx, comment, "api_review", "filter_existing_comment.prompty", inputs))
-            indices.append(idx)
+            idx = entry.get("index")
+            if not isinstance(idx, int) or isinstance(idx, bool) or not 0 <= idx < count:
+                continue
+            if idx in results:
+                duplicates.add(idx)
+            results[idx] = {k: v for k, v in entry.items() if k != "index"}
+        return {idx: result for idx, result in results.items() if idx not in duplicates}
 
-        total = len(tasks)
-        futures = {}
-        for i, (idx, comment, folder, filename, inputs) in enumerate(tasks):
-            futures[idx] = self.executor.submit(self._run_prompt, folder, filename, inputs)
+    def _run_batched(self, prompt_name: str, comments: List[Comment], batch_func, single_func) -> list:
+        """
+        Evaluate comments with one call of batch_func, and fall back to single_func for every comment
+        the batched call has no valid result for. A batch of one comment only uses single_func.
 
-        for i, (idx, comment, folder, filename, inputs) in enumerate(tasks):
+        Returns the response for each comment in order, or the exception raised while evaluating it.
+        """
+        batch_results = {}
+        if len(comments) > 1:
             try:
-                response = futures[idx].result()
-                response_json = json.loads(response)
-                action = response_json.get("action")
-                refined_comment = response_json.get("comment")
-                if action == "KEEP":
-                    comment.comment = refined_comment
-                elif action == "DISCARD":
-                    comments_to_remove.append(idx)
-                else:
-                    self.logger.warning(f"Unexpected action for line {comment.line_no}: {repr(response)}")
-                    comment.comment = refined_comment
+                batch_results = batch_func(comments)
             except Exception as e:
-                self.logger.error(f"Error filtering preexisting comments for line {comment.line_no}: {str(e)}")
-                self.logger.warning(f"Keeping comment despite filtering error: {comment.comment}")
-            percent = int(((i + 1) / total) * 100) if total else 100
-            self._print_message(f"Filtering preexisting comments... {percent}% complete", overwrite=True)
-        self._print_message()  # Ensure the progress bar is visible before the summary
-
-        # remove comments that were marked for removal
-        if not comments_to_remove:
-            return
-        initial_comment_count = len(self.results.comments)
-        self.results.comments = [
-            comment for idx, comment in enumerate(self.results.comments) if idx not in comments_to_remove
-        ]
-        final_comment_count = len(self.results.comments)
-        self._print_message(
-            # pylint: disable=line-too-long
-            f"\nFiltered preexisting comments. Kept: {final_comment_count}. Discarded: {initial_comment_count - final_comment_count}."
-        )
+                self.logger.warning(f"Error running batched {prompt_name} prompt: {str(e)}")
+            self._warn_missing_batch_results(prompt_name, len(comments), batch_results)
+        results = []
+        for idx, comment in enumerate(comments):
+            if idx in batch_results:
+                results.append(batch_results[idx])
+                continue
+            try:
+                results.append(single_func(comment))
+            except Exception as e:
+                results.append(e)
+        return results
 
-    def _score_comments_with_judge_prompt(self):
-        """
-        Score all comments using the judge prompt, processing each comment in parallel.
-        """
-        self._print_message("\nScoring comments...")
-
-        # Submit each comment to the executor for parallel processing
-        futures = {}
-        for idx, comment in enumerate(self.results.comments):
-            context_ids = comment.guideline_ids + comment.memory_ids
-            search_results = self.search.search_all_by_id(context_ids)
-            context = self.search.build_context(search_results)
-            futures[idx] = self.executor.submit(
-                self._run_prompt,
-                "api_review",
-                "judge_comment_confidence.prompty",
-                inputs={
-                    "content": comment.model_dump(),
-                    "language": get_language_pretty_name(self.language),
-                    "context": context.to_markdown() if search_results else "NONE",
-                },
+    async def _arun_batched(self, prompt_name: str, comments: List[Comment], batch_func, single_func) -> list:
+        """
+        Async counterpart of _run_batched, for async batch_func and single_func. The single-comment
+        fallbacks run concurrently.
+        """
+        batch_results = {}
+        if len(comments) > 1:
+            try:
+                batch_results = await batch_func(comments)
+            except Exception as e:
+                self.logger.warning(f"Error running batched {prompt_name} prompt: {str(e)}")
+            self._warn_missing_batch_results(prompt_name, len(comments), batch_results)
+        missing = [idx for idx in range(len(comments)) if idx not in batch_results]
+        fallbacks = await asyncio.gather(*(single_func(comments[idx]) for idx in missing), return_exceptions=True)
+        results = {**batch_results, **dict(zip(missing, fallbacks))}
+        return [results[idx] for idx in range(len(comments))]
+
+    def _warn_missing_batch_results(self, prompt_name: str, count: int, batch_results: Dict[int, dict]):
+        missing = count - len(batch_results)
+        if missing:
+            self.logger.warning(
+                f"Batched {prompt_name} prompt returned no valid result for {missing} of {count} comments. "
+                "Falling back to single-comment prompts."
             )
 
-        # Collect results as they complete, with % complete logging
-        total = len(futures)
+    def _apply_judge_result(self, comment: Comment, response_json: dict) -> dict:
+        """
+        Set the severity and confidence of a comment from its judge response, and return the judge record.
+        """
+        orig_comment = comment.model_dump()
+        results = response_json.get("results", {})
+        severity = response_json.get("severity", "UNKNOWN").upper()
+
+        yes_votes = 0
+        no_votes = 0
+        unknown_votes = 0
+
+        for result in results:
+            answer = result.get("answer", "").upper()
+            if answer == "YES":
+                yes_votes += 1
+            elif answer == "NO":
+                no_votes += 1
+            elif answer == "UNKNOWN":
+                unknown_votes += 1
+            else:
+                self.logger.warning(f"Unexpected answer {answer} for comment on line {comment.line_no}")
+        total_votes = yes_votes + no_votes + unknown_votes
+        confidence = (yes_votes / total_votes) if total_votes > 0 else 0.0
+        comment.severity = severity
+        comment.confidence_score = confidence
+        return {
+            "original_comment": orig_comment,
+            "results": results,
+            "computed_severity": severity,
+            "computed_confidence": confidence,
+        }
+
+    def _review_comments(self) -> ReviewStats:
+        """
+        Generate, filter, deduplicate, and score comments as a streaming pipeline, with the
+        prompts of every stage running on the executor. See _review_pipeline.
+
+        Returns:
+            ReviewStats: Counts of the comments that each stage kept and discarded.
+        """
+        stages = {
+            "generic_filter": self._filter_generic_comment,
+            "deduplicate": self._merge_line_comments,
+            "hard_filter": self._filter_comments_with_metadata,
+            "preexisting_filter": self._filter_preexisting_comment,
+            "judge": self._score_comments_with_judge_prompt,
+            "prefetch_context": self.search.prefetch_context,
+        }
 
-        # Collect raw judge results for optional debug output
-        judge_results = []
+        def _submit_stage(stage: str, *args) -> concurrent.futures.Future:
+            return self.executor.submit(self._timed, stage, stages[stage], *args)
 
-        for progress_idx, (idx, future) in enumerate(futures.items()):
+        sections = list(self._create_sectioned_document())
+        stats = ReviewStats()
+        with self._cancellation() as cancel_event:
+            section_futures = self._submit_section_prompts(sections, cancel_event)
+            pipeline = self._review_pipeline(sections, section_futures, _submit_stage, stats)
             try:
-                # Capture original comment snapshot before we modify severity/confidence
-                orig_comment = self.results.comments[idx].model_dump()
-                response = future.result()
-                response_json = json.loads(response)
-                results = response_json.get("results", {})
-                severity = response_json.get("severity", "UNKNOWN").upper()
-
-                yes_votes = 0
-                no_votes = 0
-                unknown_votes = 0
-
-                for result in results:
-                    answer = result.get("answer", "").upper()
-                    if answer == "YES":
-                        yes_votes += 1
-                    elif answer == "NO":
-                        no_votes += 1
-                    elif answer == "UNKNOWN":
-                        unknown_votes += 1
-                    else:
-                        self.logger.warning(f"Unexpected answer {answer} for comment at index {idx}")
-                total_votes = yes_votes + no_votes + unknown_votes
-                confidence = (yes_votes / total_votes) if total_votes > 0 else 0.0
-                self.results.comments[idx].severity = severity
-                self.results.comments[idx].confidence_score = confidence
-
-                # Record the judge result for debug output
-                judge_results.append(
-                    {
-                        "index": idx,
-                        "original_comment": orig_comment,
-                        "results": results,
-                        "computed_severity": severity,
-                        "computed_confidence": confidence,
-                    }
+                # The pipeline yields the futures it waits for and is sent back those that finished.
+                pending = next(pipeline)
+                while True:
+                    done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    pending = pipeline.send(done)
+            except StopIteration:
+                return stats
+
+    async def _areview_comments(self) -> ReviewStats:
+        """
+        Async counterpart of _review_comments, with the prompts of every stage running as tasks on the
+        running event loop. Pending tasks are cancelled if the review fails or is cancelled.
+        """
+        stages = {
+            "generic_filter": self._afilter_generic_comment,
+            "deduplicate": self._amerge_line_comments,
+            "hard_filter": self._afilter_comments_with_metadata,
+            "preexisting_filter": self._afilter_preexisting_comment,
+            "judge": self._ascore_comments_with_judge_prompt,
+            "prefetch_context": functools.partial(asyncio.to_thread, self.search.prefetch_context),
+        }
+
+        def _submit_stage(stage: str, *args) -> asyncio.Task:
+            return asyncio.create_task(self._atimed(stage, stages[stage], *args))
+
+        sections = list(self._create_sectioned_document())
+        stats = ReviewStats()
+        section_tasks = await self._asubmit_section_prompts(sections)
+        pending = {task for tasks in section_tasks.values() for task in tasks.values()}
+        pipeline = self._review_pipeline(sections, section_tasks, _submit_stage, stats)
+        try:
+            pending = next(pipeline)
+            while True:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                pending = pipeline.send(done)
+        except StopIteration:
+            return stats
+        finally:
+            for task in pending:
+                task.cancel()
+
+    # pylint: disable=too-many-locals,too-many-branches,too-many-statements
+    def _review_pipeline(self, sections: List[Section], section_futures: dict, submit_stage, stats: ReviewStats):
+        """
+        Generate, filter, deduplicate, and score comments as a streaming pipeline.
+
+        Each comment moves to the next stage as soon as its previous stage finishes, instead of
+        waiting for the stage to finish for the whole document:
+
+            generate -> generic filter -> deduplicate -> hard filter -> preexisting filter -> judge
+
+        Comments are deduplicated per line. A line is final once every section that contains it
+        has been generated and its generic comments have been filtered. The resulting comments
+        are the same, in the same order, as when every stage runs over all comments at once.
+        A comment whose line lies outside the section it was generated for, on a line that is
+        already final, is reviewed on its own and not merged.
+
+        The hard filter and judge evaluate comments in batches of up to comment_batch_size per
+        prompt. A batch is submitted once it is full, or once no earlier stage is still running.
+        Once a section's comments are generated, the knowledge graph of all the guidelines and
+        memories they cite is prefetched alongside the other stages.
+
+        The pipeline is a generator, so that it can be driven by threads or by an event loop: it
+        yields the futures (or tasks) it waits for, and must be sent those that finished.
+
+        Args:
+            sections (List[Section]): The sections of the document.
+            section_futures (dict): The prompt futures of each section, by section index and task name.
+            submit_stage: Function that starts the given stage with the given arguments and returns its future.
+            stats (ReviewStats): Counts of the comments that each stage kept and discarded, updated in place.
+        """
+        self._chunk_count = len(sections)
+
+        # Number of sections each line appears in, and still has to wait for.
+        open_sections = Counter()
+        for section in sections:
+            open_sections.update({x.line_no for x in section.lines if x.line_no is not None})
+        covered_lines = set(open_sections)
+
+        pending = {}  # future -> (stage, payload)
+        generated = {}  # section index -> generated comments
+        generic_discarded = set()  # ids of generic comments discarded by the generic filter
+        line_comments = defaultdict(list)  # line number -> [(order key, comment)]
+        blocked_lines = Counter()  # line number -> generic filter tasks in flight
+        final_lines = set()
+        merged_lines = set()
+        outputs = defaultdict(list)  # line number -> comments that passed every stage
+        keep_debug = {"generic": [], "metadata": []}
+        discard_debug = {"generic": [], "metadata": []}
+        judge_results = {}  # id(comment) -> judge record
+        hard_filter_queue = []  # comments waiting for a hard filter batch
+        judge_queue = []  # comments waiting for a judge batch
+
+        def _submit(stage: str, *args, payload=None):
+            pending[submit_stage(stage, *args)] = (stage, payload)
+
+        def _finish(comment: Comment):
+            outputs[comment.line_no].append(comment)
+
+        def _judge(comment: Comment):
+            judge_queue.append(comment)
+
+        def _preexisting(comment: Comment):
+            existing_comments = [e for e in self.existing_comments if e.line_no == comment.line_no]
+            if existing_comments:
+                _submit("preexisting_filter", comment, existing_comments, payload=comment)
+            else:
+                _judge(comment)
+
+        def _hard_filter(comment: Comment):
+            hard_filter_queue.append(comment)
+
+        def _submit_batches():
+            # Full batches are submitted right away. A partial batch is only submitted once no
+            # earlier stage is still running that could add comments to it.
+            for stage, queue, upstream_stages in (
+                ("hard_filter", hard_filter_queue, {"generate", "generic_filter", "deduplicate"}),
+                (
+                    "judge",
+                    judge_queue,
+                    {"generate", "generic_filter", "deduplicate", "hard_filter", "preexisting_filter"},
+                ),
+            ):
+                upstream_running = any(pending_stage in upstream_stages for pending_stage, _ in pending.values())
+                while len(queue) >= self.comment_batch_size or (queue and not upstream_running):
+                    batch = queue[: self.comment_batch_size]
+                    del queue[: self.comment_batch_size]
+                    _submit(stage, batch, payload=batch)
+
+        def _finalize_line(line_no: int):
+            final_lines.add(line_no)
+            batch = [comment for _, comment in sorted(line_comments.pop(line_no, []), key=lambda x: x[0])]
+            if len(batch) == 1:
+                _hard_filter(batch[0])
+            elif batch:
+                merged_lines.add(line_no)
+                stats.merged += len(batch) - 1
+                _submit("deduplicate", line_no, batch, payload=line_no)
+
+        def _line_ready(line_no: int) -> bool:
+            return (
+                line_no not in final_lines
+                and open_sections[line_no] <= 0
+                and blocked_lines[line_no] == 0
+                and (line_no in covered_lines or len(generated) == len(section_futures))
+            )
+
+        def _add_to_line(order_key, comment: Comment):
+            if comment.line_no in final_lines:
+                self.logger.warning(
+                    f"Comment for line {comment.line_no} arrived after the line was deduplicated. Reviewing it on its own."
                 )
-            except Exception as e:
-                self.logger.error(f"Error scoring comment at index {idx}: {str(e)}")
-            percent = int(((progress_idx + 1) / total) * 100) if total else 100
-            self._print_message(f"Scoring comments... {percent}% complete", overwrite=True)
+                _hard_filter(comment)
+                return
+            line_comments[comment.line_no].append((order_key, comment))
+
+        remaining_prompts = {}
+        for section_idx, futures in section_futures.items():
+            remaining_prompts[section_idx] = len(futures)
+            for future in futures.values():
+                pending[future] = ("generate", section_idx)
+
+        while pending:
+            done = yield pending
+            for future in done:
+                stage, payload = pending.pop(future)
+                touched_lines = set()
+
+                if stage == "generate":
+                    section_idx = payload
+                    remaining_prompts[section_idx] -= 1
+                    if remaining_prompts[section_idx]:
+                        continue
+                    section = sections[section_idx]
+                    comments = self._collect_section_comments(section, section_futures[section_idx])
+                    generated[section_idx] = comments
+                    stats.generated += len(comments)
+                    # Resolve the knowledge graph of every ID the comments cite at once, while they are
+                    # filtered, so that deduplicating and judging them builds their context from memory.
+                    cited_ids = list(dict.fromkeys(x for c in comments for x in c.guideline_ids + c.memory_ids))
+                    if cited_ids:
+                        _submit("prefetch_context", cited_ids, payload=section_idx)
+                    for position, comment in enumerate(comments):
+                        if comment.is_generic:
+                            blocked_lines[comment.line_no] += 1
+                            _submit("generic_filter", comment, payload=((section_idx, position), comment))
+                        else:
+                            _add_to_line((section_idx, position), comment)
+                        touched_lines.add(comment.line_no)
+                    section_lines = {x.line_no for x in section.lines if x.line_no is not None}
+                    for line_no in section_lines:
+                        open_sections[line_no] -= 1
+                    touched_lines.update(section_lines)
+                    if len(generated) == len(section_futures):
+                        # Lines outside of every section can only be final once all sections are.
+                        touched_lines.update(line_comments)
+                    self._print_message(
+                        f"Generated comments for {len(generated)} of {len(sections)} sections...", overwrite=True
+                    )
 
-        # If debug logging is enabled, write individual and aggregated judge results
+                elif stage == "prefetch_context":
+                    try:
+                        future.result()
+                    except Exception as e:
+                        # Each stage falls back to fetching the context it needs itself.
+                        self.logger.warning(f"Error prefetching the context of section {payload}: {str(e)}")
+
+                elif stage == "generic_filter":
+                    order_key, comment = payload
+                    blocked_lines[comment.line_no] -= 1
+                    touched_lines.add(comment.line_no)
+                    try:
+                        response_json = future.result()
+                        action = response_json.get("action")
+                        if action == "DISCARD":
+                            discard_debug["generic"].append({**comment.model_dump(), **response_json})
+                            generic_discarded.add(id(comment))
+                            stats.generic_discarded += 1
+                            continue
+                        if action != "KEEP":
+                            # log an error but keep the comment to be safe
+                            self.logger.error(
+                                f"Error judging comment on line {comment.line_no}: Unknown action in response: {repr(response_json)}"
+                            )
+                        keep_debug["generic"].append({**comment.model_dump(), **response_json})
+                    except Exception as e:
+                        self.logger.error(f"Error judging comment on line {comment.line_no}: {str(e)}")
+                    _add_to_line(order_key, comment)
+
+                elif stage == "deduplicate":
+                    line_no = payload
+                    try:
+                        _hard_filter(future.result())
+                    except Exception as e:
+                        self.logger.error(f"Error processing deduplication for line {line_no}: {str(e)}")
+
+                elif stage == "hard_filter":
+                    for comment, response_json in zip(payload, future.result()):
+                        try:
+                            if isinstance(response_json, Exception):
+                                raise response_json
+                            action = response_json.get("action")
+                            if action == "DISCARD":
+                                discard_debug["metadata"].append({**comment.model_dump(), **response_json})
+                                stats.hard_discarded += 1
+                                continue
+                            if action != "KEEP":
+                                self.logger.warning(
+                                    f"Unexpected action for line {comment.line_no}: {repr(response_json)}"
+                                )
+                            keep_debug["metadata"].append({**comment.model_dump(), **response_json})
+                        except Exception as e:
+                            self.logger.error(f"Error filtering comment on line {comment.line_no}: {str(e)}")
+                        _preexisting(comment)
+
+                elif stage == "preexisting_filter":
+                    comment = payload
+                    try:
+                        response_json = future.result()
+                        action = response_json.get("action")
+                        refined_comment = response_json.get("comment")
+                        if action == "DISCARD":
+                            stats.preexisting_discarded += 1
+                            continue
+                        if action != "KEEP":
+                            self.logger.warning(f"Unexpected action for line {comment.line_no}: {repr(response_json)}")
+                        comment.comment = refined_comment
+                    except Exception as e:
+                        self.logger.error(f"Error filtering preexisting comments for line {comment.line_no}: {str(e)}")
+                        self.logger.warning(f"Keeping comment despite filtering error: {comment.comment}")
+                    _judge(comment)
+
+                elif stage == "judge":
+                    for comment, response_json in zip(payload, future.result()):
+                        try:
+                            if isinstance(response_json, Exception):
+                                raise response_json
+                            judge_results[id(comment)] = self._apply_judge_result(comment, response_json)
+                        except Exception as e:
+                            self.logger.error(f"Error scoring comment on line {comment.line_no}: {str(e)}")
+                        stats.scored += 1
+                        _finish(comment)
+
+                for line_no in touched_lines:
+                    if _line_ready(line_no):
+                        _finalize_line(line_no)
+            _submit_batches()
+
+        # Order the comments as deduplicating all generated comments at once would: comments that
+        # were alone on their line first, then merged comments, each in the order of the line numbers'
+        # set. The sort by line number at the end of the review is stable, so this keeps ties identical.
+        surviving = [
+            comment
+            for section_idx in sorted(generated)
+            for comment in generated[section_idx]
+            if id(comment) not in generic_discarded
+        ]
+        line_ids = set(x.line_no for x in surviving)
+        self.results.comments = [c for line_no in line_ids if line_no not in merged_lines for c in outputs[line_no]] + [
+            c for line_no in line_ids if line_no in merged_lines for c in outputs[line_no]
+        ]
+        self._print_message()  # Ensure the progress message is visible before the summary
+
+        # Debug log: dump kept, discarded and judged comments to files if enabled
         if self.write_debug_logs and self.output_dir:
-            try:
-                judge_dir = os.path.join(self.output_dir, "judge_comments")
-                os.makedirs(judge_dir, exist_ok=True)
-                # Write aggregated file
-                aggregated_path = os.path.join(judge_dir, "judge_comments_all.json")
-                with open(aggregated_path, "w", encoding="utf-8") as af:
-                    json.dump(judge_results, af, indent=2)
-                self.logger.debug(f"Aggregated judge results written to {aggregated_path}")
-
-                # Write one file per comment for easier inspection
-                for jr in judge_results:
-                    idx = jr.get("index")
-                    per_path = os.path.join(judge_dir, f"judge_comment_{idx}.json")
-                    with open(per_path, "w", encoding="utf-8") as pf:
-                        json.dump(jr, pf, indent=2)
-            except Exception as e:
-                self.logger.error(f"Failed to write judge debug logs: {str(e)}")
+            os.makedirs(self.output_dir, exist_ok=True)
+            for name, prefix in (("generic", "filter_generic_comments"), ("metadata", "filter_comments_with_metadata")):
+                keep_path = os.path.join(self.output_dir, f"{prefix}_KEEP.json")
+                discard_path = os.path.join(self.output_dir, f"{prefix}_DISCARD.json")
+                with open(keep_path, "w", encoding="utf-8") as f:
+                    json.dump(keep_debug[name], f, indent=2)
+                with open(discard_path, "w", encoding="utf-8") as f:
+                    json.dump(discard_debug[name], f, indent=2)
+                self.logger.debug(f"Kept comments written to {keep_path}")
+                self.logger.debug(f"Discarded comments written to {discard_path}")
+            self._write_judge_debug_logs(
+                [
+                    {"index": idx, **judge_results[id(comment)]}
+                    for idx, comment in enumerate(self.results.comments)
+                    if id(comment) in judge_results
+                ]
+            )
+
+    def _write_judge_debug_logs(self, judge_results: List[dict]):
+        """
+        Write individual and aggregated judge results to the debug output directory.
+        """
+        try:
+            judge_dir = os.path.join(self.output_dir, "judge_comments")
+            os.makedirs(judge_dir, exist_ok=True)
+            # Write aggregated file
+            aggregated_path = os.path.join(judge_dir, "judge_comments_all.json")
+            with open(aggregated_path, "w", encoding="utf-8") as af:
+                json.dump(judge_results, af, indent=2)
+            self.logger.debug(f"Aggregated judge results written to {aggregated_path}")
+
+            # Write one file per comment for easier inspection
+            for jr in judge_results:
+                idx = jr.get("index")
+                per_path = os.path.join(judge_dir, f"judge_comment_{idx}.json")
+                with open(per_path, "w", encoding="utf-8") as pf:
+                    json.dump(jr, pf, indent=2)
+        except Exception as e:
+            self.logger.error(f"Failed to write judge debug logs: {str(e)}")
 
     def _run_prompt(self, folder: str, filename: str, inputs: dict, max_retries: int = 5) -> str:
         """
@@ -875,119 +1512,149 @@ class ApiViewReview:
             logger=self.logger,
         )
 
-    # pylint: disable=too-many-locals
+    async def _arun_prompt(self, folder: str, filename: str, inputs: dict, max_retries: int = 5) -> str:
+        """
+        Run a prompt with retry logic on the running event loop.
+        """
+        return await self.run_prompt_async(
+            folder=folder,
+            filename=filename,
+            inputs=inputs,
+            settings=self.settings,
+            max_retries=max_retries,
+            logger=self.logger,
+        )
+
     def run(self) -> ReviewResult:
         """Execute the APIView review process."""
         overall_start_time = time()
         review_status = "error"
         try:
-            self._print_message(f"Generating {get_language_pretty_name(self.language)} review {self.job_id}")
-            self.logger.info(f"Generating review {self.job_id} for language={self.language}")
-
-            # Canary check: try authenticating against Search and CosmosDB before LLM calls
-            canary_error = self._canary_check_search_and_cosmos()
-            if canary_error:
-                self._print_message(f"ERROR: {canary_error}")
-                self.logger.error(f"Aborting review due to canary check failure: {canary_error}")
-                raise RuntimeError(f"Aborting review: {canary_error}")
+            self._start_review(self._canary_check_search_and_cosmos())
 
             start_time = time()
-            self._generate_comments()
-            end_time = time()
-            self._print_message(
-                f"\nGenerated {len(self.results.comments)} comments in {end_time - start_time:.2f} seconds."
-            )
-            self._print_comment_counts()
-
-            # Run generic comments through a filter (skip if none exist)
-            if any(c.is_generic for c in self.results.comments):
-                start_time = time()
-                self._filter_generic_comments()
-                end_time = time()
-                self._print_message(f"  Generic comments filtered in {end_time - start_time:.2f} seconds.")
-                self._print_comment_counts()
-
-            # Track time for _deduplicate_comments
-            deduplicate_start_time = time()
-            initial_comment_count = len(self.results.comments)
-            self._deduplicate_comments()
-            merged_comment_count = len(self.results.comments)
-            deduplicate_end_time = time()
-            self._print_message(
-                f"  Deduplication completed in {deduplicate_end_time - deduplicate_start_time:.2f} seconds. Collapsed {initial_comment_count - merged_comment_count} comments."
-            )
-            self._print_comment_counts()
-
-            # Track time for _filter_comments
-            filter_start_time = time()
-            self._filter_comments_with_metadata()
-            filter_end_time = time()
-            self._print_message(f"  Hard filtering completed in {filter_end_time - filter_start_time:.2f} seconds.")
-            self._print_comment_counts()
-
-            # Track time for _filter_preexisting_comments
-            preexisting_start_time = time()
-            self._filter_preexisting_comments()
-            preexisting_end_time = time()
-            self._print_message(
-                f"Preexisting comments filtered in {preexisting_end_time - preexisting_start_time:.2f} seconds."
-            )
-            self._print_comment_counts()
-
-            score_comments_start_time = time()
-            self._score_comments_with_judge_prompt()
-            score_comments_end_time = time()
-            self._print_message(
-                f"  Comment scoring completed in {score_comments_end_time - score_comments_start_time:.2f} seconds."
-            )
-
-            results = self.results.sorted()
+            stats = self._review_comments()
+            results = self._report_review_stats(stats, start_time)
 
             correlation_id_start_time = time()
             # Assign correlation IDs for similar comments
-            results.comments = CommentGrouper(
-                comments=results.comments,
-                run_prompt_func=self.run_prompt,
-                settings=self.settings,
-                logger=self.logger,
-            ).group()
-            correlation_id_end_time = time()
-            self._print_message(
-                f"\nCorrelation IDs assigned in {correlation_id_end_time - correlation_id_start_time:.2f} seconds."
-            )
+            results.comments = self._comment_grouper(results).group()
+            self._report_grouping(correlation_id_start_time)
 
-            overall_end_time = time()
-            total_duration = overall_end_time - overall_start_time
-            self._print_message(
-                # pylint: disable=line-too-long
-                f"\nReview {self.job_id} generated in {total_duration:.2f} seconds. Found {len(results.comments)} comments"
-            )
+            self._finish_review(results, overall_start_time)
+            review_status = "success"
+            return results
+        finally:
+            self._record_review_metrics(overall_start_time, review_status)
+
+    async def arun(self) -> ReviewResult:
+        """
+        Execute the APIView review process on the running event loop.
 
-            if self.semantic_search_failed:
-                self._print_message("WARN: Semantic search failed for some chunks (see error.log).")
+        Prompts are sent with the async inference client and only search queries run in
+        worker threads, so many reviews can share one event loop without each holding a
+        pool of threads that wait for the model.
+        """
+        overall_start_time = time()
+        review_status = "error"
+        try:
+            self._start_review(await asyncio.to_thread(self._canary_check_search_and_cosmos))
+
+            start_time = time()
+            stats = await self._areview_comments()
+            results = self._report_review_stats(stats, start_time)
 
-            # Write output JSON if enabled
-            if self.write_output:
-                os.makedirs(self.output_dir, exist_ok=True)
-                output_path = os.path.join(self.output_dir, "output.json")
-                with open(output_path, "w", encoding="utf-8") as f:
-                    json.dump(results.model_dump(), f, indent=2)
-                self._print_message(f"Review results written to {output_path}")
+            correlation_id_start_time = time()
+            results.comments = await self._comment_grouper(results).agroup()
+            self._report_grouping(correlation_id_start_time)
 
+            self._finish_review(results, overall_start_time)
             review_status = "success"
             return results
         finally:
-            # Record review duration telemetry regardless of success or failure
-            total_duration = time() - overall_start_time
-            normalized_duration = total_duration / self._chunk_count if self._chunk_count > 0 else 0
-            metric_attrs = {
-                "review.language": self.language,
-                "review.mode": self.mode,
-                "review.status": review_status,
-            }
-            _review_duration_histogram.record(total_duration, attributes=metric_attrs)
-            _review_normalized_duration_histogram.record(normalized_duration, attributes=metric_attrs)
-            _review_request_counter.add(1, attributes=metric_attrs)
+            self._record_review_metrics(overall_start_time, review_status)
+
+    def _start_review(self, canary_error: Optional[str]):
+        """
+        Announce the review, and abort it if the canary check against Search and CosmosDB failed.
+        """
+        self._print_message(f"Generating {get_language_pretty_name(self.language)} review {self.job_id}")
+        self.logger.info(f"Generating review {self.job_id} for language={self.language}")
+        if canary_error:
+            self._print_message(f"ERROR: {canary_error}")
+            self.logger.error(f"Aborting review due to canary check failure: {canary_error}")
+            raise RuntimeError(f"Aborting review: {canary_error}")
+
+    def _report_review_stats(self, stats: ReviewStats, start_time: float) -> ReviewResult:
+        """
+        Report the comments each stage kept and discarded, and return the sorted results.
+        """
+        end_time = time()
+        self._record_stage_duration("review_comments", end_time - start_time)
+        self._print_message(f"\nGenerated {stats.generated} comments in {self._chunk_count} sections.")
+        if stats.generic_discarded:
+            self._print_message(f"  Generic comment filtering discarded {stats.generic_discarded} comments.")
+        self._print_message(f"  Deduplication collapsed {stats.merged} comments.")
+        self._print_message(f"  Hard filtering discarded {stats.hard_discarded} comments.")
+        self._print_message(f"  Preexisting comment filtering discarded {stats.preexisting_discarded} comments.")
+        self._print_message(
+            f"  Scored {stats.scored} comments. Comments reviewed in {end_time - start_time:.2f} seconds."
+        )
+        self._print_comment_counts()
+        return self.results.sorted()
+
+    def _comment_grouper(self, results: ReviewResult) -> CommentGrouper:
+        return CommentGrouper(
+            comments=results.comments,
+            run_prompt_func=self.run_prompt,
+            run_prompt_async_func=self.run_prompt_async,
+            settings=self.settings,
+            logger=self.logger,
+        )
+
+    def _report_grouping(self, correlation_id_start_time: float):
+        correlation_id_end_time = time()
+        self._record_stage_duration("group", correlation_id_end_time - correlation_id_start_time)
+        self._print_message(
+            f"\nCorrelation IDs assigned in {correlation_id_end_time - correlation_id_start_time:.2f} seconds."
+        )
+
+    def _finish_review(self, results: ReviewResult, overall_start_time: float):
+        """
+        Report the finished review, and write its results if output is enabled.
+        """
+        overall_end_time = time()
+        total_duration = overall_end_time - overall_start_time
+        self._print_message(
+            # pylint: disable=line-too-long
+            f"\nReview {self.job_id} generated in {total_duration:.2f} seconds. Found {len(results.comments)} comments"
+        )
+
+        if self.semantic_search_failed:
+            self._print_message("WARN: Semantic search failed for some chunks (see error.log).")
+
+        # Write output JSON if enabled
+        if self.write_output:
+            os.makedirs(self.output_dir, exist_ok=True)
+            output_path = os.path.join(self.output_dir, "output.json")
+            with open(output_path, "w", encoding="utf-8") as f:
+                json.dump(results.model_dump(), f, indent=2)
+            self._print_message(f"Review results written to {output_path}")
+
+    def _record_review_metrics(self, overall_start_time: float, review_status: str):
+        """
+        Record review duration telemetry regardless of success or failure.
+        """
+        total_duration = time() - overall_start_time
+        normalized_duration = total_duration / self._chunk_count if self._chunk_count > 0 else 0
+        metric_attrs = {
+            "review.language": self.language,
+            "review.mode": self.mode,
+            "review.status": review_status,
+        }
+        _review_duration_histogram.record(total_duration, attributes=metric_attrs)
+        _review_normalized_duration_histogram.record(normalized_duration, attributes=metric_attrs)
+        _review_request_counter.add(1, attributes=metric_attrs)
 
     def _canary_check_search_and_cosmos(self) -> str | None:
         """
@@ -1010,6 +1677,7 @@ class ApiViewReview:
         Given a code query, searches the unified index for relevant guidelines,
         memories and examples.
         """
+        start_time = time()
         try:
             results = self.search.search_all(query=query)
             context = self.search.build_context(results.results)
@@ -1017,12 +1685,17 @@ class ApiViewReview:
         except Exception as e:
             logger.error("Error retrieving context: %s: %s", type(e).__name__, e, exc_info=True)
             return None
+        finally:
+            self._record_stage_duration("context_retrieval", time() - start_time)
 
     def _retrieve_guidelines_as_context(self) -> List[object] | None:
         """
-        Retrieves all guidelines for the current language as context.
+        Retrieves all guidelines for the current language as context, from the guideline snapshot
+        the review started with if there is one.
         """
         try:
+            if self.search.guideline_snapshot is not None:
+                return self.search.guideline_snapshot.context
             language_guidelines = self.search.language_guidelines
             if not language_guidelines:
                 return None
@@ -1080,5 +1753,7 @@ class ApiViewReview:
 
     def close(self):
         """Close resources used by this ApiViewReview instance."""
+        if hasattr(self, "retrieval_executor"):
+            self.retrieval_executor.shutdown(wait=True)
         if hasattr(self, "executor"):
             self.executor.shutdown(wait=True)
@@ -6,6 +6,7 @@
 
 """Module for retrieving Azure credentials."""
 
+import asyncio
 import logging
 import os
 import threading
@@ -20,7 +21,7 @@ from azure.identity import (
 
 logger = logging.getLogger(__name__)
 
-_credential_cache = {"instance": None}
+_credential_cache = {"instance": None, "async_instance": None}
 _credential_lock = threading.Lock()
 
 
@@ -64,6 +65,44 @@ def get_credential():
         return _credential_cache["instance"]
 
 
+class _AsyncCredentialAdapter:
+    """Async token credential backed by the shared sync credential.
+
+    Token requests run in a worker thread, so the event loop is not blocked while a token is
+    acquired, and async clients share the token cache of the sync credential.
+    """
+
+    def __init__(self, credential):
+        self._credential = credential
+
+    async def get_token(self, *scopes, **kwargs):
+        """Request an access token for the scopes from the shared credential."""
+        return await asyncio.to_thread(self._credential.get_token, *scopes, **kwargs)
+
+    async def close(self):
+        """Do nothing. The shared credential outlives the async clients that use it."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+def get_async_credential():
+    """Get a shared async Azure credential instance for async clients.
+
+    Wraps the credential returned by ``get_credential()``, so tokens acquired by sync
+    and async clients are shared.
+    """
+    if _credential_cache["async_instance"] is None:
+        credential = get_credential()
+        with _credential_lock:
+            if _credential_cache["async_instance"] is None:
+                _credential_cache["async_instance"] = _AsyncCredentialAdapter(credential)
+    return _credential_cache["async_instance"]
+
+
 def warm_up_credential():
     """Pre-acquire a token so it is cached before parallel workers start.
 
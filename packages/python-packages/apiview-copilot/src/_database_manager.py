@@ -14,9 +14,9 @@ from typing import Any, Optional
 
 from azure.cosmos import CosmosClient
 from azure.cosmos.exceptions import CosmosResourceNotFoundError
-from azure.search.documents.indexes import SearchIndexerClient
 from pydantic import BaseModel
 from src._credential import get_credential
+from src._indexer_trigger import IndexerRun, get_indexer_trigger
 from src._settings import SettingsManager
 from src._utils import guideline_id_to_db
 
@@ -218,11 +218,13 @@ class DatabaseManager:
                     logger.warning("Failed to clean %s %s: %s", tgt_type, target_id, e)
 
         if run_indexer:
-            for container in containers.values():
+            runs = [container.run_indexer() for container in containers.values()]
+            # Runs start in the background once their requests are coalesced; wait to report failures.
+            for run in filter(None, runs):
                 try:
-                    container.run_indexer()
-                except Exception:
-                    pass
+                    run.wait()
+                except Exception as e:
+                    logger.warning("Failed to run indexer %s: %s", run.indexer_name, e)
 
     def link_and_save(self, type_a: str, id_a: str, type_b: str, id_b: str, *, run_indexer: bool = True):
         """Fetch two KB items, link them bidirectionally, and save with rollback.
@@ -543,18 +545,15 @@ class BasicContainer:
             self.run_indexer()
         return value
 
-    def run_indexer(self):
+    def run_indexer(self) -> Optional[IndexerRun]:
         """
-        Trigger the Azure Search indexer for this container (examples, guidelines, or memories).
+        Request a run of the Azure Search indexer for this container (examples, guidelines, or memories).
+        Requests made within a short window are coalesced into one run, which starts in the background.
+
+        Returns:
+            IndexerRun: The requested run, whose wait_indexed() returns once the writes are searchable.
         """
-        settings = SettingsManager(environment=self._environment)
-        indexer_name = f"{self.container_name}-indexer"
-        search_endpoint = settings.get("SEARCH_ENDPOINT")
-        client = SearchIndexerClient(endpoint=search_endpoint, credential=get_credential())
-        status = client.get_indexer_status(indexer_name)
-        if status.status in ["inProgress"]:
-            return
-        client.run_indexer(indexer_name)
+        return get_indexer_trigger().request(f"{self.container_name}-indexer", environment=self._environment)
 
 
 class GuidelinesContainer(BasicContainer):
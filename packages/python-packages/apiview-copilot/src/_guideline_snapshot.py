@@ -0,0 +1,167 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+"""
+Module for the process-wide snapshots of each language's guidelines.
+
+Every review of a language needs all of its guidelines, with their linked examples and memories.
+A snapshot holds them in memory, so that concurrent and later reviews of the language share one
+fetch. Once a snapshot is older than the refresh interval, the next lookup still returns it but
+reloads it in the background. A snapshot older than the staleness bound is never returned: the
+lookup waits for it to be reloaded instead.
+"""
+
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, replace
+from time import monotonic
+from typing import Callable, Dict, Optional, Tuple
+
+from opentelemetry import metrics
+
+# Seconds after which a snapshot is reloaded in the background
+DEFAULT_REFRESH_SECONDS = 5 * 60
+
+# Seconds after which a snapshot is too stale to use and lookups wait for it to be reloaded
+DEFAULT_MAX_STALENESS_SECONDS = 60 * 60
+
+logger = logging.getLogger(__name__)
+
+_meter = metrics.get_meter(__name__)
+_snapshot_age_histogram = _meter.create_histogram(
+    name="apiview.guidelines.snapshot.age",
+    description="Age of the guideline snapshot a review started with in seconds",
+    unit="s",
+)
+_snapshot_load_counter = _meter.create_counter(
+    name="apiview.guidelines.snapshot.loads",
+    description="Number of times a guideline snapshot was loaded",
+    unit="{load}",
+)
+
+
+@dataclass(frozen=True)
+class GuidelineSnapshot:
+    """
+    The guidelines of a language as returned by the search index, and their resolved context.
+    The snapshot is shared by every review of the language, so it must not be modified.
+    """
+
+    language: str
+    guidelines: object  # SearchResult
+    context: object  # Context
+    version: str
+    loaded_at: float  # time.monotonic() of the load
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was loaded."""
+        return monotonic() - self.loaded_at
+
+
+def snapshot_version(guideline_ids, context_markdown: str) -> str:
+    """Return the version of a snapshot: a hash of its guideline IDs and of the content of its context."""
+    digest = hashlib.sha256()
+    for guideline_id in guideline_ids:
+        digest.update(f"{guideline_id}\n".encode("utf-8"))
+    digest.update(context_markdown.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class GuidelineSnapshotStore:
+    """
+    Guideline snapshots by language, loaded with loader(language) -> (guidelines, context).
+
+    Loads of a language are serialized, so concurrent lookups of a missing or stale snapshot
+    load it once. A reload that finds the same version keeps the current snapshot, only
+    resetting its age. A failed background reload is logged and retried by a later lookup.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], Tuple[object, object]],
+        *,
+        refresh_seconds: float = DEFAULT_REFRESH_SECONDS,
+        max_staleness_seconds: float = DEFAULT_MAX_STALENESS_SECONDS,
+    ):
+        self.loader = loader
+        self.refresh_seconds = refresh_seconds
+        self.max_staleness_seconds = max_staleness_seconds
+        self._snapshots: Dict[str, GuidelineSnapshot] = {}
+        self._refreshing = set()  # languages with a background reload in flight
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+
+    def _load_lock(self, language: str) -> threading.Lock:
+        with self._lock:
+            return self._load_locks.setdefault(language, threading.Lock())
+
+    def _usable(self, snapshot: Optional[GuidelineSnapshot]) -> bool:
+        return snapshot is not None and snapshot.age <= self.max_staleness_seconds
+
+    def _load(self, language: str) -> GuidelineSnapshot:
+        """Load the snapshot of a language and store it. Must be called while holding its load lock."""
+        try:
+            guidelines, context = self.loader(language)
+        except Exception:
+            _snapshot_load_counter.add(1, attributes={"review.language": language, "snapshot.result": "error"})
+            raise
+        guideline_ids = [x.id for x in guidelines] if guidelines else []
+        version = snapshot_version(guideline_ids, context.to_markdown() if context else "")
+        current = self._snapshots.get(language)
+        if current is not None and current.version == version:
+            snapshot = replace(current, loaded_at=monotonic())
+            result = "unchanged"
+        else:
+            snapshot = GuidelineSnapshot(language, guidelines, context, version, monotonic())
+            result = "changed"
+            logger.info("Loaded guideline snapshot %s for %s", version[:12], language)
+        _snapshot_load_counter.add(1, attributes={"review.language": language, "snapshot.result": result})
+        with self._lock:
+            self._snapshots[language] = snapshot
+        return snapshot
+
+    def _refresh(self, language: str):
+        """Reload the snapshot of a language in the background."""
+        try:
+            with self._load_lock(language):
+                current = self._snapshots.get(language)
+                if current is None or current.age > self.refresh_seconds:
+                    self._load(language)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Error refreshing the guideline snapshot for %s: %s", language, e)
+        finally:
+            with self._lock:
+                self._refreshing.discard(language)
+
+    def get(self, language: str) -> GuidelineSnapshot:
+        """
+        Return the snapshot of the language's guidelines. Waits for it to be loaded if there is none yet
+        or it is older than the staleness bound, and reloads it in the background if it is due.
+        """
+        snapshot = self._snapshots.get(language)
+        if not self._usable(snapshot):
+            with self._load_lock(language):
+                # Another thread may have loaded the snapshot while this one waited.
+                snapshot = self._snapshots.get(language)
+                if not self._usable(snapshot):
+                    snapshot = self._load(language)
+        elif snapshot.age > self.refresh_seconds:
+            with self._lock:
+                start = language not in self._refreshing
+                self._refreshing.add(language)
+            if start:
+                threading.Thread(
+                    target=self._refresh, args=(language,), name=f"guideline-snapshot-{language}", daemon=True
+                ).start()
+        _snapshot_age_histogram.record(snapshot.age, attributes={"review.language": language})
+        return snapshot
+
+    def clear(self):
+        """Forget every snapshot, so that the next lookup of each language loads it again."""
+        with self._lock:
+            self._snapshots.clear()
@@ -0,0 +1,252 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+"""
+Module for coalescing the Azure Search indexer runs that writes to the database request.
+
+Writes to a knowledge base container request a run of its indexer. Requests for the same indexer
+within a short window are coalesced into one run, which starts once no request has come in for
+the window (or at most MAX_DELAY_SECONDS after the first one). If the indexer is still running,
+the run is retried until it can start, so that it picks up every write it was requested for.
+Pending runs are started when the process exits.
+"""
+
+import atexit
+import logging
+import threading
+from time import monotonic
+from typing import Dict, Optional, Tuple
+
+from azure.search.documents.indexes import SearchIndexerClient
+from opentelemetry import metrics
+from src._credential import get_credential
+from src._settings import SettingsManager
+
+# Seconds without another request after which a requested indexer run starts
+DEFAULT_DEBOUNCE_SECONDS = 2.0
+
+# Longest a requested run waits for requests to stop coming in
+MAX_DELAY_SECONDS = 10.0
+
+# Seconds between attempts to start a run while the indexer is still running
+BUSY_RETRY_SECONDS = 5.0
+
+# Longest a run is retried while the indexer is still running
+MAX_BUSY_SECONDS = 5 * 60
+
+logger = logging.getLogger(__name__)
+
+_meter = metrics.get_meter(__name__)
+_triggered_counter = _meter.create_counter(
+    name="apiview.search.indexer.triggered",
+    description="Number of indexer runs started for writes to the database",
+    unit="{run}",
+)
+_coalesced_counter = _meter.create_counter(
+    name="apiview.search.indexer.coalesced",
+    description="Number of indexer run requests coalesced into a run that was already pending",
+    unit="{request}",
+)
+
+
+def _is_running(status) -> bool:
+    last_result = getattr(status, "last_result", None)
+    return status.status == "inProgress" or getattr(last_result, "status", None) == "inProgress"
+
+
+class IndexerRun:
+    """A pending or started run of an indexer, shared by every request coalesced into it."""
+
+    def __init__(self, trigger: "IndexerTrigger", key: Tuple[Optional[str], str]):
+        self._trigger = trigger
+        self.environment, self.indexer_name = key
+        self.error: Optional[Exception] = None
+        self._previous_start = None  # start time of the indexer's last run before this one
+        self._started = threading.Event()
+
+    def mark_started(self, previous_start=None, error: Optional[Exception] = None):
+        """
+        Record that the run was started, or the error that kept it from starting, and release its waiters.
+        previous_start is the start time of the indexer's last run before this one.
+        """
+        self._previous_start = previous_start
+        self.error = error
+        self._started.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the run has started. Returns False on timeout, and raises the error that kept it from starting.
+        """
+        if not self._started.wait(timeout):
+            return False
+        if self.error is not None:
+            raise self.error
+        return True
+
+    def wait_indexed(self, timeout: float = 300, poll_seconds: float = 2.0) -> bool:
+        """
+        Wait until the run has finished, so that the writes it was requested for are searchable.
+        Returns False on timeout, and raises an error if the run failed.
+        """
+        deadline = monotonic() + timeout
+        if not self.wait(timeout):
+            return False
+        client = self._trigger.client(self.environment)
+        while True:
+            last_result = client.get_indexer_status(self.indexer_name).last_result
+            start_time = getattr(last_result, "start_time", None)
+            if start_time is not None and start_time != self._previous_start:
+                if last_result.status == "success":
+                    return True
+                if last_result.status != "inProgress":
+                    raise RuntimeError(
+                        f"Indexer {self.indexer_name} finished with status {last_result.status}: "
+                        f"{last_result.error_message}"
+                    )
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                return False
+            self._trigger.sleep(min(poll_seconds, remaining))
+
+
+class _Pending:
+    def __init__(self, run: IndexerRun, now: float, debounce_seconds: float):
+        self.run = run
+        self.first_request = now
+        self.due = now + debounce_seconds
+        self.busy_since: Optional[float] = None
+        # Runs of earlier pending entries for the same indexer that start with this one
+        self.joined: list[IndexerRun] = []
+
+    def mark_started(self, previous_start=None, error: Optional[Exception] = None):
+        for run in [self.run, *self.joined]:
+            run.mark_started(previous_start, error)
+
+
+class IndexerTrigger:
+    """
+    Coalesces the indexer runs that writes request, per environment and indexer, and starts them
+    from a background thread with one SearchIndexerClient per environment.
+    """
+
+    def __init__(self, debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS):
+        self.debounce_seconds = debounce_seconds
+        self._pending: Dict[Tuple[Optional[str], str], _Pending] = {}
+        self._clients: Dict[Optional[str], SearchIndexerClient] = {}
+        self._changed = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+
+    def client(self, environment: Optional[str]) -> SearchIndexerClient:
+        """Return the indexer client of the environment, creating it on first use."""
+        with self._changed:
+            client = self._clients.get(environment)
+        if client is None:
+            endpoint = SettingsManager(environment=environment).get("SEARCH_ENDPOINT")
+            client = SearchIndexerClient(endpoint=endpoint, credential=get_credential())
+            with self._changed:
+                client = self._clients.setdefault(environment, client)
+        return client
+
+    def sleep(self, seconds: float):
+        """Wait for the given seconds, e.g. between polls of an indexer's status."""
+        threading.Event().wait(seconds)
+
+    def request(self, indexer_name: str, *, environment: Optional[str] = None) -> IndexerRun:
+        """
+        Request a run of the indexer, which starts once no other request for it has come in for
+        debounce_seconds. Returns the run, which requests made before it starts share.
+        """
+        key = (environment, indexer_name)
+        now = monotonic()
+        with self._changed:
+            pending = self._pending.get(key)
+            if pending is not None:
+                pending.due = max(
+                    pending.due, min(now + self.debounce_seconds, pending.first_request + MAX_DELAY_SECONDS)
+                )
+                _coalesced_counter.add(1, attributes={"indexer.name": indexer_name})
+                return pending.run
+            pending = self._pending[key] = _Pending(IndexerRun(self, key), now, self.debounce_seconds)
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._work, name="indexer-trigger", daemon=True)
+                self._worker.start()
+            self._changed.notify_all()
+            return pending.run
+
+    def _work(self):
+        """Start the pending runs as they come due, until none are left."""
+        while True:
+            with self._changed:
+                if not self._pending:
+                    self._worker = None
+                    return
+                key, pending = min(self._pending.items(), key=lambda x: x[1].due)
+                delay = pending.due - monotonic()
+                if delay > 0:
+                    self._changed.wait(delay)
+                    continue
+                # Claim the entry, so that no one else (e.g. flush) starts it too.
+                del self._pending[key]
+            self._start(key, pending)
+
+    def _start(self, key: Tuple[Optional[str], str], pending: _Pending, *, retry_busy: bool = True):
+        """
+        Start a claimed pending run, or put it back to retry later if the indexer is still running.
+        Requests made while it is claimed get a pending run of their own.
+        """
+        environment, indexer_name = key
+        try:
+            client = self.client(environment)
+            status = client.get_indexer_status(indexer_name)
+            if _is_running(status) and retry_busy:
+                now = monotonic()
+                pending.busy_since = pending.busy_since or now
+                if now - pending.busy_since < MAX_BUSY_SECONDS:
+                    pending.due = now + BUSY_RETRY_SECONDS
+                    self._requeue(key, pending)
+                    return
+                raise TimeoutError(f"Indexer {indexer_name} was still running after {MAX_BUSY_SECONDS} seconds.")
+            previous_start = getattr(getattr(status, "last_result", None), "start_time", None)
+            client.run_indexer(indexer_name)
+            _triggered_counter.add(1, attributes={"indexer.name": indexer_name})
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Error running indexer %s: %s", indexer_name, e)
+            pending.mark_started(error=e)
+            return
+        pending.mark_started(previous_start)
+
+    def _requeue(self, key: Tuple[Optional[str], str], pending: _Pending):
+        """Put a claimed run back, merging it into a run requested for the same indexer meanwhile."""
+        with self._changed:
+            newer = self._pending.get(key)
+            if newer is None:
+                # Requests made until the run starts can join it again.
+                self._pending[key] = pending
+            else:
+                # The newer run starts after every write of this one, so this one starts with it.
+                newer.joined.extend([pending.run, *pending.joined])
+                newer.first_request = min(newer.first_request, pending.first_request)
+                newer.busy_since = newer.busy_since or pending.busy_since
+                newer.due = min(newer.due, pending.due)
+            self._changed.notify_all()
+
+    def flush(self):
+        """Start every pending run now, without waiting for its window or for a running indexer."""
+        with self._changed:
+            # Claim all entries, so that the worker does not start them too.
+            pending_runs = list(self._pending.items())
+            self._pending.clear()
+        for key, pending in pending_runs:
+            self._start(key, pending, retry_busy=False)
+
+
+_indexer_trigger = IndexerTrigger()
+atexit.register(_indexer_trigger.flush)
+
+
+def get_indexer_trigger() -> IndexerTrigger:
+    """Get the indexer trigger shared by all database writes of the process."""
+    return _indexer_trigger
@@ -10,17 +10,46 @@ Module for parsing and executing .prompty prompt template files using Azure AI F
 This module provides direct Azure AI inference calls using .prompty files
 as a human-readable prompt template format, along with retry-based prompt
 execution helpers.
+
+Parsed .prompty files, compiled templates and inference clients are cached
+process-wide, so repeated calls only pay for rendering and the request itself.
+
+``run_prompt_async`` is the asyncio-native counterpart of ``run_prompt``. It sends
+requests with the async inference client, so many concurrent prompts share one
+event loop instead of each holding a thread while it waits for the model.
+
+Prompts that opt in with ``cache`` in their front matter have their responses cached
+(see ``_response_cache``), so identical requests skip the model entirely.
 """
 
+import asyncio
+import functools
+import hashlib
 import json
 import os
 import re
+import threading
+import weakref
 from dataclasses import dataclass, field
 from pathlib import Path
+from time import perf_counter
 from typing import Any, Optional
 
 import yaml
 
+# Maximum number of keep-alive connections each pooled inference client holds per host
+MAX_POOLED_CONNECTIONS = 32
+
+_prompty_cache = {}  # resolved path -> (PromptyConfig, mtimes of its source files)
+_prompty_cache_lock = threading.Lock()
+_client_cache = {}  # (endpoint, api key or credential) -> ChatCompletionsClient
+_client_cache_lock = threading.Lock()
+_async_client_cache = weakref.WeakKeyDictionary()  # event loop -> {(endpoint, api key or credential): client}
+_prompt_semaphores = weakref.WeakKeyDictionary()  # event loop -> asyncio.Semaphore
+
+# Maximum number of prompts run_prompt_async has in flight at once on each event loop
+MAX_CONCURRENT_PROMPTS = 32
+
 
 @dataclass
 class PromptyConfig:
@@ -37,6 +66,9 @@ class PromptyConfig:
     system_template: str = ""
     user_template: str = ""
     response_format: Optional[dict] = None
+    source_files: list = field(default_factory=list)
+    source_hash: str = ""
+    cache_ttl: Optional[float] = None
 
 
 def _resolve_env_vars(value: str) -> str:
@@ -50,27 +82,40 @@ def _resolve_env_vars(value: str) -> str:
     return re.sub(pattern, replacer, value)
 
 
+def _file_reference_path(base_path: Path, value: str) -> Optional[Path]:
+    """Return the path of a file reference like ${file:schema.json}, or None if value is not one."""
+    match = re.match(r"\$\{file:([^}]+)\}", value)
+    return base_path / match.group(1) if match else None
+
+
 def _load_file_reference(base_path: Path, value: str) -> Any:
     """Load a file reference like ${file:schema.json}."""
-    pattern = r"\$\{file:([^}]+)\}"
-    match = re.match(pattern, value)
-    if match:
-        file_name = match.group(1)
-        file_path = base_path / file_name
-        if file_path.exists():
-            with open(file_path, "r", encoding="utf-8") as f:
-                if file_name.endswith(".json"):
-                    return json.load(f)
-                return f.read()
+    file_path = _file_reference_path(base_path, value)
+    if file_path and file_path.exists():
+        with open(file_path, "r", encoding="utf-8") as f:
+            if file_path.name.endswith(".json"):
+                return json.load(f)
+            return f.read()
     return value
 
 
-def _render_template(template: str, variables: dict) -> str:
-    """Render a Jinja2 template with variable substitution and control structures."""
+@functools.lru_cache(maxsize=None)
+def _template_environment():
+    """Return the shared sandboxed Jinja2 environment."""
     from jinja2.sandbox import SandboxedEnvironment
 
-    env = SandboxedEnvironment()
-    return env.from_string(template).render(variables)
+    return SandboxedEnvironment()
+
+
+@functools.lru_cache(maxsize=512)
+def _compile_template(template: str):
+    """Compile a Jinja2 template once per distinct template source."""
+    return _template_environment().from_string(template)
+
+
+def _render_template(template: str, variables: dict) -> str:
+    """Render a Jinja2 template with variable substitution and control structures."""
+    return _compile_template(template).render(variables)
 
 
 def _parse_prompty(file_path: str | Path) -> PromptyConfig:
@@ -118,16 +163,32 @@ def _parse_prompty(file_path: str | Path) -> PromptyConfig:
     params = model.get("parameters", {})
     config.parameters = {k: v for k, v in params.items() if k != "response_format"}
 
+    config.source_files = [file_path]
+
     # Handle response_format - could be a file reference
     response_format = params.get("response_format")
     if isinstance(response_format, str):
         config.response_format = _load_file_reference(file_path.parent, response_format)
+        reference_path = _file_reference_path(file_path.parent, response_format)
+        if reference_path and reference_path.exists():
+            config.source_files.append(reference_path)
     elif isinstance(response_format, dict):
         config.response_format = response_format
 
     # Parse sample inputs
     config.sample = front_matter.get("sample", {})
 
+    # Opt in to the response cache with `cache: true` or `cache: {ttl: <seconds>}`
+    cache = front_matter.get("cache")
+    if cache:
+        from src._response_cache import DEFAULT_TTL_SECONDS
+
+        config.cache_ttl = cache.get("ttl", DEFAULT_TTL_SECONDS) if isinstance(cache, dict) else DEFAULT_TTL_SECONDS
+    source_hash = hashlib.sha256()
+    for path in config.source_files:
+        source_hash.update(path.read_bytes())
+    config.source_hash = source_hash.hexdigest()
+
     # Parse template sections
     # Look for system: and user: sections
     # Note: Use \Z for end-of-string (not $ which matches end-of-line in MULTILINE mode)
@@ -142,6 +203,150 @@ def _parse_prompty(file_path: str | Path) -> PromptyConfig:
     return config
 
 
+def _source_mtimes(config: PromptyConfig) -> tuple:
+    return tuple(os.stat(path).st_mtime_ns for path in config.source_files)
+
+
+def _get_prompty(file_path: str | Path) -> PromptyConfig:
+    """Return the parsed .prompty file from the process-wide prompt registry.
+
+    The file is parsed on first use and again whenever it, or a file it references,
+    has been modified since. The returned config is shared and must not be mutated.
+    """
+    path = Path(file_path).resolve()
+    with _prompty_cache_lock:
+        cached = _prompty_cache.get(path)
+    if cached:
+        config, mtimes = cached
+        try:
+            if _source_mtimes(config) == mtimes:
+                return config
+        except OSError:
+            pass
+    config = _parse_prompty(path)
+    mtimes = _source_mtimes(config)
+    with _prompty_cache_lock:
+        _prompty_cache[path] = (config, mtimes)
+    return config
+
+
+def prompt_version(folder: str, filename: str) -> str:
+    """Return a hash of a prompt file and the files it references, which changes whenever either is edited."""
+    from src._utils import get_prompt_path
+
+    return _get_prompty(get_prompt_path(folder=folder, filename=filename)).source_hash
+
+
+def _create_transport():
+    """Create an HTTP transport that keeps up to MAX_POOLED_CONNECTIONS connections alive per host."""
+    import requests
+    from azure.core.pipeline.transport._requests_basic import RequestsTransport
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_maxsize=MAX_POOLED_CONNECTIONS))
+    return RequestsTransport(session=session, session_owner=True)
+
+
+def _get_client(endpoint: str, api_key: Optional[str] = None):
+    """Return the pooled inference client for the endpoint and credential, creating it on first use.
+
+    Clients are shared across threads, so calls reuse their open connections instead of
+    paying for a new connection and TLS handshake each time. If an API key is given, an
+    ``AzureKeyCredential`` is used; otherwise, the shared credential from ``get_credential()``.
+    """
+    from azure.ai.inference import ChatCompletionsClient
+    from azure.core.credentials import AzureKeyCredential
+    from src._credential import get_credential
+
+    credential = None if api_key else get_credential()
+    cache_key = (endpoint, api_key or credential)
+    client = _client_cache.get(cache_key)
+    if client is not None:
+        return client
+    with _client_cache_lock:
+        client = _client_cache.get(cache_key)
+        if client is None:
+            if api_key:
+                client = ChatCompletionsClient(
+                    endpoint=endpoint,
+                    credential=AzureKeyCredential(api_key),
+                    transport=_create_transport(),
+                )
+            else:
+                # Specify the cognitive services scope for Azure AI
+                client = ChatCompletionsClient(
+                    endpoint=endpoint,
+                    credential=credential,
+                    credential_scopes=["https://cognitiveservices.azure.com/.default"],
+                    transport=_create_transport(),
+                )
+            _client_cache[cache_key] = client
+    return client
+
+
+def _get_async_client(endpoint: str, api_key: Optional[str] = None):
+    """Return the pooled async inference client of the running event loop, creating it on first use.
+
+    Async clients hold connections that belong to the event loop they were opened on, so
+    each event loop has its own pool. If an API key is given, an ``AzureKeyCredential`` is
+    used; otherwise, the shared credential from ``get_async_credential()``.
+    """
+    from azure.ai.inference.aio import ChatCompletionsClient
+    from azure.core.credentials import AzureKeyCredential
+    from src._credential import get_async_credential
+
+    loop = asyncio.get_running_loop()
+    credential = None if api_key else get_async_credential()
+    cache_key = (endpoint, api_key or credential)
+    with _client_cache_lock:
+        clients = _async_client_cache.setdefault(loop, {})
+        client = clients.get(cache_key)
+        if client is None:
+            if api_key:
+                client = ChatCompletionsClient(endpoint=endpoint, credential=AzureKeyCredential(api_key))
+            else:
+                # Specify the cognitive services scope for Azure AI
+                client = ChatCompletionsClient(
+                    endpoint=endpoint,
+                    credential=credential,
+                    credential_scopes=["https://cognitiveservices.azure.com/.default"],
+                )
+            clients[cache_key] = client
+    return client
+
+
+def _get_prompt_semaphore() -> asyncio.Semaphore:
+    """Return the semaphore that limits the prompts in flight on the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _client_cache_lock:
+        semaphore = _prompt_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = _prompt_semaphores[loop] = asyncio.Semaphore(MAX_CONCURRENT_PROMPTS)
+    return semaphore
+
+
+def clear_prompt_caches():
+    """Forget all cached .prompty files, compiled templates, inference clients and in-memory responses.
+
+    Sync clients are closed. Async clients can only be closed on their event loop, so they
+    are only forgotten.
+    """
+    from src._response_cache import get_response_cache
+
+    with _prompty_cache_lock:
+        _prompty_cache.clear()
+    _compile_template.cache_clear()
+    with _client_cache_lock:
+        clients = list(_client_cache.values())
+        _client_cache.clear()
+        _async_client_cache.clear()
+        _prompt_semaphores.clear()
+    for client in clients:
+        client.close()
+    get_response_cache().clear()
+
+
 def _execute_prompt_template(
     file_path: str | Path,
     inputs: dict = None,
@@ -162,13 +367,124 @@ def _execute_prompt_template(
     Raises:
         ValueError: If FOUNDRY_ENDPOINT is not configured.
     """
-    from azure.ai.inference import ChatCompletionsClient
+    from src._rate_limiter import get_rate_limiter
+
+    completion = _prepare_completion(file_path, inputs)
+    cached = _cached_response(completion)
+    if cached is not None:
+        return cached
+
+    # Authenticate — if an explicit API key is provided (e.g., in CI), use AzureKeyCredential;
+    # otherwise, fall back to the shared credential from get_credential().
+    client = _get_client(completion.endpoint, (configuration or {}).get("api_key"))
+
+    # Wait for rate limit capacity, then make the inference call
+    start_time = perf_counter()
+    reservation = get_rate_limiter().acquire(completion.params["model"], completion.estimated_tokens)
+    response = None
+    try:
+        response = client.complete(**completion.params, raw_response_hook=reservation.observe)
+    finally:
+        reservation.settle(_used_tokens(response))
+
+    # Extract content from response
+    result_content = response.choices[0].message.content
+    _cache_response(completion, result_content, _used_tokens(response), perf_counter() - start_time)
+
+    return result_content
+
+
+async def _execute_prompt_template_async(
+    file_path: str | Path,
+    inputs: dict = None,
+    configuration: dict = None,
+) -> Any:
+    """Execute a .prompty template file using the async Azure AI Foundry client.
+
+    Takes the same arguments and returns the same result as ``_execute_prompt_template``.
+    The template is rendered in a worker thread, as the first lookup of a setting calls
+    App Configuration.
+    """
+    from src._rate_limiter import get_rate_limiter
+
+    completion = await asyncio.to_thread(_prepare_completion, file_path, inputs)
+    if completion.cache_key:
+        cached = await asyncio.to_thread(_cached_response, completion)
+        if cached is not None:
+            return cached
+    client = _get_async_client(completion.endpoint, (configuration or {}).get("api_key"))
+    start_time = perf_counter()
+    reservation = await get_rate_limiter().acquire_async(completion.params["model"], completion.estimated_tokens)
+    response = None
+    try:
+        response = await client.complete(**completion.params, raw_response_hook=reservation.observe)
+    finally:
+        reservation.settle(_used_tokens(response))
+    result_content = response.choices[0].message.content
+    if completion.cache_key:
+        await asyncio.to_thread(
+            _cache_response, completion, result_content, _used_tokens(response), perf_counter() - start_time
+        )
+    return result_content
+
+
+def _used_tokens(response) -> Optional[int]:
+    """Return the tokens a completion used, or None if they are not known."""
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", None)
+
+
+@dataclass
+class _Completion:
+    """A rendered .prompty file, ready to be sent to the inference endpoint."""
+
+    prompt: str
+    endpoint: str
+    params: dict
+    estimated_tokens: int
+    cache_key: Optional[str] = None
+    cache_ttl: Optional[float] = None
+
+
+def _cached_response(completion: _Completion) -> Optional[str]:
+    """Return the cached response of the completion, or None if it has none or its prompt doesn't opt in."""
+    from src._response_cache import get_response_cache
+
+    if not completion.cache_key:
+        return None
+    cached = get_response_cache().get(completion.cache_key, prompt=completion.prompt)
+    return cached.content if cached is not None else None
+
+
+def _cache_response(completion: _Completion, content: Optional[str], tokens: Optional[int], latency: float):
+    """Cache the response of the completion if its prompt opts in.
+
+    A response that should be JSON but isn't is not cached, so retrying the prompt asks the model again.
+    """
+    from src._response_cache import CachedResponse, get_response_cache
+
+    if not completion.cache_key or content is None:
+        return
+    if completion.params.get("response_format") == "json_object":
+        try:
+            json.loads(content)
+        except ValueError:
+            return
+    get_response_cache().set(completion.cache_key, CachedResponse(content, tokens, latency), completion.cache_ttl)
+
+
+def _prepare_completion(file_path: str | Path, inputs: dict = None) -> _Completion:
+    """
+    Render a .prompty template file and return the completion to send: the inference endpoint,
+    the parameters of the completion, the estimated tokens of the prompt and, if the prompt opts
+    in to the response cache, its cache key.
+    """
+    from src._rate_limiter import estimate_tokens
+    from src._response_cache import response_cache_key
     from azure.ai.inference.models import SystemMessage, UserMessage
-    from azure.core.credentials import AzureKeyCredential
-    from src._credential import get_credential
     from src._settings import SettingsManager
 
-    config = _parse_prompty(file_path)
+    config = _get_prompty(file_path)
     inputs = inputs or {}
 
     # Merge sample inputs with provided inputs (provided inputs take precedence)
@@ -191,24 +507,6 @@ def _execute_prompt_template(
     # Format: {FOUNDRY_ENDPOINT}/models
     inference_endpoint = f"{foundry_endpoint.rstrip('/')}/models"
 
-    # Authenticate — if an explicit API key is provided (e.g., in CI), use AzureKeyCredential;
-    # otherwise, fall back to the shared credential from get_credential().
-    api_key = (configuration or {}).get("api_key")
-    if api_key:
-        credential = AzureKeyCredential(api_key)
-        client = ChatCompletionsClient(
-            endpoint=inference_endpoint,
-            credential=credential,
-        )
-    else:
-        credential = get_credential()
-        # Specify the cognitive services scope for Azure AI
-        client = ChatCompletionsClient(
-            endpoint=inference_endpoint,
-            credential=credential,
-            credential_scopes=["https://cognitiveservices.azure.com/.default"],
-        )
-
     # Build messages
     messages = []
     if system_content:
@@ -259,13 +557,18 @@ def _execute_prompt_template(
             user_content += schema_instruction or "\n\nYou must respond in JSON format."
             completion_params["messages"][-1] = UserMessage(content=user_content)
 
-    # Make the inference call
-    response = client.complete(**completion_params)
-
-    # Extract content from response
-    result_content = response.choices[0].message.content
-
-    return result_content
+    cache_key = None
+    if config.cache_ttl is not None:
+        cache_params = {k: v for k, v in completion_params.items() if k != "messages"}
+        cache_key = response_cache_key(config.source_hash, cache_params, system_content, user_content)
+    return _Completion(
+        prompt=Path(file_path).stem,
+        endpoint=inference_endpoint,
+        params=completion_params,
+        estimated_tokens=estimate_tokens(system_content, user_content),
+        cache_key=cache_key,
+        cache_ttl=config.cache_ttl,
+    )
 
 
 def _run_prompt_template(*, folder: str, filename: str, inputs: dict = None, **kwargs) -> Any:
@@ -337,3 +640,70 @@ def run_prompt(
         logger=logger,
         description=f"prompt {filename}",
     )
+
+
+async def _run_prompt_template_async(*, folder: str, filename: str, inputs: dict = None, **kwargs) -> Any:
+    """
+    Run a prompt template file with the given inputs using the async inference client.
+
+    :param folder: Folder containing the prompt file.
+    :param filename: Name of the prompt file.
+    :param inputs: Dictionary of inputs for the prompt.
+    :param kwargs: Additional keyword arguments passed to the execute function.
+    """
+    from src._utils import get_prompt_path
+
+    prompt_path = get_prompt_path(folder=folder, filename=filename)
+    return await _execute_prompt_template_async(prompt_path, inputs=inputs, configuration=kwargs.get("configuration"))
+
+
+async def run_prompt_async(
+    folder: str,
+    filename: str,
+    inputs: dict,
+    settings=None,
+    max_retries: int = 5,
+    logger: Optional[object] = None,
+) -> str:
+    """
+    Run a prompt with retry logic on the running event loop.
+
+    Takes the same arguments and returns the same result as run_prompt. At most
+    MAX_CONCURRENT_PROMPTS prompts are in flight at once on each event loop; time spent
+    waiting for a slot does not count against the per-attempt timeout.
+
+    Raises:
+        Exception: If all retry attempts fail
+    """
+    from src._credential import in_ci
+    from src._retry import retry_with_backoff_async
+    from src._settings import SettingsManager
+
+    async def execute_prompt() -> str:
+        if in_ci():
+            configuration = {"api_key": (settings or SettingsManager()).get("OPENAI_API_KEY")}
+        else:
+            configuration = {}
+        return await _run_prompt_template_async(
+            folder=folder, filename=filename, inputs=inputs, configuration=configuration
+        )
+
+    def on_retry(exception, attempt, max_attempts):
+        if logger:
+            logger.warning(f"Error executing prompt {filename}, attempt {attempt+1}/{max_attempts}: {str(exception)}")
+
+    def on_failure(exception, attempt):
+        if logger:
+            logger.error(f"Failed to execute prompt {filename} after {attempt} attempts: {str(exception)}")
+        raise exception
+
+    return await retry_with_backoff_async(
+        func=execute_prompt,
+        max_retries=max_retries,
+        retry_exceptions=(json.JSONDecodeError, Exception),
+        on_retry=on_retry,
+        on_failure=on_failure,
+        logger=logger,
+        description=f"prompt {filename}",
+        concurrency=_get_prompt_semaphore(),
+    )
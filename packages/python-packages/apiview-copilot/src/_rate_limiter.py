@@ -0,0 +1,287 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+"""
+Module for the process-wide, adaptive rate limiter shared by all LLM calls.
+
+Every prompt reserves its estimated tokens from the token bucket of its deployment before
+it is sent. Calls that have to wait are queued by priority, so interactive calls go before
+background work such as reviews. The buckets adapt to the responses of the service: a 429
+pauses the deployment for its Retry-After and halves its capacity, each successful call
+restores part of it, and the x-ratelimit-remaining-* headers cap the tokens left.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import enum
+import heapq
+import itertools
+import threading
+from time import monotonic
+from typing import Optional
+
+from opentelemetry import metrics
+
+# Tokens per minute each deployment is assumed to allow until its responses say otherwise
+DEFAULT_TOKENS_PER_MINUTE = 1_000_000
+
+# Lowest capacity a deployment backs off to after throttling, as a fraction of its default capacity
+MIN_CAPACITY_FRACTION = 0.05
+
+# Capacity a deployment regains after each successful call, as a fraction of its default capacity
+RECOVERY_FRACTION = 0.02
+
+# Seconds to pause a deployment that is throttled without saying for how long
+DEFAULT_PAUSE_SECONDS = 1.0
+
+# Longest time an async call waits before it checks its place in the queue again
+_ASYNC_POLL_SECONDS = 0.05
+
+_meter = metrics.get_meter(__name__)
+_queue_depth_counter = _meter.create_up_down_counter(
+    name="apiview.llm.rate_limit.queue_depth",
+    description="Number of LLM calls waiting for rate limit capacity",
+    unit="{call}",
+)
+_wait_time_histogram = _meter.create_histogram(
+    name="apiview.llm.rate_limit.wait_time",
+    description="Time an LLM call waited for rate limit capacity in seconds",
+    unit="s",
+)
+
+
+class Priority(enum.IntEnum):
+    """Priority of an LLM call. Waiting calls with a lower value go first."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+_priority = contextvars.ContextVar("llm_priority", default=Priority.BACKGROUND)
+
+
+@contextlib.contextmanager
+def llm_priority(priority: Priority):
+    """Run the LLM calls made in this context at the given priority.
+
+    The priority carries over to tasks and ``asyncio.to_thread`` calls started in the context.
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def estimate_tokens(*texts: str) -> int:
+    """Estimate the tokens of a prompt from its text (~4 characters per token)."""
+    return sum(len(text) for text in texts) // 4 + 1
+
+
+def _header_number(headers, name: str) -> Optional[float]:
+    value = headers.get(name) if headers is not None else None
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class _Bucket:
+    """Token bucket of one deployment, refilled continuously at its capacity per minute."""
+
+    def __init__(self, tokens_per_minute: int):
+        self.max_capacity = float(tokens_per_minute)
+        self.capacity = float(tokens_per_minute)
+        self.tokens = float(tokens_per_minute)
+        self.updated = monotonic()
+        self.paused_until = 0.0
+        self.waiters = []  # heap of (priority, sequence) tickets
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.capacity / 60)
+        self.updated = now
+
+    def delay(self, tokens: int, now: float) -> float:
+        """Return the seconds until the bucket can grant the tokens."""
+        self.refill(now)
+        # A call larger than the bucket only waits for a full bucket.
+        tokens = min(tokens, self.capacity)
+        delay = max(self.paused_until - now, 0.0)
+        if self.tokens < tokens:
+            delay = max(delay, (tokens - self.tokens) * 60 / self.capacity)
+        return delay
+
+
+class Reservation:
+    """Tokens reserved for one LLM call."""
+
+    def __init__(self, limiter: "RateLimiter", deployment: str, tokens: int):
+        self.limiter = limiter
+        self.deployment = deployment
+        self.tokens = tokens
+
+    def observe(self, response):
+        """
+        Adapt the limiter to the status and rate limit headers of a response of the call.
+        Pass as the ``raw_response_hook`` of the request.
+        """
+        http_response = response.http_response
+        self.limiter.adapt(self.deployment, http_response.status_code, http_response.headers)
+
+    def settle(self, used_tokens: Optional[int]):
+        """Correct the reservation by the tokens the call actually used, if they are known."""
+        if isinstance(used_tokens, int) and not isinstance(used_tokens, bool):
+            self.limiter.refund(self.deployment, self.tokens - used_tokens)
+
+
+class RateLimiter:
+    """
+    Adaptive token-bucket rate limiter of LLM calls, keyed by deployment.
+
+    Calls of a deployment take their tokens in order of priority, then of arrival: a call
+    waits until it is first in line and its deployment has the tokens and isn't paused.
+    Both threads and coroutines can wait for the same deployment.
+    """
+
+    def __init__(self, tokens_per_minute: int = DEFAULT_TOKENS_PER_MINUTE):
+        self.tokens_per_minute = tokens_per_minute
+        self._changed = threading.Condition()
+        self._buckets = {}
+        self._sequence = itertools.count()
+
+    def _bucket(self, deployment: str) -> _Bucket:
+        bucket = self._buckets.get(deployment)
+        if bucket is None:
+            bucket = self._buckets[deployment] = _Bucket(self.tokens_per_minute)
+        return bucket
+
+    def _enqueue(self, deployment: str, priority: Priority) -> tuple:
+        with self._changed:
+            ticket = (priority, next(self._sequence))
+            heapq.heappush(self._bucket(deployment).waiters, ticket)
+        return ticket
+
+    def _dequeue(self, deployment: str, ticket: tuple):
+        """Remove a ticket that gave up waiting, e.g. because its call was cancelled."""
+        with self._changed:
+            waiters = self._buckets[deployment].waiters
+            if ticket in waiters:
+                waiters.remove(ticket)
+                heapq.heapify(waiters)
+                self._changed.notify_all()
+
+    def _try_acquire(self, deployment: str, ticket: tuple, tokens: int) -> Optional[float]:
+        """
+        Grant the tokens if the ticket is first in line and they are available. Returns 0 if they
+        were granted, the seconds to wait for them if the ticket is first in line, and otherwise None.
+        Must be called while holding the lock.
+        """
+        bucket = self._buckets[deployment]
+        if bucket.waiters[0] != ticket:
+            return None
+        delay = bucket.delay(tokens, monotonic())
+        if delay > 0:
+            return delay
+        heapq.heappop(bucket.waiters)
+        bucket.tokens -= tokens
+        self._changed.notify_all()
+        return 0
+
+    def acquire(self, deployment: str, tokens: int, priority: Optional[Priority] = None) -> Reservation:
+        """
+        Wait until the tokens can be taken from the deployment's bucket and return their reservation.
+        The priority defaults to the one of the current context (see llm_priority).
+        """
+        priority = _priority.get() if priority is None else priority
+        start_time = monotonic()
+        ticket = self._enqueue(deployment, priority)
+        attributes = {"llm.deployment": deployment, "llm.priority": priority.name.lower()}
+        _queue_depth_counter.add(1, attributes=attributes)
+        try:
+            with self._changed:
+                delay = self._try_acquire(deployment, ticket, tokens)
+                while delay != 0:
+                    self._changed.wait(delay)
+                    delay = self._try_acquire(deployment, ticket, tokens)
+        except BaseException:
+            self._dequeue(deployment, ticket)
+            raise
+        finally:
+            _queue_depth_counter.add(-1, attributes=attributes)
+            _wait_time_histogram.record(monotonic() - start_time, attributes=attributes)
+        return Reservation(self, deployment, tokens)
+
+    async def acquire_async(self, deployment: str, tokens: int, priority: Optional[Priority] = None) -> Reservation:
+        """
+        Async counterpart of acquire, which waits without blocking the event loop.
+        """
+        priority = _priority.get() if priority is None else priority
+        start_time = monotonic()
+        ticket = self._enqueue(deployment, priority)
+        attributes = {"llm.deployment": deployment, "llm.priority": priority.name.lower()}
+        _queue_depth_counter.add(1, attributes=attributes)
+        try:
+            while True:
+                with self._changed:
+                    delay = self._try_acquire(deployment, ticket, tokens)
+                if delay == 0:
+                    break
+                await asyncio.sleep(_ASYNC_POLL_SECONDS if delay is None else delay)
+        except BaseException:
+            self._dequeue(deployment, ticket)
+            raise
+        finally:
+            _queue_depth_counter.add(-1, attributes=attributes)
+            _wait_time_histogram.record(monotonic() - start_time, attributes=attributes)
+        return Reservation(self, deployment, tokens)
+
+    def refund(self, deployment: str, tokens: float):
+        """Return unused tokens to the deployment's bucket, or take more if tokens is negative."""
+        with self._changed:
+            bucket = self._bucket(deployment)
+            bucket.tokens = min(bucket.capacity, bucket.tokens + tokens)
+            self._changed.notify_all()
+
+    def adapt(self, deployment: str, status_code: int, headers):
+        """
+        Adapt the deployment's bucket to the status and rate limit headers of a response.
+        """
+        with self._changed:
+            bucket = self._bucket(deployment)
+            now = monotonic()
+            bucket.refill(now)
+            if status_code == 429:
+                retry_after_ms = _header_number(headers, "retry-after-ms")
+                retry_after = retry_after_ms / 1000 if retry_after_ms is not None else None
+                if retry_after is None:
+                    retry_after = _header_number(headers, "Retry-After")
+                bucket.paused_until = max(bucket.paused_until, now + (retry_after or DEFAULT_PAUSE_SECONDS))
+                bucket.capacity = max(bucket.max_capacity * MIN_CAPACITY_FRACTION, bucket.capacity / 2)
+                bucket.tokens = min(bucket.tokens, bucket.capacity)
+            elif status_code < 400:
+                bucket.capacity = min(bucket.max_capacity, bucket.capacity + bucket.max_capacity * RECOVERY_FRACTION)
+
+            remaining_tokens = _header_number(headers, "x-ratelimit-remaining-tokens")
+            if remaining_tokens is not None:
+                bucket.tokens = min(bucket.tokens, remaining_tokens)
+            if _header_number(headers, "x-ratelimit-remaining-requests") == 0:
+                bucket.paused_until = max(bucket.paused_until, now + DEFAULT_PAUSE_SECONDS)
+            self._changed.notify_all()
+
+    def queue_depth(self, deployment: str) -> int:
+        """Return the number of calls waiting for the deployment."""
+        with self._changed:
+            bucket = self._buckets.get(deployment)
+            return len(bucket.waiters) if bucket else 0
+
+
+_rate_limiter = RateLimiter()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the rate limiter shared by all LLM calls of the process."""
+    return _rate_limiter
@@ -0,0 +1,247 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+"""
+Module for the content-addressed cache of LLM responses.
+
+Prompts opt in through their front matter (``cache: true`` or ``cache: {ttl: <seconds>}``).
+A response is keyed by a hash of the .prompty source, the rendered messages and the model
+parameters, so editing the prompt, its schema or its inputs never returns a stale response.
+Responses are kept in an in-memory LRU and, if a backend is configured, in a persistent
+store shared across processes. Setting APIVIEW_PROMPT_CACHE_PATH uses a local SQLite file.
+
+The results of section prompts, which later revisions of an API reuse, are kept in a cache of
+their own, so that prompt responses never evict them.
+"""
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from time import time
+from typing import Optional
+
+from opentelemetry import metrics
+
+# Seconds a response is kept when its prompt opts in without a TTL
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+# Maximum number of responses kept in memory
+DEFAULT_MAX_ENTRIES = 1024
+
+# Maximum number of section results kept in memory, unless APIVIEW_SECTION_CACHE_MAX_ENTRIES says otherwise
+DEFAULT_SECTION_RESULT_MAX_ENTRIES = 16384
+
+# Environment variable with the path of the SQLite file to persist responses in
+CACHE_PATH_ENV_VAR = "APIVIEW_PROMPT_CACHE_PATH"
+
+# Environment variable with the maximum number of section results kept in memory
+SECTION_CACHE_MAX_ENTRIES_ENV_VAR = "APIVIEW_SECTION_CACHE_MAX_ENTRIES"
+
+logger = logging.getLogger(__name__)
+
+_meter = metrics.get_meter(__name__)
+_lookup_counter = _meter.create_counter(
+    name="apiview.llm.response_cache.lookups",
+    description="Number of lookups of the LLM response cache",
+    unit="{lookup}",
+)
+_saved_tokens_counter = _meter.create_counter(
+    name="apiview.llm.response_cache.saved_tokens",
+    description="Tokens not sent to the model because the response was cached",
+    unit="{token}",
+)
+_saved_time_counter = _meter.create_counter(
+    name="apiview.llm.response_cache.saved_time",
+    description="Time the cached responses originally took in seconds",
+    unit="s",
+)
+
+
+@dataclass
+class CachedResponse:
+    """A cached response, with the tokens and seconds it originally took."""
+
+    content: str
+    tokens: Optional[int] = None
+    latency: float = 0.0
+
+
+def response_cache_key(source_hash: str, parameters: dict, *messages: str) -> str:
+    """Return the cache key of a prompt from its source hash, model parameters and rendered messages."""
+    payload = json.dumps([source_hash, parameters, messages], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCacheBackend(ABC):
+    """Persistent store of cached responses, shared across processes."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[tuple[float, CachedResponse]]:
+        """Return the expiry time and response stored under the key, or None if there is none."""
+
+    @abstractmethod
+    def set(self, key: str, response: CachedResponse, expires: float):
+        """Store the response under the key until the expiry time (seconds since the epoch)."""
+
+
+class SqliteCacheBackend(ResponseCacheBackend):
+    """Stores cached responses in a local SQLite file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+            connection.execute("DELETE FROM responses WHERE expires <= ?", (time(),))
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """Open a connection that commits on success and is closed afterwards."""
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def get(self, key: str) -> Optional[tuple[float, CachedResponse]]:
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT value, expires FROM responses WHERE key = ? AND expires > ?", (key, time())
+            ).fetchone()
+        if row is None:
+            return None
+        return row[1], CachedResponse(**json.loads(row[0]))
+
+    def set(self, key: str, response: CachedResponse, expires: float):
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires) VALUES (?, ?, ?)",
+                (key, json.dumps(asdict(response)), expires),
+            )
+
+
+class ResponseCache:
+    """
+    In-memory LRU of responses in front of an optional persistent backend.
+
+    Errors of the backend are logged and treated as misses, so they never fail a prompt.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, backend: Optional[ResponseCacheBackend] = None):
+        self.max_entries = max_entries
+        self.backend = backend
+        self._entries = OrderedDict()  # key -> (expiry time, CachedResponse)
+        self._lock = threading.Lock()
+
+    def _remember(self, key: str, expires: float, response: CachedResponse):
+        with self._lock:
+            self._entries[key] = (expires, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _lookup(self, key: str) -> Optional[CachedResponse]:
+        now = time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    return entry[1]
+                del self._entries[key]
+        if self.backend is None:
+            return None
+        try:
+            stored = self.backend.get(key)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Error reading the response cache: %s", e)
+            return None
+        if stored is None:
+            return None
+        self._remember(key, *stored)
+        return stored[1]
+
+    def get(self, key: str, prompt: str = "") -> Optional[CachedResponse]:
+        """Return the response cached under the key, or None. Records the lookup for the prompt."""
+        response = self._lookup(key)
+        attributes = {"prompt.name": prompt}
+        _lookup_counter.add(1, attributes={**attributes, "cache.result": "hit" if response is not None else "miss"})
+        if response is not None:
+            if response.tokens:
+                _saved_tokens_counter.add(response.tokens, attributes=attributes)
+            _saved_time_counter.add(response.latency, attributes=attributes)
+        return response
+
+    def set(self, key: str, response: CachedResponse, ttl: float = DEFAULT_TTL_SECONDS):
+        """Cache the response under the key for ttl seconds."""
+        expires = time() + ttl
+        self._remember(key, expires, response)
+        if self.backend is not None:
+            try:
+                self.backend.set(key, response, expires)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.warning("Error writing the response cache: %s", e)
+
+    def clear(self):
+        """Forget the responses kept in memory. The persistent backend is left untouched."""
+        with self._lock:
+            self._entries.clear()
+
+
+_response_cache = None
+_section_result_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def configure_response_cache(
+    backend: Optional[ResponseCacheBackend] = None, max_entries: int = DEFAULT_MAX_ENTRIES
+) -> ResponseCache:
+    """Replace the process-wide response cache with one using the given backend and size."""
+    global _response_cache  # pylint: disable=global-statement
+    with _response_cache_lock:
+        _response_cache = ResponseCache(max_entries=max_entries, backend=backend)
+    return _response_cache
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    Get the process-wide response cache. Unless configured otherwise, it persists responses
+    in the SQLite file at APIVIEW_PROMPT_CACHE_PATH if that is set.
+    """
+    global _response_cache  # pylint: disable=global-statement
+    with _response_cache_lock:
+        if _response_cache is None:
+            path = os.getenv(CACHE_PATH_ENV_VAR)
+            _response_cache = ResponseCache(backend=SqliteCacheBackend(path) if path else None)
+        return _response_cache
+
+
+def get_section_result_cache() -> ResponseCache:
+    """
+    Get the process-wide cache of section prompt results. It is separate from the response cache
+    and larger, since a section is only reused by the next review of the same API. Like the
+    response cache, it persists results in the SQLite file at APIVIEW_PROMPT_CACHE_PATH if that is set.
+    """
+    global _section_result_cache  # pylint: disable=global-statement
+    with _response_cache_lock:
+        if _section_result_cache is None:
+            path = os.getenv(CACHE_PATH_ENV_VAR)
+            max_entries = int(os.getenv(SECTION_CACHE_MAX_ENTRIES_ENV_VAR, str(DEFAULT_SECTION_RESULT_MAX_ENTRIES)))
+            _section_result_cache = ResponseCache(
+                max_entries=max_entries, backend=SqliteCacheBackend(path) if path else None
+            )
+        return _section_result_cache
@@ -8,6 +8,9 @@
 Module containing retry logic with smart defaults, support for 'Retry-After' headers, and per-call timeout.
 """
 
+import asyncio
+import contextlib
+import contextvars
 import json
 import time
 from concurrent.futures import ThreadPoolExecutor, TimeoutError
@@ -63,9 +66,9 @@ def retry_with_backoff(
     e = None  # Ensure 'e' is always defined
     for attempt in range(max_retries):
         try:
-            # Use ThreadPoolExecutor to enforce a timeout
+            # Use ThreadPoolExecutor to enforce a timeout, running func in a copy of the caller's context
             with ThreadPoolExecutor(max_workers=1) as executor:
-                future = executor.submit(func)
+                future = executor.submit(contextvars.copy_context().run, func)
                 result = future.result(timeout=timeout)  # Wait for the result with a timeout
             return result
         except TimeoutError:
@@ -74,58 +77,71 @@ def retry_with_backoff(
             e = TimeoutException(f"Function execution exceeded {timeout} seconds")
         except Exception as exc:
             e = exc
-            # Check if this is a non-retryable exception
-            if isinstance(e, non_retryable_exceptions):
-                if logger:
-                    logger.error(f"Non-retryable error in {description}: {str(e)}")
+            if not _is_retryable(
+                e, attempt, max_retries, retry_exceptions, non_retryable_exceptions, logger, description
+            ):
                 if on_failure:
                     return on_failure(e, attempt)
-                raise  # Re-raise non-retryable exceptions immediately
+                raise  # Re-raise exceptions that should not be retried
 
-            # Check if this is a retryable exception
-            if not isinstance(e, retry_exceptions):
-                if logger:
-                    logger.error(f"Unhandled error in {description}: {str(e)}")
-                if on_failure:
-                    return on_failure(e, attempt)
-                raise  # Re-raise exceptions that don't match retry_exceptions
+        # Wait before retrying
+        time.sleep(_before_retry(e, attempt, max_retries, on_retry, logger, description))
 
-            # This is a retryable exception
-            error_msg = f"Error in {description}, attempt {attempt+1}/{max_retries}: {str(e)}"
-            if logger:
-                logger.error(error_msg)
-
-        # Determine retry reason for telemetry
-        retry_reason = "timeout" if isinstance(e, TimeoutException) else "other"
-
-        # Check for 'Retry-After' header if the exception has it
-        retry_after = None
-        if e is not None and hasattr(e, "response") and e.response is not None:  # pylint: disable=no-member
-            retry_after = e.response.headers.get("Retry-After")  # pylint: disable=no-member
-            if retry_after:
-                try:
-                    retry_after = int(retry_after)
-                    retry_reason = "throttled"
-                    if logger:
-                        logger.info(f"Retry-After header found: {retry_after} seconds")
-                except ValueError:
-                    retry_after = None  # Ignore invalid Retry-After values
-
-        # Use Retry-After if available, otherwise use exponential backoff
-        if retry_after is None:
-            retry_after = 2**attempt  # Exponential backoff
-            if logger:
-                logger.info(f"Using exponential backoff: {retry_after} seconds")
+        # If this was the last attempt, call on_failure and return its result
+        if attempt == max_retries - 1:
+            if on_failure:
+                return on_failure(e, attempt)
+            raise e  # Raise the last caught exception
+
+    # This shouldn't be reached, but just in case
+    raise RuntimeError(f"Failed after {max_retries} attempts")
+
+
+async def retry_with_backoff_async(
+    func,
+    *,
+    max_retries=5,
+    timeout=240,  # Timeout for each call in seconds (default: 4 minutes)
+    retry_exceptions=(json.JSONDecodeError, asyncio.TimeoutError, ConnectionError, TimeoutException),
+    non_retryable_exceptions=(AttributeError, TypeError, NameError, SyntaxError, PermissionError),
+    on_failure=None,
+    on_retry=None,
+    logger=None,
+    description="operation",
+    concurrency=None,
+):
+    """
+    Async counterpart of retry_with_backoff, for a function that returns an awaitable.
 
-        # Call the on_retry callback if provided
-        if on_retry:
-            on_retry(e, attempt, max_retries)
+    The per-call timeout is enforced on the event loop, so no thread is needed to wait for the call.
 
-        # Record retry telemetry
-        _retry_counter.add(1, attributes={"retry.reason": retry_reason, "retry.description": description})
+    Args:
+        func: The function to retry. Each call must return a new awaitable.
+        concurrency: Optional semaphore held while each attempt runs. Waiting for it does not
+                     count against the timeout, and it is not held while waiting to retry.
+
+    All other arguments and the return value are the same as for retry_with_backoff.
+    """
+    e = None  # Ensure 'e' is always defined
+    for attempt in range(max_retries):
+        try:
+            async with concurrency or contextlib.nullcontext():
+                return await asyncio.wait_for(func(), timeout=timeout)
+        except asyncio.TimeoutError:
+            if logger:
+                logger.error(f"Timeout in {description}: Function execution exceeded {timeout} seconds")
+            e = TimeoutException(f"Function execution exceeded {timeout} seconds")
+        except Exception as exc:
+            e = exc
+            if not _is_retryable(
+                e, attempt, max_retries, retry_exceptions, non_retryable_exceptions, logger, description
+            ):
+                if on_failure:
+                    return on_failure(e, attempt)
+                raise  # Re-raise exceptions that should not be retried
 
         # Wait before retrying
-        time.sleep(retry_after)
+        await asyncio.sleep(_before_retry(e, attempt, max_retries, on_retry, logger, description))
 
         # If this was the last attempt, call on_failure and return its result
         if attempt == max_retries - 1:
@@ -135,3 +151,57 @@ def retry_with_backoff(
 
     # This shouldn't be reached, but just in case
     raise RuntimeError(f"Failed after {max_retries} attempts")
+
+
+# pylint: disable=too-many-arguments
+def _is_retryable(e, attempt, max_retries, retry_exceptions, non_retryable_exceptions, logger, description) -> bool:
+    """Log an error raised by an attempt and return whether it should be retried."""
+    # Check if this is a non-retryable exception
+    if isinstance(e, non_retryable_exceptions):
+        if logger:
+            logger.error(f"Non-retryable error in {description}: {str(e)}")
+        return False
+
+    # Check if this is a retryable exception
+    if not isinstance(e, retry_exceptions):
+        if logger:
+            logger.error(f"Unhandled error in {description}: {str(e)}")
+        return False
+
+    # This is a retryable exception
+    if logger:
+        logger.error(f"Error in {description}, attempt {attempt+1}/{max_retries}: {str(e)}")
+    return True
+
+
+def _before_retry(e, attempt, max_retries, on_retry, logger, description) -> int:
+    """Report a retry of a failed attempt and return the number of seconds to wait before it."""
+    # Determine retry reason for telemetry
+    retry_reason = "timeout" if isinstance(e, TimeoutException) else "other"
+
+    # Check for 'Retry-After' header if the exception has it
+    retry_after = None
+    if e is not None and hasattr(e, "response") and e.response is not None:  # pylint: disable=no-member
+        retry_after = e.response.headers.get("Retry-After")  # pylint: disable=no-member
+        if retry_after:
+            try:
+                retry_after = int(retry_after)
+                retry_reason = "throttled"
+                if logger:
+                    logger.info(f"Retry-After header found: {retry_after} seconds")
+            except ValueError:
+                retry_after = None  # Ignore invalid Retry-After values
+
+    # Use Retry-After if available, otherwise use exponential backoff
+    if retry_after is None:
+        retry_after = 2**attempt  # Exponential backoff
+        if logger:
+            logger.info(f"Using exponential backoff: {retry_after} seconds")
+
+    # Call the on_retry callback if provided
+    if on_retry:
+        on_retry(e, attempt, max_retries)
+
+    # Record retry telemetry
+    _retry_counter.add(1, attributes={"retry.reason": retry_reason, "retry.description": description})
+    return retry_after
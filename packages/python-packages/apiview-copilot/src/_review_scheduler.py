@@ -0,0 +1,198 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+"""
+Module for the scheduler of the review jobs the service runs.
+
+At most a configured number of reviews run at once. The others wait in a queue, in order of
+submission, up to a configured length beyond which submissions are refused. A submission identical to a job that is queued or running is not queued again, but
+collapses onto that job.
+"""
+
+import asyncio
+import hashlib
+import heapq
+import itertools
+import json
+import logging
+import os
+from collections import deque
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Awaitable, Callable, Dict, Optional
+
+from opentelemetry import metrics
+
+# Reviews that run at once, unless APIVIEW_MAX_CONCURRENT_REVIEWS says otherwise
+DEFAULT_MAX_CONCURRENT_REVIEWS = 8
+
+# Reviews that may wait in the queue, unless APIVIEW_MAX_QUEUED_REVIEWS says otherwise
+DEFAULT_MAX_QUEUED_REVIEWS = 200
+
+# Number of recent review durations the ETA of queued jobs is estimated from
+_DURATION_HISTORY = 20
+
+logger = logging.getLogger(__name__)
+
+_meter = metrics.get_meter(__name__)
+_queue_wait_histogram = _meter.create_histogram(
+    name="apiview.review.queue.wait_time",
+    description="Time a review job waited in the queue before it started in seconds",
+    unit="s",
+)
+_deduplicated_counter = _meter.create_counter(
+    name="apiview.review.queue.deduplicated",
+    description="Number of review submissions that collapsed onto an identical queued or running job",
+    unit="{job}",
+)
+
+
+class SchedulerFullError(Exception):
+    """Raised when a review job is submitted while the queue is full."""
+
+
+def review_job_key(language: str, target: str, base: Optional[str], outline: Optional[str], comments) -> str:
+    """Return the content hash under which identical review submissions collapse."""
+    payload = json.dumps([language, target, base, outline, comments], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass(order=True)
+class _Job:
+    sequence: int
+    job_id: str = field(compare=False)
+    key: str = field(compare=False)
+    run: Callable[[], Awaitable] = field(compare=False)
+    submitted: float = field(compare=False, default_factory=monotonic)
+    started: Optional[float] = field(compare=False, default=None)
+
+
+class ReviewScheduler:
+    """
+    Runs review jobs on the event loop, at most max_concurrent_reviews at once.
+
+    Jobs wait in a queue ordered by submission. Jobs are keyed by the content
+    hash of their inputs, and a submission with the key of a queued or running job returns that
+    job's ID instead of queueing another one.
+    """
+
+    def __init__(
+        self,
+        max_concurrent_reviews: Optional[int] = None,
+        max_queued_reviews: Optional[int] = None,
+    ):
+        if max_concurrent_reviews is None:
+            max_concurrent_reviews = int(os.getenv("APIVIEW_MAX_CONCURRENT_REVIEWS", str(DEFAULT_MAX_CONCURRENT_REVIEWS)))
+        if max_queued_reviews is None:
+            max_queued_reviews = int(os.getenv("APIVIEW_MAX_QUEUED_REVIEWS", str(DEFAULT_MAX_QUEUED_REVIEWS)))
+        if max_concurrent_reviews < 1:
+            raise ValueError("max_concurrent_reviews must be at least 1.")
+        self.max_concurrent_reviews = max_concurrent_reviews
+        self.max_queued_reviews = max_queued_reviews
+        self._queue = []  # heap of queued _Jobs
+        self._jobs: Dict[str, _Job] = {}  # job ID -> queued or running job
+        self._job_ids_by_key: Dict[str, str] = {}
+        self._running = 0
+        self._tasks = set()
+        self._durations = deque(maxlen=_DURATION_HISTORY)
+        self._sequence = itertools.count()
+
+    def find_identical(self, key: str) -> Optional[str]:
+        """
+        Return the ID of the queued or running job with the given key, which a submission with the key
+        collapses onto, or None if there is none.
+        """
+        job_id = self._job_ids_by_key.get(key)
+        if job_id is not None:
+            _deduplicated_counter.add(1)
+        return job_id
+
+    def submit(self, key: str, job_id: str, run: Callable[[], Awaitable]) -> str:
+        """
+        Queue the coroutine function run as the job with the given ID and start it once a slot is free.
+        Must be called on the event loop the jobs run on.
+
+        Returns:
+            str: The ID of the job, which is the ID of the identical queued or running job if there is one.
+
+        Raises:
+            SchedulerFullError: If the queue is full.
+        """
+        existing = self.find_identical(key)
+        if existing is not None:
+            return existing
+        if self.full:
+            raise SchedulerFullError(f"{len(self._queue)} reviews are already waiting. Try again later.")
+        job = _Job(sequence=next(self._sequence), job_id=job_id, key=key, run=run)
+        self._jobs[job_id] = job
+        self._job_ids_by_key[key] = job_id
+        heapq.heappush(self._queue, job)
+        self._dispatch()
+        return job_id
+
+    def _dispatch(self):
+        """Start queued jobs while there are free slots."""
+        while self._queue and self._running < self.max_concurrent_reviews:
+            job = heapq.heappop(self._queue)
+            job.started = monotonic()
+            _queue_wait_histogram.record(job.started - job.submitted)
+            self._running += 1
+            task = asyncio.get_running_loop().create_task(self._run(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, job: _Job):
+        try:
+            await job.run()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Review job %s failed: %s", job.job_id, e, exc_info=True)
+        finally:
+            self._durations.append(monotonic() - job.started)
+            self._running -= 1
+            del self._jobs[job.job_id]
+            del self._job_ids_by_key[job.key]
+            self._dispatch()
+
+    def position(self, job_id: str) -> Optional[int]:
+        """
+        Return the number of queued jobs that will start before the queued job, or None if the
+        job isn't queued.
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.started is not None:
+            return None
+        return sum(1 for other in self._queue if other < job)
+
+    def eta(self, job_id: str) -> Optional[float]:
+        """
+        Estimate the seconds until the queued or running job finishes from the durations of
+        recent reviews. Returns None if the job isn't queued or running, or no review finished yet.
+        """
+        job = self._jobs.get(job_id)
+        if job is None or not self._durations:
+            return None
+        duration = sum(self._durations) / len(self._durations)
+        if job.started is not None:
+            return max(duration - (monotonic() - job.started), 0.0)
+        # The job starts once the jobs ahead of it have filled every slot once more. Assume the
+        # running jobs are half done.
+        waves = self.position(job_id) // self.max_concurrent_reviews
+        return (waves + 0.5) * duration + duration
+
+    @property
+    def full(self) -> bool:
+        """Whether a new job would neither start right away nor fit in the queue."""
+        return self._running >= self.max_concurrent_reviews and len(self._queue) >= self.max_queued_reviews
+
+    @property
+    def queued(self) -> int:
+        """Number of jobs waiting for a slot."""
+        return len(self._queue)
+
+    @property
+    def running(self) -> int:
+        """Number of jobs running."""
+        return self._running
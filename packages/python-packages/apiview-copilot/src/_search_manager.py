@@ -9,8 +9,9 @@ Module for managing search operations in APIView Copilot.
 """
 
 import copy
+import threading
 from collections import deque
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
 from azure.search.documents import SearchClient, SearchItemPaged
 
@@ -25,10 +26,16 @@ from azure.search.documents.models import (
 )
 from src._credential import get_credential
 from src._database_manager import ContainerNames, DatabaseManager
+from src._guideline_snapshot import GuidelineSnapshot, GuidelineSnapshotStore
 from src._models import Example, Guideline, Memory
 from src._settings import SettingsManager
 from src._utils import guideline_id_from_db, guideline_id_to_db
 
+# Maximum number of IDs in one IN query to the database
+_COSMOS_BATCH_SIZE = 50
+
+_KNOWLEDGE_MODELS = {"guidelines": Guideline, "examples": Example, "memories": Memory}
+
 
 class SearchItem:
     """
@@ -215,16 +222,13 @@ class ContextItem:
         self.examples = []
         self.score = score
         self.normalized_score = None  # Will be set after normalization
+        # Examples are shared with the other items and the knowledge graph cache, so they must not be modified.
         for ex_id in getattr(item, "related_examples", []):
-            example = copy.deepcopy(examples.get(ex_id)) if examples else None
+            example = examples.get(ex_id) if examples else None
             if example is not None:
                 # use the example's score if it's higher
                 if hasattr(example, "score") and example.score and (self.score is None or example.score > self.score):
                     self.score = example.score
-                if hasattr(example, "id"):
-                    del example.id
-                if hasattr(example, "guideline_ids"):
-                    del example.guideline_ids
                 self.examples.append(example)
             else:
                 print(f"WARNING: Example {ex_id} not found for guideline {item.id}. Skipping.")
@@ -235,6 +239,17 @@ class ContextItem:
         """
         return guideline_id_from_db(id)
 
+    def to_dict(self) -> dict:
+        """
+        Converts the context item to a dictionary, leaving out the IDs of its examples.
+        """
+        data = dict(self.__dict__)
+        data["examples"] = [
+            {key: value for key, value in vars(example).items() if key not in ("id", "guideline_ids")}
+            for example in self.examples
+        ]
+        return data
+
     def _metadata_markdown(self) -> str:
         """
         Converts the metadata to a markdown string.
@@ -283,6 +298,52 @@ class ContextItem:
         return markdown
 
 
+class _KnowledgeGraphCache:
+    """
+    Search items and database objects of the knowledge graph, by ID, fetched for one review.
+
+    Lookups of cached IDs don't wait for anything. Fetches of missing IDs from the same store are
+    serialized, so that concurrent lookups of the same IDs fetch them only once. IDs that weren't
+    found are cached too.
+    """
+
+    def __init__(self):
+        self._items = {}  # DB-format ID -> SearchItem, or None if the index has no such item
+        self._objects = {kind: {} for kind in _KNOWLEDGE_MODELS}  # kind -> DB-format ID -> model, or None
+        self._items_lock = threading.Lock()
+        self._object_locks = {kind: threading.Lock() for kind in _KNOWLEDGE_MODELS}
+
+    @staticmethod
+    def _fill(cache: dict, lock, keys: List[str], fetch: Callable[[List[str]], list], key_of: Callable[[object], str]):
+        """Fetch the keys missing from the cache and store what was found, or None for what wasn't."""
+        if all(key in cache for key in keys):
+            return
+        with lock:
+            # Another thread may have fetched some of the keys while this one waited.
+            missing = [key for key in keys if key not in cache]
+            if not missing:
+                return
+            found = {key_of(value): value for value in fetch(missing)}
+            for key in missing:
+                cache[key] = found.get(key)
+
+    def search_items(self, ids: List[str], fetch: Callable[[List[str]], List[SearchItem]]) -> List[SearchItem]:
+        """Return the search items with the given IDs, searching only for those not looked up before."""
+        keys = list(dict.fromkeys(guideline_id_to_db(x) for x in ids))
+        self._fill(self._items, self._items_lock, keys, fetch, lambda item: guideline_id_to_db(item.id))
+        return [self._items[key] for key in keys if self._items[key] is not None]
+
+    def objects(self, kind: str, ids: List[str], fetch: Callable[[str, List[str]], list]) -> list:
+        """Return the objects of a kind with the given IDs, fetching only those not looked up before."""
+        to_key = guideline_id_to_db if kind == "guidelines" else str
+        cache = self._objects[kind]
+        keys = list(dict.fromkeys(to_key(x) for x in ids))
+        self._fill(
+            cache, self._object_locks[kind], keys, lambda missing: fetch(kind, missing), lambda obj: to_key(obj.id)
+        )
+        return [cache[key] for key in keys if cache[key] is not None]
+
+
 class SearchManager:
     """Manages search operations using Azure Search."""
 
@@ -292,8 +353,13 @@ class SearchManager:
         language: Optional[str] = None,
         include_general_guidelines: bool = False,
         environment: Optional[str] = None,
+        cache_context: bool = False,
+        use_guideline_snapshot: bool = False,
+        load_language_guidelines: bool = True,
     ):
         self.language = language
+        # Knowledge graph cache, for managers that live as long as one review
+        self._knowledge_graph = _KnowledgeGraphCache() if cache_context else None
         self.filter_expression = None
         if language:
             self.filter_expression = f"language eq '{language}'"
@@ -310,7 +376,16 @@ class SearchManager:
         self.client = SearchClient(
             endpoint=self._search_endpoint, index_name=self._index_name, credential=self._credential
         )
-        self.language_guidelines = self._fetch_language_guidelines(language) if language else None
+        # The language's guidelines come from the process-wide snapshot if requested, and are fetched otherwise.
+        # Managers that only run searches skip them.
+        self.guideline_snapshot: Optional[GuidelineSnapshot] = None
+        self.language_guidelines = None
+        if language and load_language_guidelines:
+            if use_guideline_snapshot:
+                self.guideline_snapshot = get_guideline_snapshots().get(language)
+                self.language_guidelines = self.guideline_snapshot.guidelines
+            else:
+                self.language_guidelines = self._fetch_language_guidelines(language)
 
     def _ensure_language(self):
         if not self.language:
@@ -382,9 +457,18 @@ class SearchManager:
         return self._search(query, filter=self.filter_expression, top=top)
 
     def search_all_by_id(self, ids: List[str]) -> List[SearchItem]:
-        """Searches for items by their IDs in the Azure Search index."""
+        """
+        Searches for items by their IDs in the Azure Search index. With the knowledge graph cache,
+        only IDs that weren't searched for before are sent to the index.
+        """
         if not ids:
             return []
+        if self._knowledge_graph is not None:
+            return self._knowledge_graph.search_items(ids, self._search_by_id)
+        return self._search_by_id(ids)
+
+    def _search_by_id(self, ids: List[str]) -> List[SearchItem]:
+        """Searches the index for the items with the given IDs, in one query."""
         # Convert IDs from web format (with .html#) to search format (with =html=)
         search_ids = [guideline_id_to_db(id) for id in ids]
         escaped = ",".join(id.replace("'", "''") for id in search_ids)
@@ -403,8 +487,16 @@ class SearchManager:
         Given a set of items (guidelines, examples, memories), resolve the knowledge graph by traversing
         all related links (related_examples, related_memories, guideline_ids, memory_ids, etc.) using
         breadth-first traversal. Ensures the final context contains all linked guidelines, examples, and memories.
+        With the knowledge graph cache, objects fetched before are served from memory.
         """
-        database = DatabaseManager.get_instance()
+        # Connect to the database even for an empty context, so that it verifies access.
+        DatabaseManager.get_instance()
+        graph = self._knowledge_graph
+
+        def _graph_fetch(kind, id_list):
+            return graph.objects(kind, id_list, self._fetch_knowledge_objects)
+
+        fetch = self._fetch_knowledge_objects if graph is None else _graph_fetch
 
         # Partition input items by kind using SearchItem attributes.
         # Normalize guideline IDs from DB format to web format so that all
@@ -438,42 +530,14 @@ class SearchManager:
         example_queue = deque(examples.keys())
         memory_queue = deque(memories.keys())
 
-        batch_size = 50
-
-        def batch_query(container, id_list, *, is_guidelines=False):
-            results = []
-            for i in range(0, len(id_list), batch_size):
-                batch = id_list[i : i + batch_size]
-                # Guideline IDs are tracked in web format but stored in DB format in Cosmos
-                query_batch = [guideline_id_to_db(uid) for uid in batch] if is_guidelines else batch
-                placeholders = ",".join([f"@id{i}" for i in range(len(query_batch))])
-                query = f"SELECT * FROM c WHERE c.id IN ({placeholders})"
-                parameters = [{"name": f"@id{i}", "value": value} for i, value in enumerate(query_batch)]
-                results.extend(
-                    list(
-                        container.query_items(
-                            query=query,
-                            parameters=parameters,
-                            enable_cross_partition_query=True,
-                        )
-                    )
-                )
-            # Determine which model to use based on the container
-            if container.container_link.endswith("/guidelines"):
-                return [Guideline.model_validate(r) for r in results]
-            elif container.container_link.endswith("/examples"):
-                return [Example.model_validate(r) for r in results]
-            elif container.container_link.endswith("/memories"):
-                return [Memory.model_validate(r) for r in results]
-            else:
-                return results
+        batch_size = _COSMOS_BATCH_SIZE
 
         # BFT across all three entity types
         while guideline_queue or example_queue or memory_queue:
             # Process guidelines
             if guideline_queue:
                 batch_ids = [guideline_queue.popleft() for _ in range(min(batch_size, len(guideline_queue)))]
-                new_guidelines = batch_query(database.guidelines.client, batch_ids, is_guidelines=True)
+                new_guidelines = fetch("guidelines", batch_ids)
                 for guideline in new_guidelines:
                     gid = guideline.id
                     if gid in seen_guideline_ids:
@@ -492,7 +556,7 @@ class SearchManager:
             # Process examples
             if example_queue:
                 batch_ids = [example_queue.popleft() for _ in range(min(batch_size, len(example_queue)))]
-                new_examples = batch_query(database.examples.client, batch_ids)
+                new_examples = fetch("examples", batch_ids)
                 for example in new_examples:
                     ex_id = example.id
                     if ex_id in seen_example_ids:
@@ -511,7 +575,7 @@ class SearchManager:
             # Process memories
             if memory_queue:
                 batch_ids = [memory_queue.popleft() for _ in range(min(batch_size, len(memory_queue)))]
-                new_memories = batch_query(database.memories.client, batch_ids)
+                new_memories = fetch("memories", batch_ids)
                 for memory in new_memories:
                     mem_id = memory.id
                     if mem_id in seen_memory_ids:
@@ -530,6 +594,34 @@ class SearchManager:
         context = Context(guidelines=guidelines, examples=examples, memories=memories, scores=scores)
         return context
 
+    def _fetch_knowledge_objects(self, kind: str, ids: List[str]) -> list:
+        """
+        Fetch the guidelines, examples or memories (by kind) with the given IDs from the database,
+        in batches of IN queries. Guideline IDs may be given in web format.
+        """
+        container = getattr(DatabaseManager.get_instance(), kind).client
+        model = _KNOWLEDGE_MODELS[kind]
+        results = []
+        for i in range(0, len(ids), _COSMOS_BATCH_SIZE):
+            batch = ids[i : i + _COSMOS_BATCH_SIZE]
+            # Guideline IDs are tracked in web format but stored in DB format in Cosmos
+            query_batch = [guideline_id_to_db(uid) for uid in batch] if kind == "guidelines" else batch
+            placeholders = ",".join([f"@id{i}" for i in range(len(query_batch))])
+            query = f"SELECT * FROM c WHERE c.id IN ({placeholders})"
+            parameters = [{"name": f"@id{i}", "value": value} for i, value in enumerate(query_batch)]
+            results.extend(container.query_items(query=query, parameters=parameters, enable_cross_partition_query=True))
+        return [model.model_validate(r) for r in results]
+
+    def prefetch_context(self, ids: List[str]):
+        """
+        Resolve the knowledge graph of the given guideline, example and memory IDs into the knowledge
+        graph cache, so the context of comments citing any of them is later built from memory.
+        Does nothing without the cache.
+        """
+        if self._knowledge_graph is None or not ids:
+            return
+        self.build_context(self.search_all_by_id(ids))
+
     @classmethod
     def run_indexers(cls, container_names: Optional[List[str]] = None):
         """
@@ -557,3 +649,21 @@ class SearchManager:
             except Exception as e:
                 results[indexer_name] = {"status": "error", "message": str(e)}
         return results
+
+
+def _load_guideline_snapshot(language: str) -> tuple:
+    """Fetch the guidelines of a language and resolve their context, for a guideline snapshot."""
+    search = SearchManager(language=language)
+    guidelines = search.language_guidelines
+    # build_context normalizes the IDs of the items it is given, so resolve copies and keep the
+    # guidelines as the search index returned them, as a freshly fetched result would be.
+    context = search.build_context([copy.copy(x) for x in guidelines.results])
+    return guidelines, context
+
+
+_guideline_snapshots = GuidelineSnapshotStore(_load_guideline_snapshot)
+
+
+def get_guideline_snapshots() -> GuidelineSnapshotStore:
+    """Get the guideline snapshots shared by all reviews of the process."""
+    return _guideline_snapshots
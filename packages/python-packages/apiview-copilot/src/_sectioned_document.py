@@ -11,6 +11,9 @@ Module for sectioning large documents with line numbers.
 import re
 from typing import List, Optional
 
+# A line of an APIView listing: its line number, then an optional diff status, then the line
+_NUMBERED_LINE_PATTERN = re.compile(r"^(\d+): ( |\+|\-)?(.*)$")
+
 
 def _is_decorator_line(line: str) -> bool:
     """Check if a line is a decorator (starts with @ after stripping whitespace)."""
@@ -18,6 +21,20 @@ def _is_decorator_line(line: str) -> bool:
     return stripped.startswith("@")
 
 
+def _decorators_start(line_data: List["LineData"], idx: int, base_indent: int, floor: int) -> int:
+    """
+    Return the index of the first decorator line at base_indent that directly precedes line_data[idx],
+    or idx if there is none. The search does not go back past floor.
+    """
+    while idx > floor:
+        prev_line = line_data[idx - 1]
+        if prev_line.indent == base_indent and _is_decorator_line(prev_line.line):
+            idx -= 1
+        else:
+            break
+    return idx
+
+
 class LineData:
     """Data class representing a line in the document with its metadata."""
 
@@ -33,6 +50,7 @@ class Section:
 
     def __init__(self, lines: List[LineData]):
         self.lines = lines
+        self._positions = None  # line number -> index of its first line, built on first lookup
 
     def start_line_no(self) -> int:
         """Returns the line number of the first line in the section."""
@@ -50,10 +68,12 @@ class Section:
 
     def idx_for_line_no(self, line_no: int) -> int:
         """Returns the index of the line with the given line number."""
-        for i, line in enumerate(self.lines):
-            if line.line_no == line_no:
-                return i
-        return None
+        if self._positions is None:
+            positions = {}
+            for i, line in enumerate(self.lines):
+                positions.setdefault(line.line_no, i)
+            self._positions = positions
+        return self._positions.get(line_no)
 
     def __str__(self):
         return "\n".join([x.line for x in self.lines])
@@ -79,8 +99,7 @@ class SectionedDocument:
             line_data = []
             for line in lines:
                 # Parse the line to get it's line number and diff status
-                pattern = r"^(\d+): ( |\+|\-)?(.*)$"
-                match = re.match(pattern, line)
+                match = _NUMBERED_LINE_PATTERN.match(line)
                 if match:
                     line_no = int(match.group(1))
                     git_status = match.group(2)
@@ -91,54 +110,13 @@ class SectionedDocument:
                 indent = len(line) - len(line.lstrip())
                 line_data.append(LineData(line_no=line_no, indent=indent, line=line, git_status=git_status))
 
-        top_level_lines = [
-            x
-            for x in line_data
-            if x.indent == base_indent
-            and x.line[base_indent:] != ""
-            and x.line[base_indent:] != "}"
-            and not _is_decorator_line(x.line)  # Skip decorators - they'll be grouped with next non-decorator
-        ]
+        initial_sections = self._initial_sections(line_data, base_indent)
 
         # Handle case with no top-level lines
-        if not top_level_lines:
+        if not initial_sections:
             self.sections.append(Section(line_data))
             return
 
-        # Create initial sections based on top-level lines
-        # Each section includes any preceding decorator lines at the same indent level
-        initial_sections = []
-        for i, line1 in enumerate(top_level_lines):
-            line1_idx = line_data.index(line1)
-
-            # Look backward to find any preceding decorator lines that belong to this section
-            section_start_idx = line1_idx
-            while section_start_idx > 0:
-                prev_line = line_data[section_start_idx - 1]
-                # Include preceding decorators at the same indent level
-                if prev_line.indent == base_indent and _is_decorator_line(prev_line.line):
-                    section_start_idx -= 1
-                else:
-                    break
-
-            try:
-                line2 = top_level_lines[i + 1]
-                line2_idx = line_data.index(line2)
-                # Look backward from line2 to find where its decorators start
-                # (so we don't include them in this section)
-                section_end_idx = line2_idx
-                while section_end_idx > line1_idx:
-                    prev_line = line_data[section_end_idx - 1]
-                    if prev_line.indent == base_indent and _is_decorator_line(prev_line.line):
-                        section_end_idx -= 1
-                    else:
-                        break
-                lines_between = line_data[section_start_idx:section_end_idx]
-            except IndexError:
-                # Last section, take all remaining lines
-                lines_between = line_data[section_start_idx:]
-            initial_sections.append(Section(lines_between))
-
         # Step 2: Combine small sections into larger ones up to max_chunk_size
         current_section_lines = []
         current_size = 0
@@ -207,6 +185,36 @@ class SectionedDocument:
         if current_section_lines:
             self.sections.append(Section(current_section_lines))
 
+    @staticmethod
+    def _initial_sections(line_data: List[LineData], base_indent: int) -> List[Section]:
+        """
+        Split the lines into one section per top-level line, in a single pass over the lines.
+        Returns an empty list if there are no top-level lines.
+        """
+        top_level_indices = [
+            idx
+            for idx, x in enumerate(line_data)
+            if x.indent == base_indent
+            and x.line[base_indent:] != ""
+            and x.line[base_indent:] != "}"
+            and not _is_decorator_line(x.line)  # Skip decorators - they'll be grouped with next non-decorator
+        ]
+
+        # Each section includes any preceding decorator lines at the same indent level
+        initial_sections = []
+        for i, line1_idx in enumerate(top_level_indices):
+            section_start_idx = _decorators_start(line_data, line1_idx, base_indent, floor=0)
+            if i + 1 < len(top_level_indices):
+                # End where the decorators of the next top-level line start
+                # (so we don't include them in this section)
+                section_end_idx = _decorators_start(line_data, top_level_indices[i + 1], base_indent, floor=line1_idx)
+                lines_between = line_data[section_start_idx:section_end_idx]
+            else:
+                # Last section, take all remaining lines
+                lines_between = line_data[section_start_idx:]
+            initial_sections.append(Section(lines_between))
+        return initial_sections
+
     def __iter__(self):
         return iter(self.sections)
 
@@ -21,7 +21,7 @@ class SearchTools(Tool):
             query (str): The search query.
             language (str): The programming language to filter results.
         """
-        search = SearchManager(language=language)
+        search = SearchManager(language=language, load_language_guidelines=False)
         results = search.search_guidelines(query)
         context = search.build_context(results.results)
         return context.to_markdown()
@@ -33,7 +33,7 @@ class SearchTools(Tool):
             query (str): The search query.
             language (str): The programming language to filter results.
         """
-        search = SearchManager(language=language)
+        search = SearchManager(language=language, load_language_guidelines=False)
         results = search.search_examples(query)
         context = search.build_context(results.results)
         return context.to_markdown()
@@ -45,7 +45,7 @@ class SearchTools(Tool):
             query (str): The search query.
             language (str): The programming language to filter results.
         """
-        search = SearchManager(language=language)
+        search = SearchManager(language=language, load_language_guidelines=False)
         results = search.search_memories(query)
         context = search.build_context(results.results)
         return context.to_markdown()
@@ -57,7 +57,7 @@ class SearchTools(Tool):
             query (str): The search query.
             language (str): The programming language to filter results.
         """
-        search = SearchManager(language=language)
+        search = SearchManager(language=language, load_language_guidelines=False)
         results = search.search_all(query=query)
         context = search.build_context(results.results)
         return context.to_markdown()
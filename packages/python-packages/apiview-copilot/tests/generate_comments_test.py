@@ -7,11 +7,12 @@
 # pylint: disable=missing-class-docstring,missing-function-docstring,redefined-outer-name,unused-argument,protected-access
 
 """
-Tests for _generate_comments prompt scheduling in ApiViewReview.
+Tests for the section prompt scheduling of the ApiViewReview pipeline.
 """
 
 import json
 import sys
+import threading
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -35,6 +36,7 @@ EMPTY_RESPONSE = json.dumps({"comments": []})
 def review(monkeypatch):
     """Create an ApiViewReview with all external dependencies mocked."""
     mock_search = MagicMock()
+    mock_search.guideline_snapshot = None
     mock_search.language_guidelines = MagicMock(results=[])
     mock_search.search_all.return_value = MagicMock(results=[])
     mock_search.build_context.return_value = MagicMock(to_markdown=lambda: "")
@@ -51,11 +53,11 @@ def review(monkeypatch):
 
 
 class TestGenerateCommentsPromptScheduling:
-    """Verify that _generate_comments submits the correct prompt tasks."""
+    """Verify that the review pipeline submits the correct prompt tasks for each section."""
 
     def test_full_mode_submits_guideline_and_context_only(self, review):
         """With generic review disabled, only guideline and context prompts should run."""
-        review._generate_comments()
+        review._review_comments()
 
         # Collect all prompt filenames that were submitted
         submitted_filenames = [call.kwargs["filename"] for call in review.run_prompt.call_args_list]
@@ -66,7 +68,7 @@ class TestGenerateCommentsPromptScheduling:
 
     def test_full_mode_submits_two_prompts_per_section(self, review):
         """Each section should produce exactly 2 prompt calls (guideline + context)."""
-        review._generate_comments()
+        review._review_comments()
 
         # The small API fits in one section, so we expect exactly 2 calls
         assert review.run_prompt.call_count == 2
@@ -74,6 +76,7 @@ class TestGenerateCommentsPromptScheduling:
     def test_diff_mode_submits_guideline_and_context_only(self, monkeypatch):
         """Diff mode should also submit only guideline and context prompts."""
         mock_search = MagicMock()
+        mock_search.guideline_snapshot = None
         mock_search.language_guidelines = MagicMock(results=[])
         mock_search.search_all.return_value = MagicMock(results=[])
         mock_search.build_context.return_value = MagicMock(to_markdown=lambda: "")
@@ -90,7 +93,7 @@ class TestGenerateCommentsPromptScheduling:
             )
         r.run_prompt = MagicMock(return_value=EMPTY_RESPONSE)
 
-        r._generate_comments()
+        r._review_comments()
 
         submitted_filenames = [call.kwargs["filename"] for call in r.run_prompt.call_args_list]
 
@@ -103,6 +106,7 @@ class TestGenerateCommentsPromptScheduling:
     def test_multiple_sections_submit_two_prompts_each(self, monkeypatch):
         """Multiple sections should each get exactly 2 prompts."""
         mock_search = MagicMock()
+        mock_search.guideline_snapshot = None
         mock_search.language_guidelines = MagicMock(results=[])
         mock_search.search_all.return_value = MagicMock(results=[])
         mock_search.build_context.return_value = MagicMock(to_markdown=lambda: "")
@@ -122,8 +126,80 @@ class TestGenerateCommentsPromptScheduling:
             r = ApiViewReview(target=large_api, base=None, language="python")
         r.run_prompt = MagicMock(return_value=EMPTY_RESPONSE)
 
-        r._generate_comments()
+        r._review_comments()
 
         # Should have submitted 2 prompts for each section
         assert r._chunk_count > 1
         assert r.run_prompt.call_count == r._chunk_count * 2
+
+
+def _multi_section_review():
+    """Create an ApiViewReview over an API surface that produces several sections."""
+    mock_search = MagicMock()
+    mock_search.guideline_snapshot = None
+    mock_search.language_guidelines = MagicMock(results=[])
+    mock_search.search_all.return_value = MagicMock(results=[])
+    mock_search.build_context.return_value = MagicMock(to_markdown=lambda: "")
+
+    lines = ["namespace Foo {"]
+    for i in range(1200):
+        lines.append(f"  void method_{i}();")
+    lines.append("}")
+
+    with patch("src._apiview_reviewer.SearchManager", return_value=mock_search), patch(
+        "src._apiview_reviewer.SettingsManager", return_value=MagicMock()
+    ):
+        r = ApiViewReview(target="\\n".join(lines), base=None, language="python")
+    r.run_prompt = MagicMock(return_value=EMPTY_RESPONSE)
+    return r
+
+
+class TestGenerateCommentsContextRetrieval:
+    """Verify that context retrieval is pipelined with the context prompts."""
+
+    def test_retrievals_run_concurrently(self):
+        r = _multi_section_review()
+        section_count = len(list(r._create_sectioned_document()))
+        assert section_count > 2
+        # Every retrieval waits until all of them are in flight; serial retrieval would time out.
+        barrier = threading.Barrier(section_count, timeout=10)
+
+        def search_all(query):
+            barrier.wait()
+            return MagicMock(results=[])
+
+        r.search.search_all.side_effect = search_all
+        r._review_comments()
+
+        assert not barrier.broken
+        assert r.run_prompt.call_count == section_count * 2
+
+    def test_context_prompt_submitted_when_its_retrieval_finishes(self):
+        r = _multi_section_review()
+        sections = list(r._create_sectioned_document())
+        later_prompt_started = threading.Event()
+
+        def search_all(query):
+            if query == str(sections[0]):
+                # The first retrieval is slow; prompts of the other sections must not wait for it.
+                assert later_prompt_started.wait(timeout=10)
+            return MagicMock(results=[])
+
+        def run_prompt(**kwargs):
+            if kwargs["filename"] == "context_review.prompty" and kwargs["inputs"]["content"] != sections[0].numbered():
+                later_prompt_started.set()
+            return EMPTY_RESPONSE
+
+        r.search.search_all.side_effect = search_all
+        r.run_prompt = MagicMock(side_effect=run_prompt)
+        r._review_comments()
+
+        assert later_prompt_started.is_set()
+        assert r.run_prompt.call_count == len(sections) * 2
+
+    def test_records_stage_durations(self, review):
+        with patch("src._apiview_reviewer._review_stage_duration_histogram") as histogram:
+            review._review_comments()
+
+        stages = [call.kwargs["attributes"]["review.stage"] for call in histogram.record.call_args_list]
+        assert sorted(stages) == ["context_prompt", "context_retrieval", "guideline_prompt"]
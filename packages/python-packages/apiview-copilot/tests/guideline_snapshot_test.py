@@ -0,0 +1,115 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,protected-access
+
+"""
+Tests for the process-wide guideline snapshots in _guideline_snapshot.py.
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src._guideline_snapshot import GuidelineSnapshotStore
+
+
+class _Loader:
+    """Loads a snapshot whose context is the current content, counting the loads."""
+
+    def __init__(self, content="Use snake_case.", delay=0.0):
+        self.content = content
+        self.delay = delay
+        self.error = None
+        self.calls = 0
+
+    def __call__(self, language):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        content = self.content
+        return [SimpleNamespace(id=f"{language}_design=html=naming")], SimpleNamespace(to_markdown=lambda: content)
+
+
+def _wait_for_refresh(store, language="python"):
+    deadline = time.monotonic() + 5
+    while language in store._refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class TestGuidelineSnapshotStore:
+    def test_concurrent_lookups_load_once(self):
+        loader = _Loader(delay=0.1)
+        store = GuidelineSnapshotStore(loader)
+        snapshots = []
+        threads = [threading.Thread(target=lambda: snapshots.append(store.get("python"))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert loader.calls == 1
+        assert all(snapshot is snapshots[0] for snapshot in snapshots)
+        assert store.get("java").language == "java"
+        assert loader.calls == 2
+
+    def test_due_snapshot_is_returned_and_refreshed_in_the_background(self):
+        loader = _Loader(delay=0.1)
+        store = GuidelineSnapshotStore(loader, refresh_seconds=0)
+        first = store.get("python")
+
+        start = time.monotonic()
+        assert store.get("python") is first
+        assert time.monotonic() - start < 0.05
+        _wait_for_refresh(store)
+
+        # The content didn't change, so the snapshot keeps its version and context.
+        refreshed = store.get("python")
+        assert loader.calls >= 2
+        assert refreshed.version == first.version
+        assert refreshed.context is first.context
+        assert refreshed.loaded_at > first.loaded_at
+
+        _wait_for_refresh(store)
+        loader.content = "Use camelCase."
+        store.get("python")
+        _wait_for_refresh(store)
+        assert store.get("python").version != first.version
+
+    def test_failed_refresh_keeps_the_snapshot(self):
+        loader = _Loader()
+        store = GuidelineSnapshotStore(loader, refresh_seconds=0)
+        first = store.get("python")
+        loader.error = RuntimeError("search is down")
+
+        assert store.get("python") is first
+        _wait_for_refresh(store)
+        assert store.get("python") is first
+
+    def test_stale_snapshot_is_never_returned(self):
+        loader = _Loader()
+        store = GuidelineSnapshotStore(loader, max_staleness_seconds=0)
+        store.get("python")
+        loader.error = RuntimeError("search is down")
+
+        with pytest.raises(RuntimeError):
+            store.get("python")
+
+        loader.error = None
+        loader.content = "Use camelCase."
+        assert "camelCase" in store.get("python").context.to_markdown()
+
+    def test_records_snapshot_age(self):
+        store = GuidelineSnapshotStore(_Loader())
+        with patch("src._guideline_snapshot._snapshot_age_histogram") as age:
+            store.get("python")
+
+        assert age.record.call_args.kwargs["attributes"] == {"review.language": "python"}
+        assert 0 <= age.record.call_args.args[0] < 1
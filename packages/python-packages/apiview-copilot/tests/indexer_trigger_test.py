@@ -0,0 +1,182 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,protected-access
+
+"""
+Tests for the coalesced indexer runs in _indexer_trigger.py.
+"""
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src._indexer_trigger import IndexerTrigger
+
+
+class _IndexerClient:
+    """Fake SearchIndexerClient whose indexers finish a run by the next status poll."""
+
+    def __init__(self, running_polls=0):
+        self.runs = []
+        self.polled = []
+        self.running_polls = running_polls  # polls that report the indexer as still running
+        self.last_result = SimpleNamespace(status="success", start_time=0, error_message=None)
+
+    def get_indexer_status(self, name):
+        self.polled.append(name)
+        if self.running_polls:
+            self.running_polls -= 1
+            return SimpleNamespace(status="running", last_result=SimpleNamespace(status="inProgress", start_time=0))
+        return SimpleNamespace(status="running", last_result=self.last_result)
+
+    def run_indexer(self, name):
+        self.runs.append(name)
+        self.last_result = SimpleNamespace(status="success", start_time=len(self.runs), error_message=None)
+
+
+def _trigger(client, debounce_seconds=0.05):
+    trigger = IndexerTrigger(debounce_seconds=debounce_seconds)
+    trigger._clients[None] = client
+    return trigger
+
+
+class TestIndexerTrigger:
+    def test_requests_within_the_window_share_one_run(self):
+        client = _IndexerClient()
+        trigger = _trigger(client)
+        with patch("src._indexer_trigger._coalesced_counter") as coalesced, patch(
+            "src._indexer_trigger._triggered_counter"
+        ) as triggered:
+            runs = [trigger.request("memories-indexer") for _ in range(5)]
+            other = trigger.request("examples-indexer")
+            assert all(run is runs[0] for run in runs)
+            assert runs[0].wait(timeout=5) and other.wait(timeout=5)
+
+        assert sorted(client.runs) == ["examples-indexer", "memories-indexer"]
+        assert coalesced.add.call_count == 4
+        assert triggered.add.call_count == 2
+        assert triggered.add.call_args_list[0].kwargs["attributes"]["indexer.name"] in client.runs
+
+    def test_request_after_the_run_started_gets_a_new_run(self):
+        client = _IndexerClient()
+        trigger = _trigger(client)
+        first = trigger.request("memories-indexer")
+        assert first.wait(timeout=5)
+        second = trigger.request("memories-indexer")
+        assert second is not first
+        assert second.wait(timeout=5)
+        assert client.runs == ["memories-indexer", "memories-indexer"]
+
+    def test_run_waits_for_a_running_indexer(self):
+        client = _IndexerClient(running_polls=2)
+        trigger = _trigger(client)
+        with patch("src._indexer_trigger.BUSY_RETRY_SECONDS", 0.01):
+            run = trigger.request("memories-indexer")
+            assert run.wait(timeout=5)
+        assert client.runs == ["memories-indexer"]
+        assert client.polled == ["memories-indexer"] * 3
+
+    def test_container_runs_its_own_indexer(self):
+        from src._database_manager import BasicContainer  # pylint: disable=import-outside-toplevel
+
+        client = _IndexerClient()
+        manager = SimpleNamespace(database=MagicMock(), environment=None)
+        with patch("src._database_manager.get_indexer_trigger", return_value=_trigger(client)):
+            run = BasicContainer(manager, "memories").run_indexer()
+        assert run.wait_indexed(timeout=5, poll_seconds=0.01)
+        assert client.runs == ["memories-indexer"]
+        assert client.polled and set(client.polled) == {"memories-indexer"}
+
+    def test_wait_indexed(self):
+        client = _IndexerClient()
+        trigger = _trigger(client)
+        run = trigger.request("memories-indexer")
+        assert run.wait_indexed(timeout=5, poll_seconds=0.01)
+
+        client.run_indexer = lambda name: setattr(
+            client, "last_result", SimpleNamespace(status="transientFailure", start_time=9, error_message="boom")
+        )
+        with pytest.raises(RuntimeError, match="boom"):
+            trigger.request("memories-indexer").wait_indexed(timeout=5, poll_seconds=0.01)
+
+    def test_failed_run_reports_its_error(self):
+        client = _IndexerClient()
+
+        def fail(name):
+            raise RuntimeError("forbidden")
+
+        client.run_indexer = fail
+        run = _trigger(client).request("memories-indexer")
+        with pytest.raises(RuntimeError, match="forbidden"):
+            run.wait(timeout=5)
+
+    def test_flush_starts_pending_runs(self):
+        client = _IndexerClient()
+        trigger = _trigger(client, debounce_seconds=60)
+        run = trigger.request("memories-indexer")
+        assert not run.wait(timeout=0.05)
+        trigger.flush()
+        assert run.wait(timeout=0)
+        assert client.runs == ["memories-indexer"]
+
+    def test_flush_does_not_start_a_run_the_worker_claimed(self):
+        client = _IndexerClient()
+        trigger = _trigger(client, debounce_seconds=0)
+        started = threading.Event()
+        release = threading.Event()
+        get_status = client.get_indexer_status
+
+        def slow_status(name):
+            started.set()
+            release.wait(5)
+            return get_status(name)
+
+        client.get_indexer_status = slow_status
+        run = trigger.request("memories-indexer")
+        assert started.wait(5)
+        trigger.flush()
+        release.set()
+
+        assert run.wait(timeout=5)
+        assert client.runs == ["memories-indexer"]
+
+    def test_request_while_claimed_joins_the_requeued_run(self):
+        client = _IndexerClient(running_polls=1)
+        trigger = _trigger(client, debounce_seconds=0)
+        get_status = client.get_indexer_status
+        second = []
+
+        def status_with_request(name):
+            if not second:
+                second.append(trigger.request(name))
+            return get_status(name)
+
+        client.get_indexer_status = status_with_request
+        with patch("src._indexer_trigger.BUSY_RETRY_SECONDS", 0.01):
+            first = trigger.request("memories-indexer")
+            assert first.wait(timeout=5) and second[0].wait(timeout=5)
+
+        assert client.runs == ["memories-indexer"]
+
+
+def test_cli_reports_indexer_runs_that_failed_to_start(capsys):
+    import cli  # pylint: disable=import-outside-toplevel
+
+    failed = SimpleNamespace(wait=lambda: (_ for _ in ()).throw(RuntimeError("forbidden")))
+    started = SimpleNamespace(wait=lambda: True)
+    cli._try_run_indexers(
+        [
+            ("memory", SimpleNamespace(run_indexer=lambda: failed)),
+            ("example", SimpleNamespace(run_indexer=lambda: started)),
+        ]
+    )
+
+    output = capsys.readouterr().out
+    assert "Failed to trigger indexer for memory: forbidden" in output
+    assert "example" not in output
@@ -7,14 +7,35 @@
 # pylint: disable=missing-class-docstring,missing-function-docstring
 
 """
-Tests for _render_template and _parse_prompty in _prompt_runner.py.
+Tests for _render_template, _parse_prompty, the prompt, client and response caches and the
+async prompt execution path in _prompt_runner.py.
 """
 
+import asyncio
 import json
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from src._prompt_runner import _render_template, _parse_prompty, _resolve_env_vars, _load_file_reference
+from src._prompt_runner import (
+    MAX_CONCURRENT_PROMPTS,
+    _Completion,
+    _compile_template,
+    _execute_prompt_template,
+    _execute_prompt_template_async,
+    _get_async_client,
+    _get_client,
+    _get_prompty,
+    _load_file_reference,
+    _parse_prompty,
+    _render_template,
+    _resolve_env_vars,
+    clear_prompt_caches,
+    run_prompt_async,
+)
+from src._response_cache import DEFAULT_TTL_SECONDS
 
 
 class TestRenderTemplate:
@@ -233,3 +254,220 @@ class TestParsePrompty:
         assert "response_format" not in config.parameters
         assert config.parameters == {"frequency_penalty": 0, "max_completion_tokens": 8000}
         assert config.response_format == {"type": "json_object"}
+
+
+def _write_prompty(path, user_template="Hello {{ name }}", response_format=None, cache=None):
+    content = "---\nname: Cached\n"
+    if cache:
+        content += f"cache: {cache}\n"
+    content += "model:\n  api: chat\n"
+    if response_format:
+        content += f"  parameters:\n    response_format: {response_format}\n"
+    content += f"---\nsystem:\nYou are a helpful assistant.\n\nuser:\n{user_template}\n"
+    path.write_text(content, encoding="utf-8")
+    # Give each write a distinct modification time, however coarse the file system's clock.
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def clean_caches():
+    clear_prompt_caches()
+    yield
+    clear_prompt_caches()
+
+
+@pytest.mark.usefixtures("clean_caches")
+class TestPromptRegistry:
+    def test_reuses_parsed_prompty(self, tmp_path):
+        prompty_file = tmp_path / "test.prompty"
+        _write_prompty(prompty_file)
+        with patch("src._prompt_runner._parse_prompty", wraps=_parse_prompty) as parse:
+            first = _get_prompty(prompty_file)
+            second = _get_prompty(str(prompty_file))
+        assert first is second
+        assert parse.call_count == 1
+
+    def test_reparses_modified_prompty(self, tmp_path):
+        prompty_file = tmp_path / "test.prompty"
+        _write_prompty(prompty_file)
+        assert _get_prompty(prompty_file).user_template == "Hello {{ name }}"
+        _write_prompty(prompty_file, user_template="Goodbye {{ name }}")
+        assert _get_prompty(prompty_file).user_template == "Goodbye {{ name }}"
+
+    def test_reparses_when_referenced_schema_changes(self, tmp_path):
+        schema_file = tmp_path / "schema.json"
+        schema_file.write_text(json.dumps({"type": "json_object"}), encoding="utf-8")
+        prompty_file = tmp_path / "test.prompty"
+        _write_prompty(prompty_file, response_format="${file:schema.json}")
+        assert _get_prompty(prompty_file).response_format == {"type": "json_object"}
+
+        schema_file.write_text(json.dumps({"type": "text"}), encoding="utf-8")
+        stat = os.stat(schema_file)
+        os.utime(schema_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+        assert _get_prompty(prompty_file).response_format == {"type": "text"}
+
+    def test_compiles_each_template_once(self):
+        assert _render_template("Hello {{ name }}", {"name": "A"}) == "Hello A"
+        assert _render_template("Hello {{ name }}", {"name": "B"}) == "Hello B"
+        info = _compile_template.cache_info()
+        assert (info.misses, info.hits) == (1, 1)
+
+
+@pytest.mark.usefixtures("clean_caches")
+class TestClientPool:
+    @pytest.fixture
+    def client_class(self):
+        with patch("azure.ai.inference.ChatCompletionsClient", side_effect=lambda **kwargs: MagicMock()) as cls, patch(
+            "src._prompt_runner._create_transport"
+        ), patch("src._credential.get_credential", return_value=MagicMock()):
+            yield cls
+
+    def test_reuses_client_per_endpoint_and_key(self, client_class):
+        client = _get_client("https://a.example.com/models", "key-1")
+        assert _get_client("https://a.example.com/models", "key-1") is client
+        assert _get_client("https://a.example.com/models", "key-2") is not client
+        assert _get_client("https://b.example.com/models", "key-1") is not client
+        assert client_class.call_count == 3
+
+    def test_reuses_client_for_shared_credential(self, client_class):
+        client = _get_client("https://a.example.com/models")
+        assert _get_client("https://a.example.com/models") is client
+        assert client_class.call_count == 1
+        assert client_class.call_args.kwargs["credential_scopes"] == ["https://cognitiveservices.azure.com/.default"]
+
+    @pytest.mark.usefixtures("client_class")
+    def test_clear_closes_clients(self):
+        client = _get_client("https://a.example.com/models", "key-1")
+        clear_prompt_caches()
+        client.close.assert_called_once()
+        assert _get_client("https://a.example.com/models", "key-1") is not client
+
+
+@pytest.mark.usefixtures("clean_caches")
+class TestAsyncPromptExecution:
+    @pytest.fixture
+    def client_class(self):
+        # Other test modules replace azure.ai.inference with a mock, so the aio module is patched in directly.
+        cls = MagicMock(side_effect=lambda **kwargs: MagicMock())
+        with patch.dict(sys.modules, {"azure.ai.inference.aio": MagicMock(ChatCompletionsClient=cls)}), patch(
+            "src._credential.get_async_credential", return_value=MagicMock()
+        ):
+            yield cls
+
+    def test_reuses_async_client_per_event_loop(self, client_class):
+        async def get_clients():
+            return _get_async_client("https://a.example.com/models"), _get_async_client("https://a.example.com/models")
+
+        first, same = asyncio.run(get_clients())
+        other_loop, _ = asyncio.run(get_clients())
+        assert first is same
+        assert other_loop is not first
+        assert client_class.call_args.kwargs["credential_scopes"] == ["https://cognitiveservices.azure.com/.default"]
+
+    def test_run_prompt_async_limits_prompts_in_flight(self, client_class):
+        in_flight = []
+        peak = []
+
+        async def complete(**kwargs):
+            in_flight.append(None)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+            response = MagicMock()
+            response.choices[0].message.content = json.dumps({"model": kwargs["model"]})
+            return response
+
+        client_class.side_effect = lambda **kwargs: MagicMock(complete=AsyncMock(side_effect=complete))
+        prompt_count = MAX_CONCURRENT_PROMPTS + 8
+
+        async def main():
+            return await asyncio.gather(
+                *(
+                    run_prompt_async("api_review", "judge_comment_confidence.prompty", {"index": i})
+                    for i in range(prompt_count)
+                )
+            )
+
+        with patch(
+            "src._prompt_runner._prepare_completion",
+            return_value=_Completion("judge", "https://a.example.com/models", {"model": "gpt"}, 10),
+        ), patch("src._credential.in_ci", return_value=False):
+            results = asyncio.run(main())
+
+        assert results == [json.dumps({"model": "gpt"})] * prompt_count
+        assert max(peak) == MAX_CONCURRENT_PROMPTS
+        assert client_class.call_count == 1
+
+
+@pytest.mark.usefixtures("clean_caches")
+class TestResponseCaching:
+    @pytest.fixture
+    def complete(self):
+        responses = iter(json.dumps({"response": i}) for i in range(100))
+
+        def make_response(**_kwargs):
+            response = MagicMock()
+            response.choices[0].message.content = next(responses)
+            response.usage.total_tokens = 42
+            return response
+
+        settings = MagicMock()
+        settings.get.return_value = "https://a.example.com"
+        complete = MagicMock(side_effect=make_response)
+        with patch("src._settings.SettingsManager", return_value=settings), patch(
+            "src._prompt_runner._get_client", return_value=MagicMock(complete=complete)
+        ):
+            yield complete
+
+    def test_parses_cache_opt_in(self, tmp_path):
+        prompty_file = tmp_path / "test.prompty"
+        _write_prompty(prompty_file)
+        assert _parse_prompty(prompty_file).cache_ttl is None
+        _write_prompty(prompty_file, cache="true")
+        assert _parse_prompty(prompty_file).cache_ttl == DEFAULT_TTL_SECONDS
+        _write_prompty(prompty_file, cache="{ttl: 60}")
+        assert _parse_prompty(prompty_file).cache_ttl == 60
+
+    def test_identical_requests_are_served_from_the_cache(self, tmp_path, complete):
+        prompty_file = tmp_path / "test.prompty"
+        _write_prompty(prompty_file, cache="true")
+
+        first = _execute_prompt_template(prompty_file, inputs={"name": "World"})
+        assert _execute_prompt_template(prompty_file, inputs={"name": "World"}) == first
+        assert complete.call_count == 1
+
+        assert _execute_prompt_template(prompty_file, inputs={"name": "There"}) != first
+        assert complete.call_count == 2
+
+    @pytest.mark.usefixtures("complete")
+    def test_editing_the_prompt_invalidates_its_responses(self, tmp_path):
+        prompty_file = tmp_path / "test.prompty"
+        _write_prompty(prompty_file, cache="true")
+        first = _execute_prompt_template(prompty_file, inputs={"name": "World"})
+        _write_prompty(prompty_file, user_template="Hello  {{ name }}", cache="true")
+        assert _execute_prompt_template(prompty_file, inputs={"name": "World"}) != first
+
+    def test_prompts_without_opt_in_are_not_cached(self, tmp_path, complete):
+        prompty_file = tmp_path / "test.prompty"
+        _write_prompty(prompty_file)
+        _execute_prompt_template(prompty_file)
+        _execute_prompt_template(prompty_file)
+        assert complete.call_count == 2
+
+    def test_invalid_json_is_not_cached(self, tmp_path, complete):
+        prompty_file = tmp_path / "test.prompty"
+        _write_prompty(prompty_file, response_format="json_object", cache="true")
+        complete.side_effect = lambda **kwargs: MagicMock(choices=[MagicMock(message=MagicMock(content="not json"))])
+        _execute_prompt_template(prompty_file)
+        _execute_prompt_template(prompty_file)
+        assert complete.call_count == 2
+
+    @pytest.mark.usefixtures("complete")
+    def test_async_execution_shares_the_cache(self, tmp_path):
+        prompty_file = tmp_path / "test.prompty"
+        _write_prompty(prompty_file, cache="true")
+        first = _execute_prompt_template(prompty_file)
+        with patch("src._prompt_runner._get_async_client") as get_async_client:
+            assert asyncio.run(_execute_prompt_template_async(prompty_file)) == first
+        get_async_client.assert_not_called()
@@ -0,0 +1,152 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,protected-access
+
+"""
+Tests for the adaptive rate limiter in _rate_limiter.py.
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src._rate_limiter import DEFAULT_PAUSE_SECONDS, Priority, RateLimiter, estimate_tokens, llm_priority
+
+
+def _response(status_code=200, **headers):
+    return MagicMock(http_response=MagicMock(status_code=status_code, headers=headers))
+
+
+def _drained(tokens_per_minute=600):
+    limiter = RateLimiter(tokens_per_minute=tokens_per_minute)
+    limiter.acquire("gpt", tokens_per_minute)
+    return limiter
+
+
+class TestRateLimiter:
+    def test_estimate_tokens(self):
+        assert estimate_tokens("a" * 400, "b" * 400) == 201
+
+    def test_grants_available_tokens_without_waiting(self):
+        limiter = RateLimiter(tokens_per_minute=1000)
+        start = time.monotonic()
+        limiter.acquire("gpt", 600)
+        limiter.acquire("other", 1000)
+        assert time.monotonic() - start < 0.1
+
+    def test_waits_for_the_bucket_to_refill(self):
+        # 6000 tokens per minute refill 100 tokens per second.
+        limiter = _drained(tokens_per_minute=6000)
+        start = time.monotonic()
+        limiter.acquire("gpt", 20)
+        assert 0.15 < time.monotonic() - start < 1
+
+    def test_interactive_calls_go_before_waiting_background_calls(self):
+        # 600 tokens per minute refill 10 tokens per second, so each call waits half a second.
+        limiter = _drained()
+        finished = []
+
+        def call(priority):
+            # The priority of the context applies to calls without an explicit one.
+            with llm_priority(priority):
+                limiter.acquire("gpt", 5)
+            finished.append(priority)
+
+        background = threading.Thread(target=call, args=(Priority.BACKGROUND,))
+        background.start()
+        while not limiter.queue_depth("gpt"):
+            time.sleep(0.01)
+        interactive = threading.Thread(target=call, args=(Priority.INTERACTIVE,))
+        interactive.start()
+        interactive.join(timeout=5)
+        background.join(timeout=5)
+
+        assert finished == [Priority.INTERACTIVE, Priority.BACKGROUND]
+
+    def test_throttling_pauses_and_backs_off(self):
+        limiter = RateLimiter(tokens_per_minute=1000)
+        reservation = limiter.acquire("gpt", 10)
+        reservation.observe(_response(429, **{"retry-after-ms": "300"}))
+
+        bucket = limiter._buckets["gpt"]
+        assert bucket.capacity == 500
+        start = time.monotonic()
+        limiter.acquire("gpt", 10)
+        assert 0.25 < time.monotonic() - start < 1
+
+        reservation.observe(_response(200))
+        assert bucket.capacity == 520
+
+    def test_throttling_without_retry_after_pauses_for_the_default(self):
+        limiter = RateLimiter(tokens_per_minute=1000)
+        limiter.adapt("gpt", 429, {})
+        bucket = limiter._buckets["gpt"]
+        assert bucket.paused_until - time.monotonic() == pytest.approx(DEFAULT_PAUSE_SECONDS, abs=0.1)
+
+    def test_remaining_headers_cap_the_bucket(self):
+        limiter = RateLimiter(tokens_per_minute=60000)
+        limiter.adapt("gpt", 200, {"x-ratelimit-remaining-tokens": "50"})
+        assert limiter._buckets["gpt"].tokens <= 51
+
+        limiter.adapt("gpt", 200, {"x-ratelimit-remaining-requests": "0"})
+        assert limiter._buckets["gpt"].paused_until > time.monotonic()
+
+    def test_settle_corrects_the_reservation(self):
+        limiter = RateLimiter(tokens_per_minute=1000)
+        limiter.acquire("gpt", 900).settle(100)
+        assert limiter._buckets["gpt"].tokens >= 900
+
+        limiter.acquire("gpt", 100).settle(None)
+        assert limiter._buckets["gpt"].tokens < 900
+
+    def test_records_queue_depth_and_wait_time(self):
+        limiter = RateLimiter(tokens_per_minute=1000)
+        with patch("src._rate_limiter._queue_depth_counter") as depth, patch(
+            "src._rate_limiter._wait_time_histogram"
+        ) as wait_time:
+            limiter.acquire("gpt", 10)
+
+        attributes = {"llm.deployment": "gpt", "llm.priority": "background"}
+        assert [call.args[0] for call in depth.add.call_args_list] == [1, -1]
+        assert depth.add.call_args.kwargs["attributes"] == attributes
+        assert wait_time.record.call_args.kwargs["attributes"] == attributes
+
+
+class TestRateLimiterAsync:
+    def test_async_calls_wait_in_priority_order(self):
+        limiter = _drained()
+
+        async def main():
+            finished = []
+
+            async def call(priority):
+                await limiter.acquire_async("gpt", 5, priority=priority)
+                finished.append(priority)
+
+            background = asyncio.create_task(call(Priority.BACKGROUND))
+            await asyncio.sleep(0.05)
+            await asyncio.gather(call(Priority.INTERACTIVE), background)
+            return finished
+
+        assert asyncio.run(main()) == [Priority.INTERACTIVE, Priority.BACKGROUND]
+
+    def test_cancelled_call_leaves_the_queue(self):
+        limiter = _drained()
+
+        async def main():
+            waiter = asyncio.create_task(limiter.acquire_async("gpt", 100))
+            await asyncio.sleep(0.05)
+            assert limiter.queue_depth("gpt") == 1
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+
+        asyncio.run(main())
+        assert limiter.queue_depth("gpt") == 0
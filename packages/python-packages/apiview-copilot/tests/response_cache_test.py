@@ -0,0 +1,91 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,protected-access
+
+"""
+Tests for the LLM response cache in _response_cache.py.
+"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import src._response_cache as response_cache_module
+from src._response_cache import CachedResponse, ResponseCache, SqliteCacheBackend, response_cache_key
+
+
+class TestResponseCacheKey:
+    def test_key_depends_on_source_parameters_and_messages(self):
+        key = response_cache_key("abc", {"model": "gpt"}, "system", "user")
+        assert key == response_cache_key("abc", {"model": "gpt"}, "system", "user")
+        assert key != response_cache_key("abd", {"model": "gpt"}, "system", "user")
+        assert key != response_cache_key("abc", {"model": "gpt-mini"}, "system", "user")
+        assert key != response_cache_key("abc", {"model": "gpt"}, "system", "user!")
+
+
+class TestResponseCache:
+    def test_returns_cached_responses_until_they_expire(self):
+        cache = ResponseCache()
+        cache.set("a", CachedResponse("first"), ttl=0.1)
+        assert cache.get("a").content == "first"
+        time.sleep(0.15)
+        assert cache.get("a") is None
+
+    def test_evicts_least_recently_used_responses(self):
+        cache = ResponseCache(max_entries=2)
+        cache.set("a", CachedResponse("a"))
+        cache.set("b", CachedResponse("b"))
+        cache.get("a")
+        cache.set("c", CachedResponse("c"))
+        assert cache.get("b") is None
+        assert cache.get("a").content == "a"
+        assert cache.get("c").content == "c"
+
+    def test_persists_responses_in_sqlite(self, tmp_path):
+        path = str(tmp_path / "cache" / "responses.sqlite")
+        ResponseCache(backend=SqliteCacheBackend(path)).set("a", CachedResponse("first", tokens=10, latency=2.5))
+        ResponseCache(backend=SqliteCacheBackend(path)).set("expired", CachedResponse("old"), ttl=-1)
+
+        cache = ResponseCache(backend=SqliteCacheBackend(path))
+        assert cache.get("a") == CachedResponse("first", tokens=10, latency=2.5)
+        assert cache.get("expired") is None
+
+    def test_backend_errors_are_misses(self):
+        backend = MagicMock()
+        backend.get.side_effect = OSError("disk full")
+        backend.set.side_effect = OSError("disk full")
+        cache = ResponseCache(backend=backend)
+        cache.set("a", CachedResponse("first"))
+        cache.clear()
+        assert cache.get("a") is None
+
+    def test_records_hits_and_saved_tokens_and_time(self):
+        cache = ResponseCache()
+        cache.set("a", CachedResponse("first", tokens=10, latency=2.5))
+        with patch("src._response_cache._lookup_counter") as lookups, patch(
+            "src._response_cache._saved_tokens_counter"
+        ) as saved_tokens, patch("src._response_cache._saved_time_counter") as saved_time:
+            cache.get("a", prompt="merge_comments")
+            cache.get("b", prompt="merge_comments")
+
+        assert [call.kwargs["attributes"]["cache.result"] for call in lookups.add.call_args_list] == ["hit", "miss"]
+        saved_tokens.add.assert_called_once_with(10, attributes={"prompt.name": "merge_comments"})
+        saved_time.add.assert_called_once_with(2.5, attributes={"prompt.name": "merge_comments"})
+
+
+def test_section_results_have_a_cache_of_their_own(monkeypatch):
+    monkeypatch.delenv("APIVIEW_PROMPT_CACHE_PATH", raising=False)
+    monkeypatch.setenv("APIVIEW_SECTION_CACHE_MAX_ENTRIES", "2")
+    monkeypatch.setattr(response_cache_module, "_response_cache", None)
+    monkeypatch.setattr(response_cache_module, "_section_result_cache", None)
+
+    sections = response_cache_module.get_section_result_cache()
+    sections.set("section", CachedResponse("result"))
+    response_cache_module.get_response_cache().clear()
+
+    assert sections is not response_cache_module.get_response_cache()
+    assert sections.max_entries == 2
+    assert sections.get("section").content == "result"
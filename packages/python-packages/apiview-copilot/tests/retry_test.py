@@ -0,0 +1,102 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,redefined-outer-name,unused-argument
+
+"""
+Tests for retry_with_backoff_async in _retry.py.
+"""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src._retry import TimeoutException, _before_retry, retry_with_backoff_async
+
+
+@pytest.fixture(autouse=True)
+def no_backoff():
+    # Report retries as usual, but don't wait before them.
+    with patch("src._retry._before_retry", side_effect=lambda *args: _before_retry(*args) * 0):
+        yield
+
+
+def _flaky(failures, result="ok", delay=0):
+    calls = []
+
+    async def func():
+        calls.append(None)
+        await asyncio.sleep(delay)
+        if len(calls) <= len(failures):
+            raise failures[len(calls) - 1]
+        return result
+
+    return func, calls
+
+
+class TestRetryWithBackoffAsync:
+    def test_retries_until_success(self):
+        func, calls = _flaky([ConnectionError("reset"), ConnectionError("reset")])
+        on_retry = MagicMock()
+
+        assert asyncio.run(retry_with_backoff_async(func, on_retry=on_retry)) == "ok"
+        assert len(calls) == 3
+        assert on_retry.call_count == 2
+
+    def test_timeout_is_retried_then_fails(self):
+        func, calls = _flaky([], delay=10)
+        on_failure = MagicMock(return_value="failed")
+
+        result = asyncio.run(retry_with_backoff_async(func, max_retries=2, timeout=0.05, on_failure=on_failure))
+
+        assert result == "failed"
+        assert len(calls) == 2
+        assert isinstance(on_failure.call_args.args[0], TimeoutException)
+
+    def test_non_retryable_error_is_raised_immediately(self):
+        func, calls = _flaky([TypeError("bad")])
+
+        with pytest.raises(TypeError):
+            asyncio.run(retry_with_backoff_async(func))
+        assert len(calls) == 1
+
+    def test_waiting_for_concurrency_does_not_count_against_timeout(self):
+        async def main():
+            semaphore = asyncio.Semaphore(1)
+            func, calls = _flaky([], delay=0.01)
+
+            async def hold():
+                async with semaphore:
+                    await asyncio.sleep(0.3)
+
+            holder = asyncio.create_task(hold())
+            await asyncio.sleep(0)
+            result = await retry_with_backoff_async(func, timeout=0.2, concurrency=semaphore)
+            await holder
+            return result, calls
+
+        result, calls = asyncio.run(main())
+        assert result == "ok"
+        assert len(calls) == 1
+
+    def test_concurrency_limits_calls_in_flight(self):
+        in_flight = []
+        peak = []
+
+        async def func():
+            in_flight.append(None)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+            return "ok"
+
+        async def main():
+            semaphore = asyncio.Semaphore(2)
+            return await asyncio.gather(*(retry_with_backoff_async(func, concurrency=semaphore) for _ in range(6)))
+
+        assert asyncio.run(main()) == ["ok"] * 6
+        assert max(peak) == 2
@@ -0,0 +1,440 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,redefined-outer-name,unused-argument,protected-access
+
+"""
+Tests for the streaming review pipeline in ApiViewReview.
+"""
+
+import asyncio
+import json
+import re
+import sys
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Mock azure dependencies before importing
+sys.modules["azure.cosmos"] = MagicMock()
+sys.modules["azure.cosmos.exceptions"] = MagicMock()
+sys.modules["azure.ai.inference"] = MagicMock()
+sys.modules["azure.ai.inference.models"] = MagicMock()
+
+import pytest
+from src._apiview_reviewer import DEFAULT_COMMENT_BATCH_SIZE, ApiViewReview, _remap_line_numbers
+
+
+def _numbered_lines(content):
+    for line in content.splitlines():
+        match = re.match(r"^(\d+): (.*)$", line)
+        if match and match.group(2).strip() not in ("", "}"):
+            yield int(match.group(1)), match.group(2)
+
+
+def fake_run_prompt(*, folder, filename, inputs, **kwargs):
+    """A deterministic stand-in for the LLM."""
+    if filename in ("guidelines_review.prompty", "context_review.prompty"):
+        lines = list(_numbered_lines(inputs["content"]))
+        if filename == "guidelines_review.prompty":
+            picked = lines[1:4]
+            ids = {"guideline_ids": ["python_design.html#rule"]}
+        else:
+            # Overlaps the guideline comments on one line, so that line has to be merged.
+            picked = lines[1:2] + lines[5:6]
+            ids = {"memory_ids": ["memory-1"]}
+        comments = [
+            {
+                "line_no": str(line_no),
+                "bad_code": text,
+                "suggestion": None,
+                "comment": f"{filename.split('_')[0]} comment on {line_no}" + (" drop" if line_no % 7 == 0 else ""),
+                **ids,
+            }
+            for line_no, text in picked
+        ]
+        return json.dumps({"comments": comments})
+    if filename == "merge_comments.prompty":
+        batch = inputs["comments"]
+        merged = batch[0].model_dump()
+        merged["comment"] = " + ".join(c.comment for c in batch)
+        return json.dumps({"comments": [merged]})
+    if filename == "filter_comment_with_metadata.prompty":
+        action = "DISCARD" if inputs["content"]["comment"].endswith("drop") else "KEEP"
+        return json.dumps({"action": action})
+    if filename == "filter_existing_comment.prompty":
+        if inputs["comment"]["line_no"] % 2:
+            return json.dumps({"action": "DISCARD", "comment": ""})
+        return json.dumps({"action": "KEEP", "comment": inputs["comment"]["comment"] + " (refined)"})
+    if filename == "judge_comment_confidence.prompty":
+        line_no = inputs["content"]["line_no"]
+        answers = ["YES"] * (line_no % 3) + ["NO"]
+        return json.dumps({"severity": "should", "results": [{"answer": a} for a in answers]})
+    if filename.endswith("_batch.prompty"):
+        # Answer each comment of the batch as the single-comment prompt would.
+        single_filename = filename.replace("_batch.prompty", ".prompty")
+        results = []
+        for comment in inputs["comments"]:
+            single_inputs = {**inputs, "content": {k: v for k, v in comment.items() if k != "index"}}
+            response = fake_run_prompt(folder=folder, filename=single_filename, inputs=single_inputs)
+            results.append({"index": comment["index"], **json.loads(response)})
+        return json.dumps({"comments": results})
+    raise AssertionError(f"Unexpected prompt {filename}")
+
+
+def _prompt_calls(r, filename):
+    return [call.kwargs["inputs"] for call in r.run_prompt.call_args_list if call.kwargs["filename"] == filename]
+
+
+def _make_review(line_count=1200, existing_lines=(), lines=None, **kwargs):
+    mock_search = MagicMock()
+    mock_search.guideline_snapshot = None
+    mock_search.language_guidelines = MagicMock(results=[])
+    mock_search.search_all.return_value = MagicMock(results=[])
+    mock_search.search_all_by_id.return_value = []
+    mock_search.build_context.return_value = MagicMock(to_markdown=lambda: "")
+
+    if lines is None:
+        lines = ["namespace Foo {"]
+        for i in range(line_count):
+            lines.append(f"  void method_{i}();")
+        lines.append("}")
+    comments = [
+        {"lineNo": line_no, "createdBy": "someone", "commentText": "existing", "createdOn": "2025-01-01T00:00:00Z"}
+        for line_no in existing_lines
+    ]
+
+    with patch("src._apiview_reviewer.SearchManager", return_value=mock_search), patch(
+        "src._apiview_reviewer.SettingsManager", return_value=MagicMock()
+    ):
+        r = ApiViewReview(target="\\n".join(lines), base=None, language="python", comments=comments, **kwargs)
+    r.run_prompt = MagicMock(side_effect=fake_run_prompt)
+    return r
+
+
+def _reference_review(r):
+    """Run the review stages one after another over all comments, as before the pipeline."""
+    sections = list(r._create_sectioned_document())
+    with r._cancellation() as cancel_event:
+        section_futures = r._submit_section_prompts(sections, cancel_event)
+        comments = [
+            comment
+            for idx, futures in section_futures.items()
+            for comment in r._collect_section_comments(sections[idx], futures)
+        ]
+
+    unique_comments = []
+    batches = {}
+    for line_id in set(x.line_no for x in comments):
+        matches = [x for x in comments if x.line_no == line_id]
+        if len(matches) == 1:
+            unique_comments.append(matches[0])
+        else:
+            batches[line_id] = matches
+    for line_no, batch in batches.items():
+        unique_comments.append(r._merge_line_comments(line_no, batch))
+
+    kept = [c for c in unique_comments if r._filter_comment_with_metadata(c).get("action") != "DISCARD"]
+
+    final = []
+    for comment in kept:
+        existing = [e for e in r.existing_comments if e.line_no == comment.line_no]
+        if existing:
+            response = r._filter_preexisting_comment(comment, existing)
+            if response.get("action") == "DISCARD":
+                continue
+            comment.comment = response.get("comment")
+        final.append(comment)
+
+    for comment in final:
+        r._apply_judge_result(comment, r._score_comment_with_judge_prompt(comment))
+    r.results.comments = final
+    return r.results.sorted()
+
+
+class TestReviewPipeline:
+    @pytest.mark.parametrize("comment_batch_size", [1, 3, DEFAULT_COMMENT_BATCH_SIZE])
+    def test_result_matches_stage_by_stage_review(self, comment_batch_size):
+        existing_lines = (3, 4, 250, 603)
+        expected = _reference_review(_make_review(existing_lines=existing_lines))
+
+        r = _make_review(existing_lines=existing_lines, comment_batch_size=comment_batch_size)
+        stats = r._review_comments()
+        actual = r.results.sorted()
+
+        assert r._chunk_count > 2
+        assert stats.merged > 0 and stats.hard_discarded > 0 and stats.preexisting_discarded > 0
+        assert [c.model_dump() for c in actual.comments] == [c.model_dump() for c in expected.comments]
+
+        batch_calls = _prompt_calls(r, "filter_comment_with_metadata_batch.prompty") + _prompt_calls(
+            r, "judge_comment_confidence_batch.prompty"
+        )
+        if comment_batch_size == 1:
+            assert not batch_calls
+        else:
+            assert batch_calls
+            assert all(1 < len(inputs["comments"]) <= comment_batch_size for inputs in batch_calls)
+
+    def test_batched_prompts_fall_back_to_single_prompts(self):
+        existing_lines = (3, 4, 250, 603)
+        expected = _reference_review(_make_review(existing_lines=existing_lines))
+
+        def run_prompt(*, folder, filename, inputs, **kwargs):
+            if filename == "filter_comment_with_metadata_batch.prompty":
+                return "not json"
+            response = fake_run_prompt(folder=folder, filename=filename, inputs=inputs, **kwargs)
+            if filename == "judge_comment_confidence_batch.prompty":
+                # Leave out the first comment and answer the second one twice.
+                results = json.loads(response)["comments"]
+                return json.dumps({"comments": results[1:2] + results[1:]})
+            return response
+
+        r = _make_review(existing_lines=existing_lines, comment_batch_size=4)
+        r.run_prompt = MagicMock(side_effect=run_prompt)
+        r._review_comments()
+        actual = r.results.sorted()
+
+        assert [c.model_dump() for c in actual.comments] == [c.model_dump() for c in expected.comments]
+        filter_batches = _prompt_calls(r, "filter_comment_with_metadata_batch.prompty")
+        judge_batches = _prompt_calls(r, "judge_comment_confidence_batch.prompty")
+        assert len(_prompt_calls(r, "filter_comment_with_metadata.prompty")) == sum(
+            len(inputs["comments"]) for inputs in filter_batches
+        )
+        # The first and the duplicated comment of each judge batch fall back, as do comments judged alone.
+        judged_alone = len(actual.comments) - sum(len(inputs["comments"]) for inputs in judge_batches)
+        assert judge_batches
+        assert len(_prompt_calls(r, "judge_comment_confidence.prompty")) == 2 * len(judge_batches) + judged_alone
+
+    def test_parse_batch_response(self):
+        response = json.dumps(
+            {
+                "comments": [
+                    {"index": 0, "action": "KEEP"},
+                    {"index": 1},
+                    {"index": 2, "action": "DISCARD"},
+                    {"index": 2, "action": "KEEP"},
+                    {"index": 3, "action": "KEEP"},
+                    {"index": True, "action": "KEEP"},
+                    {"index": 5, "action": "KEEP"},
+                ]
+            }
+        )
+        assert ApiViewReview._parse_batch_response(response, 5, ("action",)) == {
+            0: {"action": "KEEP"},
+            3: {"action": "KEEP"},
+        }
+        assert ApiViewReview._parse_batch_response("not json", 5, ("action",)) == {}
+        assert ApiViewReview._parse_batch_response(json.dumps({"action": "KEEP"}), 5, ("action",)) == {}
+
+    def test_invalid_comment_batch_size(self):
+        with pytest.raises(ValueError):
+            _make_review(comment_batch_size=0)
+
+    def test_comments_flow_on_while_a_section_is_generating(self):
+        r = _make_review(comment_batch_size=2)
+        first_section = next(iter(r._create_sectioned_document())).numbered()
+        judged = threading.Event()
+
+        def run_prompt(*, folder, filename, inputs, **kwargs):
+            if filename.startswith("judge_comment_confidence"):
+                judged.set()
+            elif inputs.get("content") == first_section and filename == "guidelines_review.prompty":
+                # The first section is slow; comments of the other sections must still be scored.
+                assert judged.wait(timeout=10)
+            return fake_run_prompt(folder=folder, filename=filename, inputs=inputs, **kwargs)
+
+        r.run_prompt = MagicMock(side_effect=run_prompt)
+        stats = r._review_comments()
+
+        assert judged.is_set()
+        assert stats.scored == len(r.results.comments) > 0
+
+    def test_line_waits_for_every_section_containing_it(self):
+        r = _make_review()
+        r._review_comments()
+        merge_calls = [
+            call.kwargs["inputs"]["comments"]
+            for call in r.run_prompt.call_args_list
+            if call.kwargs["filename"] == "merge_comments.prompty"
+        ]
+        # Every line with a guideline and a context comment is merged exactly once, with both comments.
+        assert merge_calls
+        for batch in merge_calls:
+            assert [c.comment.split(" ")[0] for c in batch] == ["guidelines", "context"]
+            assert len({c.line_no for c in batch}) == 1
+
+    def test_cited_context_is_prefetched_per_section(self):
+        expected = _reference_review(_make_review())
+        r = _make_review()
+        # A failed prefetch leaves each stage to fetch its own context.
+        prefetch = r.search.prefetch_context = MagicMock(side_effect=RuntimeError("search is down"))
+        r._review_comments()
+
+        assert [c.model_dump() for c in r.results.sorted().comments] == [c.model_dump() for c in expected.comments]
+        prefetched = [call.args[0] for call in prefetch.call_args_list]
+        # Guideline IDs that aren't guidelines of the language are dropped from the comments.
+        assert prefetched == [["memory-1"]] * r._chunk_count
+
+
+def _make_async_review(**kwargs):
+    r = _make_review(**kwargs)
+    r.run_prompt = MagicMock(side_effect=AssertionError("The async review must not use the sync prompt runner."))
+    r.run_prompt_async = AsyncMock(side_effect=fake_run_prompt)
+    return r
+
+
+class TestAsyncReviewPipeline:
+    @pytest.mark.parametrize("comment_batch_size", [1, DEFAULT_COMMENT_BATCH_SIZE])
+    def test_result_matches_sync_review(self, comment_batch_size):
+        existing_lines = (3, 4, 250, 603)
+        expected_review = _make_review(existing_lines=existing_lines, comment_batch_size=comment_batch_size)
+        expected_stats = expected_review._review_comments()
+
+        r = _make_async_review(existing_lines=existing_lines, comment_batch_size=comment_batch_size)
+        stats = asyncio.run(r._areview_comments())
+
+        assert stats == expected_stats
+        assert [c.model_dump() for c in r.results.sorted().comments] == [
+            c.model_dump() for c in expected_review.results.sorted().comments
+        ]
+        assert r.run_prompt.call_count == 0
+        assert r.run_prompt_async.call_count == expected_review.run_prompt.call_count
+
+    def test_arun_matches_run(self):
+        expected = _make_review().run()
+        actual = asyncio.run(_make_async_review().arun())
+
+        def without_correlation_ids(result):
+            return [{**c.model_dump(), "correlation_id": None} for c in result.comments]
+
+        assert actual.comments
+        assert without_correlation_ids(actual) == without_correlation_ids(expected)
+
+    def test_comments_flow_on_while_a_section_is_generating(self):
+        r = _make_async_review(comment_batch_size=2)
+        first_section = next(iter(r._create_sectioned_document())).numbered()
+
+        async def main():
+            judged = asyncio.Event()
+
+            async def run_prompt_async(*, folder, filename, inputs, **kwargs):
+                if filename.startswith("judge_comment_confidence"):
+                    judged.set()
+                elif inputs.get("content") == first_section and filename == "guidelines_review.prompty":
+                    # The first section is slow; comments of the other sections must still be scored.
+                    await asyncio.wait_for(judged.wait(), timeout=10)
+                return fake_run_prompt(folder=folder, filename=filename, inputs=inputs, **kwargs)
+
+            r.run_prompt_async = AsyncMock(side_effect=run_prompt_async)
+            return await r._areview_comments()
+
+        stats = asyncio.run(main())
+        assert stats.scored == len(r.results.comments) > 0
+
+    def test_cancellation_cancels_pending_prompts(self):
+        r = _make_async_review()
+
+        async def main():
+            started = asyncio.Event()
+            cancelled = []
+
+            async def run_prompt_async(*, folder, filename, inputs, **kwargs):
+                started.set()
+                try:
+                    await asyncio.Event().wait()
+                except asyncio.CancelledError:
+                    cancelled.append(filename)
+                    raise
+
+            r.run_prompt_async = AsyncMock(side_effect=run_prompt_async)
+            review = asyncio.create_task(r._areview_comments())
+            await started.wait()
+            review.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await review
+            await asyncio.sleep(0)
+            return cancelled
+
+        cancelled = asyncio.run(main())
+        assert cancelled
+        assert r.run_prompt_async.call_count == len(cancelled)
+
+
+def _classes(**sizes):
+    """Return the lines of an API with a top-level class of the given number of methods per name."""
+    lines = []
+    for name, size in sizes.items():
+        lines.append(f"class {name}:")
+        lines.extend(f"    def {name.lower()}_{i}(self): ..." for i in range(size))
+    return lines
+
+
+def _generated(r):
+    return [(c.line_no, c.bad_code, c.guideline_ids, c.memory_ids) for c in r.results.comments]
+
+
+@pytest.fixture
+def response_cache():
+    with patch("src._response_cache._section_result_cache", None):
+        yield
+
+
+@pytest.mark.usefixtures("response_cache")
+class TestIncrementalReview:
+    # The new class is packed into the first section with A; B and C are unchanged but move down 6 lines.
+    FIRST_REVISION = _classes(A=300, B=300, C=300)
+    SECOND_REVISION = _classes(New=5, A=300, B=300, C=300)
+
+    def test_unchanged_sections_reuse_their_comments(self):
+        _make_review(lines=self.FIRST_REVISION, reuse_section_results=True)._review_comments()
+        expected = _make_review(lines=self.SECOND_REVISION)
+        expected._review_comments()
+
+        r = _make_review(lines=self.SECOND_REVISION, reuse_section_results=True)
+        r._review_comments()
+
+        assert r._chunk_count == 3
+        assert _generated(r) == _generated(expected)
+        assert len(_prompt_calls(r, "guidelines_review.prompty")) == 1
+        assert len(_prompt_calls(r, "context_review.prompty")) == 1
+
+    def test_reviews_without_reuse_run_every_section(self):
+        _make_review(lines=self.FIRST_REVISION, reuse_section_results=True)._review_comments()
+        r = _make_review(lines=self.FIRST_REVISION)
+        r._review_comments()
+        assert len(_prompt_calls(r, "guidelines_review.prompty")) == 3
+
+    def test_changed_guidelines_invalidate_every_section(self):
+        _make_review(lines=self.FIRST_REVISION, reuse_section_results=True)._review_comments()
+        r = _make_review(lines=self.FIRST_REVISION, reuse_section_results=True)
+        r.search.build_context.return_value = MagicMock(to_markdown=lambda: "A new guideline")
+        r._review_comments()
+        assert len(_prompt_calls(r, "guidelines_review.prompty")) == 3
+
+    def test_arun_reuses_unchanged_sections(self):
+        first = _make_async_review(lines=self.FIRST_REVISION, reuse_section_results=True)
+        first_result = asyncio.run(first.arun())
+        first_section_end = max(x.line_no for x in next(iter(first._create_sectioned_document())).lines if x.line_no)
+
+        r = _make_async_review(lines=self.SECOND_REVISION, reuse_section_results=True)
+        result = asyncio.run(r.arun())
+
+        def generation_calls(filename):
+            return [call for call in r.run_prompt_async.call_args_list if call.kwargs["filename"] == filename]
+
+        # Only the changed first section is sent to the model again.
+        assert r._chunk_count == 3
+        assert len(generation_calls("guidelines_review.prompty")) == 1
+        assert len(generation_calls("context_review.prompty")) == 1
+        # The comments of the unchanged sections move down with the 6 lines inserted above them.
+        moved = sorted(c.line_no + 6 for c in first_result.comments if c.line_no > first_section_end)
+        assert moved
+        assert sorted(c.line_no for c in result.comments if c.line_no > first_section_end + 6) == moved
+
+    def test_remap_line_numbers(self):
+        result = {"comments": [{"line_no": 11}, {"line_no": "11-12, 14"}, {"line_no": "40"}, {"line_no": "n/a"}]}
+        # Line 13 was dropped between lines 12 and 14 of the section, e.g. at a subsection boundary.
+        remapped = _remap_line_numbers(result, [10, 11, 12, 14], [20, 21, 22, 30])
+        assert [c["line_no"] for c in remapped["comments"]] == [21, "21-22, 30", "50", "n/a"]
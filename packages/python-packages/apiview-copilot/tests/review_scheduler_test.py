@@ -0,0 +1,143 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,protected-access
+
+"""
+Tests for the review job scheduler in _review_scheduler.py.
+"""
+
+import asyncio
+
+import pytest
+
+from src._review_scheduler import ReviewScheduler, SchedulerFullError, review_job_key
+
+
+class _Jobs:
+    """Review jobs that run until released, recording the order they started in."""
+
+    def __init__(self):
+        self.started = []
+        self.release = {}
+
+    def job(self, name):
+        async def run():
+            self.started.append(name)
+            self.release[name] = asyncio.Event()
+            await self.release[name].wait()
+
+        return run
+
+    async def finish(self, name):
+        self.release[name].set()
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+
+class TestReviewScheduler:
+    def test_review_job_key(self):
+        key = review_job_key("python", "class A: ...", None, None, [])
+        assert key == review_job_key("python", "class A: ...", None, None, [])
+        assert key != review_job_key("python", "class A: ...", "class B: ...", None, [])
+        assert key != review_job_key("java", "class A: ...", None, None, [])
+
+    def test_runs_at_most_the_maximum_at_once_in_submission_order(self):
+        async def main():
+            jobs = _Jobs()
+            scheduler = ReviewScheduler(max_concurrent_reviews=2, max_queued_reviews=10)
+            for name in ("a", "b", "c", "d", "e"):
+                scheduler.submit(name, name, jobs.job(name))
+            await asyncio.sleep(0)
+
+            assert jobs.started == ["a", "b"]
+            assert (scheduler.running, scheduler.queued) == (2, 3)
+            assert [scheduler.position(x) for x in ("a", "c", "d", "e")] == [None, 0, 1, 2]
+
+            await jobs.finish("a")
+            await jobs.finish("b")
+            assert jobs.started == ["a", "b", "c", "d"]
+            for name in ("c", "d", "e"):
+                await jobs.finish(name)
+            assert jobs.started == ["a", "b", "c", "d", "e"]
+            assert (scheduler.running, scheduler.queued) == (0, 0)
+
+        asyncio.run(main())
+
+    def test_identical_submissions_collapse_onto_one_job(self):
+        async def main():
+            jobs = _Jobs()
+            scheduler = ReviewScheduler(max_concurrent_reviews=1)
+            assert scheduler.submit("key", "first", jobs.job("first")) == "first"
+            assert scheduler.submit("key", "second", jobs.job("second")) == "first"
+            assert scheduler.find_identical("key") == "first"
+            await asyncio.sleep(0)
+            await jobs.finish("first")
+
+            # Once the job finished, the same submission runs again.
+            assert scheduler.find_identical("key") is None
+            assert scheduler.submit("key", "third", jobs.job("third")) == "third"
+            await asyncio.sleep(0)
+            await jobs.finish("third")
+            assert jobs.started == ["first", "third"]
+
+        asyncio.run(main())
+
+    def test_full_queue_refuses_submissions(self):
+        async def main():
+            jobs = _Jobs()
+            scheduler = ReviewScheduler(max_concurrent_reviews=1, max_queued_reviews=1)
+            scheduler.submit("a", "a", jobs.job("a"))
+            scheduler.submit("b", "b", jobs.job("b"))
+            assert scheduler.full
+            with pytest.raises(SchedulerFullError):
+                scheduler.submit("c", "c", jobs.job("c"))
+            await asyncio.sleep(0)
+            await jobs.finish("a")
+            assert not scheduler.full
+            await jobs.finish("b")
+
+        asyncio.run(main())
+
+    def test_failed_job_frees_its_slot(self):
+        async def main():
+            jobs = _Jobs()
+            scheduler = ReviewScheduler(max_concurrent_reviews=1)
+
+            async def fail():
+                raise RuntimeError("review failed")
+
+            scheduler.submit("a", "a", fail)
+            scheduler.submit("b", "b", jobs.job("b"))
+            for _ in range(5):
+                await asyncio.sleep(0)
+            assert jobs.started == ["b"]
+            await jobs.finish("b")
+
+        asyncio.run(main())
+
+    def test_eta_from_recent_durations(self):
+        async def main():
+            jobs = _Jobs()
+            scheduler = ReviewScheduler(max_concurrent_reviews=2)
+            scheduler.submit("a", "a", jobs.job("a"))
+            assert scheduler.eta("a") is None
+            await asyncio.sleep(0)
+            await jobs.finish("a")
+
+            scheduler._durations[0] = 100.0
+            for name in ("b", "c", "d", "e", "f"):
+                scheduler.submit(name, name, jobs.job(name))
+            await asyncio.sleep(0)
+            assert scheduler.eta("b") == pytest.approx(100.0, abs=1)
+            # "d" and "e" start once the running jobs finish; "f" starts after one more round.
+            assert scheduler.eta("d") == scheduler.eta("e") == pytest.approx(150.0)
+            assert scheduler.eta("f") == pytest.approx(250.0)
+            assert scheduler.eta("unknown") is None
+            for name in ("b", "c", "d", "e", "f"):
+                await jobs.finish(name)
+
+        asyncio.run(main())
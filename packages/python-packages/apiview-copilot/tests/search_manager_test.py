@@ -0,0 +1,202 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,redefined-outer-name,unused-argument,protected-access
+
+"""
+Tests for resolving the knowledge graph context in SearchManager.
+"""
+
+import json
+import sys
+import threading
+from unittest.mock import MagicMock, patch
+
+# Mock azure dependencies before importing
+sys.modules["azure.cosmos"] = MagicMock()
+sys.modules["azure.cosmos.exceptions"] = MagicMock()
+
+import pytest
+from src._search_manager import SearchManager, SearchResult, _load_guideline_snapshot
+
+GUIDELINES = {
+    "python_design=html=naming": {
+        "id": "python_design=html=naming",
+        "title": "Naming",
+        "content": "Use snake_case.",
+        "related_examples": ["example-1"],
+        "related_memories": ["memory-1"],
+    },
+    "python_design=html=clients": {
+        "id": "python_design=html=clients",
+        "title": "Clients",
+        "content": "Name clients after the service.",
+    },
+}
+EXAMPLES = {
+    "example-1": {
+        "id": "example-1",
+        "title": "Good name",
+        "content": "def get_item(): ...",
+        "example_type": "good",
+        "guideline_ids": ["python_design.html#naming"],
+    },
+}
+MEMORIES = {
+    "memory-1": {
+        "id": "memory-1",
+        "title": "Exception",
+        "content": "Acronyms may stay upper case.",
+        "source": "thread_resolution",
+        "related_guidelines": ["python_design.html#clients"],
+    },
+}
+INDEX = {
+    "python_design=html=naming": "guidelines",
+    "python_design=html=clients": "guidelines",
+    "example-1": "examples",
+    "memory-1": "memories",
+}
+
+
+class _Paged(list):
+    def get_answers(self):
+        return None
+
+
+def _container(objects: dict, queries: list, kind: str):
+    def query_items(*, query, parameters, **kwargs):
+        ids = [p["value"] for p in parameters]
+        queries.append((kind, ids))
+        return [objects[x] for x in ids if x in objects]
+
+    return MagicMock(query_items=MagicMock(side_effect=query_items))
+
+
+@pytest.fixture
+def database():
+    queries = []
+    instance = MagicMock()
+    instance.guidelines.client = _container(GUIDELINES, queries, "guidelines")
+    instance.examples.client = _container(EXAMPLES, queries, "examples")
+    instance.memories.client = _container(MEMORIES, queries, "memories")
+    with patch("src._search_manager.DatabaseManager.get_instance", return_value=instance):
+        yield queries
+
+
+def _search_manager(cache_context: bool) -> SearchManager:
+    with patch("src._search_manager.SettingsManager"), patch("src._search_manager.get_credential"), patch(
+        "src._search_manager.SearchClient"
+    ):
+        manager = SearchManager(cache_context=cache_context)
+
+    def search(*, filter, **kwargs):
+        ids = filter.split("'")[1].split(",")
+        return _Paged({"id": x, "kind": INDEX[x], "@search.score": 1.0} for x in ids if x in INDEX)
+
+    manager.client.search.side_effect = search
+    return manager
+
+
+def _context_markdown(manager: SearchManager, ids: list) -> str:
+    return manager.build_context(manager.search_all_by_id(ids)).to_markdown()
+
+
+class TestKnowledgeGraphCache:
+    def test_context_matches_uncached_context(self, database):
+        ids = ["python_design.html#naming", "memory-1"]
+        expected = _context_markdown(_search_manager(cache_context=False), ids)
+        manager = _search_manager(cache_context=True)
+
+        assert _context_markdown(manager, ids) == expected
+        assert _context_markdown(manager, ids) == expected
+        assert "def get_item(): ..." in expected
+
+    def test_each_id_is_fetched_once(self, database):
+        manager = _search_manager(cache_context=True)
+        manager.prefetch_context(["python_design.html#naming", "missing-memory"])
+        searches = manager.client.search.call_count
+        queries = list(database)
+
+        _context_markdown(manager, ["python_design.html#naming"])
+        _context_markdown(manager, ["missing-memory", "python_design.html#naming"])
+
+        assert manager.client.search.call_count == searches
+        assert database == queries
+        fetched = [x for _, ids in database for x in ids]
+        assert len(fetched) == len(set(fetched))
+
+    def test_only_missing_ids_are_searched(self, database):
+        manager = _search_manager(cache_context=True)
+        manager.search_all_by_id(["python_design.html#naming"])
+        items = manager.search_all_by_id(["python_design.html#naming", "example-1"])
+
+        assert [x.id for x in items] == ["python_design=html=naming", "example-1"]
+        assert "search.in(id, 'example-1', ',')" == manager.client.search.call_args.kwargs["filter"]
+
+    def test_concurrent_lookups_fetch_once(self, database):
+        manager = _search_manager(cache_context=True)
+        threads = [
+            threading.Thread(target=_context_markdown, args=(manager, ["python_design.html#naming"])) for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert manager.client.search.call_count == 1
+        fetched = [x for _, ids in database for x in ids]
+        assert len(fetched) == len(set(fetched))
+
+
+class TestContextItem:
+    def test_examples_are_shared_but_serialized_without_ids(self, database):
+        manager = _search_manager(cache_context=True)
+        context = manager.build_context(manager.search_all_by_id(["python_design.html#naming"]))
+        item = next(x for x in context if x.kind == "guideline")
+        example = item.examples[0]
+
+        assert example.id == "example-1"
+        data = json.loads(json.dumps(item.to_dict(), default=lambda o: o.__dict__))
+        assert "id" not in data["examples"][0]
+        assert "guideline_ids" not in data["examples"][0]
+        assert data["examples"][0]["content"] == "def get_item(): ..."
+
+
+class TestGuidelineSnapshot:
+    def test_snapshot_replaces_the_language_guidelines_fetch(self):
+        snapshot = MagicMock()
+        with patch("src._search_manager.SettingsManager"), patch("src._search_manager.get_credential"), patch(
+            "src._search_manager.SearchClient"
+        ) as client, patch("src._search_manager.get_guideline_snapshots") as snapshots:
+            snapshots.return_value.get.return_value = snapshot
+            manager = SearchManager(language="python", use_guideline_snapshot=True)
+
+        snapshots.return_value.get.assert_called_once_with("python")
+        client.return_value.search.assert_not_called()
+        assert manager.guideline_snapshot is snapshot
+        assert manager.language_guidelines is snapshot.guidelines
+
+    def test_search_only_manager_skips_the_language_guidelines(self):
+        with patch("src._search_manager.SettingsManager"), patch("src._search_manager.get_credential"), patch(
+            "src._search_manager.SearchClient"
+        ) as client, patch("src._search_manager.get_guideline_snapshots") as snapshots:
+            manager = SearchManager(language="python", load_language_guidelines=False)
+
+        snapshots.assert_not_called()
+        client.return_value.search.assert_not_called()
+        assert manager.language_guidelines is None
+
+    def test_snapshot_keeps_the_guideline_ids_of_the_index(self, database):
+        manager = _search_manager(cache_context=False)
+        manager.language_guidelines = SearchResult(
+            _Paged({"id": x, "kind": "guidelines", "@search.score": 1.0} for x in GUIDELINES)
+        )
+        with patch("src._search_manager.SearchManager", return_value=manager):
+            guidelines, context = _load_guideline_snapshot("python")
+
+        assert [x.id for x in guidelines] == list(GUIDELINES)
+        assert "python_design.html#naming" in context.to_markdown()
@@ -308,3 +308,31 @@ def test_multiple_classes_with_decorators():
 
         if "public class Bar" in section_text:
             assert "@Builder" in section_text, f"Bar class section should include @Builder.\nSection:\n{section_text}"
+
+
+def test_many_top_level_declarations_keep_every_line_in_order():
+    raw = []
+    for i in range(3000):
+        raw.append("@decorator")
+        raw.append(f"def function_{i}(): ...")
+        raw.append("  body")
+    numbered = [f"{i + 1}: {line}" for i, line in enumerate(raw)]
+
+    doc = SectionedDocument(lines=numbered, max_chunk_size=100)
+
+    assert all(len(section.lines) <= 100 for section in doc)
+    assert [x.line_no for section in doc for x in section.lines] == list(range(1, len(raw) + 1))
+    # Every section starts with the decorator of its first declaration
+    assert all(section.lines[0].line == "@decorator" for section in doc)
+
+
+def test_idx_for_line_no_returns_first_matching_line():
+    lines = [
+        LineData(line_no=None, indent=0, line="header"),
+        LineData(line_no=7, indent=0, line="a"),
+        LineData(line_no=7, indent=0, line="b"),
+    ]
+    sec = Section(lines)
+    assert sec.idx_for_line_no(7) == 1
+    assert sec.idx_for_line_no(None) == 0
+    assert sec.idx_for_line_no(8) is None
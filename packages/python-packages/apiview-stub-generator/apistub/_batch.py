@@ -0,0 +1,287 @@
+#!/usr/bin/env python
+
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import argparse
+import importlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+from apistub._disk_cache import DEFAULT_CACHE_SIZE_MB
+from apistub._stub_generator import (
+    PACKAGE_INSTALL_TIMEOUT_SECONDS,
+    StubGenerator,
+    install_packages,
+)
+
+
+def read_manifest(manifest_path: str) -> List[str]:
+    """Return the package paths listed in *manifest_path*.
+
+    The manifest lists one package source root, wheel or sdist per line. Blank lines
+    and lines starting with ``#`` are ignored, and relative paths are resolved
+    against the directory of the manifest.
+    """
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    pkg_paths = []
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            pkg_paths.append(os.path.normpath(os.path.join(base_dir, line)))
+    return pkg_paths
+
+
+@dataclass
+class BatchResult:
+    """Outcome and per-phase timings (seconds) of generating one package's token file."""
+
+    pkg_path: str
+    pkg_name: Optional[str] = None
+    out_file_path: Optional[str] = None
+    error: Optional[str] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+class BatchStubGenerator:
+    """Generates token files for every package of a manifest in one process.
+
+    All packages are installed with a single pip resolve into the current
+    environment, so shared dependencies are only resolved and installed once, and
+    pylint, astroid and the interpreter are only started once. Each package is then
+    parsed in turn; the modules it imported are purged from ``sys.modules`` (and
+    astroid's module cache) afterwards so the next package can't observe them. A
+    failing package is reported and does not stop the batch.
+    """
+
+    def __init__(self, **kwargs):
+        self._kwargs = kwargs
+        if not kwargs:
+            parser = argparse.ArgumentParser(
+                description="Generates APIView JSON token files for every package listed in a manifest."
+            )
+            parser.add_argument(
+                "--manifest",
+                required=True,
+                help=(
+                    "Path to a text file listing one package source root, WHL, ZIP, or TAR file per line."
+                ),
+            )
+            parser.add_argument(
+                "--out-path",
+                default=os.getcwd(),
+                help=("Directory at which to write the generated JSON files. Defaults to CWD."),
+            )
+            parser.add_argument(
+                "--temp-path",
+                help=(
+                    "Extract packages to the specified temporary path. Defaults to a random temp dir."
+                ),
+                default=tempfile.gettempdir(),
+            )
+            parser.add_argument(
+                "--report-path",
+                help=("Path at which to write a JSON report of per-package results and timings."),
+            )
+            parser.add_argument(
+                "--verbose",
+                help=("Enable verbose logging."),
+                default=False,
+                action="store_true",
+            )
+            parser.add_argument(
+                "--skip-pylint",
+                help=("Skips running pylint on the packages to obtain diagnostics."),
+                default=False,
+                action="store_true",
+            )
+            parser.add_argument(
+                "--skip-install",
+                help=("Skips installing the packages. They must already be installed in the current environment."),
+                default=False,
+                action="store_true",
+            )
+            parser.add_argument(
+                "--static",
+                help=("Parses the packages from source without installing or importing them."),
+                default=False,
+                action="store_true",
+            )
+            parser.add_argument(
+                "--jobs",
+                type=int,
+                default=1,
+                help=(
+                    "Number of worker processes used for each package. Defaults to 1."
+                ),
+            )
+            parser.add_argument(
+                "--pylint-cache-dir",
+                help=("Directory of a persistent pylint result cache shared by all packages."),
+            )
+            parser.add_argument(
+                "--pylint-cache-size",
+                type=int,
+                default=DEFAULT_CACHE_SIZE_MB,
+                help=(
+                    "Maximum size of the pylint result cache in MB. Defaults to {}.".format(DEFAULT_CACHE_SIZE_MB)
+                ),
+            )
+            parser.add_argument(
+                "--parse-cache-dir",
+                help=("Directory of a persistent cache of parsed class source indexes shared by all packages."),
+            )
+            parser.add_argument(
+                "--parse-cache-size",
+                type=int,
+                default=DEFAULT_CACHE_SIZE_MB,
+                help=(
+                    "Maximum size of the parse cache in MB. Defaults to {}.".format(DEFAULT_CACHE_SIZE_MB)
+                ),
+            )
+            self._args = parser.parse_args()
+
+        manifest = self._parse_arg("manifest")
+        pkg_paths = self._parse_arg("pkg_paths")
+        if manifest:
+            pkg_paths = read_manifest(manifest)
+        if not pkg_paths:
+            raise ValueError("No packages to generate. Pass a manifest or a list of package paths.")
+        self.pkg_paths = list(pkg_paths)
+        self.out_path = self._parse_arg("out_path") or os.getcwd()
+        self.temp_path = self._parse_arg("temp_path") or tempfile.gettempdir()
+        self.report_path = self._parse_arg("report_path")
+        self.verbose = self._parse_arg("verbose") or False
+        self.skip_pylint = self._parse_arg("skip_pylint") or False
+        self.skip_install = self._parse_arg("skip_install") or False
+        self.static = self._parse_arg("static") or False
+        self.jobs = self._parse_arg("jobs") or 1
+        self.pylint_cache_dir = self._parse_arg("pylint_cache_dir")
+        self.pylint_cache_size = self._parse_arg("pylint_cache_size") or DEFAULT_CACHE_SIZE_MB
+        self.parse_cache_dir = self._parse_arg("parse_cache_dir")
+        self.parse_cache_size = self._parse_arg("parse_cache_size") or DEFAULT_CACHE_SIZE_MB
+        os.makedirs(self.out_path, exist_ok=True)
+
+    def _parse_arg(self, name):
+        value = self._kwargs.get(name, None)
+        if not value:
+            try:
+                value = getattr(self._args, name, None)
+            except AttributeError:
+                value = None
+        return value
+
+    def run(self) -> List[BatchResult]:
+        """Generate the token file of every package and return their results in manifest order."""
+        installed = self.skip_install or self.static
+        install_time = 0.0
+        if not installed:
+            start = time.monotonic()
+            try:
+                install_packages(
+                    self.pkg_paths,
+                    timeout=PACKAGE_INSTALL_TIMEOUT_SECONDS * len(self.pkg_paths),
+                )
+                installed = True
+            except Exception as err:
+                # E.g. two packages pin conflicting dependencies. Fall back to installing
+                # each package on its own right before it is parsed.
+                print(
+                    "apistubgen: shared install failed ({0}). Installing packages one at a time.".format(err)
+                )
+            install_time = time.monotonic() - start
+
+        results = [self._generate(pkg_path, installed) for pkg_path in self.pkg_paths]
+        self._report(results, install_time)
+        return results
+
+    def _generate(self, pkg_path: str, installed: bool) -> BatchResult:
+        from .nodes import PylintParser
+
+        result = BatchResult(pkg_path=pkg_path)
+        loaded_modules = set(sys.modules)
+        stub_generator = None
+        start = time.monotonic()
+        try:
+            # Diagnostics of the previous package must not leak into this one.
+            PylintParser.load_items([])
+            stub_generator = StubGenerator(
+                pkg_path=pkg_path,
+                temp_path=self.temp_path,
+                out_path=self.out_path,
+                verbose=self.verbose,
+                skip_pylint=self.skip_pylint,
+                skip_install=installed,
+                static=self.static,
+                jobs=self.jobs,
+                pylint_cache_dir=self.pylint_cache_dir,
+                pylint_cache_size=self.pylint_cache_size,
+                parse_cache_dir=self.parse_cache_dir,
+                parse_cache_size=self.parse_cache_size,
+            )
+            result.timings["setup"] = time.monotonic() - start
+
+            phase_start = time.monotonic()
+            apiview = stub_generator.generate_tokens()
+            result.pkg_name = apiview.package_name
+            result.timings["tokens"] = time.monotonic() - phase_start
+
+            phase_start = time.monotonic()
+            result.out_file_path = stub_generator.get_out_file_path(apiview)
+            with open(result.out_file_path, "w") as json_file:
+                stub_generator.serialize_to(apiview, json_file)
+            result.timings["serialize"] = time.monotonic() - phase_start
+        except (Exception, SystemExit) as err:
+            logging.exception("Failed to generate tokens for %s", pkg_path)
+            result.error = "{0}: {1}".format(type(err).__name__, err)
+        finally:
+            if stub_generator is not None and stub_generator.namespace:
+                _purge_modules(stub_generator.namespace, loaded_modules)
+            importlib.invalidate_caches()
+        result.timings["total"] = time.monotonic() - start
+        return result
+
+    def _report(self, results: List[BatchResult], install_time: float) -> None:
+        print("apistubgen: shared install finished in {0:.1f}s.".format(install_time))
+        for result in results:
+            timings = ", ".join("{0} {1:.1f}s".format(k, v) for k, v in result.timings.items())
+            status = "ok" if result.succeeded else "FAILED ({0})".format(result.error)
+            print("apistubgen: {0}: {1} [{2}]".format(result.pkg_name or result.pkg_path, status, timings))
+        failed = sum(1 for result in results if not result.succeeded)
+        print("apistubgen: {0} of {1} packages succeeded.".format(len(results) - failed, len(results)))
+
+        if self.report_path:
+            report = {
+                "install_time": install_time,
+                "packages": [asdict(result) for result in results],
+            }
+            with open(self.report_path, "w") as report_file:
+                json.dump(report, report_file, indent=2)
+
+
+def _purge_modules(namespace: str, loaded_modules: set) -> None:
+    """Forget the modules under *namespace* imported since *loaded_modules* was taken."""
+    import astroid
+
+    prefix = namespace + "."
+    for name in list(sys.modules):
+        if name not in loaded_modules and (name == namespace or name.startswith(prefix)):
+            del sys.modules[name]
+    astroid_cache = astroid.MANAGER.astroid_cache
+    for name in list(astroid_cache):
+        if name == namespace or name.startswith(prefix):
+            del astroid_cache[name]
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import hashlib
+import logging
+import os
+from typing import Any, Optional
+
+# Default upper bound for an on-disk cache. Least recently used entries are
+# evicted once the cache grows past it.
+DEFAULT_CACHE_SIZE_MB = 1024
+
+
+def hash_bytes(*parts: bytes) -> str:
+    """Return the SHA-256 hex digest of *parts*, separated so that they can't run together."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def hash_file(file_path: str) -> str:
+    """Return the SHA-256 hex digest of the content of *file_path*."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """Content-addressed, size-bounded cache of one file per entry under *cache_dir*.
+
+    Subclasses choose the serialization by overriding ``_dumps`` and ``_loads`` and
+    build their keys with ``hash_bytes`` or ``hash_file``. Reads refresh an entry's
+    modification time, so ``evict`` removes the least recently used entries first.
+
+    :param str cache_dir: Directory to store cache entries in. Created if missing.
+    :param int max_size_mb: Maximum size of the cache directory in megabytes.
+    """
+
+    extension = ".bin"
+
+    def __init__(self, cache_dir: str, *, max_size_mb: int = DEFAULT_CACHE_SIZE_MB):
+        self.cache_dir = cache_dir
+        self.max_size = max_size_mb * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _dumps(self, value: Any) -> bytes:
+        raise NotImplementedError()
+
+    def _loads(self, data: bytes) -> Any:
+        raise NotImplementedError()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}{self.extension}")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for *key*, or None on a miss."""
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, "rb") as f:
+                value = self._loads(f.read())
+        except (OSError, ValueError, EOFError, TypeError):
+            self.misses += 1
+            return None
+        try:
+            # Refresh the modification time so eviction is least recently used.
+            os.utime(entry_path)
+        except OSError:
+            pass
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store *value* for *key*. Written atomically so concurrent runs can share a cache."""
+        entry_path = self._entry_path(key)
+        temp_path = f"{entry_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            with open(temp_path, "wb") as f:
+                f.write(self._dumps(value))
+            os.replace(temp_path, entry_path)
+        except OSError as err:
+            logging.warning("Unable to write cache entry %s: %s", entry_path, err)
+
+    def evict(self) -> None:
+        """Delete least recently used entries until the cache fits within its size limit."""
+        entries = []
+        total = 0
+        for root, _, filenames in os.walk(self.cache_dir):
+            for filename in filenames:
+                if not filename.endswith(self.extension):
+                    continue
+                entry_path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(entry_path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry_path))
+                total += stat.st_size
+        if total <= self.max_size:
+            return
+        entries.sort()
+        for _, size, entry_path in entries:
+            try:
+                os.remove(entry_path)
+            except OSError:
+                continue
+            total -= size
+            if total <= self.max_size:
+                break
@@ -123,6 +123,9 @@ class ApiView(CodeFile):
             help_link_uri=err.help_link,
             target_id=target_id,
         )
+        self.append_diagnostic(diagnostic)
+
+    def append_diagnostic(self, diagnostic):
         # Avoid duplicate diagnostics with the same text and target
         if not any(d.text == diagnostic.text and d.target_id == diagnostic.target_id for d in self.diagnostics):
             self.diagnostics.append(diagnostic)
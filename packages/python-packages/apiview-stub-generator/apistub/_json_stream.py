@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+from json import JSONEncoder
+from typing import Any, IO, Iterator
+
+from apistub._generated.treestyle.parser._model_base import _is_model
+
+# Review line lists that are written one line at a time instead of being encoded whole.
+_STREAMED_KEYS = ("ReviewLines", "Children")
+
+# Number of characters buffered before they are written to the file.
+_WRITE_BUFFER_SIZE = 1 << 16
+
+
+def iter_json(obj: Any, encoder: JSONEncoder) -> Iterator[str]:
+    """Yield the JSON encoding of *obj* in chunks, producing exactly ``encoder.encode(obj)``.
+
+    ``ReviewLines`` and ``Children`` are expanded line by line, so at most one review
+    line (without its children) is encoded in memory at a time. Everything else is
+    encoded in one piece by *encoder*.
+    """
+    if encoder.indent is not None:
+        # Indented output depends on the nesting level, so leave it to the encoder.
+        yield from encoder.iterencode(obj)
+        return
+    yield from _iter_value(obj, encoder)
+
+
+def write_json(obj: Any, fp: IO[str], encoder: JSONEncoder) -> None:
+    """Write the JSON encoding of *obj* to the text file *fp* with bounded memory."""
+    chunks = []
+    size = 0
+    for chunk in iter_json(obj, encoder):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= _WRITE_BUFFER_SIZE:
+            fp.write("".join(chunks))
+            chunks = []
+            size = 0
+    fp.write("".join(chunks))
+
+
+def _iter_value(obj: Any, encoder: JSONEncoder) -> Iterator[str]:
+    mapping = encoder.default(obj) if _is_model(obj) else obj
+    if not isinstance(mapping, dict) or not mapping or not all(isinstance(k, str) for k in mapping):
+        yield encoder.encode(mapping)
+        return
+    items = sorted(mapping.items()) if encoder.sort_keys else mapping.items()
+    yield "{"
+    for i, (key, value) in enumerate(items):
+        if i:
+            yield encoder.item_separator
+        yield encoder.encode(key)
+        yield encoder.key_separator
+        if key in _STREAMED_KEYS and isinstance(value, list):
+            yield from _iter_list(value, encoder)
+        else:
+            yield encoder.encode(value)
+    yield "}"
+
+
+def _iter_list(values: list, encoder: JSONEncoder) -> Iterator[str]:
+    if not values:
+        yield "[]"
+        return
+    yield "["
+    for i, value in enumerate(values):
+        if i:
+            yield encoder.item_separator
+        yield from _iter_value(value, encoder)
+    yield "]"
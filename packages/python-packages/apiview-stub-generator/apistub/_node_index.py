@@ -11,12 +11,20 @@ class NodeIndex:
 
     def __init__(self):
         self.index = {}
+        # Navigation IDs of nodes that were built in another process (see _parallel.py).
+        self.external_ids = {}
 
     def add(self, name, node):
-        if name in self.index:
+        if name in self.index or name in self.external_ids:
             raise ValueError("Index already has {} node".format(name))
         self.index[name] = node
 
+    def add_id(self, name, namespace_id):
+        """Registers the navigation ID of a node that is not held by this index."""
+        if name in self.index or name in self.external_ids:
+            raise ValueError("Index already has {} node".format(name))
+        self.external_ids[name] = namespace_id
+
     def get(self, name):
         return self.index.get(name, None)
 
@@ -24,4 +32,10 @@ class NodeIndex:
         node = self.get(name)
         if node and hasattr(node, "namespace_id"):
             return node.namespace_id
-        return None
+        return self.external_ids.get(name, None)
+
+    def get_ids(self):
+        """Returns a name to navigation ID map of every node known to this index."""
+        ids = {name: getattr(node, "namespace_id", None) for name, node in self.index.items()}
+        ids.update(self.external_ids)
+        return ids
@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Sharded, multi-process token generation used by `StubGenerator` when `--jobs` is greater than 1.
+
+The sorted module list is split into contiguous shards and each shard is handled by its own
+worker process, which runs in two phases:
+
+  build     - import the shard's modules and build their ModuleNodes. The worker reports the
+              navigation IDs it added to its NodeIndex and the pylint ownership it assigned.
+  tokenize  - once the parent has merged the IDs and ownership of *every* shard, the worker
+              receives them back, generates diagnostics and tokens for its modules and returns
+              the resulting ReviewLines and diagnostics.
+
+Because shards are contiguous ranges of the sorted module list and the parent concatenates the
+results in shard order, the merged ApiView is identical to the one produced by a serial run.
+"""
+
+import importlib
+import logging
+import multiprocessing
+import sys
+import traceback
+from typing import Dict, List, Optional
+
+_BUILD = "build"
+_TOKENIZE = "tokenize"
+_ERROR = "error"
+
+
+def _split_modules(modules: List[str], jobs: int) -> List[List[str]]:
+    """Split *modules* into at most *jobs* contiguous, similarly sized shards."""
+    count = min(jobs, len(modules))
+    size, remainder = divmod(len(modules), count)
+    shards = []
+    start = 0
+    for i in range(count):
+        end = start + size + (1 if i < remainder else 0)
+        shards.append(modules[start:end])
+        start = end
+    return shards
+
+
+def _send_error(conn, exc: BaseException) -> None:
+    """Send *exc* to the parent, falling back to a RuntimeError if it can't be pickled."""
+    try:
+        conn.send((_ERROR, exc))
+    except OSError:
+        # The parent has already gone away (e.g. another shard failed first).
+        pass
+    except Exception:
+        try:
+            conn.send((_ERROR, RuntimeError("".join(traceback.format_exception(exc)))))
+        except OSError:
+            pass
+
+
+def _shard_worker(
+    conn, modules, namespace, pkg_name, pkg_version, source_url, metadata_map, pylint_items, parse_cache, static_root
+):
+    """Entry point of a worker process. Handles one shard of modules."""
+    from apistub import ApiView, ReviewLines
+    from apistub.nodes import ModuleNode, PylintParser
+    from apistub.nodes._class_node import clear_caches, set_source_index_cache
+    from apistub.nodes._function_node import clear_func_caches
+    from apistub.nodes._static_nodes import StaticModuleNode, load_static_module
+
+    try:
+        clear_caches()
+        clear_func_caches()
+        set_source_index_cache(parse_cache)
+        # Ownership is reported per shard, so start from a clean slate. The parent
+        # decides the final owner of each item once every shard has been built.
+        for item in pylint_items:
+            item.owner = None
+        PylintParser.load_items(pylint_items)
+
+        apiview = ApiView(
+            pkg_name=pkg_name,
+            metadata_map=metadata_map,
+            namespace=namespace,
+            source_url=source_url,
+            pkg_version=pkg_version,
+        )
+        module_nodes = []
+        if static_root:
+            # The worker exits once its shard is done, so the path can stay.
+            sys.path.insert(0, static_root)
+        for m in modules:
+            if static_root:
+                logging.debug("Parsing module {}".format(m))
+                module_obj = load_static_module(m, static_root)
+                module_nodes.append(StaticModuleNode(m, module_obj, namespace, apiview=apiview))
+            else:
+                logging.debug("Importing module {}".format(m))
+                module_obj = importlib.import_module(m)
+                module_nodes.append(ModuleNode(m, module_obj, namespace, apiview=apiview))
+        conn.send((_BUILD, apiview.node_index.get_ids(), [x.owner for x in PylintParser.items]))
+    except BaseException as exc:
+        _send_error(conn, exc)
+        conn.close()
+        return
+
+    try:
+        node_ids, owners = conn.recv()
+        for name, namespace_id in node_ids.items():
+            if apiview.node_index.get(name) is None:
+                apiview.node_index.add_id(name, namespace_id)
+        PylintParser.set_owners(owners)
+
+        review_lines = ReviewLines()
+        for module_node in module_nodes:
+            module_node.generate_diagnostics()
+            logging.debug("Generating tokens for module {}".format(module_node.namespace))
+            module_node.generate_tokens(review_lines)
+        conn.send((_TOKENIZE, review_lines, apiview.diagnostics))
+    except BaseException as exc:
+        _send_error(conn, exc)
+    finally:
+        conn.close()
+
+
+class _Shard:
+    """Parent-side handle on a worker process and its pipe."""
+
+    def __init__(self, context, modules, **kwargs):
+        self.modules = modules
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_shard_worker,
+            args=(child_conn, modules),
+            kwargs=kwargs,
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+    def receive(self, expected: str):
+        try:
+            message = self.conn.recv()
+        except EOFError:
+            raise RuntimeError(
+                "Worker process for modules {0} exited unexpectedly (exit code {1}).".format(
+                    self.modules, self.process.exitcode
+                )
+            )
+        if message[0] == _ERROR:
+            raise message[1]
+        if message[0] != expected:
+            raise RuntimeError("Unexpected message '{0}' from worker process.".format(message[0]))
+        return message[1:]
+
+    def close(self):
+        self.conn.close()
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+
+
+def generate_tokens_in_shards(
+    apiview, modules: List[str], *, jobs: int, namespace: str, parse_cache=None, static_root: Optional[str] = None
+) -> None:
+    """Import and tokenize *modules* across *jobs* processes and merge the results into *apiview*.
+
+    :param ApiView apiview: The ApiView to populate. Its header tokens must already be generated.
+    :param list[str] modules: Sorted module names to process.
+    :param int jobs: Maximum number of worker processes.
+    :param str namespace: The package root namespace.
+    :param SourceIndexCache parse_cache: Optional persistent parse cache shared with the workers.
+    :param str static_root: If set, workers parse the modules from source under this path
+     instead of importing them.
+    """
+    from apistub.nodes import PylintParser
+
+    shards: List[_Shard] = []
+    context = multiprocessing.get_context()
+    try:
+        for shard_modules in _split_modules(modules, jobs):
+            logging.debug("Starting worker for modules {}".format(shard_modules))
+            shards.append(
+                _Shard(
+                    context,
+                    shard_modules,
+                    namespace=namespace,
+                    pkg_name=apiview.package_name,
+                    pkg_version=apiview.package_version,
+                    source_url=apiview.source_url,
+                    metadata_map=apiview.metadata_map,
+                    pylint_items=PylintParser.items,
+                    parse_cache=parse_cache,
+                    static_root=static_root,
+                )
+            )
+
+        # Merge navigation IDs in module order. NodeIndex raises on duplicate names
+        # just as it would when all modules share one index in a serial run.
+        shard_owners: List[List[Optional[str]]] = []
+        for shard in shards:
+            node_ids, owners = shard.receive(_BUILD)
+            for name, namespace_id in node_ids.items():
+                apiview.node_index.add_id(name, namespace_id)
+            shard_owners.append(owners)
+
+        # A serial run assigns ownership while walking modules in order, so the last
+        # shard that claimed an item is its owner.
+        owners = [x.owner for x in PylintParser.items]
+        for i in range(len(owners)):
+            for shard_owner in reversed(shard_owners):
+                if shard_owner[i] is not None:
+                    owners[i] = shard_owner[i]
+                    break
+        PylintParser.set_owners(owners)
+        node_ids: Dict[str, Optional[str]] = apiview.node_index.get_ids()
+        for shard in shards:
+            shard.conn.send((node_ids, owners))
+
+        ## Generate any global diagnostics
+        global_errors = PylintParser.get_items("GLOBAL")
+        for g in global_errors or []:
+            g.generate_tokens(apiview, "GLOBAL")
+
+        for shard in shards:
+            review_lines, diagnostics = shard.receive(_TOKENIZE)
+            apiview.review_lines.extend(review_lines)
+            for diagnostic in diagnostics:
+                apiview.append_diagnostic(diagnostic)
+    finally:
+        for shard in shards:
+            shard.close()
@@ -12,9 +12,11 @@ def parse_overloads(
     functions: List[astroid.FunctionDef],
     *,
     is_module_level: bool = False,
+    node_type=FunctionNode,
 ) -> List[FunctionNode]:
     """Uses AST parsing to look for @overload decorated functions
     because inspect cannot see these. Returns a list of overloads given class or module node and function nodes to look through.
+    Overloads are built with *node_type*, which takes the same arguments as FunctionNode.
     """
     overload_nodes = []
     for func in functions:
@@ -23,7 +25,7 @@ def parse_overloads(
         for ast_dec in func.decorators.nodes:
             try:
                 if ast_dec.name == "overload":
-                    overload_node = FunctionNode(
+                    overload_node = node_type(
                         node.namespace,
                         node,
                         node=func,
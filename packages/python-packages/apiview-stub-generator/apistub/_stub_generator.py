@@ -27,6 +27,8 @@ except ModuleNotFoundError:
     import tomli as tomllib
 
 from apistub._metadata_map import MetadataMap
+from apistub._disk_cache import DEFAULT_CACHE_SIZE_MB
+from apistub._json_stream import write_json
 
 from apistub._generated.treestyle.parser.models import ApiView
 from apistub._generated.treestyle.parser._model_base import (
@@ -102,6 +104,57 @@ class StubGenerator:
                 default=False,
                 action="store_true",
             )
+            parser.add_argument(
+                "--skip-install",
+                help=("Skips installing the package. It must already be installed in the current environment."),
+                default=False,
+                action="store_true",
+            )
+            parser.add_argument(
+                "--static",
+                help=(
+                    "Parses the package source without installing or importing it. Faster and safe to run on "
+                    "untrusted code, but values that only exist at runtime are not shown."
+                ),
+                default=False,
+                action="store_true",
+            )
+            parser.add_argument(
+                "--jobs",
+                type=int,
+                default=1,
+                help=(
+                    "Number of worker processes used to run pylint, import modules and generate tokens. Defaults to 1."
+                ),
+            )
+            parser.add_argument(
+                "--pylint-cache-dir",
+                help=(
+                    "Directory of a persistent pylint result cache. Only files that changed since they were cached are linted."
+                ),
+            )
+            parser.add_argument(
+                "--pylint-cache-size",
+                type=int,
+                default=DEFAULT_CACHE_SIZE_MB,
+                help=(
+                    "Maximum size of the pylint result cache in MB. Defaults to {}.".format(DEFAULT_CACHE_SIZE_MB)
+                ),
+            )
+            parser.add_argument(
+                "--parse-cache-dir",
+                help=(
+                    "Directory of a persistent cache of parsed class source indexes, shared across runs."
+                ),
+            )
+            parser.add_argument(
+                "--parse-cache-size",
+                type=int,
+                default=DEFAULT_CACHE_SIZE_MB,
+                help=(
+                    "Maximum size of the parse cache in MB. Defaults to {}.".format(DEFAULT_CACHE_SIZE_MB)
+                ),
+            )
             self._args = parser.parse_args()
 
         pkg_path = self._parse_arg("pkg_path")
@@ -112,6 +165,13 @@ class StubGenerator:
         filter_namespace = self._parse_arg("filter_namespace")
         source_url = self._parse_arg("source_url")
         skip_pylint = self._parse_arg("skip_pylint")
+        skip_install = self._parse_arg("skip_install")
+        static = self._parse_arg("static")
+        jobs = self._parse_arg("jobs") or 1
+        pylint_cache_dir = self._parse_arg("pylint_cache_dir")
+        pylint_cache_size = self._parse_arg("pylint_cache_size") or DEFAULT_CACHE_SIZE_MB
+        parse_cache_dir = self._parse_arg("parse_cache_dir")
+        parse_cache_size = self._parse_arg("parse_cache_size") or DEFAULT_CACHE_SIZE_MB
 
         if not os.path.exists(pkg_path):
             logging.error("Package path [{}] is invalid".format(pkg_path))
@@ -119,6 +179,9 @@ class StubGenerator:
         elif not os.path.exists(temp_path):
             logging.error("Temp path [{0}] is invalid".format(temp_path))
             exit(1)
+        elif jobs < 1:
+            logging.error("Jobs [{0}] must be at least 1".format(jobs))
+            exit(1)
 
         if os.path.isdir(pkg_path):
             pkg_path = os.path.abspath(pkg_path)
@@ -128,9 +191,17 @@ class StubGenerator:
         self.source_url = source_url
         self.mapping_path = mapping_path
         self.filter_namespace = filter_namespace or ""
+        self.jobs = jobs
+        self.skip_install = skip_install
+        self.static = static
         self.namespace = ""
         if verbose:
             logging.getLogger().setLevel(logging.DEBUG)
+        self.parse_cache = None
+        if parse_cache_dir:
+            from .nodes._class_node import SourceIndexCache
+
+            self.parse_cache = SourceIndexCache(parse_cache_dir, max_size_mb=parse_cache_size)
 
         # Extract package to temp directory if it is wheel or sdist
         if self.pkg_path.endswith((".whl", ".zip", ".tar.gz")):
@@ -139,7 +210,12 @@ class StubGenerator:
             self.wheel_path = None
 
         if not skip_pylint:
-            PylintParser.parse(self.wheel_path or self.pkg_path)
+            PylintParser.parse(
+                self.wheel_path or self.pkg_path,
+                jobs=jobs,
+                cache_dir=pylint_cache_dir,
+                cache_size_mb=pylint_cache_size,
+            )
 
     def _parse_arg(self, name):
         value = self._kwargs.get(name, None)
@@ -174,6 +250,11 @@ class StubGenerator:
 
     def _get_pkg_metadata(self):
         # pkginfo does not get package metadata in 3.10 when running against package root path
+        if not self.wheel_path and self.static:
+            # The package is not installed, so read its metadata from source.
+            pkg_name = self._get_package_name_from_metadata_files(self.pkg_path) or os.path.split(self.pkg_path)[-1]
+            self.extras_require = []
+            return self.pkg_path, pkg_name, self._get_version_from_source(self.pkg_path, pkg_name)
         if not self.wheel_path:
             pkg_root_path = self.pkg_path
             pkg_name = os.path.split(self.pkg_path)[-1]
@@ -199,8 +280,9 @@ class StubGenerator:
 
     def generate_tokens(self):
         # TODO: We should install to a virtualenv
-        logging.debug("Installing package from {}".format(self.pkg_path))
-        self._install_package()
+        if not self.skip_install and not self.static:
+            logging.debug("Installing package from {}".format(self.pkg_path))
+            self._install_package()
         pkg_root_path, pkg_name, version = self._get_pkg_metadata()
         logging.info(
             "package name: {0}, version:{1}".format(
@@ -263,12 +345,27 @@ class StubGenerator:
         if duplicate_ids:
             raise ValueError(f"Duplicate LineIds found: {duplicate_ids}")
 
+    def get_out_file_path(self, apiview):
+        """Returns the path of the JSON token file to write for *apiview*."""
+        # Generate JSON file name if outpath doesn't have json file name
+        if self.out_path.endswith(".json"):
+            return self.out_path
+        return os.path.join(
+            self.out_path, "{0}_python.json".format(apiview.package_name)
+        )
+
     def serialize(self, apiview, encoder=APIViewEncoder):
         # Serialize tokens into JSON
         logging.debug("Serializing tokens into json")
         json_apiview = encoder().encode(apiview)
         return json_apiview
 
+    def serialize_to(self, apiview, fp, encoder=APIViewEncoder):
+        """Writes the same JSON as ``serialize`` to the text file *fp*, one review line at a time,
+        without building the whole document in memory."""
+        logging.debug("Streaming tokens as json")
+        write_json(apiview, fp, encoder())
+
     def _find_modules(self, pkg_root_path):
         """Find modules within the package to import and parse
         :param str: pkg_root_path
@@ -333,13 +430,16 @@ class StubGenerator:
         # Importing it globally can cause circular dependency since it needs NodeIndex that is defined in this file
         from apistub.nodes._module_node import ModuleNode
         from apistub.nodes import PylintParser
-        from apistub.nodes._class_node import clear_caches
+        from apistub.nodes._class_node import clear_caches, set_source_index_cache
         from apistub.nodes._function_node import clear_func_caches
+        from apistub.nodes._static_nodes import StaticModuleNode, load_static_module, static_import_path
 
         # Reset per-file source and astroid caches so multiple packages processed
         # in the same Python process (e.g. the test suite) start with a clean slate.
+        # The persistent parse cache (if any) is content-addressed and stays valid.
         clear_caches()
         clear_func_caches()
+        set_source_index_cache(self.parse_cache)
 
         self.module_dict = {}
         mapping = MetadataMap(pkg_root_path, mapping_path=self.mapping_path)
@@ -355,21 +455,47 @@ class StubGenerator:
         )
         apiview.generate_tokens()
 
+        skipped = [m for m in modules if not m.startswith(self.namespace)]
+        for m in skipped:
+            logging.debug(
+                "Skipping module {0}. Module should start with {1}".format(
+                    m, self.namespace
+                )
+            )
+        modules = [m for m in modules if m.startswith(self.namespace)]
+        static_root = pkg_root_path if self.static else None
+
+        if self.jobs > 1 and len(modules) > 1:
+            # Import and tokenize shards of modules in worker processes.
+            from apistub._parallel import generate_tokens_in_shards
+
+            generate_tokens_in_shards(
+                apiview,
+                modules,
+                jobs=self.jobs,
+                namespace=self.namespace,
+                parse_cache=self.parse_cache,
+                static_root=static_root,
+            )
+            self._evict_parse_cache()
+            return apiview
+
         # load all modules and parse them recursively
-        for m in modules:
-            if not m.startswith(self.namespace):
-                logging.debug(
-                    "Skipping module {0}. Module should start with {1}".format(
-                        m, self.namespace
+        if static_root:
+            with static_import_path(static_root):
+                for m in modules:
+                    logging.debug("Parsing module {}".format(m))
+                    module_obj = load_static_module(m, static_root)
+                    self.module_dict[m] = StaticModuleNode(
+                        m, module_obj, self.namespace, apiview=apiview
                     )
+        else:
+            for m in modules:
+                logging.debug("Importing module {}".format(m))
+                module_obj = importlib.import_module(m)
+                self.module_dict[m] = ModuleNode(
+                    m, module_obj, self.namespace, apiview=apiview
                 )
-                continue
-
-            logging.debug("Importing module {}".format(m))
-            module_obj = importlib.import_module(m)
-            self.module_dict[m] = ModuleNode(
-                m, module_obj, self.namespace, apiview=apiview
-            )
 
         ## Generate any global diagnostics
         global_errors = PylintParser.get_items("GLOBAL")
@@ -383,8 +509,18 @@ class StubGenerator:
             # Generate and add token to APIView
             logging.debug("Generating tokens for module {}".format(m))
             self.module_dict[m].generate_tokens(apiview.review_lines)
+        self._evict_parse_cache()
         return apiview
 
+    def _evict_parse_cache(self):
+        if self.parse_cache:
+            logging.info(
+                "Parse cache: {0} hits, {1} misses".format(
+                    self.parse_cache.hits, self.parse_cache.misses
+                )
+            )
+            self.parse_cache.evict()
+
     def _extract_wheel(self):
         """Extract the wheel into out dir and return root path to azure root directory in package"""
         file_name, _ = os.path.splitext(os.path.basename(self.pkg_path))
@@ -455,53 +591,86 @@ class StubGenerator:
 
         return pkg_name
 
-    def _install_package(self):
-        # Use "-v" so pip streams its full progress - "Collecting" / "Downloading",
-        # the resolver's "looking at multiple versions of <pkg> ..." backtracking
-        # notices, and the "This is taking longer than usual" warning - straight to
-        # the console. That makes a slow dependency resolve easy to diagnose in CI
-        # logs. stderr is captured so we can still raise a friendly error on a Python
-        # version mismatch; stdout is inherited so the verbose log appears live.
-        commands = [sys.executable, "-m", "pip", "install", self.pkg_path, "-v"]
-        print("apistubgen: installing package: {0}".format(" ".join(commands)))
-        start = time.monotonic()
-        try:
-            result = run(
-                commands,
-                timeout=PACKAGE_INSTALL_TIMEOUT_SECONDS,
-                stderr=PIPE,
-                text=True,
-            )
-        except TimeoutExpired:
-            elapsed = time.monotonic() - start
-            print(
-                "apistubgen: pip install of {0} TIMED OUT after {1:.1f}s "
-                "(limit {2}s).".format(
-                    self.pkg_path, elapsed, PACKAGE_INSTALL_TIMEOUT_SECONDS
-                )
-            )
-            raise
+    def _get_version_from_source(self, path, pkg_name):
+        """Read the package version from `pyproject.toml` or, as for Azure SDK packages,
+        the `VERSION` of the package's `_version.py`."""
+        pyproject_path = os.path.join(path, "pyproject.toml")
+        if os.path.exists(pyproject_path):
+            try:
+                with open(pyproject_path, "rb") as f:
+                    version = tomllib.load(f).get("project", {}).get("version")
+                if version:
+                    return version
+            except Exception:
+                pass
+        for package_dir in (pkg_name.replace("-", os.path.sep), pkg_name.replace("-", "_")):
+            version_path = os.path.join(path, package_dir, "_version.py")
+            if not os.path.exists(version_path):
+                continue
+            with open(version_path, "r") as f:
+                match = re.search(r'^VERSION\s*=\s*["\']([^"\']+)["\']', f.read(), re.MULTILINE)
+            if match:
+                return match.group(1)
+        logging.warning("Unable to find the version of {0} in its source.".format(pkg_name))
+        return ""
 
+    def _install_package(self):
+        install_packages([self.pkg_path])
+
+
+def install_packages(pkg_paths, *, timeout=PACKAGE_INSTALL_TIMEOUT_SECONDS):
+    """Install one or more packages into the current environment with a single pip resolve.
+
+    :param list[str] pkg_paths: Package source roots, wheels or sdists to install.
+    :param int timeout: Maximum time (seconds) allowed for the install.
+    """
+    # Use "-v" so pip streams its full progress - "Collecting" / "Downloading",
+    # the resolver's "looking at multiple versions of <pkg> ..." backtracking
+    # notices, and the "This is taking longer than usual" warning - straight to
+    # the console. That makes a slow dependency resolve easy to diagnose in CI
+    # logs. stderr is captured so we can still raise a friendly error on a Python
+    # version mismatch; stdout is inherited so the verbose log appears live.
+    pkgs = " ".join(pkg_paths)
+    commands = [sys.executable, "-m", "pip", "install", *pkg_paths, "-v"]
+    print("apistubgen: installing package: {0}".format(" ".join(commands)))
+    start = time.monotonic()
+    try:
+        result = run(
+            commands,
+            timeout=timeout,
+            stderr=PIPE,
+            text=True,
+        )
+    except TimeoutExpired:
         elapsed = time.monotonic() - start
         print(
-            "apistubgen: pip install of {0} finished in {1:.1f}s.".format(
-                self.pkg_path, elapsed
+            "apistubgen: pip install of {0} TIMED OUT after {1:.1f}s "
+            "(limit {2}s).".format(
+                pkgs, elapsed, timeout
             )
         )
-        stderr = result.stderr or ""
-        if stderr:
-            print("apistubgen: pip stderr:\n{0}".format(stderr.strip()))
-
-        if result.returncode != 0:
-            # pip error format for Python version mismatch:
-            # "ERROR: Package 'x' requires a different Python: 3.10.x not in '>=3.12'"
-            match = re.search(r"requires a different Python[^']*'([^']+)'", stderr, re.IGNORECASE)
-            if match:
-                constraint = match.group(1)  # e.g. ">=3.12" or ">=3.12,<4"
-                ver_match = re.search(r">=?\s*([\d.]+)", constraint)
-                required = ver_match.group(1) if ver_match else constraint
-                raise RuntimeError(
-                    f"This package requires Python >={required}. "
-                    f"Please install at least Python {required} to generate an APIView for this package."
-                )
-            raise CalledProcessError(result.returncode, commands, stderr=stderr)
+        raise
+
+    elapsed = time.monotonic() - start
+    print(
+        "apistubgen: pip install of {0} finished in {1:.1f}s.".format(
+            pkgs, elapsed
+        )
+    )
+    stderr = result.stderr or ""
+    if stderr:
+        print("apistubgen: pip stderr:\n{0}".format(stderr.strip()))
+
+    if result.returncode != 0:
+        # pip error format for Python version mismatch:
+        # "ERROR: Package 'x' requires a different Python: 3.10.x not in '>=3.12'"
+        match = re.search(r"requires a different Python[^']*'([^']+)'", stderr, re.IGNORECASE)
+        if match:
+            constraint = match.group(1)  # e.g. ">=3.12" or ">=3.12,<4"
+            ver_match = re.search(r">=?\s*([\d.]+)", constraint)
+            required = ver_match.group(1) if ver_match else constraint
+            raise RuntimeError(
+                f"This package requires Python >={required}. "
+                f"Please install at least Python {required} to generate an APIView for this package."
+            )
+        raise CalledProcessError(result.returncode, commands, stderr=stderr)
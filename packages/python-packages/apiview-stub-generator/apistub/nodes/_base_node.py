@@ -4,7 +4,7 @@ from inspect import Parameter
 import re
 import types as _builtin_types
 
-from ._pylint_parser import PylintParser
+from ._pylint_parser import PylintParser, get_owner_key
 
 keyword_regex = re.compile(r"<(class|enum) '([\w.]+)'>")
 forward_ref_regex = re.compile(r"ForwardRef\('([\w.]+)'\)")
@@ -131,7 +131,14 @@ class NodeEntityBase:
         :return: True if this node owns the error, False otherwise
         :rtype: bool
         """
-        return err.owner == str(self.obj) and err.obj == str(self.name)
+        return err.owner == get_owner_key(self.obj) and err.obj == str(self.name)
+
+    def pylint_error_candidates(self):
+        """Return the pylint errors that could be owned by this node, so that
+        is_pylint_error_owner does not have to be checked against every error.
+        Must be overridden together with is_pylint_error_owner.
+        """
+        return PylintParser.items_for_owner(get_owner_key(self.obj))
 
     def generate_diagnostics(self):
         self.pylint_errors = PylintParser.get_items(self)
@@ -2,6 +2,7 @@ import ast
 import astroid
 import inspect
 import logging
+import marshal
 import operator
 import sys
 from enum import Enum
@@ -14,6 +15,7 @@ from ._key_node import KeyNode
 from ._property_node import PropertyNode
 from ._docstring_parser import DocstringParser
 from ._variable_node import VariableNode
+from .._disk_cache import DiskCache, hash_bytes
 from .._generated.treestyle.parser.models import ReviewLines
 from .._parsing_helpers import parse_overloads, add_overload_nodes
 
@@ -36,6 +38,11 @@ from .._parsing_helpers import parse_overloads, add_overload_nodes
 #   clear_caches       – resets all dicts; called at the start of each
 #                        StubGenerator._generate_tokens() run so the test suite
 #                        and multi-package runs stay correct.
+#
+# The per-file class line ranges can additionally be persisted across runs and
+# processes with a SourceIndexCache (see set_source_index_cache), so batch jobs
+# that generate APIViews for many versions of a package skip re-parsing files
+# whose content has not changed.
 # ---------------------------------------------------------------------------
 
 # file_path -> {qualname: extracted_source_text}  (precomputed in _build_file_index)
@@ -44,6 +51,42 @@ _FILE_CLASS_SOURCE: Dict[str, Dict[str, str]] = {}
 _FILE_CLASS_LINES: Dict[str, Dict[str, Tuple[int, int]]] = {}
 # (file_path, qualname) -> Optional[astroid.ClassDef]
 _CLASS_ASTROID_CACHE: Dict[Tuple[Optional[str], Optional[str]], Optional[object]] = {}
+# Optional persistent cache of _FILE_CLASS_LINES entries, keyed on file content.
+_SOURCE_INDEX_CACHE: Optional["SourceIndexCache"] = None
+
+# Bump when the layout of SourceIndexCache entries changes.
+_SOURCE_INDEX_FORMAT_VERSION = b"1"
+
+
+class SourceIndexCache(DiskCache):
+    """Content-addressed on-disk cache of the class line ranges of source files.
+
+    Entries are marshalled ``{qualname: (start_1based, end_1based)}`` dicts keyed on
+    the hash of the file content and the Python version whose ``ast`` produced them.
+    """
+
+    extension = ".marshal"
+
+    def _dumps(self, value: Dict[str, Tuple[int, int]]) -> bytes:
+        return marshal.dumps(value)
+
+    def _loads(self, data: bytes) -> Dict[str, Tuple[int, int]]:
+        return marshal.loads(data)
+
+    def key(self, source: str) -> str:
+        """Return the cache key for a file with the given *source* text."""
+        python_version = "{0}.{1}".format(*sys.version_info[:2]).encode("utf-8")
+        return hash_bytes(_SOURCE_INDEX_FORMAT_VERSION, python_version, source.encode("utf-8"))
+
+
+def set_source_index_cache(cache: Optional[SourceIndexCache]) -> None:
+    """Enable (or with None, disable) the persistent class source index cache."""
+    global _SOURCE_INDEX_CACHE
+    _SOURCE_INDEX_CACHE = cache
+
+
+def get_source_index_cache() -> Optional[SourceIndexCache]:
+    return _SOURCE_INDEX_CACHE
 
 
 def _collect_class_defs(node, parent_qualname: str = ""):
@@ -76,16 +119,25 @@ def _build_file_index(file_path: str) -> None:
     # Split lines ONCE so we can slice cheaply for each class.
     lines = source.splitlines(keepends=True)
     src_index: Dict[str, str] = {}
-    line_index: Dict[str, Tuple[int, int]] = {}
-    try:
-        tree = ast.parse(source)
-        for qualname, start, end in _collect_class_defs(tree):
-            # Precompute and store the source slice — O(1) lookup later.
-            src_index[qualname] = "".join(lines[start:end])
-            # Store 1-based inclusive line range for pylint error matching.
-            line_index[qualname] = (start + 1, end)
-    except SyntaxError:
-        pass
+    line_index: Optional[Dict[str, Tuple[int, int]]] = None
+    cache_key = None
+    if _SOURCE_INDEX_CACHE is not None:
+        cache_key = _SOURCE_INDEX_CACHE.key(source)
+        line_index = _SOURCE_INDEX_CACHE.get(cache_key)
+    if line_index is None:
+        line_index = {}
+        try:
+            tree = ast.parse(source)
+            for qualname, start, end in _collect_class_defs(tree):
+                # Store 1-based inclusive line range for pylint error matching.
+                line_index[qualname] = (start + 1, end)
+        except SyntaxError:
+            pass
+        if cache_key is not None:
+            _SOURCE_INDEX_CACHE.put(cache_key, line_index)
+    for qualname, (start, end) in line_index.items():
+        # Precompute and store the source slice — O(1) lookup later.
+        src_index[qualname] = "".join(lines[start - 1:end])
     _FILE_CLASS_SOURCE[file_path] = src_index
     _FILE_CLASS_LINES[file_path] = line_index
 
@@ -207,6 +259,9 @@ ABSTRACT_CLASS_METHODS = {
 class ClassNode(NodeEntityBase):
     """Class node to represent parsed class node and children"""
 
+    # Node type used for the class's variables
+    _variable_node_type = VariableNode
+
     def __init__(
         self,
         *,
@@ -308,7 +363,7 @@ class ClassNode(NodeEntityBase):
             if type_string:
                 is_ivar = not type_string.startswith("ClassVar")
             self.child_nodes.append(
-                VariableNode(
+                self._variable_node_type(
                     namespace=self.namespace,
                     parent_node=self,
                     name=name,
@@ -468,7 +523,7 @@ class ClassNode(NodeEntityBase):
         if docstring:
             docstring_parser = DocstringParser(docstring, apiview=self.apiview)
             for key, var in docstring_parser.ivars.items():
-                ivar_node = VariableNode(
+                ivar_node = self._variable_node_type(
                     namespace=self.namespace,
                     parent_node=self,
                     name=key,
@@ -27,16 +27,14 @@ class DataClassNode(ClassNode):
         for child in self.child_nodes:
             if child.display_name == "__init__":
                 child.return_type = None
-        self.dataclass_params = self._extract_properties(
-            getattr(obj, "__dataclass_params__", None)
-        )
+        self.dataclass_params = self._extract_properties(self._get_dataclass_params())
         self._allow_list = [
             f"__{x.argname}__" for x in self.dataclass_params if x.default == True
         ]
 
         # while dataclass properties looks like class variables, they are
         # actually instance variables
-        dataclass_fields = getattr(obj, "__dataclass_fields__", None) or {}
+        dataclass_fields = self._get_dataclass_fields() or {}
         for name, properties in dataclass_fields.items():
             # convert the cvar to ivar
             var_match = [
@@ -49,6 +47,12 @@ class DataClassNode(ClassNode):
                 match.is_ivar = True
                 match.dataclass_properties = self._extract_properties(properties)
 
+    def _get_dataclass_params(self):
+        return getattr(self.obj, "__dataclass_params__", None)
+
+    def _get_dataclass_fields(self):
+        return getattr(self.obj, "__dataclass_fields__", None)
+
     """ Extract dataclass properties.
     
     :param class params: An object containing dataclass members.
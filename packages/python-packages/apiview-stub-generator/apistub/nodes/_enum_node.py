@@ -1,6 +1,7 @@
 from typing import TYPE_CHECKING
 
 from ._base_node import NodeEntityBase
+from ._pylint_parser import PylintParser
 from .._generated.treestyle.parser.models import ReviewToken as Token, TokenKind
 
 if TYPE_CHECKING:
@@ -30,6 +31,9 @@ class EnumNode(NodeEntityBase):
         # Check if error obj ends with the parent enum class name and column > 0 (indicating enum value)
         return err.obj.endswith(self.parent_node.name) and err.column > 0
 
+    def pylint_error_candidates(self):
+        return PylintParser.items_for_obj_suffix(self.parent_node.name)
+
     def check_handwritten(self):
         """Check if the enum is handwritten by inheriting from parent class.
         Enum values inherit handwritten status from their parent enum class.
@@ -10,6 +10,7 @@ from ._astroid_parser import AstroidFunctionParser
 from ._docstring_parser import DocstringParser
 from ._base_node import NodeEntityBase, get_qualified_name
 from ._argtype import ArgType
+from ._pylint_parser import PylintParser
 from .._generated.treestyle.parser.models import ReviewLines
 
 
@@ -160,9 +161,7 @@ class FunctionNode(NodeEntityBase):
             self.special_vararg = parser.special_vararg
         self._parse_docstring()
 
-    def _parse_docstring(self):
-        # Parse docstring to get list of keyword args, type and default value for both positional and
-        # kw args and return type( if not already found in signature)
+    def _get_docstring(self):
         docstring = ""
         if hasattr(self.obj, "__doc__"):
             docstring = getattr(self.obj, "__doc__")
@@ -173,6 +172,12 @@ class FunctionNode(NodeEntityBase):
             and hasattr(self.parent_node.obj, "__doc__")
         ):
             docstring = getattr(self.parent_node.obj, "__doc__")
+        return docstring
+
+    def _parse_docstring(self):
+        # Parse docstring to get list of keyword args, type and default value for both positional and
+        # kw args and return type( if not already found in signature)
+        docstring = self._get_docstring()
 
         if docstring:
             #  Parse doc string to find missing types, kwargs and return type
@@ -435,6 +440,9 @@ class FunctionNode(NodeEntityBase):
         """
         return err.obj and err.obj.endswith(f".{self.name}")
 
+    def pylint_error_candidates(self):
+        return PylintParser.items_for_obj_suffix(f".{self.name}")
+
 
     def generate_tokens(self, review_lines):
         """Generates token for function signature
@@ -4,6 +4,7 @@ import inspect
 from ._base_node import NodeEntityBase, get_qualified_name
 from ._docstring_parser import DocstringParser
 from ._astroid_parser import AstroidFunctionParser
+from ._pylint_parser import PylintParser
 
 
 class PropertyNode(NodeEntityBase):
@@ -29,6 +30,11 @@ class PropertyNode(NodeEntityBase):
         """
         return err.obj and self.obj.fget and err.obj.endswith(f".{self.obj.fget.__name__}")
 
+    def pylint_error_candidates(self):
+        if not self.obj.fget:
+            return []
+        return PylintParser.items_for_obj_suffix(f".{self.obj.fget.__name__}")
+
     def _inspect(self):
         """Identify property name, type and readonly property"""
         if getattr(self.obj, "fset", None):
@@ -0,0 +1,100 @@
+import configparser
+import importlib.metadata
+import json
+import os
+import re
+import sys
+from typing import Dict, List
+
+from .._disk_cache import DEFAULT_CACHE_SIZE_MB, DiskCache, hash_bytes, hash_file
+
+# Bump when the layout of cache entries changes.
+_CACHE_FORMAT_VERSION = "1"
+_CHECKER_DISTRIBUTION = "azure-pylint-guidelines-checker"
+
+
+def _distribution_version(name: str) -> str:
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def discover_files(path: str, rcfile_path: str) -> List[str]:
+    """Return the Python files that ``pylint --recursive=y`` would lint under *path*.
+
+    Mirrors pylint's file discovery, including the ``ignore`` and ``ignore-patterns``
+    options of *rcfile_path*, which only apply to discovered (not explicitly
+    passed) files.
+    """
+    if os.path.isfile(path):
+        return [path]
+    parser = configparser.ConfigParser(interpolation=None)
+    parser.read(rcfile_path)
+    # pylint accepts both the current and the legacy name of the main section.
+    section = "MAIN" if parser.has_section("MAIN") else "MASTER"
+    ignore = [
+        x.strip() for x in parser.get(section, "ignore", fallback="CVS").split(",") if x.strip()
+    ]
+    ignore_patterns = [
+        re.compile(x.strip())
+        for x in parser.get(section, "ignore-patterns", fallback=r"^\.#").split(",")
+        if x.strip()
+    ]
+
+    def _is_ignored(basename):
+        return basename in ignore or any(p.match(basename) for p in ignore_patterns)
+
+    files = []
+    for root, dirs, filenames in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if not _is_ignored(d))
+        if "__init__.py" in filenames:
+            # Within a package pylint only descends into sub-packages.
+            dirs[:] = [d for d in dirs if os.path.isfile(os.path.join(root, d, "__init__.py"))]
+        for filename in sorted(filenames):
+            if filename.endswith(".py") and not _is_ignored(filename):
+                files.append(os.path.join(root, filename))
+    return files
+
+
+class PylintCache(DiskCache):
+    """Persistent cache of per-file pylint JSON messages.
+
+    Entries are keyed on the SHA-256 of the file content combined with the Python,
+    pylint and guidelines checker versions and the hash of the ``.pylintrc`` used,
+    so only files whose content (or tooling) changed have to be linted again.
+    Each entry is a small JSON file under *cache_dir*; once the cache exceeds
+    *max_size_mb*, the least recently used entries are evicted.
+
+    Note that a file's messages are reused when only a module it imports changed.
+    Use a fresh cache directory if such cross-module results must be recomputed.
+
+    :param str cache_dir: Directory to store cache entries in. Created if missing.
+    :param str rcfile_path: Path to the ``.pylintrc`` pylint runs with.
+    :param int max_size_mb: Maximum size of the cache directory in megabytes.
+    """
+
+    extension = ".json"
+
+    def __init__(self, cache_dir: str, rcfile_path: str, *, max_size_mb: int = DEFAULT_CACHE_SIZE_MB):
+        import pylint
+
+        super().__init__(cache_dir, max_size_mb=max_size_mb)
+        environment = [
+            _CACHE_FORMAT_VERSION,
+            "{0}.{1}".format(*sys.version_info[:2]),
+            pylint.__version__,
+            _distribution_version(_CHECKER_DISTRIBUTION),
+            hash_file(rcfile_path),
+        ]
+        self._environment_key = "|".join(environment).encode("utf-8")
+
+    def _dumps(self, value: List[Dict]) -> bytes:
+        return json.dumps(value).encode("utf-8")
+
+    def _loads(self, data: bytes) -> List[Dict]:
+        return json.loads(data.decode("utf-8"))
+
+    def key(self, file_path: str) -> str:
+        """Return the cache key for the current content of *file_path*."""
+        return hash_bytes(self._environment_key, hash_file(file_path).encode("utf-8"))
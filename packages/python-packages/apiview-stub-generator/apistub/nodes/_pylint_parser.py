@@ -1,3 +1,5 @@
+import astroid
+import bisect
 import inspect
 import json
 import logging
@@ -6,13 +8,38 @@ import re
 import subprocess
 import sys
 from types import SimpleNamespace
-from typing import Dict, List, Union, TYPE_CHECKING
+from typing import Dict, Iterable, List, Optional, Tuple, Union, TYPE_CHECKING
+
+from ._pylint_cache import DEFAULT_CACHE_SIZE_MB, PylintCache, discover_files
 
 if TYPE_CHECKING:
     from ._base_node import NodeEntityBase
 
 _HELP_LINK_REGEX = re.compile(r"(.+) See details: *([^\s]+)")
 
+# Source nodes that own pylint errors when a package is parsed without importing it.
+_STATIC_OWNER_NODES = (astroid.nodes.Module, astroid.nodes.ClassDef, astroid.nodes.FunctionDef)
+
+
+def get_owner_key(obj) -> str:
+    """Return the key that identifies *obj* as the owner of pylint errors.
+
+    Imported objects are identified by ``str(obj)``. Astroid nodes, which stand in
+    for them when a package is parsed statically, by their file, name and line.
+    """
+    if isinstance(obj, _STATIC_OWNER_NODES):
+        return "{0}:{1}:{2}".format(obj.root().file, obj.qname(), obj.lineno)
+    return str(obj)
+
+
+def _static_line_range(node) -> Tuple[int, int]:
+    """Return the 1-based inclusive line range of *node*, including its decorators."""
+    start_line = node.lineno
+    decorators = getattr(node, "decorators", None)
+    if decorators:
+        start_line = min(start_line, decorators.nodes[0].fromlineno)
+    return start_line, node.tolineno
+
 
 class PylintError:
 
@@ -52,12 +79,69 @@ class PylintError:
         apiview.add_diagnostic(err=self, target_id=target_id)
 
 
+class _SuffixTrie:
+    """A trie over reversed strings, used to answer "ends with" queries without
+    scanning every key.
+
+    ``find_keys_ending_with(suffix)`` returns the values of all keys that end with
+    *suffix* and ``find_suffixes_of(text)`` returns the values of all keys that
+    *text* ends with. Both cost O(len(query) + results) rather than O(keys).
+    """
+
+    def __init__(self):
+        self._root = {}
+
+    def add(self, key: str, value) -> None:
+        node = self._root
+        for char in reversed(key):
+            node = node.setdefault(char, {})
+        node.setdefault(None, []).append(value)
+
+    def find_keys_ending_with(self, suffix: str) -> list:
+        node = self._root
+        for char in reversed(suffix):
+            node = node.get(char)
+            if node is None:
+                return []
+        values = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for char, child in node.items():
+                if char is None:
+                    values.extend(child)
+                else:
+                    stack.append(child)
+        return values
+
+    def find_suffixes_of(self, text: str) -> list:
+        node = self._root
+        values = list(node.get(None, []))
+        for char in reversed(text):
+            node = node.get(char)
+            if node is None:
+                break
+            values.extend(node.get(None, []))
+        return values
+
+
 class PylintParser:
 
     AZURE_CHECKER_CODE = "47"
 
     items: List[PylintError] = []
-    _path_to_items: Dict[str, List[PylintError]] = {}
+    # Lookup structures rebuilt by load_items so that ownership assignment and
+    # per-node lookups do not have to scan every item:
+    #   _item_order  – id(item) -> position in items, to keep results in pylint order.
+    #   _path_trie   – file path key -> (insertion order, path key) for match_items.
+    #   _path_lines  – file path key -> (sorted lines, items sorted by line).
+    #   _obj_trie    – err.obj -> items, for the "obj ends with name" owner checks.
+    #   _owner_index – owner -> items, built lazily and reset whenever ownership changes.
+    _item_order: Dict[int, int] = {}
+    _path_trie: _SuffixTrie = _SuffixTrie()
+    _path_lines: Dict[str, Tuple[List[int], List[PylintError]]] = {}
+    _obj_trie: _SuffixTrie = _SuffixTrie()
+    _owner_index: Optional[Dict[str, List[PylintError]]] = None
 
     @classmethod
     def _normalize_namespace_inits(cls, path):
@@ -130,7 +214,87 @@ class PylintParser:
         return overwritten
 
     @classmethod
-    def parse(cls, path):
+    def _run_pylint(cls, targets: List[str], rcfile_path: str, jobs: int) -> Tuple[List[Dict], bool]:
+        """Run pylint over *targets* and return its JSON messages and whether the run
+        completed cleanly enough for its results to be cached."""
+        # Run pylint in a subprocess so that each analysis starts with a clean
+        # Python/astroid state and is not affected by packages already imported
+        # in the current process (e.g. during a full test-suite run).
+        cmd = [sys.executable, "-m", "pylint", *targets, "-f", "json", "--rcfile", rcfile_path]
+        if jobs > 1:
+            cmd.extend(["-j", str(jobs)])
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        try:
+            raw_messages = json.loads(result.stdout or "[]")
+        except json.JSONDecodeError:
+            logging.warning(
+                "pylint produced non-JSON output for %s (exit code %s). stderr: %r stdout: %r",
+                targets, result.returncode, result.stderr[:500], result.stdout[:200],
+            )
+            return [], False
+        if jobs > 1:
+            # Parallel pylint runs can report the same message more than once.
+            unique = {}
+            for m in raw_messages:
+                unique.setdefault(json.dumps(m, sort_keys=True), m)
+            raw_messages = list(unique.values())
+        # Exit status bits 1 and 32 flag a fatal message and a usage error.
+        completed = not result.returncode & (1 | 32) and not any(
+            m.get("symbol") == "bad-plugin-value" for m in raw_messages
+        )
+        return raw_messages, completed
+
+    @classmethod
+    def _run_pylint_cached(cls, path: str, rcfile_path: str, jobs: int, cache: PylintCache) -> List[Dict]:
+        """Return pylint messages for *path*, only linting files that are not in *cache*."""
+        files = discover_files(path, rcfile_path)
+        keys = {}
+        file_messages: Dict[str, List[Dict]] = {}
+        for file_path in files:
+            key = cache.key(file_path)
+            cached = cache.get(key)
+            if cached is None:
+                keys[file_path] = key
+            else:
+                file_messages[file_path] = [dict(m, path=file_path) for m in cached]
+        logging.debug(f"pylint cache: {cache.hits} hits, {cache.misses} misses")
+
+        run_messages = []
+        if keys:
+            raw_messages, completed = cls._run_pylint(list(keys), rcfile_path, jobs)
+            by_file = {os.path.normcase(os.path.abspath(f)): f for f in keys}
+            linted = {f: [] for f in keys}
+            for m in raw_messages:
+                file_path = by_file.get(os.path.normcase(os.path.abspath(m.get("path") or "")))
+                if file_path:
+                    linted[file_path].append(m)
+                else:
+                    # Not attributable to a single file (e.g. a plugin load failure).
+                    run_messages.append(m)
+            for file_path, messages in linted.items():
+                messages.sort(key=lambda m: (m.get("line") or 0, m.get("column") or 0))
+                file_messages[file_path] = messages
+                if completed:
+                    cache.put(keys[file_path], messages)
+            cache.evict()
+
+        # Order by file (and by line within each file above) so that cached and
+        # fresh results produce the same item order regardless of ``jobs``.
+        messages = list(run_messages)
+        for file_path in files:
+            messages.extend(file_messages.get(file_path, []))
+        return messages
+
+    @classmethod
+    def parse(cls, path, *, jobs: int = 1, cache_dir: Optional[str] = None, cache_size_mb: int = DEFAULT_CACHE_SIZE_MB):
+        """Run pylint over *path* and load the Azure guidelines checker errors.
+
+        :param str path: The package root or extracted wheel/sdist directory.
+        :param int jobs: Number of parallel pylint processes (``-j``).
+        :param str cache_dir: Optional directory of a persistent per-file result cache.
+         When provided, only files that changed since they were cached are linted.
+        :param int cache_size_mb: Maximum size of the cache directory in megabytes.
+        """
         from apistub import ApiView
 
         # Replace namespace azure/__init__.py files so pylint resolves
@@ -143,20 +307,12 @@ class PylintParser:
         rcfile_path = os.path.join(ApiView.get_root_path(), ".pylintrc")
         logging.debug(f"APIView root path: {ApiView.get_root_path()}")
 
-        # Run pylint in a subprocess so that each analysis starts with a clean
-        # Python/astroid state and is not affected by packages already imported
-        # in the current process (e.g. during a full test-suite run).
-        cmd = [sys.executable, "-m", "pylint", path, "-f", "json", "--recursive=y", "--rcfile", rcfile_path]
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            try:
-                raw_messages = json.loads(result.stdout or "[]")
-            except json.JSONDecodeError:
-                logging.warning(
-                    "pylint produced non-JSON output for %s (exit code %s). stderr: %r stdout: %r",
-                    path, result.returncode, result.stderr[:500], result.stdout[:200],
-                )
-                raw_messages = []
+            if cache_dir:
+                cache = PylintCache(cache_dir, rcfile_path, max_size_mb=cache_size_mb)
+                raw_messages = cls._run_pylint_cached(path, rcfile_path, jobs, cache)
+            else:
+                raw_messages, _ = cls._run_pylint([path, "--recursive=y"], rcfile_path, jobs)
         finally:
             for init_path, content in overwritten.items():
                 try:
@@ -190,42 +346,65 @@ class PylintParser:
             logging.error(
                 f"Unable to load pylint_guidelines_checker. Check that it is installed."
             )
-        cls.items = [
-            PylintError(pkg_name, x)
-            for x in messages
-            if x.msg_id[1:3] == PylintParser.AZURE_CHECKER_CODE
-        ]
-        # Build a path-keyed index so match_items can skip items in other files
-        # without iterating over the full list for every node.
-        cls._path_to_items = {}
-        for item in cls.items:
+        cls.load_items(
+            [
+                PylintError(pkg_name, x)
+                for x in messages
+                if x.msg_id[1:3] == PylintParser.AZURE_CHECKER_CODE
+            ]
+        )
+
+    @classmethod
+    def load_items(cls, items: List[PylintError]) -> None:
+        """Replace the parsed pylint errors, e.g. with the ones handed to a worker process."""
+        cls.items = items
+        cls._item_order = {id(item): i for i, item in enumerate(items)}
+        path_to_items: Dict[str, List[PylintError]] = {}
+        cls._obj_trie = _SuffixTrie()
+        for item in items:
             if item.path:
-                cls._path_to_items.setdefault(item.path, []).append(item)
+                path_to_items.setdefault(item.path, []).append(item)
+            if item.obj is not None:
+                cls._obj_trie.add(item.obj, item)
+        cls._path_trie = _SuffixTrie()
+        cls._path_lines = {}
+        for i, (path_key, path_items) in enumerate(path_to_items.items()):
+            cls._path_trie.add(path_key, (i, path_key))
+            path_items = sorted(path_items, key=lambda x: x.line)
+            cls._path_lines[path_key] = ([x.line for x in path_items], path_items)
+        cls._owner_index = None
+
+    @classmethod
+    def set_owners(cls, owners: List[Optional[str]]) -> None:
+        """Assign the owner of every item, in the same order as ``items``."""
+        for item, owner in zip(cls.items, owners):
+            item.owner = owner
+        cls._owner_index = None
 
     @classmethod
     def match_items(cls, obj) -> None:
         if not cls.items:
             return
+        is_static = isinstance(obj, _STATIC_OWNER_NODES)
         try:
-            source_file = inspect.getsourcefile(obj)
+            source_file = obj.root().file if is_static else inspect.getsourcefile(obj)
             if not source_file:
                 return
         except Exception:
             return
 
-        # Find the subset of pylint errors that belong to this source file.
-        # Iterating over unique path keys (typically O(tens)) is much cheaper
-        # than scanning all items for every node.
-        candidates = None
-        for path_key, path_items in cls._path_to_items.items():
-            if source_file.endswith(path_key):
-                candidates = path_items
-                break
-        if not candidates:
+        # Find the subset of pylint errors that belong to this source file. When
+        # several path keys are suffixes of the file, the first parsed one wins.
+        matches = cls._path_trie.find_suffixes_of(source_file)
+        if not matches:
             return
+        _, path_key = min(matches)
+        lines, candidates = cls._path_lines[path_key]
 
         try:
-            if inspect.isclass(obj):
+            if is_static:
+                start_line, end_line = _static_line_range(obj)
+            elif inspect.isclass(obj):
                 # Avoid inspect.getsourcelines for classes — it triggers an
                 # O(N_lines) ast.parse + AST walk (Python's _ClassFinder).
                 # Use our pre-built file index instead.  The lazy import is
@@ -242,17 +421,40 @@ class PylintParser:
         except Exception:
             return
 
-        for item in candidates:
+        # Items are sorted by line, so only the ones within the object's range are visited.
+        first = bisect.bisect_left(lines, start_line)
+        last = bisect.bisect_right(lines, end_line)
+        if first == last:
+            return
+        owner = get_owner_key(obj)
+        for item in candidates[first:last]:
             # nested items will overwrite ownership of their containing parent.
-            if item.line >= start_line and item.line <= end_line:
-                item.owner = str(obj)
+            item.owner = owner
+        cls._owner_index = None
+
+    @classmethod
+    def items_for_owner(cls, owner: str) -> List[PylintError]:
+        """Return the items claimed by *owner*, in pylint order."""
+        if cls._owner_index is None:
+            cls._owner_index = {}
+            for item in cls.items:
+                if item.owner:
+                    cls._owner_index.setdefault(item.owner, []).append(item)
+        return cls._owner_index.get(owner, [])
+
+    @classmethod
+    def items_for_obj_suffix(cls, suffix: str) -> List[PylintError]:
+        """Return the items whose ``obj`` ends with *suffix*, in pylint order."""
+        items = cls._obj_trie.find_keys_ending_with(suffix)
+        items.sort(key=lambda x: cls._item_order.get(id(x), 0))
+        return items
 
     @classmethod
     def get_items(cls, node: Union["NodeEntityBase", str]) -> List[PylintError]:
         if isinstance(node, str): # "GLOBAL"
-            items = [x for x in cls.items if x.owner == str(node)]
+            items = list(cls.items_for_owner(node))
         else:
-            items = [x for x in cls.items if node.is_pylint_error_owner(x)]
+            items = [x for x in node.pylint_error_candidates() if node.is_pylint_error_owner(x)]
         return items
 
     @classmethod
@@ -0,0 +1,752 @@
+"""
+Import-free counterparts of the node classes, used by ``apistubgen --static``.
+
+Instead of importing the package and inspecting live objects, these nodes walk the
+astroid trees of the package's source files. Each one stands in for the node that
+would otherwise be built from the imported object, so the ApiView is built from the
+same tree and rendered by the same ``generate_tokens`` code:
+
+  StaticModuleNode     - ``__all__`` (including ``__all__.extend(...)`` of patch files),
+                         star imports and re-exports are resolved through astroid.
+  StaticClassNode      - members are collected along the astroid MRO, with the same
+                         filtering as ``inspect.getmembers`` in ClassNode.
+  StaticDataClassNode  - dataclass parameters and fields are computed by applying
+                         ``dataclasses.dataclass`` to a stand-in class, so nothing from
+                         the package is executed.
+  StaticFunctionNode, StaticPropertyNode - read signatures and docstrings from source.
+
+No module of the package is imported, so the package does not have to be installed.
+Values that only exist at runtime (e.g. classes created by ``make_dataclass`` or
+class attributes computed by calls) are skipped.
+"""
+
+import ast
+import builtins
+import contextlib
+import dataclasses
+import functools
+import inspect
+import logging
+import os
+import sys
+import typing
+from typing import Dict, Iterator, List, Optional
+
+import astroid
+
+from ._astroid_parser import AstroidFunctionParser
+from ._base_node import get_qualified_name
+from ._class_node import (
+    ClassNode,
+    _FILE_CLASS_SOURCE,
+    _build_file_index,
+)
+from ._data_class_node import DataClassNode
+from ._docstring_parser import DocstringParser
+from ._enum_node import EnumNode
+from ._function_node import FunctionNode
+from ._key_node import KeyNode
+from ._module_node import ModuleNode
+from ._property_node import PropertyNode
+from ._variable_node import VariableNode
+from ._pylint_parser import PylintParser
+from .._parsing_helpers import parse_overloads, add_overload_nodes
+
+_ENUM_BASE = "enum.Enum"
+_TYPEDDICT_NAMES = ("TypedDict", "typing.TypedDict", "typing_extensions.TypedDict")
+_VARIABLE_TYPES = (str, int, dict, list, float, bool)
+_BUILTIN_FACTORIES = {"list": list, "dict": dict, "set": set, "tuple": tuple}
+# Decorators that turn a method into a descriptor that is neither a function nor a property.
+_DESCRIPTOR_DECORATORS = ("cached_property", "functools.cached_property")
+
+
+@contextlib.contextmanager
+def static_import_path(pkg_root_path: str) -> Iterator[None]:
+    """Let astroid resolve the package's own imports from *pkg_root_path*.
+
+    Only astroid's module lookup reads ``sys.path`` while it is extended; nothing
+    is imported.
+    """
+    sys.path.insert(0, pkg_root_path)
+    try:
+        yield
+    finally:
+        sys.path.remove(pkg_root_path)
+
+
+def load_static_module(module_name: str, pkg_root_path: str) -> astroid.Module:
+    """Return the astroid tree of *module_name*, read from its file under *pkg_root_path*."""
+    base_path = os.path.join(pkg_root_path, *module_name.split("."))
+    if os.path.isdir(base_path):
+        file_path = os.path.join(base_path, "__init__.py")
+    else:
+        file_path = base_path + ".py"
+    return astroid.MANAGER.ast_from_file(file_path, modname=module_name, source=True)
+
+
+def _literal(node):
+    """Return the Python value of a literal expression *node*, or raise ValueError."""
+    return ast.literal_eval(node.as_string(preserve_quotes=True))
+
+
+def _docstring(node) -> Optional[str]:
+    doc_node = getattr(node, "doc_node", None)
+    return doc_node.value if doc_node else None
+
+
+def _is_in_package(node, pkg_root_namespace: str) -> bool:
+    return node.root().name.startswith(pkg_root_namespace)
+
+
+def _infer(node) -> Optional[astroid.NodeNG]:
+    """Return the single value *node* infers to, or None if it can't be inferred."""
+    try:
+        value = next(node.infer())
+    except (astroid.InferenceError, StopIteration):
+        return None
+    return None if value is astroid.Uninferable else value
+
+
+def _getattr(scope, name: str) -> Optional[astroid.NodeNG]:
+    """Return what *name* is bound to in *scope*, following imports and re-exports."""
+    try:
+        value = next(scope.igetattr(name))
+    except (astroid.InferenceError, astroid.AttributeInferenceError, StopIteration):
+        return None
+    return None if value is astroid.Uninferable else value
+
+
+def _all_names(module: astroid.Module, seen=None) -> Optional[List[str]]:
+    """Return the names listed in ``__all__`` of *module*, or None if it is not defined.
+
+    Follows the statements that build ``__all__`` in order, including the
+    ``__all__.extend([p for p in _patch_all if p not in __all__])`` idiom of
+    generated packages.
+    """
+    seen = seen or set()
+    if module.name in seen or "__all__" not in module.locals:
+        return None
+    seen.add(module.name)
+
+    def _names(node) -> List[str]:
+        if isinstance(node, (astroid.nodes.List, astroid.nodes.Tuple, astroid.nodes.Set)):
+            return [x.value for x in node.elts if isinstance(x, astroid.nodes.Const) and isinstance(x.value, str)]
+        if isinstance(node, astroid.nodes.ListComp):
+            return _names(node.generators[0].iter)
+        if isinstance(node, astroid.nodes.BinOp) and node.op == "+":
+            return _names(node.left) + _names(node.right)
+        if isinstance(node, astroid.nodes.Name):
+            for assignment in node.lookup(node.name)[1]:
+                statement = assignment.statement()
+                # e.g. from ._patch import __all__ as _patch_all
+                if isinstance(statement, astroid.nodes.ImportFrom):
+                    for name, alias in statement.names:
+                        if name == "__all__" and (alias or name) == node.name:
+                            try:
+                                imported = statement.do_import_module(statement.modname)
+                            except astroid.AstroidBuildingError:
+                                return []
+                            return _all_names(imported, seen) or []
+            value = _infer(node)
+            return _names(value) if value is not None and value is not node else []
+        return []
+
+    names: List[str] = []
+    for statement in module.body:
+        if isinstance(statement, (astroid.nodes.Assign, astroid.nodes.AnnAssign)):
+            targets = statement.targets if isinstance(statement, astroid.nodes.Assign) else [statement.target]
+            if any(isinstance(t, astroid.nodes.AssignName) and t.name == "__all__" for t in targets):
+                names = _names(statement.value)
+        elif isinstance(statement, astroid.nodes.AugAssign):
+            if isinstance(statement.target, astroid.nodes.AssignName) and statement.target.name == "__all__":
+                names.extend(_names(statement.value))
+        elif isinstance(statement, astroid.nodes.Expr) and isinstance(statement.value, astroid.nodes.Call):
+            func = statement.value.func
+            if (
+                isinstance(func, astroid.nodes.Attribute)
+                and isinstance(func.expr, astroid.nodes.Name)
+                and func.expr.name == "__all__"
+                and statement.value.args
+            ):
+                if func.attrname == "extend":
+                    names.extend(x for x in _names(statement.value.args[0]) if x not in names)
+                elif func.attrname == "append":
+                    value = statement.value.args[0]
+                    if isinstance(value, astroid.nodes.Const) and isinstance(value.value, str):
+                        names.append(value.value)
+    return names
+
+
+def _type_name(node, namespace: str) -> str:
+    """Render the annotation *node* the way ``get_qualified_name`` renders its evaluated
+    type: classes of the package are fully qualified, everything else is kept as written."""
+    if isinstance(node, (astroid.nodes.Name, astroid.nodes.Attribute)):
+        value = _infer(node)
+        if isinstance(value, astroid.nodes.ClassDef):
+            if value.root().name.startswith(namespace):
+                return "{0}.{1}".format(value.root().name, value.name)
+            # Other classes render by their name only, however they are imported.
+            return value.name
+        return node.as_string()
+    if isinstance(node, astroid.nodes.Subscript):
+        if node.value.as_string().split(".")[-1] == "Literal":
+            values = node.slice.elts if isinstance(node.slice, astroid.nodes.Tuple) else [node.slice]
+            return "{0}[{1}]".format(
+                node.value.as_string(),
+                ", ".join(
+                    '"{0}"'.format(x.value) if isinstance(x, astroid.nodes.Const) and isinstance(x.value, str)
+                    else _type_name(x, namespace)
+                    for x in values
+                ),
+            )
+        return "{0}[{1}]".format(_type_name(node.value, namespace), _type_name(node.slice, namespace))
+    if isinstance(node, astroid.nodes.Tuple):
+        return ", ".join(_type_name(x, namespace) for x in node.elts)
+    if isinstance(node, astroid.nodes.List):
+        return "[{0}]".format(", ".join(_type_name(x, namespace) for x in node.elts))
+    if isinstance(node, astroid.nodes.Const) and isinstance(node.value, str):
+        # Forward reference
+        try:
+            parsed = astroid.extract_node(node.value)
+        except (astroid.AstroidSyntaxError, ValueError):
+            return node.value
+        parsed.parent = node.parent
+        return _type_name(parsed, namespace)
+    return node.as_string()
+
+
+def _builtin_type(node):
+    """Return the runtime object of an annotation built only from builtins and ``typing``
+    names, e.g. ``ClassVar[str]``, or None. Nothing from the source is evaluated."""
+    if isinstance(node, astroid.nodes.Name):
+        return getattr(builtins, node.name, None) or getattr(typing, node.name, None)
+    if isinstance(node, astroid.nodes.Attribute) and node.expr.as_string() == "typing":
+        return getattr(typing, node.attrname, None)
+    if isinstance(node, astroid.nodes.Subscript):
+        origin = _builtin_type(node.value)
+        elts = node.slice.elts if isinstance(node.slice, astroid.nodes.Tuple) else [node.slice]
+        args = [_builtin_type(x) for x in elts]
+        if origin is None or any(x is None for x in args):
+            return None
+        try:
+            return origin[tuple(args) if len(args) > 1 else args[0]]
+        except TypeError:
+            return None
+    return None
+
+
+def _class_mro(node: astroid.nodes.ClassDef) -> List[astroid.nodes.ClassDef]:
+    try:
+        return node.mro()
+    except Exception:
+        try:
+            return [node] + list(node.ancestors())
+        except Exception:
+            return [node]
+
+
+def _is_decorated_with(node, *names: str) -> bool:
+    if not node.decorators:
+        return False
+    for decorator in node.decorators.nodes:
+        if isinstance(decorator, astroid.nodes.Call):
+            decorator = decorator.func
+        if decorator.as_string() in names:
+            return True
+    return False
+
+
+def _property_accessor_of(node, *accessors: str) -> Optional[str]:
+    """Return the property name if *node* is decorated with e.g. ``@<name>.setter``."""
+    for decorator in node.decorators.nodes if node.decorators else []:
+        if isinstance(decorator, astroid.nodes.Attribute) and decorator.attrname in accessors:
+            return decorator.expr.as_string()
+    return None
+
+
+def _is_dataclass(node: astroid.nodes.ClassDef) -> bool:
+    if not node.decorators:
+        return False
+    for decorator in node.decorators.nodes:
+        if getattr(decorator, "name", None) == "dataclass":
+            return True
+    return False
+
+
+def _is_handwritten(node) -> bool:
+    return bool(node.root().file) and node.root().file.endswith("_patch.py")
+
+
+class StaticFunctionNode(FunctionNode):
+    """FunctionNode built from an astroid FunctionDef instead of an imported function.
+
+    :keyword bool is_overload: True for ``@overload`` stubs, which, like their runtime
+     counterparts, don't parse their own docstring or claim pylint errors.
+    """
+
+    def __init__(self, namespace, parent_node, *, apiview, node, is_module_level=False, is_overload=False):
+        self._source_node = node
+        self._is_overload = is_overload
+        super().__init__(namespace, parent_node, apiview=apiview, node=node, is_module_level=is_module_level)
+        if not is_overload:
+            PylintParser.match_items(node)
+
+    def check_handwritten(self):
+        return not self._is_overload and _is_handwritten(self._source_node)
+
+    def _get_docstring(self):
+        docstring = None if self._is_overload else _docstring(self.node)
+        # Refer docstring at class if this is constructor and docstring is missing for __init__
+        if not docstring and self.name == "__init__" and isinstance(self.parent_node, ClassNode):
+            docstring = _docstring(self.parent_node.obj)
+        return docstring
+
+
+class _StaticProperty:
+    """Stands in for a property object, with the astroid FunctionDefs of its accessors."""
+
+    def __init__(self, fget, fset):
+        self.fget = fget
+        self.fset = fset
+
+
+class StaticPropertyNode(PropertyNode):
+    """PropertyNode built from the astroid FunctionDefs of a property's accessors.
+
+    :param _StaticProperty obj: The getter and setter.
+    """
+
+    def is_pylint_error_owner(self, err) -> bool:
+        return err.obj and err.obj.endswith(f".{self.obj.fget.name}")
+
+    def pylint_error_candidates(self):
+        return PylintParser.items_for_obj_suffix(f".{self.obj.fget.name}")
+
+    def _inspect(self):
+        self.read_only = self.obj.fset is None
+        parser = AstroidFunctionParser(self.obj.fget, self.namespace, apiview=self.apiview, func_node=None)
+        self.type = get_qualified_name(parser.return_type, self.namespace)
+
+        # get type from docstring
+        docstring = _docstring(self.obj.fget)
+        if docstring and not self.type:
+            docstring_parser = DocstringParser(docstring, apiview=self.apiview)
+            try:
+                self.type = docstring_parser.type_for(self.name)
+                # Check for rtype docstring
+                if not self.type:
+                    self.type = docstring_parser.ret_type
+            except:
+                pass
+
+        self.display_name = "{0}: {1}".format(self.name, self.type)
+        if self.read_only:
+            self.display_name += "   # Read-only"
+
+    def check_handwritten(self):
+        return _is_handwritten(self.obj.fget)
+
+
+class _StaticEnumValue:
+    """Stands in for an enum member, whose value is all EnumNode reads."""
+
+    def __init__(self, value):
+        self.value = value
+
+
+class StaticVariableNode(VariableNode):
+    """VariableNode of a StaticClassNode."""
+
+    def _find_variable_source_class(self):
+        variable_name = self.name
+        for parent_class in _class_mro(self.parent_node.obj)[1:]:
+            if any(x.lineno is not None for x in parent_class.locals.get(variable_name, [])):
+                return parent_class
+            docstring = _docstring(parent_class) or ""
+            if f":ivar {variable_name}:" in docstring or f":param {variable_name}:" in docstring:
+                return parent_class
+        return None
+
+    def check_handwritten(self):
+        if self.is_ivar:
+            inherited_from_class = self._find_variable_source_class()
+            if inherited_from_class:
+                return _is_handwritten(inherited_from_class)
+        return self.parent_node.is_handwritten
+
+
+class StaticClassNode(ClassNode):
+    """ClassNode built from an astroid ClassDef instead of an imported class."""
+
+    _variable_node_type = StaticVariableNode
+
+    def check_handwritten(self):
+        return _is_handwritten(self.obj)
+
+    def _parse_decorators_from_class(self, class_obj):
+        if class_obj.decorators:
+            self.decorators = [f"@{x.as_string(preserve_quotes=True)}" for x in class_obj.decorators.nodes]
+        else:
+            self.decorators = []
+
+    def _parse_ivars(self):
+        # This method will add instance variables by parsing docstring
+        docstring = _docstring(self.obj)
+        if docstring:
+            docstring_parser = DocstringParser(docstring, apiview=self.apiview)
+            for key, var in docstring_parser.ivars.items():
+                ivar_node = self._variable_node_type(
+                    namespace=self.namespace,
+                    parent_node=self,
+                    name=key,
+                    type_name=var.argtype,
+                    value=None,
+                    is_ivar=True,
+                )
+                self.child_nodes.append(ivar_node)
+
+    def _get_base_classes(self):
+        # Use the same source-based extraction as ClassNode, from the file index.
+        file_path = self.obj.root().file
+        qualname = self.obj.qname()[len(self.obj.root().name) + 1 :]
+        try:
+            if file_path not in _FILE_CLASS_SOURCE:
+                _build_file_index(file_path)
+            source = _FILE_CLASS_SOURCE[file_path].get(qualname)
+            if source:
+                class_node = ast.parse(source).body[0]
+                if isinstance(class_node, ast.ClassDef):
+                    base_classes, self.class_keywords = self._extract_bases_and_keywords_from_ast(class_node)
+                    return base_classes
+        except Exception as e:
+            logging.debug(f"AST parsing failed for {self.name}: {e}")
+        return [x.as_string() for x in self.obj.bases if x.as_string() != "object"]
+
+    def _is_typeddict(self) -> bool:
+        if any(x.as_string() in _TYPEDDICT_NAMES for x in self.obj.bases):
+            return True
+        return any(x.qname().endswith(".TypedDict") for x in _class_mro(self.obj)[1:])
+
+    def _include_function(self, node) -> bool:
+        # Same rule as ClassNode._should_include_function, applied to the defining module.
+        module_name = node.root().name
+        return module_name.startswith(self.pkg_root_namespace) and not (
+            module_name.endswith("_model_base") or module_name.endswith("model_base")
+        )
+
+    def _inspect(self):
+        logging.debug("Inspecting class {}".format(self.full_name))
+        self._class_has_source = True
+        self.base_class_names = self._get_base_classes()
+        try:
+            self.is_enum = self.obj.is_subtype_of(_ENUM_BASE)
+        except Exception:
+            self.is_enum = False
+        self._parse_ivars()
+        self._parse_decorators_from_class(self.obj)
+        is_typeddict = self._is_typeddict()
+
+        mro = _class_mro(self.obj)
+        overloads_by_class = {
+            id(cls): parse_overloads(
+                self,
+                [x for x in cls.body if isinstance(x, astroid.nodes.FunctionDef)],
+                is_module_level=False,
+                node_type=functools.partial(StaticFunctionNode, is_overload=True),
+            )
+            for cls in mro
+            if cls.qname() != "builtins.object"
+        }
+
+        # Own annotations, in definition order.
+        for statement in self.obj.body:
+            if not (
+                isinstance(statement, astroid.nodes.AnnAssign)
+                and isinstance(statement.target, astroid.nodes.AssignName)
+            ):
+                continue
+            item_name = statement.target.name
+            if item_name.startswith("_"):
+                continue
+            annotation = statement.annotation
+            if is_typeddict:
+                self.child_nodes.append(KeyNode(self.namespace, self, item_name, annotation))
+            else:
+                self._handle_variable({}, item_name, type_string=_type_name(annotation, self.namespace))
+
+        if self.is_enum:
+            self._inspect_enum_members()
+            return
+
+        for name, cls, statement in self._members(mro):
+            if isinstance(statement, astroid.nodes.FunctionDef):
+                if _is_decorated_with(statement, "property") or _property_accessor_of(
+                    statement, "getter", "setter", "deleter"
+                ):
+                    getter = self._property_accessor(cls, name)
+                    if getter is not None and not name.startswith("_"):
+                        setter = self._property_accessor(cls, name, "setter")
+                        self.child_nodes.append(
+                            StaticPropertyNode(self.namespace, self, name, _StaticProperty(getter, setter))
+                        )
+                    continue
+                if _is_decorated_with(statement, *_DESCRIPTOR_DECORATORS):
+                    # Not a function once the class is created.
+                    continue
+                if not self._include_function(statement):
+                    continue
+                if (not name.startswith("_") or name.startswith("__")) and name != "__annotate__":
+                    func_node = StaticFunctionNode(self.namespace, self, node=statement, apiview=self.apiview)
+                    add_overload_nodes(self, func_node, overloads_by_class.get(id(cls), []))
+                continue
+
+            if name.startswith("_"):
+                continue
+            if isinstance(statement, astroid.nodes.ClassDef):
+                class_type = StaticDataClassNode if _is_dataclass(statement) else StaticClassNode
+                self.child_nodes.append(
+                    class_type(
+                        name=name,
+                        namespace=self.namespace,
+                        parent_node=self,
+                        obj=statement,
+                        pkg_root_namespace=self.pkg_root_namespace,
+                        apiview=self.apiview,
+                    )
+                )
+            else:
+                value = getattr(statement, "value", None)
+                try:
+                    child_obj = _literal(value)
+                except (ValueError, TypeError, SyntaxError, AttributeError, MemoryError, RecursionError):
+                    continue
+                if isinstance(child_obj, _VARIABLE_TYPES):
+                    self._handle_variable(child_obj, name, value=str(child_obj))
+
+    def _members(self, mro):
+        """Yield (name, defining class, statement) for every attribute of the class, in name
+        order. As with ``getattr`` the first class in the MRO that binds a name wins, and
+        within it the last statement binding the name."""
+        members = {}
+        for cls in mro:
+            for name, assignments in cls.locals.items():
+                if name in members or name in ("__module__", "__qualname__", "__annotations__"):
+                    continue
+                statement = assignments[-1]
+                if statement.lineno is None:
+                    # Synthesized by an astroid brain (e.g. the dataclass __init__), not in the source.
+                    continue
+                if isinstance(statement, astroid.nodes.AssignName):
+                    statement = statement.parent
+                    if not isinstance(statement, (astroid.nodes.Assign, astroid.nodes.AnnAssign)):
+                        continue
+                    if isinstance(statement, astroid.nodes.AnnAssign) and statement.value is None:
+                        # Only annotated, so not a class attribute.
+                        continue
+                members[name] = (cls, statement)
+        for name in sorted(members):
+            cls, statement = members[name]
+            yield name, cls, statement
+
+    @staticmethod
+    def _property_accessor(cls, name, accessor=None):
+        """Return the FunctionDef of the getter (or *accessor*) of property *name* in *cls*."""
+        for statement in cls.locals.get(name, []):
+            if not isinstance(statement, astroid.nodes.FunctionDef):
+                continue
+            if accessor is None and _is_decorated_with(statement, "property"):
+                return statement
+            if accessor is not None and _property_accessor_of(statement, accessor) == name:
+                return statement
+        return None
+
+    def _inspect_enum_members(self):
+        # Like Enum.__members__: every public name assigned in the class body, including aliases.
+        last_value = 0
+        for statement in self.obj.body:
+            if not isinstance(statement, astroid.nodes.Assign):
+                continue
+            for target in statement.targets:
+                if not isinstance(target, astroid.nodes.AssignName) or target.name.startswith("_"):
+                    continue
+                value_node = statement.value
+                if isinstance(value_node, astroid.nodes.Call) and value_node.func.as_string() in ("auto", "enum.auto"):
+                    value = last_value + 1 if isinstance(last_value, int) else 1
+                else:
+                    try:
+                        value = _literal(value_node)
+                    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+                        value = value_node.as_string()
+                last_value = value
+                self.child_nodes.append(
+                    EnumNode(
+                        name=target.name,
+                        namespace=self.namespace,
+                        parent_node=self,
+                        obj=_StaticEnumValue(value),
+                    )
+                )
+
+
+class StaticDataClassNode(StaticClassNode, DataClassNode):
+    """DataClassNode built from an astroid ClassDef.
+
+    ``dataclasses.dataclass`` is applied to a stand-in class with the same decorator
+    arguments and fields, so the parameters, fields and generated methods match those
+    of the real class without executing any of the package's code. Field types and
+    non-literal defaults are the astroid nodes from the source and render as written.
+    """
+
+    def _get_dataclass(self):
+        if not hasattr(self, "_dataclass"):
+            self._dataclass = self._build_dataclass()
+        return self._dataclass
+
+    def _get_dataclass_params(self):
+        return getattr(self._get_dataclass(), "__dataclass_params__", None)
+
+    def _get_dataclass_fields(self):
+        return getattr(self._get_dataclass(), "__dataclass_fields__", None)
+
+    def _dataclass_decorator_kwargs(self) -> Dict[str, object]:
+        kwargs = {}
+        for decorator in self.obj.decorators.nodes:
+            if isinstance(decorator, astroid.nodes.Call) and getattr(decorator.func, "name", None) == "dataclass":
+                for keyword in decorator.keywords or []:
+                    try:
+                        kwargs[keyword.arg] = _literal(keyword.value)
+                    except (ValueError, TypeError, SyntaxError):
+                        continue
+        return kwargs
+
+    def _field_default(self, value):
+        if isinstance(value, astroid.nodes.Call) and value.func.as_string() in ("field", "dataclasses.field"):
+            kwargs = {}
+            for keyword in value.keywords or []:
+                if keyword.arg == "default_factory":
+                    factory = keyword.value.as_string()
+                    kwargs[keyword.arg] = _BUILTIN_FACTORIES.get(factory, keyword.value)
+                    continue
+                try:
+                    kwargs[keyword.arg] = _literal(keyword.value)
+                except (ValueError, TypeError, SyntaxError):
+                    kwargs[keyword.arg] = keyword.value
+            return dataclasses.field(**kwargs)
+        try:
+            return _literal(value)
+        except (ValueError, TypeError, SyntaxError):
+            return value
+
+    def _build_dataclass(self):
+        annotations = {}
+        namespace = {}
+        # Fields of dataclass bases come first, as they do at runtime.
+        for cls in reversed(_class_mro(self.obj)):
+            if cls is not self.obj and not _is_dataclass(cls):
+                continue
+            for statement in cls.body:
+                if not (
+                    isinstance(statement, astroid.nodes.AnnAssign)
+                    and isinstance(statement.target, astroid.nodes.AssignName)
+                ):
+                    continue
+                name = statement.target.name
+                annotation = statement.annotation.as_string()
+                if annotation in ("KW_ONLY", "dataclasses.KW_ONLY"):
+                    annotations[name] = dataclasses.KW_ONLY
+                    continue
+                if annotation.startswith(("ClassVar", "typing.ClassVar")):
+                    annotations[name] = _builtin_type(statement.annotation) or typing.ClassVar
+                else:
+                    annotations[name] = statement.annotation
+                if statement.value is not None:
+                    namespace[name] = self._field_default(statement.value)
+        namespace["__annotations__"] = annotations
+        namespace["__module__"] = self.obj.root().name
+        try:
+            return dataclasses.dataclass(**self._dataclass_decorator_kwargs())(
+                type(self.obj.name, (), namespace)
+            )
+        except Exception as err:
+            logging.debug(f"Unable to compute dataclass fields of {self.name}: {err}")
+            return None
+
+    def _inspect(self):
+        super()._inspect()
+        dataclass = self._get_dataclass()
+        # Field defaults given with field() are only class attributes once @dataclass ran.
+        for name in getattr(dataclass, "__dataclass_fields__", {}):
+            value = vars(dataclass).get(name)
+            if isinstance(value, _VARIABLE_TYPES) and not name.startswith("_"):
+                self._handle_variable(value, name, value=str(value))
+        # Methods that @dataclass generates don't exist in the source.
+        defined = {x.name for x in self.child_nodes}
+        for name, func in sorted(vars(dataclass).items() if dataclass else []):
+            if name in defined or any(x.lineno is not None for x in self.obj.locals.get(name, [])):
+                continue
+            if name.startswith("__") and inspect.isfunction(func):
+                self.child_nodes.append(FunctionNode(self.namespace, self, obj=func, apiview=self.apiview))
+
+
+class StaticModuleNode(ModuleNode):
+    """ModuleNode built from an astroid Module instead of an imported module."""
+
+    def check_handwritten(self):
+        return _is_handwritten(self.obj)
+
+    def _inspect(self):
+        public_entities = _all_names(self.obj) or []
+        module_overloads = {}
+        for name in sorted(self.obj.locals):
+            if public_entities and name not in public_entities:
+                logging.debug("Object is not listed in __all__. Skipping object {}".format(name))
+                continue
+            if name.startswith("_"):
+                logging.debug("Skipping object {}".format(name))
+                continue
+            member = _getattr(self.obj, name)
+            if not isinstance(member, (astroid.nodes.ClassDef, astroid.nodes.FunctionDef)):
+                logging.debug("Skipping unknown type member in module: {}".format(name))
+                continue
+            # Skip any member in module level that is defined in external or built in package
+            if not _is_in_package(member, self.pkg_root_namespace):
+                continue
+
+            if isinstance(member, astroid.nodes.ClassDef):
+                class_type = StaticDataClassNode if _is_dataclass(member) else StaticClassNode
+                class_node = class_type(
+                    name=name,
+                    namespace=self.namespace,
+                    parent_node=self,
+                    obj=member,
+                    pkg_root_namespace=self.pkg_root_namespace,
+                    apiview=self.apiview,
+                )
+                key = "{0}.{1}".format(self.namespace, class_node.name)
+                self.node_index.add(key, class_node)
+                self.child_nodes.append(class_node)
+            else:
+                func_node = StaticFunctionNode(
+                    self.namespace,
+                    self,
+                    node=member,
+                    is_module_level=True,
+                    apiview=self.apiview,
+                )
+                key = "{0}.{1}".format(self.namespace, func_node.name)
+
+                # Parse function module for overloads and store
+                defining_module = member.root()
+                if defining_module.name not in module_overloads:
+                    functions = [x for x in defining_module.body if isinstance(x, astroid.nodes.FunctionDef)]
+                    module_overloads[defining_module.name] = parse_overloads(
+                        self,
+                        functions,
+                        is_module_level=True,
+                        node_type=functools.partial(StaticFunctionNode, is_overload=True),
+                    )
+
+                overloads = module_overloads[defining_module.name]
+                add_overload_nodes(self, func_node, overloads)
+
+                self.node_index.add(key, func_node)
@@ -4,6 +4,7 @@
 # license information.
 # --------------------------------------------------------------------------
 
+import json
 import os
 import sys
 import tempfile
@@ -13,6 +14,7 @@ import pytest
 from pytest import fail, mark
 
 from apistub import ApiView, TokenKind, StubGenerator, ReviewLines
+from apistub._batch import BatchStubGenerator
 from apistub.nodes import PylintParser
 
 # Read in all init files from init_files folder and add the paths to INIT_PARAMS in the form of (file_name, file_path)
@@ -318,6 +320,82 @@ class TestApiView:
         except ValueError:
             pass
 
+    def test_jobs_output_matches_serial(self):
+        temp_path = tempfile.gettempdir()
+        stub_gen = StubGenerator(pkg_path=PKG_PATH, temp_path=temp_path)
+        serial_json = stub_gen.serialize(stub_gen.generate_tokens())
+
+        stub_gen = StubGenerator(pkg_path=PKG_PATH, temp_path=temp_path, jobs=3)
+        apiview = stub_gen.generate_tokens()
+        self._validate_line_ids(apiview)
+        assert apiview.diagnostics
+        assert stub_gen.serialize(apiview) == serial_json
+
+    def test_batch_output_matches_single(self, tmp_path):
+        temp_path = tempfile.gettempdir()
+        stub_gen = StubGenerator(pkg_path=PKG_PATH, temp_path=temp_path)
+        expected_json = stub_gen.serialize(stub_gen.generate_tokens())
+
+        missing_path = str(tmp_path / "missing-package")
+        manifest = tmp_path / "packages.txt"
+        manifest.write_text(f"# packages to generate\n{PKG_PATH}\n\n{missing_path}\n")
+        out_path = str(tmp_path / "out")
+        report_path = str(tmp_path / "report.json")
+        results = BatchStubGenerator(
+            manifest=str(manifest), temp_path=temp_path, out_path=out_path, report_path=report_path
+        ).run()
+
+        assert [r.pkg_path for r in results] == [PKG_PATH, missing_path]
+        assert results[0].succeeded and not results[1].succeeded
+        assert set(results[0].timings) == {"setup", "tokens", "serialize", "total"}
+        with open(results[0].out_file_path) as f:
+            assert f.read() == expected_json
+        with open(report_path) as f:
+            assert len(json.load(f)["packages"]) == 2
+
+    def test_static_matches_runtime(self):
+        def collect_lines(review_lines, lines):
+            for line in review_lines:
+                if line.line_id:
+                    lines[line.line_id] = [token.value for token in line.tokens]
+                collect_lines(line.children or [], lines)
+            return lines
+
+        temp_path = tempfile.gettempdir()
+        stub_gen = StubGenerator(pkg_path=PKG_PATH, temp_path=temp_path, skip_pylint=True)
+        runtime_lines = collect_lines(stub_gen.generate_tokens().review_lines, {})
+        stub_gen = StubGenerator(pkg_path=PKG_PATH, temp_path=temp_path, skip_pylint=True, static=True)
+        apiview = stub_gen.generate_tokens()
+        self._validate_line_ids(apiview)
+        static_lines = collect_lines(apiview.review_lines, {})
+
+        # Only exist at runtime: an __init__ added by a class decorator and a functional TypedDict.
+        runtime_only = {
+            line_id
+            for line_id in runtime_lines
+            if line_id.startswith(
+                (
+                    "apiview_stub_generator_test.models.ClassWithDecorators.__init__",
+                    "apiview_stub_generator_test.models.FakeTypedDict",
+                )
+            )
+        }
+        assert set(static_lines) == set(runtime_lines) - runtime_only
+        # At runtime the keys' string annotations render as ForwardRef.
+        forward_refs = {line_id for line_id in static_lines if "NoPublicNameDict." in line_id}
+        assert len(forward_refs) == 2
+        for line_id in set(static_lines) - forward_refs:
+            assert static_lines[line_id] == runtime_lines[line_id], line_id
+
+    def test_static_does_not_import_package(self):
+        script = (
+            "import sys\n"
+            "from apistub import StubGenerator\n"
+            f"StubGenerator(pkg_path={PKG_PATH!r}, skip_pylint=True, static=True).generate_tokens()\n"
+            "assert not [m for m in sys.modules if m.startswith('apiview_stub_generator_test')]\n"
+        )
+        check_call([sys.executable, "-c", script])
+
     @mark.parametrize("pkg_path, mapping_file", MAPPING_PATHS, ids=MAPPING_IDS)
     def test_mapping_file(self, pkg_path, mapping_file):
         # Check that mapping file exists
@@ -4,7 +4,17 @@
 # license information.
 # --------------------------------------------------------------------------
 
+import inspect
+
 from apistub.nodes import ClassNode
+from apistub.nodes._class_node import (
+    SourceIndexCache,
+    _build_file_index,
+    _get_class_line_range,
+    _get_class_source,
+    clear_caches,
+    set_source_index_cache,
+)
 from apiview_stub_generator_test.models import (
     AliasNewType,
     AliasUnion,
@@ -707,3 +717,28 @@ class TestClassParsing:
         assert metadata["RelatedToLine"] == 4
         assert metadata["IsContextEndLine"] == 1
 
+
+    def test_source_index_cache(self, tmp_path):
+        obj = SomethingWithOverloads
+        file_path = inspect.getsourcefile(obj)
+        clear_caches()
+        expected_source = _get_class_source(obj)
+        expected_range = _get_class_line_range(obj)
+
+        cache = SourceIndexCache(str(tmp_path))
+        set_source_index_cache(cache)
+        try:
+            for _ in range(2):
+                clear_caches()
+                assert _get_class_source(obj) == expected_source
+                assert _get_class_line_range(obj) == expected_range
+            assert (cache.hits, cache.misses) == (1, 1)
+
+            # A file with different content gets its own entry.
+            other = tmp_path / "other.py"
+            other.write_text(open(file_path).read() + "\nclass Extra:\n    pass\n")
+            _build_file_index(str(other))
+            assert (cache.hits, cache.misses) == (1, 2)
+        finally:
+            set_source_index_cache(None)
+            clear_caches()
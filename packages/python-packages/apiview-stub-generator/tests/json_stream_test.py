@@ -0,0 +1,110 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import io
+import logging
+import time
+import tracemalloc
+
+import pytest
+
+from apistub import ApiView, ReviewLines, StubGenerator
+from apistub._json_stream import iter_json
+from apistub._generated.treestyle.parser._model_base import SdkJSONEncoder
+from apistub._generated.treestyle.parser.models import CodeDiagnostic, CodeDiagnosticLevel
+
+# Roughly the size of the token file of a large generated package such as azure-synapse-artifacts.
+CLASS_COUNT = 1500
+MEMBERS_PER_CLASS = 12
+
+
+def _add_class(review_lines, index):
+    class_name = f"Model{index}"
+    line = review_lines.create_review_line(line_id=f"pkg.models.{class_name}")
+    line.add_keyword("class")
+    line.add_text(class_name, navigation_display_name=class_name)
+    line.add_punctuation(":", has_suffix_space=False)
+    children = ReviewLines()
+    for m in range(MEMBERS_PER_CLASS):
+        member = children.create_review_line(line_id=f"pkg.models.{class_name}.member_{m}")
+        member.add_keyword("def", has_prefix_space=True)
+        member.add_text(f"member_{m}", has_suffix_space=False)
+        member.add_punctuation("(", has_suffix_space=False)
+        member.add_text("self", has_suffix_space=False)
+        member.add_punctuation(",")
+        member.add_string_literal("défaut ✓")
+        member.add_punctuation(")", has_suffix_space=False)
+        children.append(member)
+    children.set_blank_lines(1, last_is_context_end_line=True)
+    line.add_children(children)
+    review_lines.append(line)
+
+
+@pytest.fixture(scope="module")
+def large_apiview():
+    apiview = ApiView(pkg_name="azure-synthetic-artifacts", namespace="pkg", pkg_version="1.0.0")
+    for i in range(CLASS_COUNT):
+        _add_class(apiview.review_lines, i)
+    apiview.review_lines.set_blank_lines(1)
+    apiview.diagnostics.append(
+        CodeDiagnostic(level=CodeDiagnosticLevel.WARNING, text="Synthetic \"warning\"", target_id="pkg.models.Model0")
+    )
+    return apiview
+
+
+class TestJsonStream:
+    def test_matches_encoder(self, large_apiview):
+        stub_gen = StubGenerator.__new__(StubGenerator)
+        expected = stub_gen.serialize(large_apiview)
+        out = io.StringIO()
+        stub_gen.serialize_to(large_apiview, out)
+        assert out.getvalue() == expected
+
+    @pytest.mark.parametrize(
+        "options",
+        [{"sort_keys": True}, {"ensure_ascii": False}, {"separators": (",", ":")}, {"indent": 2}],
+    )
+    def test_matches_encoder_options(self, large_apiview, options):
+        encoder = SdkJSONEncoder(**options)
+        assert "".join(iter_json(large_apiview, encoder)) == encoder.encode(large_apiview)
+
+    def test_benchmark_against_encoder(self, large_apiview):
+        stub_gen = StubGenerator.__new__(StubGenerator)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        json_tokens = stub_gen.serialize(large_apiview)
+        encode_time = time.perf_counter() - start
+        _, encode_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        size = len(json_tokens)
+        del json_tokens
+
+        sink = _CountingSink()
+        tracemalloc.start()
+        start = time.perf_counter()
+        stub_gen.serialize_to(large_apiview, sink)
+        stream_time = time.perf_counter() - start
+        _, stream_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        logging.warning(
+            "%.1f MB of JSON: encode %.2fs (%.1f MB/s, peak %.1f MB), stream %.2fs (%.1f MB/s, peak %.1f MB)",
+            size / 1e6, encode_time, size / 1e6 / encode_time, encode_peak / 1e6,
+            stream_time, size / 1e6 / stream_time, stream_peak / 1e6,
+        )
+        assert sink.size == size
+        assert stream_peak < encode_peak / 4
+
+
+class _CountingSink:
+    """A text file that only counts what is written to it."""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
@@ -0,0 +1,169 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import importlib
+import logging
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from apistub import ApiView
+from apistub.nodes import ModuleNode, PylintParser, PylintError
+from apistub.nodes._pylint_cache import PylintCache
+
+SYNTHETIC_PKG = "apistub_synthetic_pkg"
+MODULE_COUNT = 10
+CLASSES_PER_MODULE = 25
+METHODS_PER_CLASS = 8
+# 2 diagnostics per class, method and property => 5000 diagnostics.
+DIAGNOSTICS_PER_OBJECT = 2
+
+
+def _message(path, line, obj, column=4):
+    return SimpleNamespace(
+        C="C",
+        category="convention",
+        module=SYNTHETIC_PKG,
+        obj=obj,
+        line=line,
+        column=column,
+        end_line=None,
+        end_column=None,
+        path=path,
+        symbol="synthetic-check",
+        msg=f"Synthetic diagnostic for {obj}",
+        msg_id="C4799",
+    )
+
+
+def _write_module(pkg_dir, index):
+    """Write a module of classes with methods and a property and return the pylint
+    messages that a checker would have reported for it."""
+    module_name = f"module_{index}"
+    path = os.path.join(pkg_dir, f"{module_name}.py")
+    lines = []
+    messages = []
+    for c in range(CLASSES_PER_MODULE):
+        class_name = f"Class{index}x{c}"
+        lines.append(f"class {class_name}:")
+        messages.extend(_message(path, len(lines), class_name, column=0) for _ in range(DIAGNOSTICS_PER_OBJECT))
+        lines.append(f'    """{class_name} docstring."""')
+        for m in range(METHODS_PER_CLASS):
+            lines.append(f"    def method_{m}(self, value: int) -> int:")
+            messages.extend(
+                _message(path, len(lines), f"{class_name}.method_{m}") for _ in range(DIAGNOSTICS_PER_OBJECT)
+            )
+            lines.append("        return value")
+        lines.append("    @property")
+        lines.append("    def prop(self) -> int:")
+        messages.extend(_message(path, len(lines), f"{class_name}.prop") for _ in range(DIAGNOSTICS_PER_OBJECT))
+        lines.append("        return 1")
+        lines.append("")
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    return module_name, messages
+
+
+@pytest.fixture(scope="module")
+def synthetic_package(tmp_path_factory):
+    """A generated package with 5k diagnostics, used to benchmark diagnostic ownership."""
+    root = tmp_path_factory.mktemp("synthetic")
+    pkg_dir = os.path.join(root, SYNTHETIC_PKG)
+    os.mkdir(pkg_dir)
+    open(os.path.join(pkg_dir, "__init__.py"), "w").close()
+    modules = []
+    messages = []
+    for i in range(MODULE_COUNT):
+        module_name, module_messages = _write_module(pkg_dir, i)
+        modules.append(f"{SYNTHETIC_PKG}.{module_name}")
+        messages.extend(module_messages)
+
+    sys.path.insert(0, str(root))
+    try:
+        yield modules, messages
+    finally:
+        sys.path.remove(str(root))
+        for name in [x for x in sys.modules if x.startswith(SYNTHETIC_PKG)]:
+            del sys.modules[name]
+        PylintParser.load_items([])
+
+
+def _walk(nodes):
+    for node in nodes:
+        yield node
+        yield from _walk(node.child_nodes)
+
+
+class TestPylintParser:
+    def test_ownership_lookup_matches_full_scan(self, synthetic_package):
+        modules, messages = synthetic_package
+        PylintParser.load_items([PylintError(SYNTHETIC_PKG, x) for x in messages])
+        assert len(PylintParser.items) == 5000
+
+        start = time.perf_counter()
+        apiview = ApiView(pkg_name=SYNTHETIC_PKG, namespace=SYNTHETIC_PKG)
+        module_nodes = [
+            ModuleNode(m, importlib.import_module(m), SYNTHETIC_PKG, apiview=apiview) for m in modules
+        ]
+        nodes = list(_walk(module_nodes))
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        indexed = [PylintParser.get_items(node) for node in nodes]
+        indexed_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scanned = [[x for x in PylintParser.items if node.is_pylint_error_owner(x)] for node in nodes]
+        scan_time = time.perf_counter() - start
+
+        logging.warning(
+            "%d nodes, %d diagnostics: build %.2fs, indexed lookup %.3fs, full scan %.3fs",
+            len(nodes), len(PylintParser.items), build_time, indexed_time, scan_time,
+        )
+        assert indexed == scanned
+        assert not PylintParser.get_unclaimed()
+
+    def test_cached_parse_matches_full_run(self, tmp_path, monkeypatch):
+        pkg_path = os.path.abspath(
+            os.path.join(os.path.dirname(__file__), "..", "..", "apiview-stub-generator-test")
+        )
+        cache_dir = str(tmp_path / "pylint-cache")
+
+        def _summary():
+            return sorted((x.path, x.line, x.column, x.symbol, x.obj) for x in PylintParser.items)
+
+        PylintParser.parse(pkg_path)
+        expected = _summary()
+        assert expected
+
+        PylintParser.parse(pkg_path, cache_dir=cache_dir, jobs=2)
+        assert _summary() == expected
+        assert os.listdir(cache_dir)
+
+        # Every file is now cached, so pylint must not run again.
+        def _fail(*args, **kwargs):
+            raise AssertionError("pylint should not run when every file is cached")
+
+        monkeypatch.setattr(PylintParser, "_run_pylint", _fail)
+        PylintParser.parse(pkg_path, cache_dir=cache_dir)
+        assert _summary() == expected
+
+    def test_cache_evicts_least_recently_used(self, tmp_path):
+        rcfile = tmp_path / ".pylintrc"
+        rcfile.write_text("[MAIN]\n")
+        cache = PylintCache(str(tmp_path / "cache"), str(rcfile), max_size_mb=0)
+        cache.max_size = 250
+        for i in range(5):
+            cache.put(f"{i:02d}" * 32, [{"message": "x" * 90}])
+            os.utime(cache._entry_path(f"{i:02d}" * 32), (i, i))
+        cache.get("00" * 32)  # refreshes the oldest entry
+        cache.evict()
+        assert cache.get("00" * 32) is not None
+        assert cache.get("04" * 32) is not None
+        assert cache.get("01" * 32) is None
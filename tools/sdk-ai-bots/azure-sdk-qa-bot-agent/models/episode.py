@@ -97,6 +97,10 @@ class EpisodeDocument(BaseModel):
     message_count: int = Field(
         default=0, description="Number of messages in the thread at extraction time.",
     )
+    content_hash: Optional[str] = Field(
+        default=None,
+        description="Hash of the thread content at extraction time; unchanged threads are not re-extracted.",
+    )
 
     # Vector embedding (populated before storage)
     embedding: Optional[list[float]] = Field(
@@ -121,11 +125,11 @@ class EpisodeDocument(BaseModel):
         source_thread_id: str,
         embedding: list[float] | None = None,
         message_count: int = 0,
+        content_hash: str | None = None,
     ) -> EpisodeDocument:
         """Create a Cosmos DB document from a Memory-Agent episode."""
-        doc_id = f"episode-{tenant_id}-{source_thread_id}"
         return cls(
-            id=doc_id,
+            id=cls.make_id(tenant_id, source_thread_id),
             tenant_id=tenant_id,
             trigger=episode.trigger,
             symptoms=list(episode.symptoms),
@@ -135,9 +139,15 @@ class EpisodeDocument(BaseModel):
             confidence=episode.confidence,
             source_thread_id=source_thread_id,
             message_count=message_count,
+            content_hash=content_hash,
             embedding=embedding,
         )
 
+    @staticmethod
+    def make_id(tenant_id: str, source_thread_id: str) -> str:
+        """Return the deterministic document ID for a tenant's thread."""
+        return f"episode-{tenant_id}-{source_thread_id}"
+
     def to_searchable_text(self) -> str:
         """Return the text used to generate the vector embedding."""
         parts = [self.trigger]
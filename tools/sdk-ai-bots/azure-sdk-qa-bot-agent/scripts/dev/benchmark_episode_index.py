@@ -0,0 +1,110 @@
+"""Benchmark the local episode index against brute-force search.
+
+Generates synthetic clustered embeddings (episodes on related topics sit
+close together, as real embeddings do), builds a ``TenantEpisodeIndex`` and
+reports, per size:
+- Build time (including the IVF index above the brute-force threshold)
+- Query latency (p50 / p95) for the index and for exact brute force
+- Recall@k of the index against exact brute force
+
+No Azure resources are needed.
+
+Usage::
+
+    # Default: 10k and 100k episodes, 1536 dimensions
+    python scripts/dev/benchmark_episode_index.py
+
+    # Custom sizes / queries
+    python scripts/dev/benchmark_episode_index.py --sizes 10000 50000 --queries 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+_PROJECT_DIR = Path(__file__).resolve().parent.parent.parent
+if str(_PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(_PROJECT_DIR))
+
+from utils.episode_index import TenantEpisodeIndex  # noqa: E402
+
+
+def _clustered_embeddings(
+    rng: np.random.Generator, count: int, dimensions: int, topics: int
+) -> np.ndarray:
+    centers = rng.standard_normal((topics, dimensions)).astype(np.float32)
+    labels = rng.integers(0, topics, count)
+    noise = rng.standard_normal((count, dimensions)).astype(np.float32)
+    return centers[labels] + 0.8 * noise
+
+
+def _percentile_ms(samples: list[float], q: float) -> float:
+    return float(np.percentile(samples, q) * 1000)
+
+
+def run(size: int, dimensions: int, queries: int, top_k: int) -> None:
+    rng = np.random.default_rng(size)
+    embeddings = _clustered_embeddings(rng, size, dimensions, topics=max(size // 50, 8))
+    docs = [
+        {"id": f"ep-{i}", "tenant_id": "bench", "embedding": embeddings[i]}
+        for i in range(size)
+    ]
+
+    started = time.perf_counter()
+    index = TenantEpisodeIndex()
+    index.upsert(docs)
+    build_secs = time.perf_counter() - started
+
+    # Queries are perturbed episodes, like a new question on a known topic.
+    picks = rng.integers(0, size, queries)
+    query_vectors = embeddings[picks] + 0.5 * rng.standard_normal(
+        (queries, dimensions)
+    ).astype(np.float32)
+
+    normalized = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    index_latency: list[float] = []
+    exact_latency: list[float] = []
+    hits = 0
+    for query in query_vectors:
+        started = time.perf_counter()
+        results = index.search(query, top_k)
+        index_latency.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        scores = normalized @ (query / np.linalg.norm(query))
+        exact = np.argpartition(-scores, top_k - 1)[:top_k]
+        exact_latency.append(time.perf_counter() - started)
+
+        expected = {f"ep-{i}" for i in exact}
+        hits += len(expected & {r["id"] for r in results})
+
+    mode = "ivf" if index._ivf is not None else "brute-force"
+    print(
+        f"episodes={size:>7} mode={mode:<11} build={build_secs:6.2f}s "
+        f"index p50={_percentile_ms(index_latency, 50):6.2f}ms "
+        f"p95={_percentile_ms(index_latency, 95):6.2f}ms | "
+        f"exact p50={_percentile_ms(exact_latency, 50):6.2f}ms "
+        f"p95={_percentile_ms(exact_latency, 95):6.2f}ms | "
+        f"recall@{top_k}={hits / (queries * top_k):.3f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--dimensions", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=2)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        run(size, args.dimensions, args.queries, args.top_k)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,20 +7,33 @@ them in a dedicated Cosmos DB container for vector-similarity retrieval.
 Triggered as a background task whenever ``/conversation/save`` persists
 a new message.  The service:
 1. Queries the full thread from Cosmos DB.
-2. If the thread qualifies, extracts an episode via ``chat.completions``
+2. Waits for the thread to go quiet: updates of the same thread within the
+   debounce window are coalesced into one extraction.
+3. Skips the extraction when the thread content hash matches the one
+   stored with the thread's episode.
+4. If the thread qualifies, extracts an episode via ``chat.completions``
    and stores it in the ``experience-episodes`` Cosmos DB container.
+
+Long threads are capped: the opening message and the most recent messages
+are sent verbatim, the replies in between as a rolling summary that is
+extended (not rebuilt) as the thread grows.
 """
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import logging
+import time
+from collections import OrderedDict
 from pathlib import Path
 
 from models.conversation import ConversationMessage, ConversationMessageItem, Role
 from models.episode import Episode, EpisodeDocument
-from utils.azure_ai_foundry import get_embedding_client, get_project_client
-from utils.azure_cosmosdb import save_episode
+from utils.azure_ai_foundry import get_project_client
+from utils.azure_cosmosdb import get_episode, save_episode
+from utils.embedding_service import EmbeddingService
 from config.app_config import get as cfg
 
 logger = logging.getLogger(__name__)
@@ -30,24 +43,166 @@ _EPISODE_EXTRACTION_TEMPERATURE = 0.2
 _EPISODE_PROMPT_PATH = (
     Path(__file__).resolve().parent.parent / "prompts" / "episode_extraction.md"
 )
+_SUMMARY_PROMPT_PATH = (
+    Path(__file__).resolve().parent.parent / "prompts" / "thread_summary.md"
+)
+
+_DEFAULT_DEBOUNCE_SECS = 20.0
+_DEFAULT_DEBOUNCE_MAX_SECS = 120.0
+_DEFAULT_TRANSCRIPT_MAX_MESSAGES = 30
+
+# The summarized range grows in steps, so that the summary is extended at
+# most once every this many messages.
+_SUMMARY_STEP = 10
+
+# Fallback when the summary call fails: each earlier message is cut to this.
+_CONDENSED_MESSAGE_CHARS = 200
+
+# Threads whose content hash and summary are kept in memory.
+_MAX_TRACKED_THREADS = 1024
+
+
+class _PendingUpdate:
+    """The latest state of a thread waiting for its debounced extraction."""
+
+    def __init__(
+        self,
+        message: ConversationMessage,
+        thread_messages: list[ConversationMessageItem],
+    ) -> None:
+        self.message = message
+        self.thread_messages = thread_messages
+        self.first_at = self.last_at = time.monotonic()
+        self.updates = 1
+        # Set by qualifying updates; cleared when the extraction starts
+        self.dirty = True
+
+    def update(
+        self,
+        message: ConversationMessage,
+        thread_messages: list[ConversationMessageItem],
+        *,
+        qualifies: bool,
+    ) -> None:
+        self.last_at = time.monotonic()
+        self.updates += 1
+        # Concurrent thread queries may complete out of order.
+        if len(thread_messages) >= len(self.thread_messages):
+            self.thread_messages = thread_messages
+        if qualifies:
+            self.message = message
+            self.dirty = True
+
+
+class _ThreadSummary:
+    """Summary of ``raw_messages[1:covered]`` of one thread."""
+
+    def __init__(self, covered: int, prefix_hash: str, text: str) -> None:
+        self.covered = covered
+        self.prefix_hash = prefix_hash
+        self.text = text
 
 
 class ThreadMemoryService:
     """Extracts structured episodes from conversation threads."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        debounce_secs: float | None = None,
+        debounce_max_secs: float | None = None,
+        transcript_max_messages: int | None = None,
+    ) -> None:
         self._episode_prompt: str | None = None
+        self._summary_prompt: str | None = None
+        # Explicit settings win; otherwise they are read from App Config on use
+        # (the service is created before App Config is loaded).
+        self._debounce_secs = debounce_secs
+        self._debounce_max_secs = debounce_max_secs
+        self._transcript_max_messages = transcript_max_messages
+        # (tenant_id, thread_id) -> update waiting for (or in) extraction
+        self._pending: dict[tuple[str, str], _PendingUpdate] = {}
+        # (tenant_id, thread_id) -> content hash of the stored episode
+        self._content_hashes: OrderedDict[tuple[str, str], str] = OrderedDict()
+        # (tenant_id, thread_id) -> rolling summary of earlier messages
+        self._summaries: OrderedDict[tuple[str, str], _ThreadSummary] = (
+            OrderedDict()
+        )
 
     async def process_thread_update(
         self,
         message: ConversationMessage,
         thread_messages: list[ConversationMessageItem],
     ) -> None:
-        """Extract episodes from the thread if it qualifies."""
+        """Extract episodes from the thread if it qualifies.
+
+        Updates of a thread arriving while an earlier update waits for the
+        debounce window only replace the pending state; the waiting call
+        runs one extraction with the latest thread once the thread has been
+        quiet for ``MEMORY_EPISODE_DEBOUNCE_SECS`` (or after
+        ``MEMORY_EPISODE_DEBOUNCE_MAX_SECS`` at the latest).
+        """
         tenant_id = (message.tenant_id or "").strip()
+        if not tenant_id:
+            return
+
+        debounce_secs = self._setting(
+            self._debounce_secs, "MEMORY_EPISODE_DEBOUNCE_SECS", _DEFAULT_DEBOUNCE_SECS
+        )
+        if debounce_secs <= 0:
+            await self._extract_episode(message, thread_messages, tenant_id)
+            return
+
+        key = (tenant_id, message.conversation_id or "unknown")
+        raw_messages = [self._item_to_dict(m) for m in thread_messages]
+        qualifies = self._qualifies_for_episode(message, raw_messages)
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            pending.update(message, thread_messages, qualifies=qualifies)
+            return
+        if not qualifies:
+            logger.info(
+                "Episode extraction skipped: thread does not qualify "
+                "(conversation=%s, messages=%d)",
+                message.conversation_id,
+                len(thread_messages),
+            )
+            return
 
-        # --- Episode extraction ---
-        await self._extract_episode(message, thread_messages, tenant_id)
+        max_secs = self._setting(
+            self._debounce_max_secs,
+            "MEMORY_EPISODE_DEBOUNCE_MAX_SECS",
+            _DEFAULT_DEBOUNCE_MAX_SECS,
+        )
+        pending = self._pending[key] = _PendingUpdate(message, thread_messages)
+        try:
+            # Updates arriving during an extraction set ``dirty`` again and
+            # get one more round.
+            while pending.dirty:
+                while True:
+                    deadline = min(
+                        pending.last_at + debounce_secs, pending.first_at + max_secs
+                    )
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    await asyncio.sleep(remaining)
+
+                pending.dirty = False
+                if pending.updates > 1:
+                    logger.info(
+                        "Episode extraction coalesced %d updates of thread=%s",
+                        pending.updates,
+                        key[1],
+                    )
+                pending.first_at = pending.last_at = time.monotonic()
+                pending.updates = 0
+                await self._extract_episode(
+                    pending.message, pending.thread_messages, tenant_id
+                )
+        finally:
+            self._pending.pop(key, None)
 
     # ------------------------------------------------------------------
     # Episode extraction
@@ -70,6 +225,9 @@ class ThreadMemoryService:
         The LLM decides whether the conversation has reached a conclusion.
         If not, it returns ``null`` and we wait for more messages.  If it
         returns an episode, we upsert (deterministic ID replaces previous).
+
+        Threads whose content is unchanged since their stored episode was
+        extracted are skipped.
         """
         if not tenant_id:
             return
@@ -87,9 +245,20 @@ class ThreadMemoryService:
 
         source_thread_id = message.conversation_id or "unknown"
         current_length = len(thread_messages)
+        key = (tenant_id, source_thread_id)
 
-        # Format the thread as a transcript
-        formatted = self._format_thread(raw_messages)
+        content_hash = self._content_hash(raw_messages)
+        if await self._stored_content_hash(tenant_id, source_thread_id) == content_hash:
+            logger.info(
+                "Episode extraction skipped: thread=%s unchanged since the "
+                "stored episode (messages=%d)",
+                source_thread_id,
+                current_length,
+            )
+            return
+
+        # Format the thread as a transcript, capping long threads
+        formatted = await self._build_transcript(key, raw_messages)
 
         # Call LLM — it returns null if the thread is unresolved
         episode = await self._call_llm(formatted)
@@ -109,6 +278,7 @@ class ThreadMemoryService:
             tenant_id=tenant_id,
             source_thread_id=source_thread_id,
             message_count=current_length,
+            content_hash=content_hash,
         )
 
         # Generate embedding
@@ -126,6 +296,7 @@ class ThreadMemoryService:
                 current_length,
                 doc.confidence,
             )
+            self._remember(self._content_hashes, key, content_hash)
         except Exception:
             logger.warning(
                 "Episode save failed: thread=%s tenant=%s",
@@ -160,13 +331,133 @@ class ThreadMemoryService:
         logger.debug("Episode extraction raw response: %s", raw[:500])
         return self._parse_episode(raw)
 
+    async def _stored_content_hash(
+        self, tenant_id: str, source_thread_id: str
+    ) -> str | None:
+        """Return the content hash stored with the thread's episode, if any."""
+        key = (tenant_id, source_thread_id)
+        if key in self._content_hashes:
+            self._content_hashes.move_to_end(key)
+            return self._content_hashes[key]
+        try:
+            stored = await get_episode(
+                tenant_id, EpisodeDocument.make_id(tenant_id, source_thread_id)
+            )
+        except Exception:
+            logger.warning(
+                "Episode lookup failed: thread=%s tenant=%s",
+                source_thread_id,
+                tenant_id,
+                exc_info=True,
+            )
+            return None
+        content_hash = (stored or {}).get("content_hash")
+        if content_hash:
+            self._remember(self._content_hashes, key, content_hash)
+        return content_hash
+
+    # ------------------------------------------------------------------
+    # Transcript
+    # ------------------------------------------------------------------
+
+    async def _build_transcript(
+        self, key: tuple[str, str], raw_messages: list[dict]
+    ) -> str:
+        """Format the thread, folding earlier replies of long threads into a summary.
+
+        The opening message and the most recent messages are kept verbatim.
+        The summary of ``raw_messages[1:boundary]`` is extended with the
+        newly covered messages when the boundary moves, and rebuilt only if
+        the already summarized messages changed.
+        """
+        max_messages = int(
+            self._setting(
+                self._transcript_max_messages,
+                "MEMORY_EPISODE_TRANSCRIPT_MAX_MESSAGES",
+                _DEFAULT_TRANSCRIPT_MAX_MESSAGES,
+            )
+        )
+        overflow = len(raw_messages) - max(max_messages, 2)
+        if overflow <= 0:
+            return self._format_thread(raw_messages)
+
+        steps = -(-overflow // _SUMMARY_STEP)
+        boundary = min(1 + steps * _SUMMARY_STEP, len(raw_messages) - 1)
+        summary = await self._rolling_summary(key, raw_messages, boundary)
+
+        parts = [
+            self._format_thread(raw_messages[:1]),
+            f"[Summary of {boundary - 1} earlier messages]\n{summary}",
+            self._format_thread(raw_messages[boundary:]),
+        ]
+        return "\n\n".join(part for part in parts if part)
+
+    async def _rolling_summary(
+        self, key: tuple[str, str], raw_messages: list[dict], boundary: int
+    ) -> str:
+        """Return a summary of ``raw_messages[1:boundary]``."""
+        previous = self._summaries.get(key)
+        if previous is not None and (
+            previous.covered > boundary
+            or previous.prefix_hash
+            != self._content_hash(raw_messages[1 : previous.covered])
+        ):
+            previous = None
+        if previous is not None and previous.covered == boundary:
+            self._summaries.move_to_end(key)
+            return previous.text
+
+        start = previous.covered if previous is not None else 1
+        text = await self._call_summary_llm(
+            previous.text if previous is not None else None,
+            raw_messages[start:boundary],
+        )
+        if text is None:
+            return self._condense(raw_messages[1:boundary])
+
+        self._remember(
+            self._summaries,
+            key,
+            _ThreadSummary(
+                boundary, self._content_hash(raw_messages[1:boundary]), text
+            ),
+        )
+        return text
+
+    async def _call_summary_llm(
+        self, previous_summary: str | None, messages: list[dict]
+    ) -> str | None:
+        """Summarize *messages*, extending *previous_summary* if given."""
+        if self._summary_prompt is None:
+            self._summary_prompt = _SUMMARY_PROMPT_PATH.read_text(encoding="utf-8")
+
+        content = self._format_thread(messages)
+        if previous_summary:
+            content = (
+                f"[Summary so far]\n{previous_summary}\n\n[New messages]\n{content}"
+            )
+
+        model = cfg("MEMORY_AGENT_MODEL", "gpt-4.1")
+        openai_client = get_project_client().get_openai_client()
+        try:
+            response = await openai_client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": self._summary_prompt},
+                    {"role": "user", "content": content},
+                ],
+                temperature=_EPISODE_EXTRACTION_TEMPERATURE,
+            )
+        except Exception:
+            logger.warning("Thread summary LLM call failed", exc_info=True)
+            return None
+        return (response.choices[0].message.content or "").strip() or None
+
     async def _generate_embedding(self, text: str) -> list[float]:
         """Generate a vector embedding for similarity search."""
         model = cfg("MEMORY_STORE_EMBEDDING_MODEL", "text-embedding-3-small")
-        client = get_embedding_client()
         try:
-            response = await client.embeddings.create(model=model, input=text)
-            return response.data[0].embedding
+            return await EmbeddingService.instance().embed(text, model=model)
         except Exception:
             logger.warning("Embedding generation failed", exc_info=True)
             return []
@@ -230,6 +521,44 @@ class ThreadMemoryService:
             "conversation_partition": getattr(item, "conversation_partition", None),
         }
 
+    @staticmethod
+    def _setting(explicit: float | None, key: str, default: float) -> float:
+        if explicit is not None:
+            return explicit
+        return float(cfg(key, str(default)))
+
+    @staticmethod
+    def _remember(cache: OrderedDict, key: tuple[str, str], value) -> None:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > _MAX_TRACKED_THREADS:
+            cache.popitem(last=False)
+
+    @staticmethod
+    def _content_hash(thread_messages: list[dict]) -> str:
+        """Hash the parts of the thread that the extraction depends on."""
+        payload = json.dumps(
+            [
+                [m.get("sender_role"), m.get("sender_id"), m.get("content") or ""]
+                for m in thread_messages
+            ],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _condense(thread_messages: list[dict]) -> str:
+        """One shortened line per message: the summary fallback."""
+        lines: list[str] = []
+        for msg in thread_messages:
+            content = " ".join((msg.get("content") or "").split())
+            if not content:
+                continue
+            if len(content) > _CONDENSED_MESSAGE_CHARS:
+                content = content[: _CONDENSED_MESSAGE_CHARS - 3] + "..."
+            lines.append(f"- {msg.get('sender_name', 'Unknown')}: {content}")
+        return "\n".join(lines)
+
     @staticmethod
     def _format_thread(thread_messages: list[dict]) -> str:
         """Format a thread into a readable transcript for the LLM."""
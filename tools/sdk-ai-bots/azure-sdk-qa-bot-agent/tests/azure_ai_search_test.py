@@ -0,0 +1,160 @@
+"""Tests for batched hierarchy expansion in SearchClient."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+_PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+import utils.azure_ai_search as azure_ai_search_module
+from models.knowledge import KnowledgeChunk
+from utils.azure_ai_search import SearchClient, _ExpansionCache
+
+
+def _doc(title: str, h1: str, h2: str, text: str, source: str = "typespec_docs") -> dict:
+    return {
+        "chunk_id": f"{title}-{text}",
+        "title": title,
+        "chunk": text,
+        "context_id": source,
+        "header_1": h1,
+        "header_2": h2,
+        "header_3": "",
+    }
+
+
+class _AsyncResults:
+    def __init__(self, docs: list[dict]) -> None:
+        self._docs = iter(docs)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        try:
+            return next(self._docs)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class _FakeAzureSearchClient:
+    """Returns *docs* (in ordinal order) for every query, capped at ``top``.
+
+    Single-section queries whose filter is in *by_filter* get those docs instead.
+    """
+
+    def __init__(self, docs: list[dict], by_filter: dict[str, list[dict]] | None = None):
+        self._docs = docs
+        self._by_filter = by_filter or {}
+        self.calls: list[dict] = []
+
+    async def search(self, **kwargs):
+        self.calls.append(kwargs)
+        docs = self._by_filter.get(kwargs["filter"], self._docs)
+        return _AsyncResults(docs[: kwargs["top"]])
+
+
+def _client(fake: _FakeAzureSearchClient) -> SearchClient:
+    client = SearchClient.__new__(SearchClient)
+    client._search_client = fake
+    client._expansion_cache = _ExpansionCache(max_entries=10, ttl_secs=3600)
+    return client
+
+
+def _chunk(title: str, h1: str, h2: str = "") -> KnowledgeChunk:
+    return KnowledgeChunk(
+        chunk_id=f"{title}-{h1}-{h2}",
+        source="typespec_docs",
+        title=title,
+        header1=h1,
+        header2=h2,
+    )
+
+
+_DOCS = [
+    _doc("versioning.md", "Versioning", "", "intro"),
+    _doc("versioning.md", "Versioning", "Added", "use @added"),
+    _doc("paging.md", "Paging", "", "paging intro"),
+    _doc("versioning.md", "Versioning", "Removed", "use @removed"),
+]
+
+
+@pytest.mark.asyncio
+async def test_batch_expansion_uses_one_query_and_assembles_each_section() -> None:
+    fake = _FakeAzureSearchClient(_DOCS)
+    client = _client(fake)
+
+    expanded = await client.expand_by_hierarchy_batch(
+        [
+            _chunk("versioning.md", "Versioning", "Added"),
+            _chunk("paging.md", "Paging"),
+            _chunk("versioning.md", "Versioning"),
+        ]
+    )
+
+    assert len(fake.calls) == 1
+    assert " or " in fake.calls[0]["filter"]
+    assert expanded[0].content == "# versioning.md\n# Versioning\n## Added\nuse @added"
+    assert expanded[1].content == "# paging.md\n# Paging\npaging intro"
+    assert expanded[2].content == (
+        "# versioning.md\n# Versioning\nintro\n## Added\nuse @added\n"
+        "## Removed\nuse @removed"
+    )
+    assert expanded[0].header2 == "Added"
+
+
+@pytest.mark.asyncio
+async def test_expanded_sections_are_cached() -> None:
+    fake = _FakeAzureSearchClient(_DOCS)
+    client = _client(fake)
+
+    first = await client.expand_by_hierarchy(_chunk("paging.md", "Paging"))
+    second = await client.expand_by_hierarchy_batch(
+        [_chunk("paging.md", "Paging"), _chunk("versioning.md", "Versioning", "Added")]
+    )
+
+    assert len(fake.calls) == 2
+    assert "paging.md" not in fake.calls[1]["filter"]
+    assert second[0].content == first.content
+
+
+@pytest.mark.asyncio
+async def test_sections_cut_short_by_the_batch_limit_are_refetched(monkeypatch) -> None:
+    monkeypatch.setattr(azure_ai_search_module, "_HIERARCHY_EXPANSION_TOP", 2)
+    paging = _chunk("paging.md", "Paging")
+    # The combined query returns top=4 results, all from versioning.md.
+    crowded = [_doc("versioning.md", "Versioning", "", f"part {i}") for i in range(6)]
+    paging_filter = azure_ai_search_module._section_filter(paging)
+    fake = _FakeAzureSearchClient(
+        crowded, by_filter={paging_filter: [_doc("paging.md", "Paging", "", "paging intro")]}
+    )
+    client = _client(fake)
+
+    expanded = await client.expand_by_hierarchy_batch(
+        [_chunk("versioning.md", "Versioning"), paging]
+    )
+
+    assert len(fake.calls) == 2
+    assert fake.calls[1]["filter"] == paging_filter
+    assert expanded[0].content == "# versioning.md\n# Versioning\npart 0\npart 1"
+    assert expanded[1].content == "# paging.md\n# Paging\npaging intro"
+
+
+def test_expansion_cache_evicts_least_recently_used() -> None:
+    cache = _ExpansionCache(max_entries=2, ttl_secs=3600)
+    cache.put(("a",), "A")
+    cache.put(("b",), "B")
+    assert cache.get(("a",)) == "A"
+    cache.put(("c",), "C")
+
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) == "A"
+
+    expired = _ExpansionCache(max_entries=2, ttl_secs=0)
+    expired.put(("a",), "A")
+    assert expired.get(("a",)) is None
@@ -0,0 +1,174 @@
+"""Tests for EmbeddingService — caching, coalescing and batching."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+_PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+import utils.embedding_service as embedding_service_module
+from utils.embedding_service import EmbeddingService, normalize_text
+
+
+class _FakeEmbeddings:
+    """Records embeddings.create calls; the embedding of a text is [len(text)]."""
+
+    def __init__(self, error: Exception | None = None) -> None:
+        self.calls: list[list[str]] = []
+        self.error = error
+        # Any request including one of these texts fails
+        self.rejected: set[str] = set()
+
+    async def create(self, *, model, input):
+        self.calls.append(list(input))
+        await asyncio.sleep(0)
+        if self.error:
+            raise self.error
+        if self.rejected & set(input):
+            raise ValueError("input too long")
+        return SimpleNamespace(
+            data=[
+                SimpleNamespace(index=i, embedding=[float(len(text))])
+                for i, text in enumerate(input)
+            ]
+        )
+
+
+@pytest.fixture
+def embeddings(monkeypatch) -> _FakeEmbeddings:
+    fake = _FakeEmbeddings()
+    client = SimpleNamespace(embeddings=fake)
+    monkeypatch.setattr(embedding_service_module, "get_embedding_client", lambda: client)
+    return fake
+
+
+def test_normalize_text_collapses_whitespace() -> None:
+    assert normalize_text("  How do I\n\tuse  TypeSpec? ") == "How do I use TypeSpec?"
+
+
+@pytest.mark.asyncio
+async def test_repeated_text_is_served_from_cache(embeddings) -> None:
+    service = EmbeddingService(batch_window_secs=0)
+
+    first = await service.embed("How do I use TypeSpec?", model="m")
+    second = await service.embed("How do I  use TypeSpec?\n", model="m")
+
+    assert first == second == [22.0]
+    assert embeddings.calls == [["How do I use TypeSpec?"]]
+    stats = service.stats()
+    assert (stats["hit"], stats["miss"]) == (1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_cache_is_keyed_by_model(embeddings) -> None:
+    service = EmbeddingService(batch_window_secs=0)
+
+    await service.embed("question", model="small")
+    await service.embed("question", model="large")
+
+    assert len(embeddings.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_texts_are_coalesced_and_batched(embeddings) -> None:
+    service = EmbeddingService(batch_window_secs=0.01)
+
+    results = await asyncio.gather(
+        service.embed("a", model="m"),
+        service.embed("bb", model="m"),
+        service.embed("a", model="m"),
+    )
+
+    assert results == [[1.0], [2.0], [1.0]]
+    assert embeddings.calls == [["a", "bb"]]
+    assert service.stats()["coalesced"] == 1
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_sent_without_waiting_for_the_window(embeddings) -> None:
+    service = EmbeddingService(batch_window_secs=60, max_batch_size=2)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(service.embed("a", model="m"), service.embed("bb", model="m")),
+        timeout=1,
+    )
+
+    assert results == [[1.0], [2.0]]
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_and_are_evicted(embeddings) -> None:
+    service = EmbeddingService(batch_window_secs=0, ttl_secs=0)
+    await service.embed("a", model="m")
+    await service.embed("a", model="m")
+    assert len(embeddings.calls) == 2
+
+    service = EmbeddingService(batch_window_secs=0, max_entries=1)
+    await service.embed("a", model="m")
+    await service.embed("bb", model="m")
+    await service.embed("a", model="m")
+    assert embeddings.calls[-3:] == [["a"], ["bb"], ["a"]]
+
+
+@pytest.mark.asyncio
+async def test_failed_request_is_raised_and_not_cached(embeddings) -> None:
+    service = EmbeddingService(batch_window_secs=0)
+    embeddings.error = RuntimeError("throttled")
+
+    with pytest.raises(RuntimeError, match="throttled"):
+        await service.embed("a", model="m")
+
+    embeddings.error = None
+    assert await service.embed("a", model="m") == [1.0]
+    assert len(embeddings.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_caller_text_is_embedded_not_the_normalized_key(embeddings) -> None:
+    service = EmbeddingService(batch_window_secs=0)
+
+    await service.embed("  line one\n\tline two ", model="m")
+
+    assert embeddings.calls == [["  line one\n\tline two "]]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_retried_per_text(embeddings) -> None:
+    service = EmbeddingService(batch_window_secs=0.01)
+    embeddings.rejected = {"bad"}
+
+    results = await asyncio.gather(
+        service.embed("a", model="m"),
+        service.embed("bad", model="m"),
+        service.embed("cc", model="m"),
+        return_exceptions=True,
+    )
+
+    assert results[0] == [1.0] and results[2] == [2.0]
+    assert isinstance(results[1], ValueError)
+    assert embeddings.calls[0] == ["a", "bad", "cc"]
+    assert sorted(embeddings.calls[1:]) == [["a"], ["bad"], ["cc"]]
+
+
+@pytest.mark.asyncio
+async def test_early_batch_cancels_its_window_timer(embeddings) -> None:
+    service = EmbeddingService(batch_window_secs=0.05, max_batch_size=2)
+
+    await asyncio.gather(service.embed("a", model="m"), service.embed("b", model="m"))
+    await asyncio.sleep(0.03)
+    # The next batch waits for its own window, not the first batch's timer.
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await service.embed("cc", model="m")
+    waited = loop.time() - started
+
+    assert embeddings.calls == [["a", "b"], ["cc"]]
+    assert waited >= 0.045
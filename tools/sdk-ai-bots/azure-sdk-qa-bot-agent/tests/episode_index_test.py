@@ -0,0 +1,140 @@
+"""Tests for the local episode index."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+_PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+import utils.episode_index as episode_index_module
+from utils.episode_index import EpisodeIndex, TenantEpisodeIndex
+
+
+def _episode(episode_id: str, embedding: list[float], ts: int = 1) -> dict:
+    return {
+        "id": episode_id,
+        "tenant_id": "tenant-a",
+        "trigger": f"trigger {episode_id}",
+        "embedding": embedding,
+        "_ts": ts,
+    }
+
+
+def test_search_returns_most_similar_episodes_with_cosine_scores() -> None:
+    index = TenantEpisodeIndex()
+    index.upsert(
+        [
+            _episode("x", [1.0, 0.0]),
+            _episode("y", [0.0, 2.0]),
+            _episode("xy", [1.0, 1.0]),
+            _episode("no-embedding", []),
+        ]
+    )
+
+    results = index.search([2.0, 0.1], top_k=2)
+
+    assert len(index) == 3
+    assert [r["id"] for r in results] == ["x", "xy"]
+    assert results[0]["similarity_score"] == pytest.approx(0.9988, abs=1e-3)
+    assert "embedding" not in results[0] and "_ts" not in results[0]
+
+
+def test_upsert_replaces_an_existing_episode() -> None:
+    index = TenantEpisodeIndex()
+    index.upsert([_episode("a", [1.0, 0.0]), _episode("b", [0.0, 1.0])])
+    index.upsert([{**_episode("a", [0.0, 1.0]), "trigger": "updated"}])
+
+    results = index.search([0.0, 1.0], top_k=2)
+
+    assert len(index) == 2
+    assert {r["id"] for r in results} == {"a", "b"}
+    assert next(r for r in results if r["id"] == "a")["trigger"] == "updated"
+
+
+def test_large_index_is_searched_through_ivf(monkeypatch) -> None:
+    monkeypatch.setattr(episode_index_module, "_IVF_MIN_EPISODES", 200)
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((10, 32))
+    vectors = centers[rng.integers(0, 10, 400)] + 0.1 * rng.standard_normal((400, 32))
+    index = TenantEpisodeIndex()
+    index.upsert([_episode(f"ep-{i}", list(v)) for i, v in enumerate(vectors)])
+    assert index._ivf is not None
+
+    # Rows added after the build are searched too.
+    index.upsert([_episode("new", list(-centers[0]))])
+    assert index.search(list(-centers[0]), top_k=1)[0]["id"] == "new"
+
+    exact = int(np.argmax(vectors @ vectors[7] / np.linalg.norm(vectors, axis=1)))
+    assert index.search(list(vectors[7]), top_k=1)[0]["id"] == f"ep-{exact}"
+
+
+class _Loader:
+    def __init__(self, episodes: list[dict]) -> None:
+        self.episodes = episodes
+        self.calls: list[dict] = []
+
+    async def __call__(self, **kwargs):
+        self.calls.append(kwargs)
+        since = kwargs["modified_since"]
+        return [e for e in self.episodes if since is None or e["_ts"] >= since]
+
+
+@pytest.mark.asyncio
+async def test_cold_tenant_falls_back_until_loaded_then_delta_syncs() -> None:
+    loader = _Loader([_episode("a", [1.0, 0.0], ts=10)])
+    episode_index = EpisodeIndex(loader=loader, sync_interval_secs=3600)
+
+    assert await episode_index.search("tenant-a", [1.0, 0.0], top_k=1) is None
+    await episode_index.sync("tenant-a")
+    results = await episode_index.search("tenant-a", [1.0, 0.0], top_k=1)
+    assert results[0]["id"] == "a"
+
+    loader.episodes.append(_episode("b", [0.0, 1.0], ts=20))
+    await episode_index.sync("tenant-a")
+
+    assert loader.calls[0]["modified_since"] is None
+    assert loader.calls[-1] == {
+        "tenant_id": "tenant-a",
+        "include_embedding": True,
+        "modified_since": 10,
+    }
+    results = await episode_index.search("tenant-a", [0.0, 1.0], top_k=1)
+    assert results[0]["id"] == "b"
+
+
+@pytest.mark.asyncio
+async def test_delta_sync_swaps_in_a_new_index() -> None:
+    loader = _Loader([_episode("a", [1.0, 0.0], ts=10)])
+    episode_index = EpisodeIndex(loader=loader, sync_interval_secs=3600)
+    await episode_index.sync("tenant-a")
+    before = episode_index._tenants["tenant-a"].index
+
+    loader.episodes.append(_episode("b", [0.0, 1.0], ts=20))
+    await episode_index.sync("tenant-a")
+
+    after = episode_index._tenants["tenant-a"].index
+    assert after is not before
+    assert (len(before), len(after)) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_tenant_over_the_size_cap_is_not_indexed() -> None:
+    loader = _Loader([_episode("a", [1.0, 0.0], ts=10)])
+    episode_index = EpisodeIndex(loader=loader, sync_interval_secs=0, max_episodes=1)
+    await episode_index.sync("tenant-a")
+    assert await episode_index.search("tenant-a", [1.0, 0.0], top_k=1) is not None
+
+    loader.episodes.append(_episode("b", [0.0, 1.0], ts=20))
+    await episode_index.sync("tenant-a")
+
+    assert episode_index._tenants["tenant-a"].index is None
+    # No reload is attempted before the next full reload is due.
+    calls = len(loader.calls)
+    assert await episode_index.search("tenant-a", [1.0, 0.0], top_k=1) is None
+    assert len(loader.calls) == calls
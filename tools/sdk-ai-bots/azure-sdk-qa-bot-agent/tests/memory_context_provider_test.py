@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import sys
 from pathlib import Path
 from types import SimpleNamespace
@@ -14,7 +15,9 @@ _PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
 if _PROJECT_ROOT not in sys.path:
     sys.path.insert(0, _PROJECT_ROOT)
 
+import utils.embedding_service as embedding_service_module
 import utils.memory_context_provider as memory_context_provider_module
+from utils.embedding_service import EmbeddingService
 from utils.memory_context_provider import MemoryContextProvider
 
 
@@ -224,9 +227,10 @@ async def test_before_run_injects_user_memories_and_episodes(monkeypatch) -> Non
     }
 
     monkeypatch.setattr(
-        memory_context_provider_module, "get_embedding_client",
+        embedding_service_module, "get_embedding_client",
         lambda: mock_embedding_client,
     )
+    monkeypatch.setattr(EmbeddingService, "_instance", EmbeddingService())
     monkeypatch.setattr(
         memory_context_provider_module, "search_episodes_by_vector",
         AsyncMock(return_value=[fake_episode]),
@@ -281,3 +285,131 @@ async def test_after_run_updates_only_user_store(monkeypatch) -> None:
     assert len(memory_stores.update_calls) == 1
     assert memory_stores.update_calls[0]["name"] == "test-memory-store"
     assert memory_stores.update_calls[0]["scope"] == "user_alice"
+
+
+# ---------------------------------------------------------------------------
+# before_run: concurrent retrieval branches
+# ---------------------------------------------------------------------------
+
+def _tenant_user_context() -> _FakeContext:
+    return _FakeContext(
+        input_messages=[
+            Message("system", ["[tenant_context] original_tenant_id=azure_sdk_onboarding"]),
+            Message("system", ["[memory_scope] value=user_alice"]),
+            Message("user", ["How do I add a new API version?"]),
+        ]
+    )
+
+
+@pytest.mark.asyncio
+async def test_before_run_searches_user_store_and_episodes_concurrently(monkeypatch) -> None:
+    """The user search and the episode search are in flight at the same time."""
+    _patch_stores(monkeypatch)
+    both_started = asyncio.Event()
+    in_flight: list[str] = []
+
+    async def wait_for_other(name):
+        in_flight.append(name)
+        if len(in_flight) == 2:
+            both_started.set()
+        await asyncio.wait_for(both_started.wait(), timeout=1)
+
+    class _SlowMemoryStores(_FakeMemoryStores):
+        async def search_memories(self, **kwargs):
+            if "items" in kwargs:
+                await wait_for_other("user")
+            return await super().search_memories(**kwargs)
+
+    async def search_episodes(context, tenant_id):
+        await wait_for_other("episodes")
+        return [{"trigger": "tsp-client fails", "similarity_score": 0.9}]
+
+    memory_stores = _SlowMemoryStores(contextual_memories=[_make_memory("c1", "context mem")])
+    project_client = SimpleNamespace(beta=SimpleNamespace(memory_stores=memory_stores))
+    provider = MemoryContextProvider(project_client)
+    monkeypatch.setattr(provider, "_search_episodes", search_episodes)
+    state: dict = {"initialized": True, "user_static_memories": []}
+    context = _tenant_user_context()
+
+    await provider.before_run(
+        agent=None,
+        session=SimpleNamespace(session_id="session-1"),
+        context=context,
+        state=state,
+    )
+
+    assert sorted(in_flight) == ["episodes", "user"]
+    injected_text = context.extended_messages[0][1][0].text
+    assert "context mem" in injected_text
+    assert "tsp-client fails" in injected_text
+
+
+@pytest.mark.asyncio
+async def test_before_run_slow_episode_search_degrades_to_no_episodes(monkeypatch) -> None:
+    """A branch that exceeds its timeout is dropped instead of stalling the turn."""
+    _patch_stores(monkeypatch)
+    memory_stores = _FakeMemoryStores(
+        static_memories=[_make_memory("s1", "User prefers Python")],
+        contextual_memories=[_make_memory("c1", "context mem")],
+    )
+    project_client = SimpleNamespace(beta=SimpleNamespace(memory_stores=memory_stores))
+    provider = MemoryContextProvider(project_client)
+    provider._episode_search_timeout = 0.05
+
+    async def hang(context, tenant_id):
+        await asyncio.sleep(10)
+        return []
+
+    monkeypatch.setattr(provider, "_search_episodes", hang)
+    state: dict = {}
+    context = _tenant_user_context()
+
+    await asyncio.wait_for(
+        provider.before_run(
+            agent=None,
+            session=SimpleNamespace(session_id="session-1"),
+            context=context,
+            state=state,
+        ),
+        timeout=2,
+    )
+
+    injected_text = context.extended_messages[0][1][0].text
+    assert "User prefers Python" in injected_text
+    assert "context mem" in injected_text
+    assert "## Expert experience" not in injected_text
+    assert state["initialized"] is True
+
+
+@pytest.mark.asyncio
+async def test_before_run_retries_static_fetch_after_timeout(monkeypatch) -> None:
+    """A timed-out static fetch leaves the session uninitialized so the next turn retries it."""
+    _patch_stores(monkeypatch)
+
+    class _SlowStaticStores(_FakeMemoryStores):
+        async def search_memories(self, **kwargs):
+            if "items" not in kwargs:
+                await asyncio.sleep(10)
+            return await super().search_memories(**kwargs)
+
+    memory_stores = _SlowStaticStores(contextual_memories=[_make_memory("c1", "context mem")])
+    project_client = SimpleNamespace(beta=SimpleNamespace(memory_stores=memory_stores))
+    provider = MemoryContextProvider(project_client)
+    provider._user_search_timeout = 0.05
+    state: dict = {}
+    context = _FakeContext(
+        input_messages=[
+            Message("system", ["[memory_scope] value=user_alice"]),
+            Message("user", ["What failed in my pipeline?"]),
+        ]
+    )
+
+    await provider.before_run(
+        agent=None,
+        session=SimpleNamespace(session_id="session-1"),
+        context=context,
+        state=state,
+    )
+
+    assert "initialized" not in state
+    assert "context mem" in context.extended_messages[0][1][0].text
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import sys
 from datetime import datetime, timezone
@@ -15,7 +16,12 @@ _PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
 if _PROJECT_ROOT not in sys.path:
     sys.path.insert(0, _PROJECT_ROOT)
 
-from models.conversation import ConversationMessage, ConversationType, Role
+from models.conversation import (
+    ConversationMessage,
+    ConversationMessageItem,
+    ConversationType,
+    Role,
+)
 from models.episode import Episode, EpisodeDocument
 from services.thread_memory_service import ThreadMemoryService
 
@@ -386,3 +392,185 @@ class TestExtractEpisode:
             episode = await svc._call_llm(formatted)
 
         assert episode is None
+
+
+# ---------------------------------------------------------------------------
+# Debounced, incremental extraction
+# ---------------------------------------------------------------------------
+
+
+def _items(thread: list[dict]) -> list[ConversationMessageItem]:
+    return [
+        ConversationMessageItem(
+            id=f"msg-{i}",
+            channel_id="channel-1",
+            sender_role=Role(m["sender_role"]),
+            sender_id=m["sender_id"],
+            sender_name=m["sender_name"],
+            content=m["content"],
+            created_at=datetime.now(timezone.utc),
+            conversation_id="conv-001",
+            conversation_type=ConversationType.teams_channel,
+            tenant_id="tenant-1",
+            conversation_partition="teams_channel:conv-001",
+        )
+        for i, m in enumerate(thread)
+    ]
+
+
+def _tenant_message(sender_id: str, content: str) -> ConversationMessage:
+    return _make_message(sender_id, sender_id, content).model_copy(
+        update={"tenant_id": "tenant-1"}
+    )
+
+
+def _long_thread(count: int) -> list[dict]:
+    return [
+        {
+            "sender_role": "user",
+            "sender_id": "user_alice" if i % 2 == 0 else "user_bob_expert",
+            "sender_name": "Alice" if i % 2 == 0 else "Bob",
+            "content": f"message {i}",
+        }
+        for i in range(count)
+    ]
+
+
+class TestDebouncedExtraction:
+    @pytest.mark.asyncio
+    async def test_rapid_updates_are_coalesced_into_one_extraction(self):
+        svc = ThreadMemoryService(debounce_secs=0.05, debounce_max_secs=5)
+        expert = _tenant_message("user_bob_expert", "Add the emitter.")
+        thanks = _tenant_message("user_alice", "That worked!")
+        thread = _items(_EXPERT_THREAD)
+
+        with patch.object(svc, "_extract_episode", new_callable=AsyncMock) as extract:
+            first = asyncio.create_task(
+                svc.process_thread_update(expert, thread[:4])
+            )
+            await asyncio.sleep(0.01)
+            await svc.process_thread_update(expert, thread[:4])
+            await svc.process_thread_update(thanks, thread)
+            await first
+
+        # The poster's reply extends the thread but keeps the expert message.
+        extract.assert_awaited_once_with(expert, thread, "tenant-1")
+
+    @pytest.mark.asyncio
+    async def test_update_during_extraction_triggers_another_round(self):
+        svc = ThreadMemoryService(debounce_secs=0.01, debounce_max_secs=5)
+        expert = _tenant_message("user_bob_expert", "Add the emitter.")
+        thread = _items(_EXPERT_THREAD)
+        calls: list[int] = []
+
+        async def extract(message, thread_messages, tenant_id):
+            calls.append(len(thread_messages))
+            if len(calls) == 1:
+                await svc.process_thread_update(expert, thread)
+
+        with patch.object(svc, "_extract_episode", side_effect=extract):
+            await svc.process_thread_update(expert, thread[:4])
+
+        assert calls == [4, 5]
+
+    @pytest.mark.asyncio
+    async def test_non_qualifying_update_does_not_start_a_window(self):
+        svc = ThreadMemoryService(debounce_secs=60)
+        thanks = _tenant_message("user_alice", "That worked!")
+
+        with patch.object(svc, "_extract_episode", new_callable=AsyncMock) as extract:
+            await asyncio.wait_for(
+                svc.process_thread_update(thanks, _items(_EXPERT_THREAD)), timeout=1
+            )
+
+        extract.assert_not_awaited()
+
+
+class TestIncrementalExtraction:
+    @pytest.mark.asyncio
+    async def test_unchanged_thread_is_not_re_extracted(self):
+        svc = ThreadMemoryService(debounce_secs=0)
+        expert = _tenant_message("user_bob_expert", "Add the emitter.")
+        thread = _items(_EXPERT_THREAD)
+        content_hash = svc._content_hash([svc._item_to_dict(m) for m in thread])
+
+        with patch(
+            "services.thread_memory_service.get_episode",
+            AsyncMock(return_value={"content_hash": content_hash}),
+        ), patch.object(svc, "_call_llm", new_callable=AsyncMock) as call_llm:
+            await svc.process_thread_update(expert, thread)
+
+        call_llm.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_saved_episode_records_content_hash(self):
+        svc = ThreadMemoryService(debounce_secs=0)
+        expert = _tenant_message("user_bob_expert", "Add the emitter.")
+        thread = _items(_EXPERT_THREAD)
+        episode = Episode(
+            trigger="emitter not found",
+            reasoning_chain=["Check tspconfig.yaml", "Add the emitter"],
+            resolution="Add the Python emitter",
+            key_insight="Check the emitter configuration",
+        )
+        save = AsyncMock()
+
+        with patch(
+            "services.thread_memory_service.get_episode",
+            AsyncMock(return_value=None),
+        ) as get_episode, patch(
+            "services.thread_memory_service.save_episode", save
+        ), patch.object(
+            svc, "_call_llm", AsyncMock(return_value=episode)
+        ) as call_llm, patch.object(
+            svc, "_generate_embedding", AsyncMock(return_value=[0.1])
+        ):
+            await svc.process_thread_update(expert, thread)
+            await svc.process_thread_update(expert, thread)
+
+        assert call_llm.await_count == 1
+        assert get_episode.await_count == 1
+        saved = save.await_args.args[0]
+        assert saved["message_count"] == 5
+        assert saved["content_hash"] == svc._content_hash(
+            [svc._item_to_dict(m) for m in thread]
+        )
+
+    @pytest.mark.asyncio
+    async def test_long_thread_is_capped_with_rolling_summary(self):
+        svc = ThreadMemoryService(transcript_max_messages=12)
+        key = ("tenant-1", "conv-001")
+        summarize = AsyncMock(side_effect=["summary 1-10", "summary 1-20"])
+
+        with patch.object(svc, "_call_summary_llm", summarize):
+            short = await svc._build_transcript(key, _long_thread(12))
+            first = await svc._build_transcript(key, _long_thread(20))
+            again = await svc._build_transcript(key, _long_thread(22))
+            extended = await svc._build_transcript(key, _long_thread(25))
+
+        assert short == svc._format_thread(_long_thread(12))
+        assert first.startswith(
+            "[Alice]\nmessage 0\n\n[Summary of 10 earlier messages]"
+        )
+        assert "message 11" in first and "message 10" not in first
+        assert "summary 1-10" in again
+        # Only the messages that left the verbatim tail are summarized.
+        assert summarize.await_count == 2
+        previous, messages = summarize.await_args.args
+        assert previous == "summary 1-10"
+        assert [m["content"] for m in messages] == [
+            f"message {i}" for i in range(11, 21)
+        ]
+        assert "[Summary of 20 earlier messages]\nsummary 1-20" in extended
+
+    @pytest.mark.asyncio
+    async def test_summary_failure_falls_back_to_condensed_messages(self):
+        svc = ThreadMemoryService(transcript_max_messages=12)
+
+        with patch.object(svc, "_call_summary_llm", AsyncMock(return_value=None)):
+            transcript = await svc._build_transcript(
+                ("tenant-1", "conv-001"), _long_thread(15)
+            )
+
+        assert "[Summary of 10 earlier messages]\n- Bob: message 1\n" in transcript
+        assert not svc._summaries
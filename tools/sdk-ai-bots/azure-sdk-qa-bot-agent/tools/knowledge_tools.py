@@ -189,10 +189,7 @@ class KnowledgeTools:
             len(raw_chunks),
         )
 
-        expand_tasks = [
-            search_client.expand_by_hierarchy(chunk) for chunk in unique_chunks
-        ]
-        expanded = await asyncio.gather(*expand_tasks)
+        expanded = await search_client.expand_by_hierarchy_batch(unique_chunks)
 
         # Log final search results (mirrors Go backend's "Final Search Result" log)
         logger.info("=========Final Search Result=========")
@@ -2,8 +2,8 @@
 
 This module uses the Azure AI Search Python SDK (not raw REST).  Each search
 result is automatically expanded by its header hierarchy so the agent gets
-full section context in a single call.  Sibling queries run concurrently
-via ``asyncio.gather`` for fast response times.
+full section context in a single call.  The siblings of all results are
+fetched with a few OR-combined queries, and expanded sections are cached.
 
 Two search strategies are provided and run in parallel:
   - **Agentic search** – uses the KnowledgeBaseRetrievalClient for
@@ -15,6 +15,8 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
+from collections import OrderedDict
 from enum import Enum
 
 from azure.search.documents.aio import SearchClient as AzureSearchClient
@@ -40,6 +42,13 @@ logger = logging.getLogger(__name__)
 _KB_MAX_OUTPUT_SIZE = 20000
 _HIERARCHY_EXPANSION_TOP = 20
 
+# Sections whose siblings are fetched together in one OR-combined query.
+_HIERARCHY_EXPANSION_BATCH_SIZE = 10
+
+# Expanded sections cached by (source, title, header path).
+_EXPANSION_CACHE_MAX_ENTRIES = 512
+_EXPANSION_CACHE_TTL_SECS = 3600.0
+
 # Chunks below this rerank score are considered low-relevance and dropped.
 _RERANK_SCORE_LOW_RELEVANCE_THRESHOLD = 2.0
 
@@ -64,6 +73,9 @@ class SearchClient:
             index_name=self._index,
             credential=self._credential,
         )
+        self._expansion_cache = _ExpansionCache(
+            _EXPANSION_CACHE_MAX_ENTRIES, _EXPANSION_CACHE_TTL_SECS
+        )
 
     @property
     def top_k(self) -> int:
@@ -228,18 +240,128 @@ class SearchClient:
 
     async def expand_by_hierarchy(self, chunk: KnowledgeChunk) -> KnowledgeChunk:
         """Fetch sibling chunks for a single ref and assemble content."""
-        hierarchy_filter = _build_hierarchy_filter(
-            title=chunk.title,
-            context_id=chunk.source,
-            header1=chunk.header1,
-            header2=chunk.header2,
-            header3=chunk.header3,
+        return (await self.expand_by_hierarchy_batch([chunk]))[0]
+
+    async def expand_by_hierarchy_batch(
+        self, chunks: list[KnowledgeChunk]
+    ) -> list[KnowledgeChunk]:
+        """Expand every chunk by its header hierarchy, in input order.
+
+        Sections already in the expansion cache are reused.  The siblings of
+        the remaining sections are fetched with one OR-combined filter query
+        per ``_HIERARCHY_EXPANSION_BATCH_SIZE`` sections, and assembled into
+        per-section content client-side.
+        """
+        contents: dict[tuple[str, ...], str] = {}
+        missing: dict[tuple[str, ...], KnowledgeChunk] = {}
+        for chunk in chunks:
+            key = _section_key(chunk)
+            if key in contents or key in missing:
+                continue
+            cached = self._expansion_cache.get(key)
+            if cached is not None:
+                contents[key] = cached
+            else:
+                missing[key] = chunk
+
+        if missing:
+            keys = list(missing)
+            groups = [
+                keys[i : i + _HIERARCHY_EXPANSION_BATCH_SIZE]
+                for i in range(0, len(keys), _HIERARCHY_EXPANSION_BATCH_SIZE)
+            ]
+            fetched = await asyncio.gather(
+                *(self._fetch_sections(group, missing) for group in groups)
+            )
+            for group_contents in fetched:
+                for key, content in group_contents.items():
+                    contents[key] = content
+                    self._expansion_cache.put(key, content)
+
+        logger.info(
+            "Hierarchy expansion: %d chunks, %d sections, %d from cache",
+            len(chunks),
+            len(contents),
+            len(contents) - len(missing),
+        )
+
+        expanded: list[KnowledgeChunk] = []
+        for chunk in chunks:
+            # Resolve link via the source's link config
+            source_def = get_knowledge_source(chunk.source)
+            link = source_def.get_link(chunk.title) if source_def else ""
+            expanded.append(
+                KnowledgeChunk(
+                    source=chunk.source,
+                    title=chunk.title,
+                    link=link,
+                    content=contents[_section_key(chunk)],
+                    chunk_id=chunk.chunk_id,
+                    header1=chunk.header1,
+                    header2=chunk.header2,
+                    header3=chunk.header3,
+                )
+            )
+        return expanded
+
+    async def _fetch_sections(
+        self,
+        keys: list[tuple[str, ...]],
+        chunks: dict[tuple[str, ...], KnowledgeChunk],
+    ) -> dict[tuple[str, ...], str]:
+        """Fetch the siblings of several sections in one query and assemble each.
+
+        Each section keeps its first ``_HIERARCHY_EXPANSION_TOP`` siblings by
+        ordinal position, as a per-section query would.  If the combined
+        query hits its ``top`` limit, sections that may have been cut short
+        are re-fetched on their own.
+        """
+        top = _HIERARCHY_EXPANSION_TOP * len(keys)
+        combined_filter = " or ".join(
+            f"({_section_filter(chunks[key])})" for key in keys
         )
+        siblings = await self._search_siblings(combined_filter, top)
+
+        by_section: dict[tuple[str, ...], list[KnowledgeChunk]] = {
+            key: [] for key in keys
+        }
+        for sibling in siblings:
+            sibling_path = _section_key(sibling, depth=3)
+            for key, section in by_section.items():
+                if sibling_path[: len(key)] == key:
+                    section.append(sibling)
+
+        if len(siblings) >= top and len(keys) > 1:
+            incomplete = [
+                key
+                for key, section in by_section.items()
+                if len(section) < _HIERARCHY_EXPANSION_TOP
+            ]
+            refetched = await asyncio.gather(
+                *(
+                    self._search_siblings(
+                        _section_filter(chunks[key]), _HIERARCHY_EXPANSION_TOP
+                    )
+                    for key in incomplete
+                )
+            )
+            by_section.update(zip(incomplete, refetched))
+
+        return {
+            key: _assemble_section(
+                chunks[key].title, section[:_HIERARCHY_EXPANSION_TOP]
+            )
+            for key, section in by_section.items()
+        }
 
-        sibling_results = await self._search_client.search(
+    async def _search_siblings(
+        self, odata_filter: str, top: int
+    ) -> list[KnowledgeChunk]:
+        """Return the chunks matching *odata_filter* in ordinal order."""
+        results = await self._search_client.search(
             search_text="*",
-            filter=hierarchy_filter,
-            top=_HIERARCHY_EXPANSION_TOP,
+            filter=odata_filter,
+            top=top,
             order_by=["ordinal_position asc"],
             select=[
                 "chunk_id",
@@ -251,44 +373,7 @@ class SearchClient:
                 "header_3",
             ],
         )
-
-        content_parts: list[str] = [f"# {chunk.title}"]
-        current_h1 = ""
-        current_h2 = ""
-        current_h3 = ""
-
-        async for s in sibling_results:
-            sibling = KnowledgeChunk.model_validate(dict(s))
-
-            if sibling.header1 != current_h1:
-                current_h1, current_h2, current_h3 = sibling.header1, "", ""
-                if current_h1:
-                    content_parts.append(f"# {current_h1}")
-            if sibling.header2 != current_h2:
-                current_h2, current_h3 = sibling.header2, ""
-                if current_h2:
-                    content_parts.append(f"## {current_h2}")
-            if sibling.header3 != current_h3:
-                current_h3 = sibling.header3
-                if current_h3:
-                    content_parts.append(f"### {current_h3}")
-            if sibling.content:
-                content_parts.append(sibling.content)
-
-        # Resolve link via the source's link config
-        source_def = get_knowledge_source(chunk.source)
-        link = source_def.get_link(chunk.title) if source_def else ""
-
-        return KnowledgeChunk(
-            source=chunk.source,
-            title=chunk.title,
-            link=link,
-            content="\n".join(content_parts),
-            chunk_id=chunk.chunk_id,
-            header1=chunk.header1,
-            header2=chunk.header2,
-            header3=chunk.header3,
-        )
+        return [KnowledgeChunk.model_validate(dict(s)) async for s in results]
 
     async def close(self) -> None:
         await self._kb_client.close()
@@ -351,6 +436,90 @@ def _build_hierarchy_filter(
     return " and ".join(filters)
 
 
+def _section_key(chunk: KnowledgeChunk, depth: int | None = None) -> tuple[str, ...]:
+    """Return ``(source, title, *header path)`` of the section a chunk expands to.
+
+    The header path stops at the chunk's deepest header, matching the scope of
+    ``_build_hierarchy_filter``; *depth* forces a fixed number of headers.
+    """
+    headers = (chunk.header1 or "", chunk.header2 or "", chunk.header3 or "")
+    if depth is None:
+        if chunk.header3:
+            depth = 3
+        elif chunk.header2:
+            depth = 2
+        elif chunk.header1:
+            depth = 1
+        else:
+            depth = 0
+    return (chunk.source, chunk.title, *headers[:depth])
+
+
+def _section_filter(chunk: KnowledgeChunk) -> str:
+    return _build_hierarchy_filter(
+        title=chunk.title,
+        context_id=chunk.source,
+        header1=chunk.header1,
+        header2=chunk.header2,
+        header3=chunk.header3,
+    )
+
+
+def _assemble_section(title: str, siblings: list[KnowledgeChunk]) -> str:
+    """Join sibling chunks into section content, re-emitting header lines."""
+    content_parts: list[str] = [f"# {title}"]
+    current_h1 = ""
+    current_h2 = ""
+    current_h3 = ""
+
+    for sibling in siblings:
+        if sibling.header1 != current_h1:
+            current_h1, current_h2, current_h3 = sibling.header1, "", ""
+            if current_h1:
+                content_parts.append(f"# {current_h1}")
+        if sibling.header2 != current_h2:
+            current_h2, current_h3 = sibling.header2, ""
+            if current_h2:
+                content_parts.append(f"## {current_h2}")
+        if sibling.header3 != current_h3:
+            current_h3 = sibling.header3
+            if current_h3:
+                content_parts.append(f"### {current_h3}")
+        if sibling.content:
+            content_parts.append(sibling.content)
+
+    return "\n".join(content_parts)
+
+
+class _ExpansionCache:
+    """Bounded LRU of assembled section content with a TTL.
+
+    Docs change rarely, so expanded sections are reused across tool calls.
+    """
+
+    def __init__(self, max_entries: int, ttl_secs: float) -> None:
+        self._max_entries = max_entries
+        self._ttl_secs = ttl_secs
+        self._entries: OrderedDict[tuple[str, ...], tuple[float, str]] = OrderedDict()
+
+    def get(self, key: tuple[str, ...]) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, content = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return content
+
+    def put(self, key: tuple[str, ...], content: str) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl_secs, content)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
 _client: SearchClient | None = None
 
 
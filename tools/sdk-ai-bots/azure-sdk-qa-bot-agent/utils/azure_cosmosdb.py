@@ -261,6 +261,15 @@ async def save_episode(document: dict[str, Any]) -> dict[str, Any]:
     return result
 
 
+async def get_episode(tenant_id: str, episode_id: str) -> dict[str, Any] | None:
+    """Point-read an episode document, or return ``None`` if it does not exist."""
+    container = await get_episode_container()
+    try:
+        return await container.read_item(item=episode_id, partition_key=tenant_id)
+    except cosmos_exceptions.CosmosResourceNotFoundError:
+        return None
+
+
 async def search_episodes_by_vector(
     tenant_id: str,
     query_embedding: list[float],
@@ -306,18 +315,25 @@ async def query_episodes(
     *,
     tenant_id: str | None = None,
     source_thread_id: str | None = None,
+    include_embedding: bool = False,
+    modified_since: int | None = None,
 ) -> list[dict[str, Any]]:
     """Query episodes by tenant and/or source thread ID.
 
-    Returns episodes without the embedding field for efficiency.
+    Returns episodes without the embedding field for efficiency, unless
+    *include_embedding* is set (the embedding and ``_ts`` are then included).
+    *modified_since* limits the results to episodes whose ``_ts`` (seconds
+    since the epoch) is at least that value, for delta syncs.
     """
     container = await get_episode_container()
 
     fields = (
         "c.id, c.tenant_id, c.trigger, c.symptoms, c.reasoning_chain, "
         "c.resolution, c.key_insight, c.confidence, c.source_thread_id, "
-        "c.message_count, c.created_at, c.updated_at"
+        "c.message_count, c.content_hash, c.created_at, c.updated_at"
     )
+    if include_embedding:
+        fields += ", c.embedding, c._ts"
     conditions: list[str] = []
     parameters: list[dict] = []
     partition_key: str | None = None
@@ -331,6 +347,10 @@ async def query_episodes(
         conditions.append("CONTAINS(c.source_thread_id, @thread_id)")
         parameters.append({"name": "@thread_id", "value": source_thread_id})
 
+    if modified_since is not None:
+        conditions.append("c._ts >= @modified_since")
+        parameters.append({"name": "@modified_since", "value": modified_since})
+
     where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
     query = f"SELECT {fields} FROM c{where} ORDER BY c.created_at DESC"
 
@@ -0,0 +1,230 @@
+"""Shared async embedding service.
+
+Every caller that needs a text embedding goes through
+``EmbeddingService.instance().embed(...)`` so that repeated texts are
+embedded once:
+
+- **Cache**: LRU keyed by ``(model, normalized text)`` with a TTL.  Retried
+  turns and identical questions across channels reuse the cached vector.
+- **Coalescing**: concurrent requests for the same text share one in-flight
+  request instead of each calling the model.
+- **Batching**: texts requested within a short window are sent in a single
+  ``embeddings.create`` call (up to ``max_batch_size`` inputs).  If a batch
+  fails, its texts are retried one by one so that one bad input only fails
+  its own callers.
+
+Only the cache key is normalized; the model embeds the caller's text.
+
+Lookups are counted in the ``embedding_cache_lookups`` metric with a
+``result`` attribute (``hit`` / ``coalesced`` / ``miss``); the hit rate is
+also available in-process via ``stats()``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+
+from opentelemetry import metrics as otel_metrics
+
+from config.app_config import get as cfg
+from utils.azure_ai_foundry import get_embedding_client
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_MAX_ENTRIES = 2048
+_DEFAULT_TTL_SECS = 3600.0
+_DEFAULT_BATCH_WINDOW_SECS = 0.01
+_DEFAULT_MAX_BATCH_SIZE = 16
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_meter = otel_metrics.get_meter("azure-sdk-qa-bot-embeddings")
+_lookup_counter = _meter.create_counter(
+    name="embedding_cache_lookups",
+    description="Embedding lookups by result (hit, coalesced, miss)",
+    unit="{lookup}",
+)
+_batch_size_histogram = _meter.create_histogram(
+    name="embedding_batch_size",
+    description="Number of texts sent in one embeddings.create call",
+    unit="{text}",
+)
+
+
+def normalize_text(text: str) -> str:
+    """Return the cache key form of *text*: NFKC-normalized, whitespace collapsed."""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+class EmbeddingService:
+    """Embed texts with caching, request coalescing and batching."""
+
+    _instance: EmbeddingService | None = None
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = _DEFAULT_MAX_ENTRIES,
+        ttl_secs: float = _DEFAULT_TTL_SECS,
+        batch_window_secs: float = _DEFAULT_BATCH_WINDOW_SECS,
+        max_batch_size: int = _DEFAULT_MAX_BATCH_SIZE,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl_secs = ttl_secs
+        self._batch_window_secs = batch_window_secs
+        self._max_batch_size = max_batch_size
+        # (model, text) -> (expires_at, embedding), least recently used first
+        self._cache: OrderedDict[tuple[str, str], tuple[float, list[float]]] = (
+            OrderedDict()
+        )
+        # (model, text) -> future of a request that is pending or in flight
+        self._in_flight: dict[tuple[str, str], asyncio.Future] = {}
+        # model -> (cache key text, text to embed) waiting for the next batch
+        self._pending: dict[str, list[tuple[str, str]]] = {}
+        # model -> timer that starts the pending batch at the end of the window
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        self._counts = {"hit": 0, "coalesced": 0, "miss": 0}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    @classmethod
+    def instance(cls) -> EmbeddingService:
+        """Return the process-wide singleton, creating it on first call."""
+        if cls._instance is None:
+            cls._instance = cls(
+                max_entries=int(
+                    cfg("EMBEDDING_CACHE_MAX_ENTRIES", str(_DEFAULT_MAX_ENTRIES))
+                ),
+                ttl_secs=float(cfg("EMBEDDING_CACHE_TTL_SECS", str(_DEFAULT_TTL_SECS))),
+            )
+        return cls._instance
+
+    async def embed(self, text: str, *, model: str) -> list[float]:
+        """Return the embedding of *text* from *model*.
+
+        Raises the error of the underlying ``embeddings.create`` call; failed
+        requests are not cached.
+        """
+        key = (model, normalize_text(text))
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            expires_at, embedding = cached
+            if expires_at > time.monotonic():
+                self._cache.move_to_end(key)
+                self._record("hit")
+                return embedding
+            del self._cache[key]
+
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Pending requests belong to a previous event loop that is gone.
+            self._loop = loop
+            self._in_flight.clear()
+            self._pending.clear()
+            self._timers.clear()
+
+        future = self._in_flight.get(key)
+        if future is not None:
+            self._record("coalesced")
+            return await asyncio.shield(future)
+
+        self._record("miss")
+        future = loop.create_future()
+        self._in_flight[key] = future
+        pending = self._pending.setdefault(model, [])
+        pending.append((key[1], text))
+        if len(pending) >= self._max_batch_size:
+            self._start_batch(model)
+        elif len(pending) == 1:
+            self._timers[model] = loop.call_later(
+                self._batch_window_secs, self._start_batch, model
+            )
+        return await asyncio.shield(future)
+
+    def _start_batch(self, model: str) -> None:
+        """Send the texts pending for *model* in one request."""
+        timer = self._timers.pop(model, None)
+        if timer is not None:
+            # Started early by a full batch; the timer belongs to this batch.
+            timer.cancel()
+        batch = self._pending.pop(model, [])
+        if batch:
+            task = asyncio.ensure_future(self._run_batch(model, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, model: str, batch: list[tuple[str, str]]) -> None:
+        _batch_size_histogram.record(len(batch), {"model": model})
+        try:
+            embeddings = await self._create(model, [text for _, text in batch])
+        except Exception as exc:
+            logger.warning(
+                "Embedding batch failed: model=%s texts=%d",
+                model,
+                len(batch),
+                exc_info=True,
+            )
+            if len(batch) == 1:
+                self._fail(model, batch[0][0], exc)
+                return
+            # Retry one by one so that one bad input (e.g. too long) does not
+            # fail the other callers of the batch.
+            await asyncio.gather(
+                *(self._run_batch(model, [entry]) for entry in batch)
+            )
+            return
+
+        expires_at = time.monotonic() + self._ttl_secs
+        for (key_text, _), embedding in zip(batch, embeddings):
+            key = (model, key_text)
+            self._cache[key] = (expires_at, embedding)
+            self._cache.move_to_end(key)
+            future = self._in_flight.pop(key, None)
+            if future is not None and not future.done():
+                future.set_result(embedding)
+        while len(self._cache) > self._max_entries:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    async def _create(model: str, texts: list[str]) -> list[list[float]]:
+        client = get_embedding_client()
+        response = await client.embeddings.create(model=model, input=texts)
+        embeddings = [None] * len(texts)
+        for position, item in enumerate(response.data):
+            embeddings[getattr(item, "index", position)] = item.embedding
+        return embeddings
+
+    def _fail(self, model: str, key_text: str, exc: Exception) -> None:
+        future = self._in_flight.pop((model, key_text), None)
+        if future is not None and not future.done():
+            future.set_exception(exc)
+            # Callers that timed out no longer await the future; mark the
+            # error retrieved so asyncio does not log it again.
+            future.exception()
+
+    def _record(self, result: str) -> None:
+        self._counts[result] += 1
+        _lookup_counter.add(1, {"result": result})
+
+    def stats(self) -> dict[str, float]:
+        """Return lookup counts by result and the hit rate since startup.
+
+        Coalesced lookups count as hits: they did not call the model.
+        """
+        total = sum(self._counts.values())
+        saved = self._counts["hit"] + self._counts["coalesced"]
+        return {
+            **self._counts,
+            "entries": len(self._cache),
+            "hit_rate": saved / total if total else 0.0,
+        }
+
+    def clear(self) -> None:
+        """Drop all cached embeddings."""
+        self._cache.clear()
@@ -0,0 +1,365 @@
+"""In-process vector index of tenant episodes.
+
+Cosmos DB stays the source of truth; this module keeps a per-tenant copy of
+the episode embeddings in memory so that the per-turn similarity search does
+not need a ``VectorDistance`` query.
+
+- Small tenants are searched by brute force (one NumPy matrix product).
+- Tenants with at least ``_IVF_MIN_EPISODES`` episodes also get an IVF
+  index (k-means centroids with inverted lists); a query scans only the
+  lists of its ``n_probe`` nearest centroids.
+- A tenant is loaded from ``query_episodes`` on its first search, in the
+  background; until then ``search`` returns ``None`` and the caller falls
+  back to Cosmos.  Later searches trigger a delta sync (episodes with a
+  newer ``_ts``) every ``sync_interval_secs`` and a full reload, which also
+  drops deleted episodes, every ``full_reload_secs``.  Loads and delta
+  syncs build a new index in a worker thread and swap it in, so searches
+  never wait for an IVF (re)build.
+- Tenants with more than ``max_episodes`` episodes are not indexed locally
+  (about 6 KB per 1536-dimension episode); their searches go to Cosmos.
+
+Scores are cosine similarities, like ``VectorDistance`` on the episode
+container's cosine vector policy.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import numpy as np
+
+from config.app_config import get as cfg
+from utils.azure_cosmosdb import query_episodes
+from utils.background_tasks import BackgroundTaskTracker
+
+logger = logging.getLogger(__name__)
+
+# Tenants with at least this many episodes get an IVF index.
+_IVF_MIN_EPISODES = 20_000
+
+# Inverted lists probed per query.
+_IVF_N_PROBE = 24
+
+# Rebuild the IVF index once this share of rows is outside it.
+_IVF_REBUILD_RATIO = 0.1
+
+_KMEANS_ITERATIONS = 8
+_KMEANS_SAMPLE_PER_LIST = 32
+
+_DEFAULT_SYNC_INTERVAL_SECS = 60.0
+_DEFAULT_FULL_RELOAD_SECS = 3600.0
+_DEFAULT_MAX_EPISODES = 50_000
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class _IvfIndex:
+    """Inverted-file index over the rows of a normalized embedding matrix."""
+
+    def __init__(self, vectors: np.ndarray, *, seed: int = 0) -> None:
+        rows = len(vectors)
+        n_lists = max(int(np.sqrt(rows)), 1)
+        rng = np.random.default_rng(seed)
+        sample_size = min(rows, n_lists * _KMEANS_SAMPLE_PER_LIST)
+        sample = vectors[rng.choice(rows, sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, n_lists, replace=False)]
+
+        # Spherical k-means on the sample
+        for _ in range(_KMEANS_ITERATIONS):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            counts = np.bincount(assignment, minlength=n_lists)
+            filled = counts > 0
+            centroids[filled] = _normalize(sums[filled])
+
+        assignment = np.empty(rows, dtype=np.int64)
+        for start in range(0, rows, 8192):
+            block = vectors[start : start + 8192]
+            assignment[start : start + 8192] = np.argmax(block @ centroids.T, axis=1)
+
+        order = np.argsort(assignment, kind="stable")
+        bounds = np.searchsorted(assignment[order], np.arange(n_lists + 1))
+        self.centroids = centroids
+        self.lists = [order[bounds[i] : bounds[i + 1]] for i in range(n_lists)]
+        self.rows = rows
+
+    def candidates(self, query: np.ndarray, n_probe: int) -> np.ndarray:
+        """Return the rows in the lists of the *n_probe* centroids nearest *query*."""
+        n_probe = min(n_probe, len(self.lists))
+        nearest = np.argpartition(-(self.centroids @ query), n_probe - 1)[:n_probe]
+        return np.concatenate([self.lists[i] for i in nearest])
+
+
+class TenantEpisodeIndex:
+    """Episodes of one tenant: normalized embeddings plus the episode fields."""
+
+    def __init__(self, dimensions: int | None = None) -> None:
+        self._dimensions = dimensions
+        self._vectors = np.empty((0, dimensions or 0), dtype=np.float32)
+        self._count = 0
+        self._docs: list[dict[str, Any]] = []
+        self._rows: dict[str, int] = {}
+        self._ivf: _IvfIndex | None = None
+        # Rows not (correctly) covered by the IVF lists: appended or re-embedded
+        self._outside_ivf: set[int] = set()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def copy(self) -> TenantEpisodeIndex:
+        """Return an independent copy; the (immutable) IVF index is shared."""
+        clone = TenantEpisodeIndex(self._dimensions)
+        clone._vectors = self._vectors[: self._count].copy()
+        clone._count = self._count
+        clone._docs = list(self._docs)
+        clone._rows = dict(self._rows)
+        clone._ivf = self._ivf
+        clone._outside_ivf = set(self._outside_ivf)
+        return clone
+
+    def upsert(self, docs: list[dict[str, Any]]) -> None:
+        """Add or replace episodes; each doc must carry ``id`` and ``embedding``."""
+        docs = [
+            d for d in docs if d.get("embedding") is not None and len(d["embedding"])
+        ]
+        if not docs:
+            return
+        vectors = _normalize(
+            np.asarray([d["embedding"] for d in docs], dtype=np.float32)
+        )
+        if self._dimensions is None:
+            self._dimensions = vectors.shape[1]
+            self._vectors = np.empty((0, self._dimensions), dtype=np.float32)
+
+        for doc, vector in zip(docs, vectors):
+            fields = {k: v for k, v in doc.items() if k not in ("embedding", "_ts")}
+            row = self._rows.get(doc["id"])
+            if row is None:
+                row = self._append_row()
+                self._rows[doc["id"]] = row
+                self._docs.append(fields)
+            else:
+                self._docs[row] = fields
+            self._vectors[row] = vector
+            if self._ivf is not None:
+                self._outside_ivf.add(row)
+
+        if self._ivf is None and self._count >= _IVF_MIN_EPISODES:
+            self.build_ivf()
+        elif (
+            self._ivf is not None
+            and len(self._outside_ivf) > _IVF_REBUILD_RATIO * self._count
+        ):
+            self.build_ivf()
+
+    def _append_row(self) -> int:
+        if self._count == len(self._vectors):
+            capacity = max(64, 2 * len(self._vectors))
+            grown = np.empty((capacity, self._dimensions), dtype=np.float32)
+            grown[: self._count] = self._vectors[: self._count]
+            self._vectors = grown
+        self._count += 1
+        return self._count - 1
+
+    def build_ivf(self) -> None:
+        """(Re)build the IVF index over all rows.
+
+        Takes seconds for large tenants: call it off the event loop.
+        """
+        started = time.perf_counter()
+        self._ivf = _IvfIndex(self._vectors[: self._count])
+        self._outside_ivf.clear()
+        logger.info(
+            "Built episode IVF index: episodes=%d lists=%d in %.2fs",
+            self._count,
+            len(self._ivf.lists),
+            time.perf_counter() - started,
+        )
+
+    def search(
+        self, query_embedding: list[float], top_k: int
+    ) -> list[dict[str, Any]]:
+        """Return the *top_k* most similar episodes with a ``similarity_score``."""
+        if not self._count or top_k <= 0:
+            return []
+        query = _normalize(np.asarray(query_embedding, dtype=np.float32))
+        vectors = self._vectors[: self._count]
+
+        if self._ivf is None:
+            rows = None
+            scores = vectors @ query
+        else:
+            rows = self._ivf.candidates(query, _IVF_N_PROBE)
+            if self._outside_ivf:
+                rows = np.union1d(
+                    rows, np.fromiter(self._outside_ivf, dtype=np.int64)
+                )
+            scores = vectors[rows] @ query
+
+        k = min(top_k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        results = []
+        for i in best:
+            row = int(i) if rows is None else int(rows[i])
+            results.append({**self._docs[row], "similarity_score": float(scores[i])})
+        return results
+
+
+class _TenantState:
+    def __init__(self) -> None:
+        self.index: TenantEpisodeIndex | None = None
+        self.last_ts = 0
+        self.last_sync = 0.0
+        self.last_full_load = 0.0
+        self.syncing = False
+        # Set while the tenant is over ``max_episodes``: no local index until then
+        self.oversized_until = 0.0
+
+
+class EpisodeIndex:
+    """Per-tenant local episode indexes, kept in sync with Cosmos DB."""
+
+    _instance: EpisodeIndex | None = None
+
+    def __init__(
+        self,
+        *,
+        loader: Callable[..., Awaitable[list[dict[str, Any]]]] = query_episodes,
+        sync_interval_secs: float = _DEFAULT_SYNC_INTERVAL_SECS,
+        full_reload_secs: float = _DEFAULT_FULL_RELOAD_SECS,
+        max_episodes: int = _DEFAULT_MAX_EPISODES,
+    ) -> None:
+        self._loader = loader
+        self._sync_interval_secs = sync_interval_secs
+        self._full_reload_secs = full_reload_secs
+        self._max_episodes = max_episodes
+        self._tenants: dict[str, _TenantState] = {}
+
+    @classmethod
+    def instance(cls) -> EpisodeIndex:
+        """Return the process-wide singleton, creating it on first call."""
+        if cls._instance is None:
+            cls._instance = cls(
+                sync_interval_secs=float(
+                    cfg(
+                        "MEMORY_EPISODE_INDEX_SYNC_SECS",
+                        str(_DEFAULT_SYNC_INTERVAL_SECS),
+                    )
+                ),
+                max_episodes=int(
+                    cfg("MEMORY_EPISODE_INDEX_MAX_EPISODES", str(_DEFAULT_MAX_EPISODES))
+                ),
+            )
+        return cls._instance
+
+    async def search(
+        self,
+        tenant_id: str,
+        query_embedding: list[float],
+        *,
+        top_k: int,
+    ) -> list[dict[str, Any]] | None:
+        """Search the tenant's local index.
+
+        Returns ``None`` while the tenant is not loaded yet (loading it in the
+        background), so that the caller can fall back to Cosmos DB.
+        """
+        state = self._tenants.setdefault(tenant_id, _TenantState())
+        if state.oversized_until > time.monotonic():
+            return None
+        if time.monotonic() - state.last_sync >= self._sync_interval_secs:
+            self._start_sync(tenant_id, state)
+        if state.index is None:
+            return None
+        return state.index.search(query_embedding, top_k)
+
+    def _start_sync(self, tenant_id: str, state: _TenantState) -> None:
+        if state.syncing:
+            return
+        state.syncing = True
+        task = asyncio.create_task(self.sync(tenant_id))
+        BackgroundTaskTracker.instance().track(task)
+
+    async def sync(self, tenant_id: str) -> None:
+        """Load the tenant's episodes changed since the last sync (or all)."""
+        state = self._tenants.setdefault(tenant_id, _TenantState())
+        state.syncing = True
+        full = (
+            state.index is None
+            or time.monotonic() - state.last_full_load >= self._full_reload_secs
+        )
+        try:
+            docs = await self._loader(
+                tenant_id=tenant_id,
+                include_embedding=True,
+                modified_since=None if full else state.last_ts,
+            )
+            # Build off the event loop (k-means on a large tenant takes a
+            # while) and swap the new index in; searches keep using the old
+            # one meanwhile.
+            if full:
+                if len(docs) > self._max_episodes:
+                    self._drop_oversized(tenant_id, state, len(docs))
+                    return
+                index = await asyncio.to_thread(self._build, docs)
+                state.last_full_load = time.monotonic()
+            elif docs:
+                index = await asyncio.to_thread(self._apply_delta, state.index, docs)
+            else:
+                index = state.index
+            if len(index) > self._max_episodes:
+                self._drop_oversized(tenant_id, state, len(index))
+                return
+            state.index = index
+            state.last_ts = max(
+                [state.last_ts, *(d.get("_ts", 0) for d in docs)]
+            )
+            logger.info(
+                "Episode index %s for tenant=%s: %d loaded, %d indexed",
+                "loaded" if full else "synced",
+                tenant_id,
+                len(docs),
+                len(state.index),
+            )
+        except Exception:
+            logger.warning(
+                "Episode index sync failed for tenant=%s", tenant_id, exc_info=True
+            )
+        finally:
+            state.last_sync = time.monotonic()
+            state.syncing = False
+
+    def _drop_oversized(self, tenant_id: str, state: _TenantState, count: int) -> None:
+        logger.warning(
+            "Episode index disabled for tenant=%s: %d episodes exceed the "
+            "limit of %d; searching Cosmos DB until the next full reload",
+            tenant_id,
+            count,
+            self._max_episodes,
+        )
+        state.index = None
+        state.last_ts = 0
+        state.oversized_until = time.monotonic() + self._full_reload_secs
+
+    @staticmethod
+    def _build(docs: list[dict[str, Any]]) -> TenantEpisodeIndex:
+        index = TenantEpisodeIndex()
+        index.upsert(docs)
+        return index
+
+    @staticmethod
+    def _apply_delta(
+        current: TenantEpisodeIndex, docs: list[dict[str, Any]]
+    ) -> TenantEpisodeIndex:
+        index = current.copy()
+        index.upsert(docs)
+        return index
@@ -20,26 +20,31 @@ Key behaviors aligned with FoundryMemoryProvider best practices:
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 import re
-from typing import Any
+import time
+from typing import Any, Awaitable
 
 from agent_framework import Message
 from agent_framework._sessions import ContextProvider
 from azure.ai.projects.aio import AIProjectClient
 from azure.ai.projects.models import MemorySearchOptions
+from opentelemetry import trace
 
 from config.app_config import get as cfg
 from utils.azure_cosmosdb import search_episodes_by_vector
-from utils.azure_ai_foundry import get_embedding_client
 from utils.azure_memory_store import (
     get_memory_update_delay,
     get_user_store_name,
     sanitize_scope,
 )
+from utils.embedding_service import EmbeddingService
+from utils.episode_index import EpisodeIndex
 
 logger = logging.getLogger(__name__)
+_tracer = trace.get_tracer(__name__)
 
 _MAX_MEMORIES_PER_SEARCH = 10
 
@@ -82,6 +87,19 @@ class MemoryContextProvider(ContextProvider):
             "MEMORY_STORE_EMBEDDING_MODEL", "text-embedding-3-small"
         )
 
+        # Local episode index (Cosmos DB remains the source of truth)
+        self._episode_index = (
+            EpisodeIndex.instance()
+            if cfg("MEMORY_EPISODE_LOCAL_INDEX", "false").lower() == "true"
+            else None
+        )
+
+        # Per-branch retrieval timeouts for before_run
+        self._user_search_timeout = float(cfg("MEMORY_USER_SEARCH_TIMEOUT_SECS", "5"))
+        self._episode_search_timeout = float(
+            cfg("MEMORY_EPISODE_SEARCH_TIMEOUT_SECS", "5")
+        )
+
         logger.info(
             "MemoryContextProvider initialized: user_store=%s, "
             "update_delay=%d, enable_tenant_memory_search=%s, "
@@ -120,43 +138,58 @@ class MemoryContextProvider(ContextProvider):
             logger.info("before_run skipped: no scope resolved from input messages")
             return
 
-        # Fetch static (user profile) memories once per session
-        if not state.get("initialized"):
-            await self._fetch_static_memories(session, user_scope, state)
-            state["initialized"] = True
-
         # Build search items from all non-empty input messages (excluding markers)
         items = self._build_search_items(context.input_messages)
         logger.info("before_run: %d search items built from input messages", len(items))
 
-        if not items:
-            memory_text = self._format_all_memories(
-                state.get("user_static_memories", []),
+        # The static fetch (once per session), the contextual user search and the
+        # episode search are independent round-trips, so they run concurrently.
+        # A branch that exceeds its timeout contributes no memories to this turn.
+        branches: dict[str, Awaitable] = {}
+        fetch_static = not state.get("initialized")
+        if fetch_static and user_scope:
+            branches["user_static"] = self._run_branch(
+                "user_static",
+                self._fetch_static_from_store(
+                    self._user_store_name, user_scope, session
+                ),
+                self._user_search_timeout,
             )
-            if memory_text:
-                context.extend_messages(self, [Message("system", [memory_text])])
-            return
-
-        # --- User contextual search ---
-        user_ctx_mems: list = []
-        if self._user_store_name and user_scope:
-            user_ctx_mems = await self._search_contextual(
-                self._user_store_name,
-                user_scope,
-                items,
-                state,
-                "user_previous_search_id",
+        if items and user_scope:
+            branches["user_contextual"] = self._run_branch(
+                "user_contextual",
+                self._search_contextual(
+                    self._user_store_name,
+                    user_scope,
+                    items,
+                    state,
+                    "user_previous_search_id",
+                ),
+                self._user_search_timeout,
+            )
+        if items and tenant_scope and self._enable_tenant_memory_search:
+            branches["episodes"] = self._run_branch(
+                "episodes",
+                self._search_episodes(context, tenant_scope),
+                self._episode_search_timeout,
             )
+        elif items and tenant_scope:
+            logger.info("Tenant memory search disabled by config")
 
-        # Combine user memories
-        all_user = list(state.get("user_static_memories", [])) + user_ctx_mems
+        results = dict(zip(branches, await asyncio.gather(*branches.values())))
 
-        # --- Episode search (Cosmos DB vector similarity) ---
-        episodes: list[dict] = []
-        if tenant_scope and self._enable_tenant_memory_search:
-            episodes = await self._search_episodes(context, tenant_scope)
-        elif tenant_scope and not self._enable_tenant_memory_search:
-            logger.info("Tenant memory search disabled by config")
+        if fetch_static:
+            static_mems = results.get("user_static")
+            if static_mems is not None or not user_scope:
+                state["user_static_memories"] = static_mems or []
+                state["initialized"] = True
+            # else: timed out — retried on the next turn
+
+        # Combine user memories
+        all_user = list(state.get("user_static_memories", [])) + (
+            results.get("user_contextual") or []
+        )
+        episodes: list[dict] = results.get("episodes") or []
 
         memory_text = self._format_all_memories(all_user, episodes)
 
@@ -176,6 +209,35 @@ class MemoryContextProvider(ContextProvider):
                 tenant_scope,
             )
 
+    @staticmethod
+    async def _run_branch(name: str, coro: Awaitable, timeout: float) -> Any:
+        """Await one retrieval branch of before_run in its own span.
+
+        Returns ``None`` if the branch does not finish within *timeout* seconds.
+        """
+        with _tracer.start_as_current_span(f"memory.before_run.{name}") as span:
+            start = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(coro, timeout=timeout)
+            except asyncio.TimeoutError:
+                span.set_attribute("memory.timed_out", True)
+                logger.warning(
+                    "before_run: %s timed out after %.1fs — continuing without it",
+                    name,
+                    timeout,
+                )
+                return None
+            elapsed = time.perf_counter() - start
+            span.set_attribute("memory.timed_out", False)
+            span.set_attribute("memory.result_count", len(result))
+            logger.info(
+                "before_run: %s returned %d results in %.2fs",
+                name,
+                len(result),
+                elapsed,
+            )
+            return result
+
     async def _search_contextual(
         self,
         store_name: str,
@@ -249,11 +311,18 @@ class MemoryContextProvider(ContextProvider):
             return []
 
         try:
-            results = await search_episodes_by_vector(
-                tenant_id,
-                embedding,
-                top_k=self._episode_top_k,
-            )
+            results = None
+            if self._episode_index is not None:
+                results = await self._episode_index.search(
+                    tenant_id, embedding, top_k=self._episode_top_k
+                )
+            if results is None:
+                # No local index, or the tenant is still loading
+                results = await search_episodes_by_vector(
+                    tenant_id,
+                    embedding,
+                    top_k=self._episode_top_k,
+                )
         except Exception:
             logger.warning(
                 "Episode search failed for tenant=%s",
@@ -277,13 +346,10 @@ class MemoryContextProvider(ContextProvider):
         return filtered
 
     async def _generate_query_embedding(self, text: str) -> list[float]:
-        """Generate a vector embedding for the user's query."""
-        client = get_embedding_client()
-        response = await client.embeddings.create(
-            model=self._episode_embedding_model,
-            input=text,
+        """Generate a vector embedding for the user's query (cached)."""
+        return await EmbeddingService.instance().embed(
+            text, model=self._episode_embedding_model
         )
-        return response.data[0].embedding
 
     @staticmethod
     def _get_latest_user_text(messages) -> str | None:
@@ -394,19 +460,6 @@ class MemoryContextProvider(ContextProvider):
     # Static memory fetch (once per session)
     # ------------------------------------------------------------------
 
-    async def _fetch_static_memories(
-        self, session, user_scope: str | None, state: dict[str, Any]
-    ) -> None:
-        """Fetch user-profile memories (no items/query) from the user store."""
-        if self._user_store_name and user_scope:
-            state["user_static_memories"] = await self._fetch_static_from_store(
-                self._user_store_name,
-                user_scope,
-                session,
-            )
-        else:
-            state["user_static_memories"] = []
-
     async def _fetch_static_from_store(
         self,
         store_name: str,